@@ -15,6 +15,31 @@
 # ------------------------------------------------------------------------------
 import sys
 import os
+import pathlib
+import argparse
+import ast
+import asyncio
+import atexit
+import collections
+import concurrent.futures
+import contextlib
+import cProfile
+import functools
+import gzip
+import hashlib
+import mimetypes
+import posixpath
+import pstats
+import queue
+import re
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+import weakref
+import zlib
+from http import HTTPStatus
 import io
 import json
 import sqlite3
@@ -26,12 +51,17 @@ import matplotlib
 matplotlib.use('QtAgg')
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
 import shutil
+import tempfile
 from datetime import datetime
 import logging
+import logging.handlers
 import time
 import geopandas as gpd
+import shapely
 from shapely.geometry import Point, Polygon
+from shapely.strtree import STRtree
 import folium.plugins as plugins
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QWidget,
@@ -39,10 +69,11 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QWidget,
                              QDialogButtonBox, QMessageBox, QComboBox, QLabel,
                              QCheckBox, QGroupBox, QHBoxLayout, QListWidget, QListWidgetItem,
                              QScrollArea, QFileDialog, QDateEdit, QMenuBar, QMenu,
-                             QSplashScreen, QStyle, QTableWidget, QTableWidgetItem, QHeaderView)
+                             QSplashScreen, QStyle, QTableWidget, QTableWidgetItem, QHeaderView, QSpinBox)
 from PyQt6.QtWebChannel import QWebChannel
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtCore import Qt, QUrl, QDate, QObject, pyqtSlot, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob
+from PyQt6.QtCore import Qt, QUrl, QDate, QObject, QThread, pyqtSlot, pyqtSignal, QBuffer, QIODevice, QFile
 from PyQt6.QtGui import QAction, QIcon, QPixmap, QColor, QActionGroup
 
 from reportlab.pdfgen import canvas
@@ -52,6 +83,9 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import Paragraph
 from reportlab.lib.colors import navy, green, red
 
+import patara_isci
+from patara_isci import PATARA_SINIR_KUTUSU, TARIH_SUTUNLARI, SAYIM_SUTUNLARI, kullanilabilir_cpu_sayisi, sutun_adlarini_normallestir, web_merkator, karo_araligi
+
 # ------------------------------------------------------------------------------
 # BÖLÜM 2: GLOBAL AYARLAR VE YARDIMCI FONKSİYONLAR
 # ------------------------------------------------------------------------------
@@ -86,25 +120,336 @@ def load_config():
         return {"sabit_lejantlar": {}}
 
 
-def setup_logging():
+GUNLUK_KLASORU = os.path.join(SCRIPT_DIR, "gunlukler")
+GUNLUK_DOSYASI = "etkinlik.jsonl"
+ESKI_GUNLUK_DOSYASI = os.path.join(SCRIPT_DIR, "activity_log.txt")
+GUNLUK_AZAMI_BOYUT = 5 * 1024 * 1024
+GUNLUK_YEDEK_SAYISI = 20
+YAVAS_ISLEM_ESIGI_MS = 200
+GUNLUK_ALANLARI = ("eylem", "idler", "yil", "satir", "sure_ms", "islem", "ust")
+_gunluk_dinleyici = None
+
+
+class JsonSatirBicimleyici(logging.Formatter):
     """
-    Uygulama aktivitelerini ve hatalarını 'activity_log.txt' dosyasına kaydetmek
-    için loglama sistemini kurar.
+    Her kaydı tek satırlık bir JSON nesnesi olarak biçimlendirir. `extra=` ile verilen
+    yapısal alanlar (eylem, idler, yil, satir, sure_ms, islem, ust) olduğu gibi yazılır.
     """
-    log_dosyasi = os.path.join(SCRIPT_DIR, "activity_log.txt")
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_dosyasi, mode='a', encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
 
+    def format(self, record):
+        kayit = {"zaman": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"), "seviye": record.levelname,
+                 "kaynak": record.name, "fonksiyon": record.funcName, "is_parcacigi": record.threadName, "mesaj": record.getMessage()}
+        for alan in GUNLUK_ALANLARI:
+            if getattr(record, alan, None) is not None: kayit[alan] = getattr(record, alan)
+        if record.exc_info and not record.exc_text: record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text: kayit["hata"] = record.exc_text
+        return json.dumps(kayit, ensure_ascii=False, default=str)
+
+
+class GunlukKuyrukIsleyici(logging.handlers.QueueHandler):
+    """
+    Kaydı kuyruğa koymadan önce mesajı ve hata izini metne çevirir; ham `msg`, yapısal
+    alanlar ve kaynak bilgisi korunur. Dosyaya yazma arka plandaki dinleyicide yapılır.
+    """
+
+    def prepare(self, record):
+        hazir = logging.makeLogRecord(record.__dict__)
+        hazir.msg = record.getMessage(); hazir.args = None
+        if record.exc_info and not record.exc_text: hazir.exc_text = logging.Formatter().formatException(record.exc_info)
+        hazir.exc_info = None
+        return hazir
+
+
+def _gunlugu_sikistir(kaynak, hedef):
+    with open(kaynak, 'rb') as girdi, gzip.open(hedef, 'wb') as cikti: shutil.copyfileobj(girdi, cikti)
+    os.remove(kaynak)
+
+
+def setup_logging(klasor=None):
+    """
+    Loglama sistemini kurar. Kayıtlar kuyruğa bırakılır; arka plandaki bir dinleyici onları
+    'gunlukler/etkinlik.jsonl' dosyasına JSON satırları olarak yazar ve konsola basar.
+    Dosya GUNLUK_AZAMI_BOYUT'u aşınca döndürülür ve eski parçalar .gz olarak sıkıştırılır.
+    """
+    global _gunluk_dinleyici
+    gunlugu_kapat()
+    klasor = klasor or GUNLUK_KLASORU; os.makedirs(klasor, exist_ok=True)
+    dosya = logging.handlers.RotatingFileHandler(os.path.join(klasor, GUNLUK_DOSYASI), maxBytes=GUNLUK_AZAMI_BOYUT,
+                                                 backupCount=GUNLUK_YEDEK_SAYISI, encoding='utf-8', delay=True)
+    dosya.namer = lambda ad: ad + ".gz"; dosya.rotator = _gunlugu_sikistir; dosya.setFormatter(JsonSatirBicimleyici())
+    konsol = logging.StreamHandler(); konsol.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    kuyruk = queue.SimpleQueue(); kok = logging.getLogger()
+    for isleyici in list(kok.handlers): kok.removeHandler(isleyici)
+    kok.setLevel(logging.INFO); kok.addHandler(GunlukKuyrukIsleyici(kuyruk))
+    _gunluk_dinleyici = logging.handlers.QueueListener(kuyruk, dosya, konsol, respect_handler_level=True); _gunluk_dinleyici.start()
+
+
+def gunlugu_kapat():
+    """Dinleyiciyi durdurur; kuyrukta bekleyen kayıtlar yazıldıktan sonra döner."""
+    global _gunluk_dinleyici
+    if _gunluk_dinleyici is None: return
+    _gunluk_dinleyici.stop()
+    for isleyici in _gunluk_dinleyici.handlers: isleyici.close()
+    _gunluk_dinleyici = None
+
+
+atexit.register(gunlugu_kapat)
+
+
+ESKI_GUNLUK_DESENI = re.compile(r"^(\d{4}-\d\d-\d\d) (\d\d:\d\d:\d\d),(\d{3}) - (\w+) - (.*)$")
+
+
+def gunluk_dosyalari(klasor=None, eski=True):
+    """Günlük dosyalarını eskiden yeniye sıralı döner (eski metin günlüğü, .N.gz parçaları, etkin dosya)."""
+    klasor = klasor or GUNLUK_KLASORU; parcalar = []
+    if os.path.isdir(klasor):
+        for ad in os.listdir(klasor):
+            if m := re.fullmatch(re.escape(GUNLUK_DOSYASI) + r"\.(\d+)\.gz", ad): parcalar.append((int(m.group(1)), os.path.join(klasor, ad)))
+    yollar = [yol for _, yol in sorted(parcalar, reverse=True)]
+    if os.path.exists(os.path.join(klasor, GUNLUK_DOSYASI)): yollar.append(os.path.join(klasor, GUNLUK_DOSYASI))
+    return ([ESKI_GUNLUK_DOSYASI] if eski and os.path.exists(ESKI_GUNLUK_DOSYASI) else []) + yollar
+
+
+def _eski_gunluk_kayitlari(satirlar):
+    kayit = None
+    for satir in satirlar:
+        m = ESKI_GUNLUK_DESENI.match(satir.rstrip("\n"))
+        if not m:
+            if kayit is not None: kayit["hata"] = kayit.get("hata", "") + satir  # çok satırlı hata izi
+            continue
+        if kayit is not None: yield kayit
+        kayit = {"zaman": f"{m.group(1)}T{m.group(2)}.{m.group(3)}", "seviye": m.group(4), "kaynak": "root", "mesaj": m.group(5)}
+        if kayit["mesaj"].startswith("KULLANICI EYLEMİ:"): kayit["eylem"] = "eski_kayit"
+    if kayit is not None: yield kayit
+
+
+def gunluk_kayitlari(klasor=None, baslangic=None, bitis=None, eski=True):
+    """
+    Yapısal günlük kayıtlarını (sözlük olarak) zaman sırasıyla üretir. Sıkıştırılmış parçalar ve
+    eski 'activity_log.txt' de okunur. `baslangic`/`bitis` 'YYYY-AA-GG' (ya da daha uzun ISO) önekleridir.
+    """
+    for yol in gunluk_dosyalari(klasor, eski):
+        with (gzip.open(yol, 'rt', encoding='utf-8') if yol.endswith(".gz") else open(yol, encoding='utf-8', errors='replace')) as f:
+            if yol == ESKI_GUNLUK_DOSYASI: kayitlar = _eski_gunluk_kayitlari(f)
+            else: kayitlar = (json.loads(satir) for satir in f if satir.strip())
+            for kayit in kayitlar:
+                if baslangic and kayit["zaman"] < baslangic: continue
+                if bitis and kayit["zaman"][:len(bitis)] > bitis: continue
+                yield kayit
+
+
+def gunluk_tablosu(klasor=None, baslangic=None, bitis=None, eski=True):
+    """Günlük kayıtlarını sabit sütunlu bir DataFrame olarak döner."""
+    sutunlar = ["zaman", "seviye", "kaynak", "fonksiyon", "mesaj", *GUNLUK_ALANLARI, "hata"]
+    return pd.DataFrame(list(gunluk_kayitlari(klasor, baslangic, bitis, eski)), columns=sutunlar)
 
-def create_pdf_report(dosya_yolu, baslik, icerik_listesi, grafik_yolu=None):
+
+def gunluk_ozeti(tur, df, esik_ms=YAVAS_ISLEM_ESIGI_MS):
+    """
+    Günlük tablosunu özetler: 'eylemler' eylem başına sayı/satır toplamı, 'yavas' eşiği aşan
+    işlemlerin süre dağılımı, 'hatalar' uyarı ve hataların mesaj başına sayısıdır.
+    """
+    if tur == "eylemler":
+        df = df[df["eylem"].notna()].assign(satir=lambda d: pd.to_numeric(d["satir"], errors="coerce"))
+        ozet = df.groupby("eylem").agg(sayi=("zaman", "size"), satir=("satir", "sum"), ilk=("zaman", "min"), son=("zaman", "max"))
+        return ozet.sort_values("sayi", ascending=False).reset_index()
+    if tur == "yavas":
+        df = df[df["islem"].notna()].assign(sure_ms=lambda d: pd.to_numeric(d["sure_ms"], errors="coerce"))
+        df = df[df["sure_ms"] >= esik_ms]; gruplar = df.groupby("islem")["sure_ms"]
+        ozet = pd.DataFrame({"sayi": gruplar.size(), "p50_ms": gruplar.median(), "p95_ms": gruplar.quantile(0.95),
+                             "en_uzun_ms": gruplar.max(), "toplam_sn": gruplar.sum() / 1000, "son": df.groupby("islem")["zaman"].max()})
+        return ozet.sort_values("toplam_sn", ascending=False).round(1).reset_index()
+    if tur == "hatalar":
+        df = df[df["seviye"].isin(["WARNING", "ERROR", "CRITICAL"])].assign(mesaj=lambda d: d["mesaj"].str.split("\n").str[0].str.slice(0, 120))
+        ozet = df.groupby(["seviye", "mesaj"]).agg(sayi=("zaman", "size"), son=("zaman", "max"))
+        return ozet.sort_values("sayi", ascending=False).reset_index()
+    raise ValueError(f"Bilinmeyen özet türü: {tur}")
+
+
+class PerformansKaydedici:
+    """
+    Sıcak yollardaki işlemlerin sürelerini iç içe ölçüm aralıkları olarak kaydeder.
+    Her aralık adını, üst aralığını, derinliğini, süresini ve (varsa) satır sayısını tutar.
+    Son kayıtlar bellekte sınırlı bir halkada saklanır; özet p50/p95 olarak alınabilir.
+    `yavas_esik_ms`'yi aşan aralıklar ayrıca yapısal günlüğe (islem, sure_ms, satir) yazılır.
+    """
+
+    def __init__(self, kapasite=20000, yavas_esik_ms=YAVAS_ISLEM_ESIGI_MS):
+        self._araliklar = collections.deque(maxlen=kapasite); self.yavas_esik_ms = yavas_esik_ms
+        self._yerel = threading.local()
+        self._profil = None
+
+    def _yigin(self):
+        if not hasattr(self._yerel, 'yigin'): self._yerel.yigin = []
+        return self._yerel.yigin
+
+    @contextlib.contextmanager
+    def olc(self, ad, satir=None):
+        yigin = self._yigin()
+        aralik = {"ad": ad, "ust": yigin[-1]["ad"] if yigin else None, "derinlik": len(yigin),
+                  "baslangic": time.time(), "sure_ms": None, "satir": satir, "is_parcacigi": threading.current_thread().name}
+        yigin.append(aralik); t0 = time.perf_counter()
+        try:
+            yield aralik
+        finally:
+            aralik["sure_ms"] = (time.perf_counter() - t0) * 1000
+            yigin.pop(); self._araliklar.append(aralik)
+            if self.yavas_esik_ms is not None and aralik["sure_ms"] >= self.yavas_esik_ms:
+                logging.getLogger("patara.performans").info(f"Yavaş işlem: {ad} {aralik['sure_ms']:.0f} ms",
+                    extra={"islem": ad, "sure_ms": round(aralik["sure_ms"], 1), "satir": aralik["satir"], "ust": aralik["ust"]})
+
+    def olculen(self, ad=None):
+        """Fonksiyonu bir ölçüm aralığıyla saran dekoratör. Dönüş değerinin uzunluğu satır sayısı olarak kaydedilir."""
+        def dekorator(fonksiyon):
+            aralik_adi = ad or fonksiyon.__qualname__
+
+            @functools.wraps(fonksiyon)
+            def sarmalayici(*args, **kwargs):
+                with self.olc(aralik_adi) as aralik:
+                    sonuc = fonksiyon(*args, **kwargs)
+                    if aralik["satir"] is None and isinstance(sonuc, (list, dict, pd.DataFrame)): aralik["satir"] = len(sonuc)
+                    return sonuc
+            return sarmalayici
+        return dekorator
+
+    def satir_say(self, satir):
+        """İçinde bulunulan ölçüm aralığının satır sayısını belirler."""
+        yigin = self._yigin()
+        if yigin: yigin[-1]["satir"] = satir
+
+    def temizle(self):
+        self._araliklar.clear()
+
+    def araliklar(self):
+        return list(self._araliklar)
+
+    def ozet(self):
+        """Ölçüm adına göre çağrı sayısı, p50/p95/en uzun süre ve ortalama satır sayısını döner."""
+        gruplar = {}
+        for aralik in list(self._araliklar): gruplar.setdefault(aralik["ad"], []).append(aralik)
+        ozet = []
+        for ad, araliklar in gruplar.items():
+            sureler = np.array([a["sure_ms"] for a in araliklar]); satirlar = [a["satir"] for a in araliklar if a["satir"] is not None]
+            ozet.append({"ad": ad, "cagri": len(araliklar), "p50_ms": float(np.percentile(sureler, 50)),
+                         "p95_ms": float(np.percentile(sureler, 95)), "en_uzun_ms": float(sureler.max()),
+                         "toplam_ms": float(sureler.sum()), "ortalama_satir": float(np.mean(satirlar)) if satirlar else None})
+        return sorted(ozet, key=lambda o: o["toplam_ms"], reverse=True)
+
+    def json_aktar(self, dosya_yolu):
+        with open(dosya_yolu, 'w', encoding='utf-8') as f:
+            json.dump({"olusturulma": datetime.now().isoformat(), "ozet": self.ozet(), "araliklar": self.araliklar()},
+                      f, ensure_ascii=False, indent=2)
+
+    @property
+    def profil_aktif(self):
+        return self._profil is not None
+
+    def profil_baslat(self):
+        """İsteğe bağlı cProfile kaydını başlatır."""
+        if self._profil is None: self._profil = cProfile.Profile(); self._profil.enable()
+
+    def profil_durdur(self, dosya_yolu):
+        """cProfile kaydını durdurup '.prof' dosyasına ve yanına okunabilir bir özet '.txt' dosyasına yazar."""
+        if self._profil is None: return
+        self._profil.disable(); self._profil.dump_stats(dosya_yolu)
+        with open(os.path.splitext(dosya_yolu)[0] + ".txt", 'w', encoding='utf-8') as f:
+            pstats.Stats(self._profil, stream=f).sort_stats("cumulative").print_stats(60)
+        self._profil = None
+
+
+performans = PerformansKaydedici()
+
+CIKTI_ONBELLEK_KLASORU = os.path.join(SCRIPT_DIR, "cache", "ciktilar")
+CIKTI_ONBELLEK_AZAMI_BAYT = 256 * 1024 * 1024
+
+
+@functools.lru_cache(maxsize=None)
+def kod_surumu():
+    """Çalışan kaynak dosyanın kısa özeti; kod değişince diskteki çıktı önbelleği kendiliğinden geçersizleşir."""
+    try:
+        with open(os.path.abspath(__file__), 'rb') as f: return hashlib.sha256(f.read()).hexdigest()[:16]
+    except OSError: return "v1.3"
+
+
+class CiktiOnbellegi:
+    """
+    Çizilmiş grafik, harita ve rapor parçalarını diskte, girdilerinin parmak iziyle (sorgu/filtre, parametreler,
+    veri kimliği, kod sürümü) saklar. Toplam boyut sınırı aşıldığında en uzun süredir kullanılmayan dosyalar
+    silinir (LRU; son kullanım zamanı dosyanın mtime değeridir, her isabette tazelenir).
+    """
+
+    def __init__(self, klasor=CIKTI_ONBELLEK_KLASORU, azami_bayt=CIKTI_ONBELLEK_AZAMI_BAYT):
+        self.klasor = klasor; self.azami_bayt = azami_bayt; self.isabet = 0; self.iska = 0; self._kilit = threading.Lock()
+
+    @staticmethod
+    def anahtar(tur, /, **girdiler):
+        """Girdilerden kararlı bir önbellek anahtarı üretir; girdiler JSON'a çevrilebilir olmalıdır."""
+        kimlik = json.dumps({"tur": tur, "kod": kod_surumu(), "girdiler": girdiler}, sort_keys=True, default=str, ensure_ascii=False)
+        return f"{tur}_{hashlib.sha256(kimlik.encode('utf-8')).hexdigest()[:32]}"
+
+    def _yol(self, anahtar, uzanti):
+        return os.path.join(self.klasor, anahtar + uzanti)
+
+    def getir(self, anahtar, uzanti):
+        """Önbellekteki çıktının yolunu döner (son kullanım zamanını tazeleyerek); yoksa None."""
+        yol = self._yol(anahtar, uzanti)
+        try: os.utime(yol)
+        except OSError: self.iska += 1; return None
+        self.isabet += 1; return yol
+
+    def sakla(self, anahtar, uzanti, kaynak_yol):
+        """Üretilmiş bir dosyayı önbelleğe kopyalar (atomik) ve boyut sınırını uygular; önbellekteki yolu döner."""
+        os.makedirs(self.klasor, exist_ok=True); yol = self._yol(anahtar, uzanti)
+        gecici = os.path.join(self.klasor, f".{anahtar}.{os.getpid()}.{threading.get_ident()}{uzanti}")
+        shutil.copyfile(kaynak_yol, gecici); os.replace(gecici, yol); self.buda(koru=yol)
+        return yol
+
+    def uret(self, anahtar, uzanti, uretici):
+        """Önbellekte varsa yolunu döner; yoksa uretici(hedef_yol) ile üretip saklar. Üretim hatası önbelleğe yazılmaz."""
+        yol = self.getir(anahtar, uzanti)
+        if yol: return yol
+        os.makedirs(self.klasor, exist_ok=True); yol = self._yol(anahtar, uzanti)
+        gecici = os.path.join(self.klasor, f".{anahtar}.{os.getpid()}.{threading.get_ident()}{uzanti}")
+        try:
+            with performans.olc(f"onbellek.uret.{anahtar.split('_')[0]}"): uretici(gecici)
+            os.replace(gecici, yol)
+        finally:
+            if os.path.exists(gecici): os.remove(gecici)
+        self.buda(koru=yol); return yol
+
+    def buda(self, koru=None):
+        """Toplam boyut sınırın altına inene dek en eski kullanılan çıktıları siler; silinen dosya sayısını döner."""
+        with self._kilit:
+            try: dosyalar = [(g.stat().st_mtime, g.stat().st_size, g.path) for g in os.scandir(self.klasor) if g.is_file() and not g.name.startswith('.')]
+            except OSError: return 0
+            toplam = sum(boyut for _, boyut, _ in dosyalar); silinen = 0
+            for _, boyut, yol in sorted(dosyalar):
+                if toplam <= self.azami_bayt: break
+                if yol == koru: continue
+                try: os.remove(yol); toplam -= boyut; silinen += 1
+                except OSError: pass
+            return silinen
+
+    def temizle(self):
+        """Önbelleği boşaltır; silinen dosya sayısını döner."""
+        if not os.path.isdir(self.klasor): return 0
+        silinen = 0
+        for g in os.scandir(self.klasor):
+            if g.is_file(): os.remove(g.path); silinen += 1
+        return silinen
+
+    def ozet(self):
+        dosyalar = [g.stat().st_size for g in os.scandir(self.klasor) if g.is_file()] if os.path.isdir(self.klasor) else []
+        return {"klasor": self.klasor, "dosya": len(dosyalar), "bayt": sum(dosyalar), "azami_bayt": self.azami_bayt, "isabet": self.isabet, "iska": self.iska}
+
+
+cikti_onbellegi = CiktiOnbellegi()
+
+
+def create_pdf_report(dosya_yolu, baslik, icerik_listesi, grafik_yolu=None, harita_yollari=()):
     """
     Verilen bilgilerle standart bir PDF raporu oluşturur.
+    harita_yollari verilirse her statik harita görüntüsü ayrı bir sayfaya sığdırılarak eklenir.
     """
     try:
         c = canvas.Canvas(dosya_yolu, pagesize=letter)
@@ -142,191 +487,3347 @@ def create_pdf_report(dosya_yolu, baslik, icerik_listesi, grafik_yolu=None):
             c.drawImage(grafik_yolu, 1 * inch, y_pozisyonu - 4.5 * inch, width=6.5 * inch, height=4 * inch,
                         preserveAspectRatio=True)
 
+        for harita_yolu in harita_yollari:
+            if not os.path.exists(harita_yolu): continue
+            c.showPage()
+            c.drawImage(harita_yolu, 0.75 * inch, 0.75 * inch, width=width - 1.5 * inch, height=height - 1.5 * inch,
+                        preserveAspectRatio=True)
+
         c.save()
         return True, "PDF raporu başarıyla oluşturuldu."
     except Exception as e:
         return False, f"PDF oluşturulurken bir hata oluştu: {e}"
 
 
-# --- Veritabanı Fonksiyonları ---
+# --- Veritabanı Fonksiyonları ---
+
+def get_connection(db_yolu=None, check_same_thread=True):
+    """
+    Veritabanı bağlantısı oluşturur. Yol verilmezse ana veritabanı kullanılır.
+    Arşivlenmiş sezon dosyaları salt okunur bağlanır ve 'tum_yuvalar' görünümü kurulur.
+    """
+    db_yolu = db_yolu or DB_PATH
+    conn = sqlite3.connect(db_yolu, uri=True, check_same_thread=check_same_thread)
+    if db_yolu in _ANLIK_GORUNTULER: return _yedegi_bagla(conn, *_ANLIK_GORUNTULER[db_yolu])
+    return sezon_arsivlerini_bagla(conn, db_yolu)
+
+
+@contextlib.contextmanager
+def veritabani_kullan(db_yolu):
+    """Blok süresince ana veritabanı yolunu geçici olarak değiştirir (kıyaslama ve araçlar için)."""
+    global DB_PATH
+    onceki_yol = DB_PATH; DB_PATH = db_yolu
+    try: yield db_yolu
+    finally: DB_PATH = onceki_yol
+
+
+YUVA_SUTUNLARI = [
+    'id', 'yil', 'lat', 'lon', 'yuva_tarihi', 'ilk_yavru_cikis_tarihi', 'ikinci_predasyon_tarihi',
+    'kuru_kum_uzakligi', 'yari_islak_kum_uzakligi', 'islak_kum_uzakligi', 'toplam_denize_uzaklik',
+    'tasinma_durumu', 'sicaklik_aleti_var_mi', 'kulucka_suresi_gun', 'yuva_basarisi_yuzde', 'predasyon_durumu',
+    'predator_canli_listesi', 'marka', 'yuva_derinligi', 'yuva_capi', 'yuva_ici_canli_yavru', 'yuva_ici_olu_yavru',
+    'erken_donem_embriyo', 'orta_donem_embriyo', 'gec_donem_embriyo', 'toplam_olu_embriyo', 'bos_kabuk_sayisi',
+    'predasyonlu_yumurta_sayisi', 'dollenmemis_yumurta_sayisi', 'toplam_yumurta_sayisi',
+    'yavru_cikis_gun_1', 'yavru_cikis_gun_2', 'yavru_cikis_gun_3'
+]
+
+
+def _json_nesnesi(onek):
+    """Tetikleyicilerde bir 'yuvalar' satırını JSON nesnesine çeviren SQL ifadesini üretir."""
+    return "json_object(" + ", ".join(f"'{s}', {onek}.{s}" for s in YUVA_SUTUNLARI) + ")"
+
+
+def degisiklik_gunlugunu_kur(cursor):
+    """
+    'yuvalar' tablosundaki her değişikliği sıra numarasıyla kaydeden, sadece
+    eklenebilen değişiklik günlüğünü ve onu dolduran tetikleyicileri kurar.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS gunluk_islemleri (
+        islem_no INTEGER PRIMARY KEY AUTOINCREMENT, aciklama TEXT, zaman REAL NOT NULL,
+        tur TEXT NOT NULL DEFAULT 'islem', hedef_islem INTEGER, durum TEXT NOT NULL DEFAULT 'aktif'
+    )""")
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS degisiklik_gunlugu (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT, islem_no INTEGER, tur TEXT NOT NULL,
+        id INTEGER NOT NULL, yil INTEGER NOT NULL, eski TEXT, yeni TEXT
+    )""")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_degisiklik_gunlugu_islem ON degisiklik_gunlugu (islem_no)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS acik_gunluk_islemi (islem_no INTEGER)")  # En fazla bir satır: gunluk_islemi() bloğu süresince
+    aktif_islem = "(SELECT islem_no FROM acik_gunluk_islemi)"  # Açık işlem yoksa NULL: işlem dışı yazmalar hiçbir işleme bağlanmaz
+    for (tetikleyici,) in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'yuvalar_gunluk_%' "
+                                      "AND sql LIKE '%MAX(islem_no)%'").fetchall():
+        cursor.execute(f"DROP TRIGGER {tetikleyici}")  # Eski sürümün tetikleyicileri son işleme bağlıyordu
+    degisti_mi = " OR ".join(f"OLD.{s} IS NOT NEW.{s}" for s in YUVA_SUTUNLARI)
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS yuvalar_gunluk_insert AFTER INSERT ON yuvalar BEGIN
+        INSERT INTO degisiklik_gunlugu (islem_no, tur, id, yil, eski, yeni)
+        VALUES ({aktif_islem}, 'INSERT', NEW.id, NEW.yil, NULL, {_json_nesnesi('NEW')});
+    END""")
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS yuvalar_gunluk_update AFTER UPDATE ON yuvalar WHEN {degisti_mi} BEGIN
+        INSERT INTO degisiklik_gunlugu (islem_no, tur, id, yil, eski, yeni)
+        VALUES ({aktif_islem}, 'UPDATE', NEW.id, NEW.yil, {_json_nesnesi('OLD')}, {_json_nesnesi('NEW')});
+    END""")
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS yuvalar_gunluk_delete AFTER DELETE ON yuvalar BEGIN
+        INSERT INTO degisiklik_gunlugu (islem_no, tur, id, yil, eski, yeni)
+        VALUES ({aktif_islem}, 'DELETE', OLD.id, OLD.yil, {_json_nesnesi('OLD')}, NULL);
+    END""")
+
+
+YUVALAR_TABLOSU_SEMASI = """
+    CREATE TABLE IF NOT EXISTS yuvalar (
+        id INTEGER NOT NULL, yil INTEGER NOT NULL, lat REAL, lon REAL, yuva_tarihi TEXT, 
+        ilk_yavru_cikis_tarihi TEXT, ikinci_predasyon_tarihi TEXT, kuru_kum_uzakligi REAL, 
+        yari_islak_kum_uzakligi REAL, islak_kum_uzakligi REAL, toplam_denize_uzaklik REAL, 
+        tasinma_durumu TEXT, sicaklik_aleti_var_mi TEXT, kulucka_suresi_gun INTEGER, 
+        yuva_basarisi_yuzde REAL, predasyon_durumu TEXT, predator_canli_listesi TEXT, marka TEXT, 
+        yuva_derinligi REAL, yuva_capi REAL, yuva_ici_canli_yavru INTEGER, yuva_ici_olu_yavru INTEGER, 
+        erken_donem_embriyo INTEGER, orta_donem_embriyo INTEGER, gec_donem_embriyo INTEGER, 
+        toplam_olu_embriyo INTEGER, bos_kabuk_sayisi INTEGER, predasyonlu_yumurta_sayisi INTEGER,
+        dollenmemis_yumurta_sayisi INTEGER, toplam_yumurta_sayisi INTEGER,
+        yavru_cikis_gun_1 INTEGER, yavru_cikis_gun_2 INTEGER, yavru_cikis_gun_3 INTEGER,
+        PRIMARY KEY (id, yil)
+    )"""
+
+
+KARANTINA_TABLOSU_SEMASI = """
+    CREATE TABLE IF NOT EXISTS karantina (
+        kimlik INTEGER PRIMARY KEY AUTOINCREMENT, zaman TEXT NOT NULL, kaynak TEXT, satir INTEGER,
+        id INTEGER, yil INTEGER, nedenler TEXT NOT NULL, veri TEXT
+    )"""
+
+
+def setup_database(db_yolu=None):
+    """Veritabanını ve 'yuvalar' tablosunu Yıllık ID şemasıyla kurar."""
+    conn = get_connection(db_yolu)
+    cursor = conn.cursor()
+    cursor.execute(YUVALAR_TABLOSU_SEMASI)
+    cursor.execute(KARANTINA_TABLOSU_SEMASI)
+    degisiklik_gunlugunu_kur(cursor)
+    conn.commit()
+    try: degisiklik_gunlugunu_sikistir(conn)
+    finally: conn.close()
+    logging.info("Veritabanı şeması (yıl bilgisiyle) kuruldu/kontrol edildi.")
+
+
+# --- Satır İçerik Özetleri ---
+# Her yuva satırının kanonik içeriğinden 64 bitlik bir özet 'satir_ozeti' tablosunda tutulur ve değişiklik
+# akışıyla güncel kalır. Güncellemeli içe aktarma gelen satırları bu özetlerle vektörel karşılaştırır;
+# yalnızca içeriği gerçekten değişen satırlar UPDATE edilir.
+OZET_SUTUNLARI = YUVA_SUTUNLARI[2:]
+TAM_SAYI_SUTUNLARI = {'kulucka_suresi_gun', *SAYIM_SUTUNLARI}
+ONDALIK_SUTUNLARI = {'lat', 'lon', 'kuru_kum_uzakligi', 'yari_islak_kum_uzakligi', 'islak_kum_uzakligi', 'toplam_denize_uzaklik',
+                     'yuva_basarisi_yuzde', 'yuva_derinligi', 'yuva_capi'}
+
+
+def _kanonik_sutun(seri, sutun):
+    """Sütunu veritabanı türüne göre karşılaştırılabilir metne çevirir; Excel'den ve SQLite'tan gelen aynı değer aynı metni verir."""
+    if sutun in TAM_SAYI_SUTUNLARI or sutun in ONDALIK_SUTUNLARI:
+        deger = pd.to_numeric(seri, errors='coerce')
+        metin = deger.round().astype('Int64').astype(str) if sutun in TAM_SAYI_SUTUNLARI else deger.round(6).astype(str)
+        return metin.where(deger.notna(), "")
+    metin = seri.astype(object).where(seri.notna(), "").astype(str).str.strip()
+    return metin.replace("[]", "") if sutun == 'predator_canli_listesi' else metin  # Boş liste ile boş hücre aynı sayılır
+
+
+def icerik_ozetleri(df, sutunlar=OZET_SUTUNLARI):
+    """Verilen sütunlar üzerinden her satır için int64 içerik özeti (sütun sırası özetin parçasıdır)."""
+    kanonik = pd.DataFrame({s: _kanonik_sutun(df[s], s) if s in df.columns else "" for s in sutunlar}, index=df.index)
+    return pd.util.hash_pandas_object(kanonik, index=False).to_numpy().view(np.int64)
+
+
+@performans.olculen("db.satir_ozeti_guncelle")
+def satir_ozetlerini_guncelle(conn):
+    """'satir_ozeti' tablosunu veri sürümüne getirir (ilk seferde tümü, sonra yalnızca değişen satırlar); işlenen satır sayısını döner."""
+    _indeks_tablolarini_kur(conn)
+    islenen_seq = _indeks_durumu(conn, 'ozet', 'islenen_seq'); surum = veri_surumu(conn); sorgu = f"SELECT id, yil, {', '.join(OZET_SUTUNLARI)} FROM tum_yuvalar"
+    if islenen_seq is None or surum < int(islenen_seq):
+        conn.execute("DELETE FROM satir_ozeti"); df = pd.read_sql_query(sorgu, conn)
+    elif surum > int(islenen_seq):
+        _, degisenler = degisiklikleri_getir(int(islenen_seq), conn)
+        conn.executemany("DELETE FROM satir_ozeti WHERE id = ? AND yil = ?", degisenler)
+        df = pd.DataFrame(_degisen_satirlari_getir(conn, sorgu + " WHERE (id, yil) IN (SELECT id, yil FROM _degisen)", degisenler), columns=['id', 'yil', *OZET_SUTUNLARI])
+    else: return 0
+    if not df.empty: conn.executemany("INSERT INTO satir_ozeti VALUES (?, ?, ?)", zip(df['id'].tolist(), df['yil'].tolist(), icerik_ozetleri(df).tolist()))
+    _indeks_durumu_yaz(conn, 'ozet', islenen_seq=surum); performans.satir_say(len(df))
+    return len(df)
+
+
+def _degisen_satirlari_bul(conn, gelen):
+    """
+    Veritabanında zaten olan gelen satırlardan içeriği farklı olanların maskesini döner. Gelen tablo tüm içerik
+    sütunlarını taşıyorsa saklı özetler kullanılır; eksik sütunlu dosyalarda özet yalnızca dosyadaki sütunlar
+    üzerinden iki tarafta da anında hesaplanır.
+    """
+    sutunlar = [s for s in OZET_SUTUNLARI if s in gelen.columns]
+    if len(sutunlar) == len(OZET_SUTUNLARI):
+        satir_ozetlerini_guncelle(conn); mevcut = pd.read_sql_query("SELECT id, yil, ozet FROM satir_ozeti", conn)
+    else:
+        mevcut = pd.read_sql_query(f"SELECT id, yil, {', '.join(sutunlar)} FROM tum_yuvalar", conn)
+        mevcut = mevcut[['id', 'yil']].assign(ozet=icerik_ozetleri(mevcut, sutunlar))
+    konum = pd.MultiIndex.from_frame(mevcut[['id', 'yil']]).get_indexer(pd.MultiIndex.from_frame(gelen[['id', 'yil']].astype('int64')))
+    return (konum < 0) | (mevcut['ozet'].to_numpy()[konum] != icerik_ozetleri(gelen, sutunlar)), sutunlar
+
+
+EXCEL_UZANTILARI = ('.xlsx', '.xls')
+PARALEL_EXCEL_ISCI_BASINA_BAYT = 1_000_000  # İşçi başına bundan az veri düşüyorsa süreç başlatma (~1 sn) kazançtan büyüktür
+
+
+def excel_dosyalarini_bul(yollar):
+    """Dosya ve klasör yollarını sıralı, tekil Excel dosyası listesine açar; Office kilit dosyaları ('~$') atlanır."""
+    dosyalar = []
+    for yol in yollar:
+        if os.path.isdir(yol): dosyalar.extend(sorted(str(p) for p in pathlib.Path(yol).rglob('*') if p.suffix.lower() in EXCEL_UZANTILARI and not p.name.startswith('~$')))
+        elif str(yol).lower().endswith(EXCEL_UZANTILARI): dosyalar.append(str(yol))
+    return list(dict.fromkeys(os.path.abspath(d) for d in dosyalar))
+
+
+def _excel_sonucunu_tamamla(sonuc, olcumler):
+    """
+    İşçiden gelen (yol, df, karantina_df, sutunlar, hata) sonucunu (yol, df, karantina_df, bilinmeyen_sutunlar, hata)
+    biçimine getirir ve yuva_basarisi_yuzde'yi hesaplar. Dışa aktarılmış ölçüm sütunları türetilmiştir; sessizce atlanır.
+    """
+    yol, df, karantina_df, sutunlar, hata = sonuc
+    if df is None: return yol, None, None, [], hata
+    try:
+        bilinmeyen = [s for s in sutunlar if s not in YUVA_SUTUNLARI and s not in ('yuva_sira_no', 'yuva_no') and s not in olcumler]
+        if 'yuva_ici_canli_yavru' in df.columns and 'toplam_yumurta_sayisi' in df.columns: df = basari_yuzdesini_hesapla(df)
+        return yol, df, karantina_df, bilinmeyen, None
+    except Exception as e:
+        return yol, None, None, [], str(e)
+
+
+@performans.olculen("excelleri_toplu_ekle")
+def excelleri_toplu_ekle(yollar, isci_sayisi=None, guncelle=False):
+    """
+    Birden çok çalışma kitabını (ya da klasörleri) okuyup doğrular ve normalleştirir; birden çok işlemci varsa ve işçi
+    başına yeterli veri düşüyorsa okuma, yalnızca Qt'siz patara_isci modülünü yükleyen işçi süreçlerde paralel yapılır.
+    Geçerli satırlar tek geçişte (id, yil) üzerinden tekilleştirilir (aynı anahtar birden çok dosyadaysa dosya
+    sırasına göre ilki alınır); hatalı satırlar nedenleriyle 'karantina' tablosuna ayrılır (aynı dosyanın önceki
+    aktarımından kalan karantina satırlarının yerine). guncelle=True ise zaten
+    kayıtlı satırlardan içerik özeti değişenler, dosyadaki sütunlarla toplu UPDATE edilir. Her şey tek bir işlemde
+    yazılır. (eklenen + güncellenen, mesaj, dosya_ozetleri) döner.
+    """
+    dosyalar = excel_dosyalarini_bul(yollar); ozetler = []
+    try:
+        if not dosyalar: return 0, "Aktarılacak Excel dosyası bulunamadı.", ozetler
+        islemci = kullanilabilir_cpu_sayisi(); toplam_bayt = sum(os.path.getsize(d) for d in dosyalar)
+        isci_sayisi = max(1, min(len(dosyalar), isci_sayisi or islemci, islemci, toplam_bayt // PARALEL_EXCEL_ISCI_BASINA_BAYT))
+        with performans.olc("excel.okuma"):
+            if isci_sayisi == 1: okunan = list(map(patara_isci.excel_calismasini_oku, dosyalar))
+            else: okunan = patara_isci.paralel_esle(patara_isci.excel_calismasini_oku, dosyalar, isci_sayisi)
+            olcumler = olcum_tanimlari(); sonuclar = [_excel_sonucunu_tamamla(sonuc, olcumler) for sonuc in okunan]
+        ozetler = [{"dosya": os.path.basename(yol), "okunan": (len(df) + len(karantina_df)) if df is not None else 0, "eklenen": 0, "guncellenen": 0, "yinelenen": 0, "mevcut": 0,
+                    "karantina": len(karantina_df) if karantina_df is not None else 0, "bilinmeyen_sutunlar": bilinmeyen, "hata": hata}
+                   for yol, df, karantina_df, bilinmeyen, hata in sonuclar]
+        hatalar = "".join(f"\n{o['dosya']}: {o['hata']}" for o in ozetler if o['hata'])
+        parcalar = [df.assign(_dosya=i) for i, (_, df, _, _, _) in enumerate(sonuclar) if df is not None and not df.empty]
+        karantinalar = [k.assign(kaynak=os.path.basename(yol)) for yol, _, k, _, _ in sonuclar if k is not None and not k.empty]
+        if not parcalar and not karantinalar: return 0, "Excel dosyalarında aktarılabilir kayıt bulunamadı." + hatalar, ozetler
+        birlesik = pd.concat(parcalar, ignore_index=True) if parcalar else pd.DataFrame(columns=['id', 'yil', '_dosya'])
+        performans.satir_say(len(birlesik))
+
+        conn = get_connection(); eklenen = 0
+        try:
+            mevcut_df = pd.read_sql_query("SELECT id, yil FROM tum_yuvalar", conn)
+            anahtarlar = pd.MultiIndex.from_frame(birlesik[['id', 'yil']])
+            yinelenen = anahtarlar.duplicated(keep='first'); mevcut = anahtarlar.isin(pd.MultiIndex.from_frame(mevcut_df)) & ~yinelenen
+            yeni = ~yinelenen & ~mevcut
+            for sayac, maske in (("yinelenen", yinelenen), ("mevcut", mevcut), ("eklenen", yeni)):
+                for i, adet in birlesik.loc[maske, '_dosya'].value_counts().items(): ozetler[i][sayac] = int(adet)
+            guncellenecek = np.zeros(len(birlesik), dtype=bool); guncelleme_gruplari = []
+            if guncelle and mevcut.any():
+                for i in np.unique(birlesik.loc[mevcut, '_dosya']):  # Her dosya yalnızca kendi sütunlarını günceller
+                    maske = mevcut & (birlesik['_dosya'] == i).to_numpy()
+                    gelen = birlesik.loc[maske, ['id', 'yil', *[s for s in OZET_SUTUNLARI if s in sonuclar[i][1].columns]]]
+                    degisti, sutunlar = _degisen_satirlari_bul(conn, gelen)
+                    guncellenecek[np.flatnonzero(maske)[degisti]] = True; guncelleme_gruplari.append((gelen[degisti], sutunlar))
+                    ozetler[i]['guncellenen'] = int(degisti.sum()); ozetler[i]['mevcut'] = int((~degisti).sum())
+
+            yazma_izni_kontrolu(conn, birlesik.loc[yeni | guncellenecek, 'yil'].unique())
+            # Yeniden aktarılan bir dosyanın önceki karantina satırları, bu okumanın sonuçlarıyla değiştirilir
+            conn.executemany("DELETE FROM karantina WHERE kaynak = ?", [(os.path.basename(yol),) for yol, _, _, _, hata in sonuclar if hata is None])
+            if karantinalar:
+                pd.concat(karantinalar, ignore_index=True).assign(zaman=datetime.now().isoformat(timespec='seconds')).to_sql('karantina', conn, if_exists='append', index=False)
+            if yeni.any() or guncellenecek.any():
+                gunluk_islemi_baslat(conn, f"Excel aktarımı: {os.path.basename(dosyalar[0])}" + (f" ve {len(dosyalar) - 1} dosya daha" if len(dosyalar) > 1 else ""))
+            if yeni.any():
+                db_sutunlar = {row[1] for row in conn.execute("PRAGMA table_info(yuvalar)")}
+                eklenecek_df = birlesik.loc[yeni, [col for col in birlesik.columns if col in db_sutunlar]]
+                eklenecek_df.to_sql('yuvalar', conn, if_exists='append', index=False); eklenen = len(eklenecek_df)
+            for degisen_df, sutunlar in guncelleme_gruplari:
+                if degisen_df.empty: continue
+                degerler = degisen_df[[*sutunlar, 'id', 'yil']].astype(object).where(degisen_df[[*sutunlar, 'id', 'yil']].notna(), None)
+                conn.executemany(f"UPDATE yuvalar SET {', '.join(f'{s} = ?' for s in sutunlar)} WHERE id = ? AND yil = ?", degerler.itertuples(index=False, name=None))
+            gunluk_islemini_kapat(conn); conn.commit()
+        finally:
+            conn.close()
+        karantina_sayisi = sum(o['karantina'] for o in ozetler); guncellenen = int(guncellenecek.sum())
+        if guncelle: mesaj = f"{len(dosyalar)} dosya: {eklenen} kayıt eklendi, {guncellenen} kayıt güncellendi, {int(mevcut.sum()) - guncellenen} kayıt değişmedi."
+        elif not eklenen: mesaj = "Excel dosyalarında yeni bir (ID, Yıl) kombinasyonu bulunamadı."
+        elif len(dosyalar) > 1: mesaj = f"{len(dosyalar)} dosyadan {eklenen} yeni kayıt başarıyla eklendi ({isci_sayisi} işçi süreç)."
+        else: mesaj = f"{eklenen} yeni kayıt başarıyla eklendi."
+        if guncelle and yinelenen.any(): mesaj += f" {int(yinelenen.sum())} yinelenen satır atlandı."
+        elif not guncelle and (yinelenen.any() or mevcut.any()): mesaj += f" {int(yinelenen.sum())} yinelenen, {int(mevcut.sum())} zaten kayıtlı satır atlandı."
+        if karantina_sayisi: mesaj += f" {karantina_sayisi} hatalı satır karantinaya alındı."
+        bilinmeyen = sorted({s for o in ozetler for s in o['bilinmeyen_sutunlar']})
+        if bilinmeyen: mesaj += f" Tanınmayan sütunlar aktarılmadı: {', '.join(bilinmeyen)}."
+        return eklenen + guncellenen, mesaj + hatalar, ozetler
+    except Exception as e:
+        logging.error(f"Excel aktarım hatası: {e}", exc_info=True)
+        return 0, f"Excel aktarım hatası: {e}", ozetler
+
+
+def excel_aktarim_ozeti_metni(ozetler):
+    """Dosya başına aktarım özetini düz metin tabloya çevirir."""
+    return "\n".join(f"{o['dosya']}: {o['okunan']} okunan, {o['eklenen']} eklenen, {o['guncellenen']} güncellenen, {o['yinelenen']} yinelenen, {o['mevcut']} mevcut/değişmeyen, {o['karantina']} karantina"
+                     + (f" — HATA: {o['hata']}" if o['hata'] else "") for o in ozetler)
+
+
+def karantina_kayitlari(conn=None):
+    """Karantinadaki satırları en yeniden eskiye DataFrame olarak döner."""
+    kendi_baglantisi = conn is None; conn = conn or get_connection()
+    try: return pd.read_sql_query("SELECT kimlik, zaman, kaynak, satir, id, yil, nedenler, veri FROM karantina ORDER BY kimlik DESC", conn)
+    finally:
+        if kendi_baglantisi: conn.close()
+
+
+def karantinayi_temizle(kimlikler=None):
+    """Karantinayı (ya da verilen kimlikleri) siler; silinen satır sayısını döner."""
+    conn = get_connection()
+    try:
+        if kimlikler is None: silinen = conn.execute("DELETE FROM karantina").rowcount
+        else: silinen = conn.executemany("DELETE FROM karantina WHERE kimlik = ?", [(int(k),) for k in kimlikler]).rowcount
+        conn.commit(); return silinen
+    finally:
+        conn.close()
+
+
+def excelden_toplu_ekle(excel_dosya_yolu):
+    """Excel dosyasından toplu veri aktarımı yapar, Yıllık ID sistemini dikkate alır."""
+    eklenen, mesaj, _ = excelleri_toplu_ekle([excel_dosya_yolu])
+    return eklenen, mesaj
+
+
+def yuva_var_mi(id, yil):
+    """Belirtilen ID ve YIL kombinasyonunun veritabanında olup olmadığını kontrol eder."""
+    conn = get_connection();
+    cursor = conn.cursor();
+    cursor.execute(f"SELECT 1 FROM {yuva_kaynagi(conn, yil)} WHERE id = ? AND yil = ?", (id, yil));
+    result = cursor.fetchone();
+    conn.close();
+    return result is not None
+
+
+def yuva_ekle(yuva_verisi):
+    """Verilen yuva verisini, 'yil' sütununu otomatik ekleyerek kaydeder."""
+    try:
+        kayit = YuvaIslemBirimi._kaydi_hazirla(yuva_verisi)
+    except ValueError as e:
+        logging.error(str(e)); return
+    try:
+        YuvaIslemBirimi(f"Yuva eklendi: [{kayit['yil']}] ID {kayit['id']}").ekle(kayit).uygula()
+    except sqlite3.IntegrityError:
+        logging.error(f"Bileşik anahtar hatası: ID {kayit['id']} YIL {kayit['yil']} zaten mevcut.")
+
+
+def yuva_predasyon_guncelle(id, yil, durum, turler):
+    """Belirtilen ID ve YIL'a ait yuvanın predasyon durumunu günceller."""
+    islem = YuvaIslemBirimi(f"Predasyon güncellendi: [{yil}] ID {id}")
+    islem.predasyon_guncelle(id, yil, durum, turler)
+    islem.uygula()
+
+
+def toplu_yuva_sil(yuva_kombinasyonlari):
+    """Verilen (id, yil) listesindeki tüm yuvaları tek bir transaction içinde siler."""
+    if not yuva_kombinasyonlari: return
+    islem = YuvaIslemBirimi(f"{len(yuva_kombinasyonlari)} yuva silindi")
+    for yuva_id, yil in yuva_kombinasyonlari:
+        islem.sil(yuva_id, yil)
+    try:
+        islem.uygula()
+    except Exception as e:
+        logging.error(f"Toplu silme hatası: {e}", exc_info=True)
+
+
+class YuvaIslemBirimi:
+    """
+    Ekleme, upsert, predasyon güncelleme ve silme işlemlerini biriktirir ve
+    hepsini tek bir bağlantı ve tek bir transaction içinde 'executemany' ile uygular.
+    Aynı sütun kümesine sahip kayıtlar tek bir toplu sorguda yazılır.
+    """
+
+    def __init__(self, aciklama="Toplu yazma"):
+        self.aciklama = aciklama
+        self._eklenecekler = []
+        self._upsert_edilecekler = []
+        self._predasyon_guncellemeleri = []
+        self._silinecekler = []
+
+    def __len__(self):
+        return (len(self._eklenecekler) + len(self._upsert_edilecekler) +
+                len(self._predasyon_guncellemeleri) + len(self._silinecekler))
+
+    @staticmethod
+    def _kaydi_hazirla(yuva_verisi):
+        """'yil' bilgisini tarihten türetir ve sadece dolu, şemada olan alanları bırakır."""
+        kayit = {k: v for k, v in yuva_verisi.items() if v is not None and k in YUVA_SUTUNLARI}
+        if kayit.get('yuva_tarihi'):
+            try:
+                kayit['yil'] = datetime.strptime(str(kayit['yuva_tarihi'])[:10], '%Y-%m-%d').year
+            except (ValueError, TypeError):
+                raise ValueError(f"Geçersiz tarih: {kayit['yuva_tarihi']}.")
+        if 'id' not in kayit: raise ValueError("Yuva verisinde 'id' bilgisi eksik.")
+        if 'yil' not in kayit: raise ValueError("Yuva verisinde 'yil' bilgisi eksik.")
+        return kayit
+
+    def ekle(self, yuva_verisi):
+        """Yeni bir yuva ekler; (id, yil) zaten varsa uygulama sırasında IntegrityError oluşur."""
+        self._eklenecekler.append(self._kaydi_hazirla(yuva_verisi))
+        return self
+
+    def upsert(self, yuva_verisi):
+        """Yuva yoksa ekler, varsa sadece verilen (dolu) alanlarını günceller."""
+        self._upsert_edilecekler.append(self._kaydi_hazirla(yuva_verisi))
+        return self
+
+    def predasyon_guncelle(self, id, yil, durum, turler):
+        self._predasyon_guncellemeleri.append((durum, json.dumps(turler or []), id, yil))
+        return self
+
+    def sil(self, id, yil):
+        self._silinecekler.append((id, yil))
+        return self
+
+    @staticmethod
+    def _sutun_kumelerine_ayir(kayitlar):
+        gruplar = {}
+        for kayit in kayitlar:
+            gruplar.setdefault(tuple(kayit.keys()), []).append(tuple(kayit.values()))
+        return gruplar
+
+    @performans.olculen("db.toplu_yazma")
+    def uygula(self, conn=None):
+        """
+        Biriken tüm işlemleri tek transaction içinde yazar. Herhangi bir hata
+        olursa hiçbir değişiklik kalıcı olmaz ve hata yukarı iletilir.
+        Etkilenen satır sayılarını içeren bir sözlük döner.
+        """
+        sayilar = {"eklenen": 0, "upsert": 0, "predasyon": 0, "silinen": 0}
+        if not len(self): return sayilar
+        kendi_baglantimiz = conn is None
+        if kendi_baglantimiz: conn = get_connection()
+        try:
+            yazma_izni_kontrolu(conn, {k['yil'] for k in self._eklenecekler + self._upsert_edilecekler} |
+                                          {g[3] for g in self._predasyon_guncellemeleri} | {yil for _, yil in self._silinecekler})
+            with conn, gunluk_islemi(conn, self.aciklama):
+                cursor = conn.cursor()
+                for sutunlar, satirlar in self._sutun_kumelerine_ayir(self._eklenecekler).items():
+                    yer_tutucular = ', '.join(['?'] * len(sutunlar))
+                    cursor.executemany(f"INSERT INTO yuvalar ({', '.join(sutunlar)}) VALUES ({yer_tutucular})", satirlar)
+                    sayilar["eklenen"] += len(satirlar)
+                for sutunlar, satirlar in self._sutun_kumelerine_ayir(self._upsert_edilecekler).items():
+                    yer_tutucular = ', '.join(['?'] * len(sutunlar))
+                    guncellenecekler = [s for s in sutunlar if s not in ('id', 'yil')]
+                    cakisma = (f"DO UPDATE SET {', '.join(f'{s} = excluded.{s}' for s in guncellenecekler)}"
+                               if guncellenecekler else "DO NOTHING")
+                    cursor.executemany(f"INSERT INTO yuvalar ({', '.join(sutunlar)}) VALUES ({yer_tutucular}) "
+                                       f"ON CONFLICT(id, yil) {cakisma}", satirlar)
+                    sayilar["upsert"] += len(satirlar)
+                if self._predasyon_guncellemeleri:
+                    cursor.executemany("UPDATE yuvalar SET predasyon_durumu = ?, predator_canli_listesi = ? "
+                                       "WHERE id = ? AND yil = ?", self._predasyon_guncellemeleri)
+                    sayilar["predasyon"] = len(self._predasyon_guncellemeleri)
+                if self._silinecekler:
+                    cursor.executemany("DELETE FROM yuvalar WHERE id = ? AND yil = ?", self._silinecekler)
+                    sayilar["silinen"] = len(self._silinecekler)
+        finally:
+            if kendi_baglantimiz: conn.close()
+        logging.info(f"Toplu yazma uygulandı: {sayilar}")
+        return sayilar
+
+
+@performans.olculen("saha_formu_uygula")
+def saha_formu_uygula(dosya_yolu):
+    """
+    Bir günlük saha formunu (Excel veya CSV) tek bir commit ile uygular.
+    Var olan (ID, Yıl) kayıtlarında sadece formda dolu olan alanlar güncellenir,
+    konum ve tarih bilgisi olan yeni kayıtlar eklenir.
+    """
+    try:
+        if dosya_yolu.lower().endswith('.csv'): df = pd.read_csv(dosya_yolu)
+        else: df = pd.read_excel(dosya_yolu, engine='openpyxl')
+        df.columns = sutun_adlarini_normallestir(df.columns)
+        id_key = next((k for k in ['id', 'yuva_sira_no', 'yuva_no'] if k in df.columns), None)
+        if id_key is None: return 0, "Saha formunda 'id' sütunu bulunamadı."
+        if id_key != 'id': df['id'] = df[id_key]
+        if 'yuva_tarihi' in df.columns:
+            df['yuva_tarihi'] = pd.to_datetime(df['yuva_tarihi'], errors='coerce').dt.strftime('%Y-%m-%d')
+        if 'yil' not in df.columns and 'yuva_tarihi' not in df.columns: return 0, "Saha formunda 'yil' veya 'yuva_tarihi' sütunu bulunamadı."
+        if 'yil' not in df.columns: df['yil'] = np.nan
+        if 'yuva_tarihi' in df.columns: df['yil'] = df['yil'].fillna(pd.to_datetime(df['yuva_tarihi'], errors='coerce').dt.year)
+        df = df.dropna(subset=['id', 'yil'])
+        df['id'] = df['id'].astype(int); df['yil'] = df['yil'].astype(int)
+        if 'predator_canli_listesi' in df.columns:
+            df['predator_canli_listesi'] = df['predator_canli_listesi'].apply(
+                lambda d: json.dumps([p.strip().lower() for p in str(d).split(',') if p.strip()]) if pd.notna(d) else None)
+        df = df.astype(object).where(pd.notna(df), None)
+
+        conn = get_connection()
+        try:
+            mevcut = set(conn.execute("SELECT id, yil FROM tum_yuvalar").fetchall())
+            islem = YuvaIslemBirimi(f"Saha formu: {os.path.basename(dosya_yolu)}"); atlanan = 0
+            for kayit in df.to_dict('records'):
+                anahtar = (kayit['id'], kayit['yil'])
+                if anahtar not in mevcut and (kayit.get('lat') is None or kayit.get('lon') is None):
+                    atlanan += 1; logging.warning(f"Saha formu: [{kayit['yil']}] ID {kayit['id']} bulunamadı ve konum bilgisi yok, atlandı."); continue
+                canli = kayit.get('yuva_ici_canli_yavru'); toplam = kayit.get('toplam_yumurta_sayisi')
+                if canli is not None and toplam: kayit['yuva_basarisi_yuzde'] = round(float(canli) * 100 / float(toplam), 2)
+                islem.upsert(kayit)
+            sayilar = islem.uygula(conn)
+        finally:
+            conn.close()
+        mesaj = f"Saha formu uygulandı: {sayilar['upsert']} kayıt tek işlemde yazıldı."
+        if atlanan: mesaj += f" {atlanan} satır atlandı (kayıt yok ve konum eksik)."
+        return sayilar['upsert'], mesaj
+    except Exception as e:
+        logging.error(f"Saha formu uygulama hatası: {e}", exc_info=True)
+        return 0, f"Saha formu uygulanamadı: {e}"
+
+
+# --- Sezon Arşivleri ---
+# Geçmiş sezonlar '<veritabanı>_sezonlar/sezon_<yıl>.db' dosyalarına taşınabilir. Her bağlantı bu
+# dosyaları salt okunur ve bellek eşlemeli (mmap) olarak ATTACH eder ve tüm sezonları UNION ALL ile
+# birleştiren geçici 'tum_yuvalar' görünümünü kurar. Geçmişin tamamını okuyan sorgular bu görünümü,
+# tek bir yıla bakan sorgular yuva_kaynagi() ile doğrudan o yılın tablosunu kullanır. Yazmalar ve
+# değişiklik günlüğü ana dosyada kalır; arşivlenmiş bir sezona yazma girişimi reddedilir.
+# Arşiv listesi klasörün değişiklik zamanıyla önbelleğe alınır; havuzdaki uzun ömürlü bağlantılar
+# arşivleri yalnızca bu imza değiştiğinde yeniden bağlar.
+
+ARSIV_MMAP_BOYUTU = 256 * 1024 * 1024
+_ARSIV_LISTESI_ONBELLEGI = {}  # arşiv klasörü -> (klasörün değişiklik zamanı, {yil: dosya_yolu})
+
+
+def sezon_arsiv_klasoru(db_yolu=None):
+    return os.path.splitext(db_yolu or DB_PATH)[0] + "_sezonlar"
+
+
+def arsiv_imzasi(db_yolu=None):
+    """Arşiv klasörünün değişiklik zamanı; dosya eklenince, silinince ya da yeniden adlandırılınca değişir. Klasör yoksa None."""
+    try: return os.stat(sezon_arsiv_klasoru(db_yolu)).st_mtime_ns
+    except FileNotFoundError: return None
+
+
+def arsiv_dosyalari(db_yolu=None):
+    """Arşivlenmiş sezonların {yil: dosya_yolu} sözlüğünü yıla göre sıralı döner; klasör yalnızca değiştiyse yeniden listelenir."""
+    klasor = sezon_arsiv_klasoru(db_yolu); imza = arsiv_imzasi(db_yolu)
+    if imza is None: return {}
+    onbellek = _ARSIV_LISTESI_ONBELLEGI.get(klasor)
+    if onbellek is None or onbellek[0] != imza:
+        dosyalar = {int(eslesme.group(1)): os.path.join(klasor, ad) for ad in os.listdir(klasor) if (eslesme := re.fullmatch(r"sezon_(\d{4})\.db", ad))}
+        onbellek = _ARSIV_LISTESI_ONBELLEGI[klasor] = (imza, dict(sorted(dosyalar.items())))
+    return dict(onbellek[1])
+
+
+def sezon_arsivlerini_bagla(conn, db_yolu=None, ana_kaynak="main.yuvalar", haric_yillar=()):
+    """
+    Arşiv dosyalarını bağlantıya salt okunur bağlar ve 'tum_yuvalar' geçici görünümünü kurar.
+    haric_yillar: ana kaynakta zaten bulunan (örn. arşivlenmeden önce alınmış bir yedekteki) sezonlar.
+    """
+    arsivler = {yil: yol for yil, yol in arsiv_dosyalari(db_yolu).items() if yil not in haric_yillar}; sinir = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) - 1  # Bir yer içe aktarma/arşivleme için boş kalır
+    if len(arsivler) > sinir:
+        logging.error(f"{len(arsivler)} sezon arşivi var ama en fazla {sinir} tanesi bağlanabilir; en eski arşivler okunmayacak.")
+        arsivler = dict(list(arsivler.items())[-sinir:])
+    for yil, yol in arsivler.items():
+        conn.execute(f"ATTACH DATABASE ? AS sezon_{yil}", (pathlib.Path(yol).resolve().as_uri() + "?mode=ro",))
+        conn.execute(f"PRAGMA sezon_{yil}.mmap_size = {ARSIV_MMAP_BOYUTU}")
+    sutunlar = ', '.join(YUVA_SUTUNLARI)
+    kaynaklar = [f"SELECT {sutunlar} FROM {ana_kaynak}"] + [f"SELECT {sutunlar} FROM sezon_{yil}.yuvalar" for yil in arsivler]
+    conn.execute(f"CREATE TEMP VIEW IF NOT EXISTS tum_yuvalar AS {' UNION ALL '.join(kaynaklar)}")
+    return conn
+
+
+def arsivleri_yeniden_bagla(conn, db_yolu=None, arsivsiz=False):
+    """
+    Açık bir bağlantının arşiv bağlarını ve 'tum_yuvalar' görünümünü güncel arşiv kümesine göre kurar.
+    arsivsiz=True ise tüm arşivler bırakılır ve görünüm yalnızca ana kaynağı kapsar.
+    """
+    db_yolu = db_yolu or DB_PATH
+    conn.execute("DROP VIEW IF EXISTS temp.tum_yuvalar")
+    for yil in arsivli_sezonlar(conn): conn.execute(f"DETACH DATABASE sezon_{yil}")
+    canli_yol, ana_kaynak, haric = db_yolu, "main.yuvalar", ()
+    if db_yolu in _ANLIK_GORUNTULER: _, canli_yol, haric = _ANLIK_GORUNTULER[db_yolu]; ana_kaynak = "yedek.yuvalar"
+    if arsivsiz: haric = arsiv_dosyalari(canli_yol).keys()
+    return sezon_arsivlerini_bagla(conn, canli_yol, ana_kaynak=ana_kaynak, haric_yillar=haric)
+
+
+def arsivli_sezonlar(conn):
+    """Bağlantıya salt okunur bağlanmış sezonların yıllarını döner."""
+    return {int(ad[len("sezon_"):]) for _, ad, _ in conn.execute("PRAGMA database_list") if ad.startswith("sezon_")}
+
+
+def yuva_kaynagi(conn, yil=None):
+    """Yıl verilirse sadece o sezonun tablosunu (arşiv ya da ana dosya), verilmezse tüm sezonların görünümünü döner."""
+    if yil is None: return "tum_yuvalar"
+    return f"sezon_{int(yil)}.yuvalar" if int(yil) in arsivli_sezonlar(conn) else "main.yuvalar"
+
+
+def yazma_izni_kontrolu(conn, yillar):
+    """Bağlantı bir yedek görüntüsüne aitse ya da yazılacak yıllardan biri arşivlenmişse ValueError fırlatır."""
+    if any(ad == "yedek" for _, ad, _ in conn.execute("PRAGMA database_list")): raise ValueError("Yedek görüntüsü salt okunurdur. Değişiklik için canlı veriye dönün.")
+    arsivli = arsivli_sezonlar(conn) & {int(y) for y in yillar}
+    if arsivli: raise ValueError(f"Arşivlenmiş sezonlar salt okunurdur: {', '.join(map(str, sorted(arsivli)))}. Değişiklik için önce sezonu arşivden çıkarın.")
+
+
+@performans.olculen("db.sezon_arsivle")
+def sezonlari_arsivle(yillar=None, db_yolu=None):
+    """
+    Sezonları ana dosyadan yıllık arşiv dosyalarına taşır (varsayılan: en son sezon dışındakiler).
+    Arşiv dosyası önce geçici adla yazılıp doğrulanır, sonra yerine konur ve satırlar ana tablodan
+    tek işlemde silinir; böylece yarıda kesilen bir taşıma veri kaybettirmez. (basarili, mesaj) döner.
+    """
+    db_yolu = db_yolu or DB_PATH; sutunlar = ', '.join(YUVA_SUTUNLARI)
+    try:
+        with contextlib.closing(get_connection(db_yolu)) as conn:
+            ana_yillar = [yil for (yil,) in conn.execute("SELECT DISTINCT yil FROM main.yuvalar ORDER BY yil")]
+            yillar = ana_yillar[:-1] if yillar is None else sorted({int(y) for y in yillar} & set(ana_yillar))
+            if not yillar: return False, "Arşivlenecek sezon bulunamadı."
+            mevcut = arsiv_dosyalari(db_yolu); sinir = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) - 1
+            if cakisan := set(mevcut) & set(yillar): return False, f"{sorted(cakisan)} sezonları hem arşivde hem ana dosyada; önce arşivden çıkarın."
+            if len(mevcut) + len(yillar) > sinir: return False, f"En fazla {sinir} sezon arşivlenebilir (SQLite ATTACH sınırı); şu an {len(mevcut)} arşiv var."
+            os.makedirs(sezon_arsiv_klasoru(db_yolu), exist_ok=True); tasinan = 0
+            for yil in yillar:
+                hedef = os.path.join(sezon_arsiv_klasoru(db_yolu), f"sezon_{yil}.db"); gecici = hedef + ".tmp"
+                if os.path.exists(gecici): os.remove(gecici)
+                conn.execute("ATTACH DATABASE ? AS yeni_arsiv", (gecici,))
+                try:
+                    with conn:
+                        conn.execute(YUVALAR_TABLOSU_SEMASI.replace("EXISTS yuvalar", "EXISTS yeni_arsiv.yuvalar"))
+                        conn.execute(f"INSERT INTO yeni_arsiv.yuvalar ({sutunlar}) SELECT {sutunlar} FROM main.yuvalar WHERE yil = ?", (yil,))
+                    adet = conn.execute("SELECT COUNT(*) FROM yeni_arsiv.yuvalar").fetchone()[0]
+                finally: conn.execute("DETACH DATABASE yeni_arsiv")
+                if adet != conn.execute("SELECT COUNT(*) FROM main.yuvalar WHERE yil = ?", (yil,)).fetchone()[0]: raise RuntimeError(f"{yil} sezonu arşive eksik yazıldı.")
+                os.replace(gecici, hedef)
+                with conn, gunluk_islemi(conn, f"Sezon arşivlendi: {yil} ({adet} yuva)", tur='arsiv'):
+                    conn.execute("DELETE FROM main.yuvalar WHERE yil = ?", (yil,))
+                tasinan += adet; logging.info(f"{yil} sezonu arşivlendi: {adet} yuva -> {hedef}")
+        return True, f"{len(yillar)} sezon ({', '.join(map(str, yillar))}) arşivlendi: {tasinan} yuva taşındı."
+    except Exception as e:
+        logging.error(f"Sezon arşivleme hatası: {e}", exc_info=True)
+        return False, f"Sezon arşivlenemedi: {e}"
+
+
+def sezonu_arsivden_cikar(yil, db_yolu=None):
+    """
+    Arşivlenmiş bir sezonu yeniden ana dosyaya alır ve arşiv dosyasını kaldırır. Bu süreçteki bağlantı
+    havuzları işlem boyunca arşivleri bırakıp bekler. Dosya önce yeniden adlandırılır; başka bir süreç
+    dosyayı açık tutuyorsa (Windows) hiçbir şey değiştirilmeden vazgeçilir. (basarili, mesaj) döner.
+    """
+    db_yolu = db_yolu or DB_PATH; yol = arsiv_dosyalari(db_yolu).get(int(yil)); sutunlar = ', '.join(YUVA_SUTUNLARI)
+    if yol is None: return False, f"{yil} sezonu arşivde değil."
+    cikarilan = yol + ".cikariliyor"
+    try:
+        with contextlib.ExitStack() as havuzlar:
+            for havuz in list(_BAGLANTI_HAVUZLARI):
+                if os.path.abspath(havuz.arsiv_sahibi) == os.path.abspath(db_yolu): havuzlar.enter_context(havuz.arsivleri_birak())
+            try: os.replace(yol, cikarilan)
+            except PermissionError: return False, f"{yil} sezonu arşivi başka bir programda açık (örn. API sunucusu); onu kapatıp yeniden deneyin."
+            try:
+                with contextlib.closing(get_connection(db_yolu)) as conn:
+                    conn.execute("ATTACH DATABASE ? AS cikarilan_arsiv", (pathlib.Path(cikarilan).resolve().as_uri() + "?mode=ro",))
+                    with conn, gunluk_islemi(conn, f"Sezon arşivden çıkarıldı: {yil}", tur='arsiv'):
+                        adet = conn.execute(f"INSERT OR IGNORE INTO main.yuvalar ({sutunlar}) SELECT {sutunlar} FROM cikarilan_arsiv.yuvalar").rowcount
+            except Exception:
+                os.replace(cikarilan, yol); raise
+        os.remove(cikarilan); logging.info(f"{yil} sezonu arşivden çıkarıldı: {adet} yuva ana dosyaya alındı.")
+        return True, f"{yil} sezonu arşivden çıkarıldı ({adet} yuva)."
+    except Exception as e:
+        logging.error(f"Arşivden çıkarma hatası: {e}", exc_info=True)
+        return False, f"Sezon arşivden çıkarılamadı: {e}"
+
+
+def _arsivleri_yedekle(yedekler_klasoru, db_yolu=None):
+    """Arşiv dosyalarını yedek klasörüne kopyalar; boyutu ve değişiklik zamanı aynı olan arşivler atlanır."""
+    hedef_klasor = os.path.join(yedekler_klasoru, os.path.basename(sezon_arsiv_klasoru(db_yolu))); kopyalanan = 0
+    for yol in arsiv_dosyalari(db_yolu).values():
+        hedef = os.path.join(hedef_klasor, os.path.basename(yol)); kaynak_bilgi = os.stat(yol)
+        if os.path.exists(hedef) and (os.stat(hedef).st_size, int(os.stat(hedef).st_mtime)) == (kaynak_bilgi.st_size, int(kaynak_bilgi.st_mtime)): continue
+        os.makedirs(hedef_klasor, exist_ok=True); shutil.copy2(yol, hedef); kopyalanan += 1
+    return kopyalanan
+
+
+# --- Yedeklerde Zaman Yolculuğu ve Anlık Görüntü Farkı ---
+# Bir yedek, canlı dosyaya dokunmadan incelenebilir: oturuma özel geçici bir çalışma dosyası 'main'
+# olarak açılır, yedek 'yedek' adıyla salt okunur (immutable) bağlanır. Nitelenmemiş tablo adları
+# ('yuvalar', 'degisiklik_gunlugu' ...) yedeğe çözülür, 'tum_yuvalar' görünümü yedeğin üzerine kurulur;
+# böylece filtre, istatistik ve harita kodu değişmeden çalışır. Kıyı indeksi gibi türetilmiş tablolar
+# çalışma dosyasında oluşur; yedeğe yapılan her yazma girişimi reddedilir.
+
+_ANLIK_GORUNTULER = {}  # çalışma dosyası -> (yedek yolu, arşivlerin ait olduğu canlı veritabanı, yedekteki yıllar)
+YEDEK_ZAMAN_DESENI = re.compile(r"_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.db$")
+
+
+def canli_veritabani_yolu():
+    """Bir yedek görüntüsü açıkken bile canlı veritabanının yolunu döner."""
+    return _ANLIK_GORUNTULER[DB_PATH][1] if DB_PATH in _ANLIK_GORUNTULER else DB_PATH
+
+
+def yedekleri_listele(yedekler_klasoru=None):
+    """Yedekleri [(zaman, yol), ...] olarak yeniden eskiye sıralı döner; zaman dosya adından, yoksa değişiklik zamanından alınır."""
+    yedekler_klasoru = yedekler_klasoru or os.path.join(SCRIPT_DIR, "backups")
+    if not os.path.isdir(yedekler_klasoru): return []
+    yedekler = []
+    for ad in os.listdir(yedekler_klasoru):
+        if not ad.endswith(".db"): continue
+        yol = os.path.join(yedekler_klasoru, ad); eslesme = YEDEK_ZAMAN_DESENI.search(ad)
+        yedekler.append((datetime.strptime(eslesme.group(1), "%Y-%m-%d_%H-%M-%S") if eslesme else datetime.fromtimestamp(os.path.getmtime(yol)), yol))
+    return sorted(yedekler, reverse=True)
+
+
+def tarihten_onceki_yedek(tarih, yedekler_klasoru=None):
+    """Verilen tarihte ya da ondan önce alınmış en son yedeğin yolunu döner (yoksa None)."""
+    return next((yol for zaman, yol in yedekleri_listele(yedekler_klasoru) if zaman <= tarih), None)
+
+
+def _yedegi_bagla(conn, yedek_yolu, canli_db_yolu, yedek_yillari):
+    conn.execute("ATTACH DATABASE ? AS yedek", (pathlib.Path(yedek_yolu).resolve().as_uri() + "?mode=ro&immutable=1",))
+    return sezon_arsivlerini_bagla(conn, canli_db_yolu, ana_kaynak="yedek.yuvalar", haric_yillar=yedek_yillari)
+
+
+def anlik_goruntu_ac(yedek_yolu):
+    """Yedeği salt okunur inceleme için hazırlar ve get_connection'a verilecek çalışma dosyası yolunu döner."""
+    with contextlib.closing(sqlite3.connect(pathlib.Path(yedek_yolu).resolve().as_uri() + "?mode=ro&immutable=1", uri=True)) as conn:
+        yedek_yillari = frozenset(yil for (yil,) in conn.execute("SELECT DISTINCT yil FROM yuvalar"))
+    calisma_yolu = os.path.join(tempfile.mkdtemp(prefix="patara_yedek_"), "calisma.db")
+    _ANLIK_GORUNTULER[calisma_yolu] = (os.path.abspath(yedek_yolu), canli_veritabani_yolu(), yedek_yillari)
+    logging.info(f"Yedek salt okunur açıldı: {yedek_yolu}")
+    return calisma_yolu
+
+
+def anlik_goruntu_kapat(calisma_yolu):
+    if _ANLIK_GORUNTULER.pop(calisma_yolu, None): shutil.rmtree(os.path.dirname(calisma_yolu), ignore_errors=True)
+
+
+@contextlib.contextmanager
+def anlik_goruntu_kullan(yedek_yolu):
+    """Blok süresince tüm okumaları verilen yedeğe yönlendirir."""
+    calisma_yolu = anlik_goruntu_ac(yedek_yolu)
+    try:
+        with veritabani_kullan(calisma_yolu): yield calisma_yolu
+    finally: anlik_goruntu_kapat(calisma_yolu)
+
+
+def _goruntu_satirlari(yol):
+    """Bir görüntünün tüm sezonlarını (id, yil, satir_json) olarak okur; yol None ise canlı veritabanı."""
+    sorgu = f"SELECT id, yil, json_array({', '.join(YUVA_SUTUNLARI[2:])}) AS satir FROM tum_yuvalar"
+    if yol is None or os.path.abspath(yol) == os.path.abspath(canli_veritabani_yolu()):
+        with contextlib.closing(get_connection(canli_veritabani_yolu())) as conn: return pd.read_sql_query(sorgu, conn)
+    calisma_yolu = anlik_goruntu_ac(yol)
+    try:
+        with contextlib.closing(get_connection(calisma_yolu)) as conn: return pd.read_sql_query(sorgu, conn)
+    finally: anlik_goruntu_kapat(calisma_yolu)
+
+
+@performans.olculen("analiz.anlik_goruntu_farki")
+def anlik_goruntu_farki(eski_yol, yeni_yol=None):
+    """
+    İki görüntüyü (yedek ya da canlı veritabanı; yeni_yol None ise canlı) (id, yil) anahtarıyla karşılaştırır.
+    Her satırın değerleri 64 bitlik bir özete indirgenir; sütunlar sadece özeti farklı satırlarda tek tek
+    karşılaştırılır. (ozet, fark_df) döner; fark_df sütunları: id, yil, degisiklik, sutun, eski, yeni.
+    """
+    t0 = time.perf_counter(); eski = _goruntu_satirlari(eski_yol); yeni = _goruntu_satirlari(yeni_yol)
+    for df in (eski, yeni): df['ozet'] = pd.util.hash_array(df['satir'].to_numpy(dtype=object))
+    birlesik = eski.merge(yeni, on=['id', 'yil'], how='outer', suffixes=('_eski', '_yeni'), indicator=True)
+    eklenen = birlesik[birlesik['_merge'] == 'right_only']; silinen = birlesik[birlesik['_merge'] == 'left_only']
+    degisen = birlesik[(birlesik['_merge'] == 'both') & (birlesik['ozet_eski'] != birlesik['ozet_yeni'])]
+    satirlar = [(i, y, 'eklendi', None, None, None) for i, y in zip(eklenen['id'], eklenen['yil'])]
+    satirlar += [(i, y, 'silindi', None, None, None) for i, y in zip(silinen['id'], silinen['yil'])]
+    for yuva_id, yil, eski_json, yeni_json in zip(degisen['id'], degisen['yil'], degisen['satir_eski'], degisen['satir_yeni']):
+        satirlar.extend((yuva_id, yil, 'degisti', sutun, e, y) for sutun, e, y in zip(YUVA_SUTUNLARI[2:], json.loads(eski_json), json.loads(yeni_json)) if e != y)
+    fark_df = pd.DataFrame(satirlar, columns=['id', 'yil', 'degisiklik', 'sutun', 'eski', 'yeni']).sort_values(['yil', 'id'], kind='stable', ignore_index=True)
+    ozet = {"eski": os.path.basename(eski_yol) if eski_yol else "canlı", "yeni": os.path.basename(yeni_yol) if yeni_yol else "canlı",
+            "eski_yuva": len(eski), "yeni_yuva": len(yeni), "eklenen": len(eklenen), "silinen": len(silinen), "degisen": len(degisen),
+            "degisen_alan": int((fark_df['degisiklik'] == 'degisti').sum()), "sure_sn": round(time.perf_counter() - t0, 3)}
+    performans.satir_say(len(eski) + len(yeni)); logging.info(f"Anlık görüntü farkı: {ozet}")
+    return ozet, fark_df
+
+
+# --- Değişiklik Günlüğü, Geri Al / Yinele ve Değişiklik Akışı ---
+
+def gunluk_islemi_baslat(conn, aciklama, tur='islem', hedef_islem=None):
+    """
+    Açık transaction içinde yeni bir günlük işlemi açar; tetikleyiciler gunluk_islemini_kapat()
+    çağrılana dek satır değişikliklerini bu işleme bağlar. Yeni bir kullanıcı işlemi yinele yığınını temizler.
+    """
+    if tur == 'islem':
+        conn.execute("UPDATE gunluk_islemleri SET durum = 'kalici' WHERE durum = 'geri_alindi'")
+    cursor = conn.execute("INSERT INTO gunluk_islemleri (aciklama, zaman, tur, hedef_islem) VALUES (?, ?, ?, ?)",
+                          (aciklama, time.time(), tur, hedef_islem))
+    conn.execute("DELETE FROM acik_gunluk_islemi"); conn.execute("INSERT INTO acik_gunluk_islemi VALUES (?)", (cursor.lastrowid,))
+    return cursor.lastrowid
+
+
+def gunluk_islemini_kapat(conn):
+    """Açık günlük işlemini kapatır; bundan sonraki yazmalar (işlem dışı) günlüğe işlemsiz (NULL) yazılır."""
+    conn.execute("DELETE FROM acik_gunluk_islemi")
+
+
+@contextlib.contextmanager
+def gunluk_islemi(conn, aciklama, tur='islem', hedef_islem=None):
+    """Blok içindeki satır değişikliklerini tek bir günlük işlemine bağlar; işlem numarasını verir."""
+    islem_no = gunluk_islemi_baslat(conn, aciklama, tur, hedef_islem)
+    try: yield islem_no
+    finally: gunluk_islemini_kapat(conn)
+
+
+def veri_surumu(conn=None):
+    """Veritabanının veri sürümünü (son değişiklik sıra numarası) döner. Önbellek anahtarı olarak kullanılır."""
+    kendi_baglantimiz = conn is None
+    if kendi_baglantimiz: conn = get_connection()
+    try:
+        return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM degisiklik_gunlugu").fetchone()[0]
+    finally:
+        if kendi_baglantimiz: conn.close()
+
+
+def veri_parmak_izi(yillar=None, conn=None):
+    """
+    Disk önbellekleri için veri kimliği: [veritabanı, son değişikliğin sırası, o değişikliğin işlem zamanı]. Yedekten geri
+    dönüldükten sonra yeniden kullanılan sıra numaralarını işlem zamanı ayırt eder. yillar verilirse yalnızca bu yılların
+    değişiklikleri sayılır; böylece yıl başına çıktılar yalnızca kendi yılı değiştiğinde geçersizleşir.
+    """
+    kendi_baglantimiz = conn is None
+    if kendi_baglantimiz: conn = get_connection()
+    try:
+        kosul = f" WHERE g.yil IN ({', '.join('?' * len(yillar))})" if yillar else ""
+        satir = conn.execute("SELECT g.seq, i.zaman FROM degisiklik_gunlugu g LEFT JOIN gunluk_islemleri i ON i.islem_no = g.islem_no"
+                             f"{kosul} ORDER BY g.seq DESC LIMIT 1", [int(y) for y in yillar or []]).fetchone()
+        return [os.path.abspath(DB_PATH), *(satir or (0, None))]
+    finally:
+        if kendi_baglantimiz: conn.close()
+
+
+def degisiklikleri_getir(son_seq, conn=None):
+    """Verilen sıra numarasından sonra değişen (id, yil) anahtarlarını ve yeni veri sürümünü döner."""
+    kendi_baglantimiz = conn is None
+    if kendi_baglantimiz: conn = get_connection()
+    try:
+        satirlar = conn.execute("SELECT seq, id, yil FROM degisiklik_gunlugu WHERE seq > ? ORDER BY seq",
+                                (son_seq,)).fetchall()
+        yeni_seq = satirlar[-1][0] if satirlar else son_seq
+        return yeni_seq, {(yuva_id, yil) for _, yuva_id, yil in satirlar}
+    finally:
+        if kendi_baglantimiz: conn.close()
+
+
+def _satiri_yaz(cursor, durum):
+    """Günlükteki bir JSON satır durumunu 'yuvalar' tablosuna aynen yazar."""
+    sutunlar = [s for s in YUVA_SUTUNLARI if s in durum]
+    cursor.execute(f"INSERT OR REPLACE INTO yuvalar ({', '.join(sutunlar)}) VALUES ({', '.join(['?'] * len(sutunlar))})",
+                   [durum[s] for s in sutunlar])
+
+
+def _gunluk_islemini_uygula(hedef_islem, geri_al):
+    """Bir günlük işlemini tersine (geri al) ya da yeniden (yinele) uygular."""
+    conn = get_connection()
+    try:
+        with conn:
+            cursor = conn.cursor()
+            kayitlar = cursor.execute("SELECT tur, id, yil, eski, yeni FROM degisiklik_gunlugu WHERE islem_no = ? "
+                                      f"ORDER BY seq {'DESC' if geri_al else 'ASC'}", (hedef_islem,)).fetchall()
+            yazma_izni_kontrolu(conn, {kayit[2] for kayit in kayitlar})
+            if geri_al:
+                for tur, yuva_id, yil, eski, yeni in kayitlar:
+                    mevcut = cursor.execute(f"SELECT {_json_nesnesi('yuvalar')} FROM yuvalar WHERE id = ? AND yil = ?",
+                                            (yuva_id, yil)).fetchone()
+                    beklenen = json.loads(yeni) if yeni else None
+                    if (json.loads(mevcut[0]) if mevcut else None) != beklenen:
+                        raise ValueError(f"[{yil}] ID {yuva_id} sonradan değiştirildiği için işlem geri alınamıyor.")
+            with gunluk_islemi(conn, None, tur='geri_al' if geri_al else 'yinele', hedef_islem=hedef_islem):
+                for tur, yuva_id, yil, eski, yeni in kayitlar:
+                    hedef_durum = eski if geri_al else yeni
+                    if hedef_durum is None: cursor.execute("DELETE FROM yuvalar WHERE id = ? AND yil = ?", (yuva_id, yil))
+                    else: _satiri_yaz(cursor, json.loads(hedef_durum))
+            cursor.execute("UPDATE gunluk_islemleri SET durum = ? WHERE islem_no = ?",
+                           ('geri_alindi' if geri_al else 'aktif', hedef_islem))
+        return len(kayitlar)
+    finally:
+        conn.close()
+
+
+def son_islemi_geri_al():
+    """En son aktif kullanıcı işlemini geri alır. (basarili, mesaj) döner."""
+    conn = get_connection()
+    try:
+        hedef = conn.execute("SELECT islem_no, aciklama FROM gunluk_islemleri i WHERE tur = 'islem' AND durum = 'aktif' "
+                             "AND EXISTS (SELECT 1 FROM degisiklik_gunlugu d WHERE d.islem_no = i.islem_no) "
+                             "ORDER BY islem_no DESC LIMIT 1").fetchone()
+    finally:
+        conn.close()
+    if not hedef: return False, "Geri alınacak işlem yok."
+    try:
+        satir_sayisi = _gunluk_islemini_uygula(hedef[0], geri_al=True)
+    except Exception as e:
+        logging.error(f"Geri alma hatası: {e}", exc_info=True); return False, f"Geri alınamadı: {e}"
+    logging.info(f"KULLANICI EYLEMİ: '{hedef[1]}' geri alındı ({satir_sayisi} satır).", extra={"eylem": "geri_al", "satir": satir_sayisi})
+    return True, f"Geri alındı: {hedef[1]} ({satir_sayisi} satır)"
+
+
+def son_islemi_yinele():
+    """En son geri alınan işlemi yeniden uygular. (basarili, mesaj) döner."""
+    conn = get_connection()
+    try:
+        hedef = conn.execute("SELECT i.islem_no, i.aciklama FROM gunluk_islemleri g "
+                             "JOIN gunluk_islemleri i ON i.islem_no = g.hedef_islem "
+                             "WHERE g.tur = 'geri_al' AND i.durum = 'geri_alindi' ORDER BY g.islem_no DESC LIMIT 1").fetchone()
+    finally:
+        conn.close()
+    if not hedef: return False, "Yinelenecek işlem yok."
+    try:
+        satir_sayisi = _gunluk_islemini_uygula(hedef[0], geri_al=False)
+    except Exception as e:
+        logging.error(f"Yineleme hatası: {e}", exc_info=True); return False, f"Yinelenemedi: {e}"
+    logging.info(f"KULLANICI EYLEMİ: '{hedef[1]}' yinelendi ({satir_sayisi} satır).", extra={"eylem": "yinele", "satir": satir_sayisi})
+    return True, f"Yinelendi: {hedef[1]} ({satir_sayisi} satır)"
+
+
+GERI_ALMA_DERINLIGI = 100  # Satır görüntüleri (eski/yeni) son bu kadar kullanıcı işlemi için saklanır
+
+
+def degisiklik_gunlugunu_sikistir(conn, derinlik=GERI_ALMA_DERINLIGI):
+    """
+    Geri alınabilecek son `derinlik` kullanıcı işleminden ve senkronizasyonun işlediği noktadan eski günlük
+    satırlarını sıkıştırır: her (id, yil) için yalnızca en son satır kalır ve satır görüntüleri silinir. Herhangi
+    bir sıra numarasından sonra değişen anahtarlar aynen bulunduğu için değişiklik akışı ve artımlı indeksler
+    etkilenmez; sınırdan eski işlemler artık geri alınamaz. Silinen günlük satırı sayısını döner.
+    """
+    senkron = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'senkron_ayarlari'").fetchone() and _senkron_ayari(conn, 'islenen_seq') is not None
+    if senkron: _alan_surumlerini_guncelle(conn)  # Bekleyen değişiklikler önce alan damgalarına işlenir
+    sinir_islem = conn.execute("SELECT islem_no FROM gunluk_islemleri WHERE tur = 'islem' ORDER BY islem_no DESC LIMIT 1 OFFSET ?",
+                               (derinlik - 1,)).fetchone()
+    if sinir_islem is None: return 0
+    sinir = conn.execute("SELECT MIN(seq) FROM degisiklik_gunlugu WHERE islem_no >= ?", sinir_islem).fetchone()[0] or veri_surumu(conn) + 1
+    if senkron: sinir = min(sinir, int(_senkron_ayari(conn, 'islenen_seq')) + 1)
+    with conn:
+        silinen = conn.execute("DELETE FROM degisiklik_gunlugu WHERE seq < ? AND seq NOT IN (SELECT MAX(seq) FROM degisiklik_gunlugu GROUP BY id, yil)",
+                               (sinir,)).rowcount
+        conn.execute("UPDATE degisiklik_gunlugu SET eski = NULL, yeni = NULL WHERE seq < ? AND (eski IS NOT NULL OR yeni IS NOT NULL)", (sinir,))
+        conn.execute("UPDATE gunluk_islemleri SET durum = 'kalici' WHERE islem_no < ? AND durum IN ('aktif', 'geri_alindi')", sinir_islem)
+        conn.execute("DELETE FROM gunluk_islemleri WHERE islem_no < ? AND NOT EXISTS "
+                     "(SELECT 1 FROM degisiklik_gunlugu d WHERE d.islem_no = gunluk_islemleri.islem_no)", sinir_islem)
+    if silinen: logging.info(f"Değişiklik günlüğü sıkıştırıldı: {silinen} eski satır silindi.")
+    return silinen
+
+
+class YuvaOnbellegi:
+    """
+    Yuva kayıtlarını bellekte tutar. Her yenilemede tabloyu baştan okumak yerine
+    değişiklik günlüğünden sadece değişen (id, yil) satırlarını uygular.
+    """
+
+    def __init__(self):
+        self._yuvalar = {}
+        self.son_seq = None
+        self.nesil = 0  # İçerik her değiştiğinde artar; yenileme hattı yükleme aşamasını buna bağlar
+
+    def gecersiz_kil(self):
+        """Veritabanı dosyası değiştiğinde (örn. yedekten geri yükleme) tam yeniden yüklemeye zorlar."""
+        self.son_seq = None
+
+    @performans.olculen("db.onbellek_guncelle")
+    def guncelle(self):
+        conn = get_connection(); conn.row_factory = sqlite3.Row
+        try:
+            surum = veri_surumu(conn)
+            if self.son_seq is None or surum < self.son_seq:
+                self._yuvalar = {(y['id'], y['yil']): y for y in map(_yuva_satirini_coz, conn.execute("SELECT * FROM tum_yuvalar"))}
+                performans.satir_say(len(self._yuvalar)); self.nesil += 1
+            elif surum > self.son_seq:
+                _, degisenler = degisiklikleri_getir(self.son_seq, conn)
+                for anahtar in degisenler:
+                    satir = conn.execute("SELECT * FROM tum_yuvalar WHERE id = ? AND yil = ?", anahtar).fetchone()
+                    if satir is None: self._yuvalar.pop(anahtar, None)
+                    else: self._yuvalar[anahtar] = _yuva_satirini_coz(satir)
+                if degisenler: self.nesil += 1
+                logging.info(f"Yuva önbelleği güncellendi: {len(degisenler)} değişen kayıt uygulandı.")
+                performans.satir_say(len(degisenler))
+            self.son_seq = surum
+        finally:
+            conn.close()
+        return self
+
+    def yuvalar(self):
+        return list(self.guncelle()._yuvalar.values())
+
+
+def _yuva_satirini_coz(row):
+    """Bir veritabanı satırını, predatör listesi çözülmüş bir sözlüğe çevirir."""
+    yuva = dict(row)
+    if 'predator_canli_listesi' in yuva and yuva['predator_canli_listesi']:
+        try:
+            yuva['predator_canli_listesi'] = json.loads(yuva['predator_canli_listesi'])
+        except (json.JSONDecodeError, TypeError):
+            yuva['predator_canli_listesi'] = []
+    else:
+        yuva['predator_canli_listesi'] = []
+    return yuva
+
+
+class YenilemeHatti:
+    """
+    Arayüz yenilemesini önbellekli aşamalardan oluşan bir bağımlılık grafiğine böler. Her aşama girdilerini
+    açıkça bildirir: önceki aşamaların sonuçları (girdiler) ve arayüz kontrollerinden okunan değerler (kontroller).
+    Girdi sürümleri ve kontrol değerleri son çalıştırmayla aynı olan aşama atlanır; yeniden hesaplanan bir aşama
+    önceki sonucunun aynısını (aynı nesneyi) dönerse ona bağlı aşamalar da atlanır.
+    """
+
+    def __init__(self):
+        self._asamalar = {}; self._sonuclar = {}; self._imzalar = {}; self._surumler = {}
+
+    def asama(self, ad, islev, girdiler=(), kontroller=None):
+        """islev(*girdi_sonuclari, **kontrol_degerleri) biçiminde çağrılır; kontroller {ad: değeri okuyan fonksiyon} sözlüğüdür."""
+        eksik = [g for g in girdiler if g not in self._asamalar]
+        if eksik: raise ValueError(f"'{ad}' aşaması tanımlanmamış aşamalara bağlı: {eksik}")
+        self._asamalar[ad] = (islev, tuple(girdiler), dict(kontroller or {}))
+
+    def gecersiz_kil(self, *adlar):
+        """Verilen (ya da tüm) aşamaları bir sonraki çalıştırmada yeniden hesaplanmaya zorlar."""
+        for ad in adlar or list(self._asamalar): self._imzalar.pop(ad, None)
+
+    def sonuc(self, ad):
+        return self._sonuclar.get(ad)
+
+    def calistir(self, *hedefler):
+        """Hedef aşamaları (varsayılan: tümü) ve bağımlılıklarını tanım sırasıyla günceller; yeniden hesaplananları döner."""
+        gerekli = set(); yigin = list(hedefler or self._asamalar)
+        while yigin:
+            ad = yigin.pop()
+            if ad not in gerekli: gerekli.add(ad); yigin.extend(self._asamalar[ad][1])
+        hesaplanan = []
+        for ad, (islev, girdiler, kontroller) in self._asamalar.items():
+            if ad not in gerekli: continue
+            degerler = {k: oku() for k, oku in kontroller.items()}
+            imza = (tuple(self._surumler.get(g, 0) for g in girdiler), degerler)
+            if self._imzalar.get(ad) == imza: continue
+            with performans.olc(f"yenileme.{ad}"): sonuc = islev(*(self._sonuclar[g] for g in girdiler), **degerler)
+            if ad not in self._sonuclar or sonuc is not self._sonuclar[ad]: self._surumler[ad] = self._surumler.get(ad, 0) + 1
+            self._sonuclar[ad] = sonuc; self._imzalar[ad] = imza; hesaplanan.append(ad)
+        return hesaplanan
+
+
+@performans.olculen("db.tum_yuvalari_getir")
+def tum_yuvalari_getir():
+    """Tüm yuva kayıtlarını veritabanından çeker."""
+    conn = get_connection();
+    conn.row_factory = sqlite3.Row;
+    cursor = conn.cursor();
+    cursor.execute("SELECT * FROM tum_yuvalar");
+    yuvalar = [_yuva_satirini_coz(row) for row in cursor.fetchall()]
+    conn.close();
+    return yuvalar
+
+
+@performans.olculen("db.yuvalari_dataframe_yap")
+def yuvalari_dataframe_yap(sicaklik_ozetleriyle=False):
+    """
+    Tüm yuva kayıtlarını bir Pandas DataFrame'ine dönüştürür.
+    sicaklik_ozetleriyle=True ise kaydedici verisinden hesaplanan kuluçka sıcaklık özetleri de eklenir.
+    """
+    conn = get_connection();
+    if sicaklik_ozetleriyle:
+        sicaklik_ozetlerini_guncelle(conn)
+        df = pd.read_sql_query("SELECT y.*, s.derece_gun, s.ortalama_kulucka_sicakligi, s.orta_ucte_bir_sicaklik, s.tahmini_disi_orani_yuzde, "
+                               "s.sicaklik_ornek_sayisi FROM tum_yuvalar y LEFT JOIN sicaklik_ozetleri s ON s.id = y.id AND s.yil = y.yil", conn)
+    else: df = pd.read_sql_query("SELECT * FROM tum_yuvalar", conn);
+    conn.close()
+    if not df.empty and 'predator_canli_listesi' in df.columns:
+        df['predator_canli_listesi'] = df['predator_canli_listesi'].apply(
+            lambda x: json.loads(x) if isinstance(x, str) and x.startswith('[') else [])
+    return df
+
+
+# --- Türetilmiş Ölçümler ---
+# Yuva başına türetilen oranlar (kuluçka/çıkış başarısı, embriyo evreleri, ...) tek bir kayıt
+# defterinde ifade olarak tanımlanır. İfadeler yuvalar sütunları üzerinde yazılan küçük bir
+# Python alt kümesidir: AST'leri bir kez doğrulanıp derlenir ve tüm sütun üzerinde tek seferde
+# (NumPy dizileriyle) değerlendirilir; satır satır döngü yoktur. Kullanıcı ölçümleri config.json'un
+# "olcumler" anahtarında saklanır. Veritabanından hesaplanan ölçüm tablosu veri sürümüne göre önbelleğe alınır.
+
+YERLESIK_OLCUMLER = {
+    "yuva_basarisi": ("Yuva Başarısı (%)", "oran(doldur(yuva_ici_canli_yavru, 0), toplam_yumurta_sayisi) * 100"),
+    "kulucka_basarisi": ("Kuluçka Başarısı (%)", "oran(bos_kabuk_sayisi, toplam_yumurta_sayisi) * 100"),
+    "cikis_basarisi": ("Çıkış Başarısı (%)", "oran(bos_kabuk_sayisi - doldur(yuva_ici_canli_yavru, 0) - doldur(yuva_ici_olu_yavru, 0), toplam_yumurta_sayisi) * 100"),
+    "erken_embriyo_orani": ("Erken Dönem Embriyo Oranı (%)", "oran(erken_donem_embriyo, toplam_olu_embriyo) * 100"),
+    "orta_embriyo_orani": ("Orta Dönem Embriyo Oranı (%)", "oran(orta_donem_embriyo, toplam_olu_embriyo) * 100"),
+    "gec_embriyo_orani": ("Geç Dönem Embriyo Oranı (%)", "oran(gec_donem_embriyo, toplam_olu_embriyo) * 100"),
+    "dollenmemis_orani": ("Döllenmemiş Yumurta Oranı (%)", "oran(dollenmemis_yumurta_sayisi, toplam_yumurta_sayisi) * 100"),
+}
+OLCUM_SUTUNLARI = YUVA_SUTUNLARI + ['derece_gun', 'ortalama_kulucka_sicakligi', 'orta_ucte_bir_sicaklik', 'tahmini_disi_orani_yuzde', 'sicaklik_ornek_sayisi']
+
+
+def _oran(pay, payda, bos=np.nan):
+    pay, payda = np.broadcast_arrays(np.asarray(pay, dtype=float), np.asarray(payda, dtype=float))
+    return np.divide(pay, payda, out=np.full(pay.shape, float(bos)), where=(payda != 0) & ~np.isnan(payda))
+
+
+OLCUM_ISLEVLERI = {  # İfadelerde çağrılabilen fonksiyonlar; hepsi tüm sütunu tek seferde işler
+    "oran": _oran, "where": np.where, "abs": np.abs, "sqrt": np.sqrt, "log": np.log, "minimum": np.minimum, "maximum": np.maximum,
+    "clip": np.clip, "bos": lambda x: pd.isna(np.asarray(x)), "doldur": lambda x, deger: np.where(pd.isna(np.asarray(x)), deger, x),
+    "gun_farki": lambda a, b: (np.asarray(b, dtype='datetime64[ns]') - np.asarray(a, dtype='datetime64[ns]')) / np.timedelta64(1, 'D'),
+    "ay": lambda x: pd.DatetimeIndex(x).month.to_numpy(dtype=float),
+}
+_OLCUM_YARDIMCILARI = {"_ve": np.logical_and, "_veya": np.logical_or, "_degil": np.logical_not,
+                       "_icinde": lambda x, degerler: pd.Series(np.asarray(x, dtype=object)).isin(degerler).to_numpy(),
+                       "_us": lambda taban, us: np.power(np.asarray(taban, dtype=float), np.asarray(us, dtype=float))}
+OLCUM_AZAMI_US = 100  # Sabit üslerin mutlak değer sınırı
+_IZINLI_ISLECLER = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd,
+                    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+
+class _OlcumDonusturucu(ast.NodeTransformer):
+    """
+    Doğrulanmış ifadedeki and/or/not/in'i dizi üzerinde çalışan yardımcı çağrılara çevirir. Üs alma
+    float dizilerde yapılır; Python tamsayılarıyla 9 ** 9 ** 9 gibi bir ifade arayüzü dondururdu.
+    """
+
+    def _cagri(self, ad, *argumanlar):
+        return ast.Call(func=ast.Name(id=ad, ctx=ast.Load()), args=list(argumanlar), keywords=[])
+
+    def visit_BoolOp(self, dugum):
+        self.generic_visit(dugum); sonuc = dugum.values[0]
+        for deger in dugum.values[1:]: sonuc = self._cagri("_ve" if isinstance(dugum.op, ast.And) else "_veya", sonuc, deger)
+        return sonuc
+
+    def visit_UnaryOp(self, dugum):
+        self.generic_visit(dugum)
+        return self._cagri("_degil", dugum.operand) if isinstance(dugum.op, ast.Not) else dugum
+
+    def visit_BinOp(self, dugum):
+        self.generic_visit(dugum)
+        return self._cagri("_us", dugum.left, dugum.right) if isinstance(dugum.op, ast.Pow) else dugum
+
+    def visit_Compare(self, dugum):
+        self.generic_visit(dugum)
+        if not isinstance(dugum.ops[0], (ast.In, ast.NotIn)): return dugum
+        icinde = self._cagri("_icinde", dugum.left, ast.List(elts=dugum.comparators[0].elts, ctx=ast.Load()))
+        return self._cagri("_degil", icinde) if isinstance(dugum.ops[0], ast.NotIn) else icinde
+
+
+@functools.lru_cache(maxsize=256)
+def olcum_ifadesini_derle(ifade):
+    """
+    İfadeyi doğrular ve derler; (kod nesnesi, kullandığı adlar) döner. Yalnızca sayı/metin sabitleri, adlar,
+    aritmetik, tekli karşılaştırma, and/or/not, sabit listesiyle 'in' ve OLCUM_ISLEVLERI çağrılarına izin verilir.
+    """
+    try: agac = ast.parse(ifade.strip(), mode="eval")
+    except SyntaxError as e: raise ValueError(f"İfade çözümlenemedi: {e.msg}") from None
+    adlar = set()
+    for dugum in ast.walk(agac):
+        if isinstance(dugum, ast.Call):
+            if not isinstance(dugum.func, ast.Name) or dugum.func.id not in OLCUM_ISLEVLERI or dugum.keywords:
+                raise ValueError(f"İzin verilmeyen çağrı. Kullanılabilir fonksiyonlar: {', '.join(OLCUM_ISLEVLERI)}")
+        elif isinstance(dugum, ast.Name):
+            if dugum.id not in OLCUM_ISLEVLERI: adlar.add(dugum.id)
+        elif isinstance(dugum, ast.Constant):
+            if not isinstance(dugum.value, (int, float, str)): raise ValueError(f"İzin verilmeyen sabit: {dugum.value!r}")
+        elif isinstance(dugum, ast.Compare):
+            if len(dugum.ops) > 1: raise ValueError("Zincirleme karşılaştırma desteklenmez; 'a < b and b < c' yazın.")
+            if isinstance(dugum.ops[0], (ast.In, ast.NotIn)) and not (isinstance(dugum.comparators[0], (ast.List, ast.Tuple))
+                                                                      and all(isinstance(e, ast.Constant) for e in dugum.comparators[0].elts)):
+                raise ValueError("'in' yalnızca sabit listesiyle kullanılabilir, örn. predasyon_durumu in ['tam', 'yari'].")
+        elif isinstance(dugum, ast.BinOp):
+            if any(isinstance(taraf, ast.Constant) and isinstance(taraf.value, str) for taraf in (dugum.left, dugum.right)):
+                raise ValueError("Metin sabitleri aritmetikte kullanılamaz; yalnızca karşılaştırmada ve 'in' listesinde yer alabilir.")
+            if isinstance(dugum.op, ast.Pow):
+                us = dugum.right.operand if isinstance(dugum.right, ast.UnaryOp) and isinstance(dugum.right.op, (ast.USub, ast.UAdd)) else dugum.right
+                if isinstance(us, ast.Constant) and isinstance(us.value, (int, float)) and abs(us.value) > OLCUM_AZAMI_US:
+                    raise ValueError(f"Üs en fazla {OLCUM_AZAMI_US} olabilir.")
+        elif isinstance(dugum, (ast.List, ast.Tuple)):
+            continue  # 'in' sağ tarafı; başka yerde kullanımı Compare denetiminde reddedilir
+        elif not isinstance(dugum, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.And, ast.Or, ast.Not, ast.In, ast.NotIn, ast.Load, *_IZINLI_ISLECLER)):
+            raise ValueError(f"İfadede izin verilmeyen öğe: {type(dugum).__name__}")
+    for dugum in ast.walk(agac):  # Liste/demet yalnızca 'in'in sağında olabilir
+        for alt in ast.iter_child_nodes(dugum):
+            if isinstance(alt, (ast.List, ast.Tuple)) and not (isinstance(dugum, ast.Compare) and alt in dugum.comparators):
+                raise ValueError("Liste yalnızca 'in' ile kullanılabilir.")
+    agac = ast.fix_missing_locations(_OlcumDonusturucu().visit(agac))
+    return compile(agac, f"<ölçüm: {ifade}>", "eval"), frozenset(adlar)
+
+
+def olcum_tanimlari():
+    """Yerleşik ve kullanıcı ölçümlerini {ad: {"etiket", "ifade", "yerlesik"}} olarak (tanım sırasıyla) döner."""
+    tanimlar = {ad: {"etiket": etiket, "ifade": ifade, "yerlesik": True} for ad, (etiket, ifade) in YERLESIK_OLCUMLER.items()}
+    for ad, tanim in load_config().get("olcumler", {}).items():
+        if ad in tanimlar: continue
+        tanimlar[ad] = {"etiket": tanim.get("etiket") or ad.replace('_', ' ').title(), "ifade": tanim["ifade"], "yerlesik": False}
+    return tanimlar
+
+
+def olcum_imzasi(tanimlar=None):
+    """Önbellek anahtarlarında kullanılan (ad, ifade) demetleri."""
+    return tuple((ad, tanim["ifade"]) for ad, tanim in (tanimlar or olcum_tanimlari()).items())
+
+
+def _olcumu_dogrula(ad, ifade, tanimlar):
+    _, adlar = olcum_ifadesini_derle(ifade)
+    bilinmeyen = sorted(adlar - set(OLCUM_SUTUNLARI) - set(tanimlar))
+    if bilinmeyen: raise ValueError(f"Bilinmeyen sütun/ölçüm: {', '.join(bilinmeyen)}")
+    yol = [ad]; ziyaret = set()
+    def dolas(hedef):
+        for bagimlilik in olcum_ifadesini_derle(tanimlar[hedef]["ifade"])[1] & set(tanimlar):
+            if bagimlilik == ad: raise ValueError(f"Döngüsel ölçüm tanımı: {' -> '.join(yol + [ad])}")
+            if bagimlilik not in ziyaret: ziyaret.add(bagimlilik); yol.append(bagimlilik); dolas(bagimlilik); yol.pop()
+    dolas(ad)
+
+
+def olcum_tanimini_kaydet(ad, ifade, etiket=None):
+    """Kullanıcı ölçümünü doğrulayıp config.json'a ekler ya da günceller; (basarili, mesaj) döner."""
+    ad = ad.strip()
+    if not ad.isidentifier() or ad.startswith('_'): return False, f"Geçersiz ölçüm adı: '{ad}' (harf, rakam ve _ kullanın)."
+    if ad in YERLESIK_OLCUMLER or ad in OLCUM_SUTUNLARI or ad in OLCUM_ISLEVLERI: return False, f"'{ad}' adı zaten bir sütun, fonksiyon ya da yerleşik ölçüm."
+    tanimlar = olcum_tanimlari(); tanimlar[ad] = {"etiket": etiket or ad.replace('_', ' ').title(), "ifade": ifade, "yerlesik": False}
+    deneme = pd.DataFrame([{s: "2024-06-01" if s in TARIH_SUTUNLARI else 1 if s in TAM_SAYI_SUTUNLARI or s in ONDALIK_SUTUNLARI else "" for s in OLCUM_SUTUNLARI}])
+    try: _olcumu_dogrula(ad, ifade, tanimlar); olcumleri_hesapla(deneme, [ad], tanimlar)  # Tür hataları tek satırlık örnekle yakalanır
+    except Exception as e: return False, f"Ölçüm kaydedilmedi: {e}"
+    config = load_config(); config.setdefault("olcumler", {})[ad] = {"etiket": tanimlar[ad]["etiket"], "ifade": ifade}
+    with open(os.path.join(SCRIPT_DIR, "config.json"), 'w', encoding='utf-8') as f: json.dump(config, f, indent=2, ensure_ascii=False)
+    logging.info(f"KULLANICI EYLEMİ: '{ad}' ölçümü kaydedildi: {ifade}", extra={"eylem": "olcum_kaydet"}); return True, f"'{ad}' ölçümü kaydedildi."
+
+
+def olcum_tanimini_sil(ad):
+    """Kullanıcı ölçümünü config.json'dan siler (başka bir ölçüm ona bağlıysa silmez); (basarili, mesaj) döner."""
+    config = load_config(); kullanici = config.get("olcumler", {})
+    if ad not in kullanici: return False, f"'{ad}' adında bir kullanıcı ölçümü yok."
+    bagimlilar = [diger for diger, tanim in kullanici.items() if diger != ad and ad in olcum_ifadesini_derle(tanim["ifade"])[1]]
+    if bagimlilar: return False, f"'{ad}' silinemez; şu ölçümler onu kullanıyor: {', '.join(bagimlilar)}"
+    del kullanici[ad]
+    with open(os.path.join(SCRIPT_DIR, "config.json"), 'w', encoding='utf-8') as f: json.dump(config, f, indent=2, ensure_ascii=False)
+    logging.info(f"KULLANICI EYLEMİ: '{ad}' ölçümü silindi.", extra={"eylem": "olcum_sil"}); return True, f"'{ad}' ölçümü silindi."
+
+
+class _OlcumAlani(dict):
+    """İfade değerlendirmesindeki ad alanı; sütunları ve bağımlı ölçümleri ilk kullanımda dizilere çevirir."""
+
+    def __init__(self, df, tanimlar):
+        super().__init__(OLCUM_ISLEVLERI); self.update(_OLCUM_YARDIMCILARI); self.df = df; self.tanimlar = tanimlar; self._hesaplanan = set()
+
+    def __missing__(self, ad):
+        if ad in self.tanimlar:
+            if ad in self._hesaplanan: raise ValueError(f"Döngüsel ölçüm tanımı: {ad}")
+            self._hesaplanan.add(ad); deger = self.olcum(ad)
+        elif ad in self.df.columns:
+            seri = self.df[ad]
+            if ad in TARIH_SUTUNLARI: deger = pd.to_datetime(seri, errors='coerce').to_numpy(dtype='datetime64[ns]')
+            elif ad in TAM_SAYI_SUTUNLARI or ad in ONDALIK_SUTUNLARI or pd.api.types.is_numeric_dtype(seri): deger = pd.to_numeric(seri, errors='coerce').to_numpy(dtype=float)
+            else: deger = seri.to_numpy(dtype=object)
+        elif ad in OLCUM_SUTUNLARI: deger = np.full(len(self.df), np.nan)  # Bu tabloda olmayan sütun: eksik değer
+        else: raise NameError(f"Bilinmeyen sütun/ölçüm: {ad}")
+        self[ad] = deger; return deger
+
+    def olcum(self, ad):
+        deger = eval(olcum_ifadesini_derle(self.tanimlar[ad]["ifade"])[0], {"__builtins__": {}}, self)
+        try: return np.broadcast_to(np.asarray(deger, dtype=float), (len(self.df),)).copy()
+        except (TypeError, ValueError): raise ValueError(f"'{ad}' ölçümü sayısal bir değer üretmiyor.") from None
+
+
+@performans.olculen("analiz.olcumler")
+def olcumleri_hesapla(df, adlar=None, tanimlar=None):
+    """
+    Verilen yuva tablosu için ölçüm sütunlarını (df ile aynı indeksli, float) hesaplar. Hesaplanamayan
+    kullanıcı ölçümleri uyarı verilerek atlanır; tabloda olmayan sütunlar eksik değer sayılır.
+    """
+    tanimlar = tanimlar or olcum_tanimlari(); alan = _OlcumAlani(df, tanimlar); sonuc = {}
+    for ad in (adlar or list(tanimlar)):
+        try: sonuc[ad] = alan[ad]
+        except Exception as e:
+            if tanimlar[ad]["yerlesik"] or adlar: raise
+            logging.warning(f"'{ad}' ölçümü hesaplanamadı, atlandı: {e}")
+    return pd.DataFrame(sonuc, index=df.index)
+
+
+@functools.lru_cache(maxsize=8)
+def _olcum_tablosu_hesapla(db_yolu, surum, imza):
+    with contextlib.closing(get_connection(db_yolu)) as conn:
+        df = pd.read_sql_query("SELECT * FROM tum_yuvalar", conn)
+    tanimlar = {ad: tanim for ad, tanim in olcum_tanimlari().items() if (ad, tanim["ifade"]) in imza}
+    return pd.concat([df[['id', 'yil']], olcumleri_hesapla(df, tanimlar=tanimlar)], axis=1)
+
+
+def olcum_tablosu():
+    """
+    Tüm yuvalar için (id, yil, ölçümler...) tablosunu döner. Veri sürümü ve ölçüm tanımları değişmedikçe
+    önbellekten gelir; bu yüzden çağıran tarafından değiştirilmemelidir.
+    """
+    return _olcum_tablosu_hesapla(DB_PATH, veri_surumu(), olcum_imzasi())
+
+
+def olcumleri_ekle(df):
+    """Veritabanından okunmuş yuva tablosuna önbellekteki ölçüm sütunlarını (id, yil üzerinden) ekler."""
+    if df.empty: return df
+    olcumler = olcum_tablosu(); eklenecek = [s for s in olcumler.columns if s not in df.columns]
+    return df.merge(olcumler[eklenecek + ['id', 'yil']], on=['id', 'yil'], how='left')
+
+
+def olcum_etiketleri():
+    """Ölçüm adından okunur etikete sözlük (grafik eksenleri ve dışa aktarma başlıkları için)."""
+    return {ad: tanim["etiket"] for ad, tanim in olcum_tanimlari().items()}
+
+
+# --- Arayüzden Bağımsız Analiz Yardımcıları ---
+# Ana pencere ve diyaloglar bu fonksiyonları kullanır; kıyaslama paketi de aynı kodu
+# arayüz açmadan ölçebilsin diye Qt'ye bağımlı değillerdir.
+
+ISTATISTIK_KRITERLERI = ["Toplam Yuva Sayısı", "Predasyonlu Yuva Sayısı", "Predasyon Oranı (%)"]  # Ardından her ölçümün ortalaması gelir
+
+
+def _konumlu_yuvalar_gdf(yuvalar):
+    """Koordinatı olan yuvaları ve bunların GeoDataFrame'ini döner."""
+    gecerli_yuvalar = [y for y in yuvalar if y.get('lat') is not None and y.get('lon') is not None]
+    gdf = gpd.GeoDataFrame(geometry=gpd.points_from_xy([y['lon'] for y in gecerli_yuvalar], [y['lat'] for y in gecerli_yuvalar]), crs="EPSG:4326")
+    return gecerli_yuvalar, gdf
+
+
+def _tampon_bolge_utm(referans_koordinat, mesafe_metre):
+    """[lat, lon] referans noktası çevresinde UTM 35N'de metre cinsinden tampon bölge oluşturur."""
+    referans_noktasi_utm = gpd.GeoSeries([Point(referans_koordinat[1], referans_koordinat[0])], crs="EPSG:4326").to_crs("EPSG:32635")[0]
+    return referans_noktasi_utm.buffer(mesafe_metre)
+
+
+def poligon_icindeki_yuvalar(yuvalar, poligon_koordinatlari):
+    """Haritada çizilen [lat, lon] köşe listesiyle tanımlı alanın içindeki yuvaları döner."""
+    gecerli_yuvalar, gdf = _konumlu_yuvalar_gdf(yuvalar)
+    if not gecerli_yuvalar: return []
+    # Çizim köşeleri [lat, lon] sırasıyla gelir; noktalarla aynı (lon, lat) eksen düzenine çevrilir.
+    poligon = Polygon([(lon, lat) for lat, lon in poligon_koordinatlari])
+    icinde = gdf.within(poligon).to_numpy()
+    return [yuva for yuva, secili in zip(gecerli_yuvalar, icinde) if secili]
+
+
+def referansa_yakin_yuvalar(yuvalar, referans_koordinat, mesafe_metre):
+    """Referans noktasına verilen metre mesafe içindeki yuvaları döner."""
+    gecerli_yuvalar, gdf = _konumlu_yuvalar_gdf(yuvalar)
+    if not gecerli_yuvalar: return []
+    icinde = gdf.to_crs("EPSG:32635").within(_tampon_bolge_utm(referans_koordinat, mesafe_metre)).to_numpy()
+    return [yuva for yuva, secili in zip(gecerli_yuvalar, icinde) if secili]
+
+
+def yuva_anahtari(yuva):
+    """Harita işaretçisi ile liste satırını eşleyen anahtar: 'id_yil'."""
+    return f"{yuva.get('id')}_{yuva.get('yil')}"
+
+
+def yuva_aramaya_uyuyor_mu(yuva_data, arama_metni, kriter):
+    """Listedeki arama kutusunun eşleşme kuralı; arama_metni küçük harfe çevrilmiş olmalıdır."""
+    if not arama_metni: return True
+    if kriter == "ID": return arama_metni in str(yuva_data.get('id', ''))
+    if kriter == "Yıl": return arama_metni in str(yuva_data.get('yil', ''))
+    if kriter == "Durum": return arama_metni in str(yuva_data.get('predasyon_durumu', '')).lower()
+    if kriter == "Predatör": return arama_metni in ', '.join(yuva_data.get('predator_canli_listesi', [])).lower()
+    return arama_metni in ' '.join(str(v) for v in yuva_data.values()).lower()
+
+
+def grup_istatistigi_hesapla(df_grup):
+    """Karşılaştırma ve simülasyon tablolarında gösterilen özet ölçümleri metin olarak döner."""
+    tanimlar = olcum_tanimlari()
+    if df_grup.empty: return {k: "N/A" for k in ISTATISTIK_KRITERLERI + [f"Ortalama {t['etiket']}" for t in tanimlar.values()]}
+    stats = {}; toplam_yuva = len(df_grup); stats["Toplam Yuva Sayısı"] = str(toplam_yuva)
+    predasyonlu_sayisi = int(df_grup['predasyon_durumu'].isin(['tam', 'yari', 'kismi']).sum()); stats["Predasyonlu Yuva Sayısı"] = str(predasyonlu_sayisi)
+    predasyon_orani = (predasyonlu_sayisi / toplam_yuva) * 100 if toplam_yuva > 0 else 0; stats["Predasyon Oranı (%)"] = f"{predasyon_orani:.2f}"
+    for ad, ortalama in olcumleri_hesapla(df_grup, tanimlar=tanimlar).mean().items(): stats[f"Ortalama {tanimlar[ad]['etiket']}"] = f"{ortalama:.2f}" if pd.notna(ortalama) else "N/A"
+    return stats
+
+
+def ozet_istatistikleri(df):
+    """İstatistiksel özet raporunun (etiket, değer, renk) satırlarını hesaplar; kaydedicili yuvalar için sıcaklık özetleri de eklenir."""
+    toplam_yuva = len(df); satirlar = [("Toplam Kayıtlı Yuva Sayısı:", f"{toplam_yuva}", "navy")]
+    tanimlar = olcum_tanimlari(); olcumler = olcumleri_hesapla(df, tanimlar=tanimlar)
+    for ad in olcumler.columns:
+        degerler = olcumler[ad].dropna()
+        satirlar.append((f"Ortalama {tanimlar[ad]['etiket']}:", f"{degerler.mean():.2f} ({len(degerler)} yuva)" if len(degerler) else "N/A", "green"))
+    ortalama_kulucka = pd.to_numeric(df['kulucka_suresi_gun'], errors='coerce').dropna().mean()
+    satirlar.append(("Ortalama Kuluçka Süresi (Gün):", f"{ortalama_kulucka:.1f}" if pd.notna(ortalama_kulucka) else "N/A", "navy"))
+    predasyonlu_sayisi = int(df['predasyon_durumu'].isin(['tam', 'yari', 'kismi']).sum())
+    predasyon_orani = (predasyonlu_sayisi / toplam_yuva) * 100 if toplam_yuva > 0 else 0
+    satirlar.append(("Predasyona Uğrayan Yuva Sayısı/Oranı:", f"{predasyonlu_sayisi} yuva (% {predasyon_orani:.2f})", "red"))
+    kaydedicili = df[df['orta_ucte_bir_sicaklik'].notna()] if 'orta_ucte_bir_sicaklik' in df.columns else df.iloc[0:0]
+    if not kaydedicili.empty:
+        satirlar.append(("Ortalama Orta Üçte Bir Sıcaklığı:", f"{kaydedicili['orta_ucte_bir_sicaklik'].mean():.2f} °C ({len(kaydedicili)} yuva)", "navy"))
+        satirlar.append(("Ortalama Derece-Gün:", f"{kaydedicili['derece_gun'].mean():.1f}", "navy"))
+        satirlar.append(("Tahmini Dişi Oranı:", f"% {kaydedicili['tahmini_disi_orani_yuzde'].mean():.1f}", "green"))
+    return satirlar
+
+
+def ozet_istatistiklerini_getir():
+    """Özet istatistik satırlarını çıktı önbelleğinden ya da (veri veya sıcaklık deposu değiştiyse) yeniden hesaplayarak döner."""
+    def hesapla(hedef):
+        df = yuvalari_dataframe_yap(sicaklik_ozetleriyle=True)
+        with open(hedef, 'w', encoding='utf-8') as f: json.dump(ozet_istatistikleri(df) if not df.empty else [], f, ensure_ascii=False)
+    anahtar = cikti_onbellegi.anahtar("istatistik_ozeti", veri=veri_parmak_izi(), sicaklik=SicaklikDeposu().uzunluk(), olcumler=olcum_imzasi())
+    with open(cikti_onbellegi.uret(anahtar, ".json", hesapla), encoding='utf-8') as f: return [tuple(satir) for satir in json.load(f)]
+
+
+def konum_bazli_simulasyon(df, referans_koordinat, mesafe_metre, yeni_durum):
+    """
+    Referans noktasına verilen mesafedeki yuvaların predasyon durumunu değiştirir.
+    Yeni bir DataFrame ve etkilenen yuva sayısını döner; başarı yüzdesi yeniden hesaplanır.
+    """
+    df_simule = df.copy(); etkilenen_yuva_sayisi = 0
+    df_geo = df_simule[df_simule['lat'].notna() & df_simule['lon'].notna()]
+    if not df_geo.empty:
+        gdf_utm = gpd.GeoSeries(gpd.points_from_xy(df_geo.lon, df_geo.lat), index=df_geo.index, crs="EPSG:4326").to_crs("EPSG:32635")
+        etkilenen_indexler = df_geo.index[gdf_utm.within(_tampon_bolge_utm(referans_koordinat, mesafe_metre)).to_numpy()]
+        etkilenen_yuva_sayisi = len(etkilenen_indexler)
+        df_simule.loc[etkilenen_indexler, 'predasyon_durumu'] = yeni_durum
+    return basari_yuzdesini_hesapla(df_simule), etkilenen_yuva_sayisi
+
+
+def basari_yuzdesini_hesapla(df):
+    """'yuva_basarisi' ölçümünden 'yuva_basarisi_yuzde' sütununu yeniden hesaplar (toplam yumurta yoksa 0 yazılır)."""
+    df['yuva_basarisi_yuzde'] = olcumleri_hesapla(df, ["yuva_basarisi"])["yuva_basarisi"].fillna(0).round(2)
+    return df
+
+
+def veritabanini_yedekle(yedekler_klasoru=None):
+    """Veritabanını zaman damgalı bir dosyaya kopyalar; yedek dosyasının yolunu (yoksa None) döner."""
+    yedekler_klasoru = yedekler_klasoru or os.path.join(SCRIPT_DIR, "backups")
+    os.makedirs(yedekler_klasoru, exist_ok=True)
+    tarih_damgasi = datetime.now().strftime("%Y-%m-%d_%H-%M-%S"); yedek_dosya_yolu = os.path.join(yedekler_klasoru, f"caretta_final_{tarih_damgasi}.db")
+    kaynak_yolu = canli_veritabani_yolu()  # Bir yedek incelenirken de canlı veritabanı yedeklenir
+    if not os.path.exists(kaynak_yolu): return None
+    shutil.copy2(kaynak_yolu, yedek_dosya_yolu); logging.info(f"Veritabanı yedeklendi: {yedek_dosya_yolu}")
+    if arsiv_sayisi := _arsivleri_yedekle(yedekler_klasoru, kaynak_yolu): logging.info(f"{arsiv_sayisi} değişmiş sezon arşivi yedeklendi.")
+    _sicaklik_deposunu_yedekle(kaynak_yolu, yedek_dosya_yolu)
+    return yedek_dosya_yolu
+
+
+def _sicaklik_deposunu_yedekle(db_yolu, yedek_dosya_yolu):
+    """
+    Sıcaklık deposunu yedeğin kendi '<yedek>_sicaklik' klasörüne alır. Depo sıkıştırmalar arasında yalnızca
+    sona eklenerek büyüdüğünden veritabanından sonra kopyalanan depo yedekteki tüm serileri içerir.
+    Önceki bir yedektekiyle aynı (boyut, değişiklik zamanı) olan dosyalar kopyalanmaz, sabit bağlanır.
+    """
+    kaynak = SicaklikDeposu(db_yolu)
+    if kaynak.uzunluk() == 0: return
+    hedef = SicaklikDeposu(yedek_dosya_yolu); os.makedirs(hedef.klasor, exist_ok=True)
+    onceki_klasorler = [SicaklikDeposu(yol).klasor for _, yol in yedekleri_listele(os.path.dirname(yedek_dosya_yolu)) if yol != yedek_dosya_yolu]
+    for kaynak_yolu in (kaynak.zaman_yolu, kaynak.sicaklik_yolu):
+        ad = os.path.basename(kaynak_yolu); hedef_yolu = os.path.join(hedef.klasor, ad); bilgi = os.stat(kaynak_yolu)
+        ayni = next((yol for yol in (os.path.join(k, ad) for k in onceki_klasorler)
+                     if os.path.exists(yol) and (os.stat(yol).st_size, int(os.stat(yol).st_mtime)) == (bilgi.st_size, int(bilgi.st_mtime))), None)
+        try:
+            if ayni: os.link(ayni, hedef_yolu); continue
+        except OSError: pass
+        shutil.copy2(kaynak_yolu, hedef_yolu)
+
+
+# --- Kıyı Hattı Boyunca Doğrusal Referanslama ---
+# Sabit lejantlar (dağ … bitiş) sırasıyla kıyı hattını oluşturur. Her yuva bu hatta bir kez
+# izdüşürülür; "dağ"dan itibaren metre cinsinden konumu (kilometraj) ve iki lejant arasındaki
+# segment numarası 'kiyi_indeksi' tablosunda saklanır ve değişiklik akışıyla güncel tutulur.
+# Bölge sorguları sıralı kilometraj üzerinde ikili arama, segment özetleri bincount olur.
+
+def _indeks_tablolarini_kur(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS indeks_durumu (indeks TEXT NOT NULL, anahtar TEXT NOT NULL, deger TEXT, PRIMARY KEY (indeks, anahtar))")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS kiyi_indeksi (
+        id INTEGER NOT NULL, yil INTEGER NOT NULL, mesafe_m REAL NOT NULL, segment INTEGER NOT NULL,
+        dik_uzaklik_m REAL NOT NULL, PRIMARY KEY (id, yil)
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_kiyi_indeksi_mesafe ON kiyi_indeksi (mesafe_m)")
+    conn.execute("CREATE TABLE IF NOT EXISTS satir_ozeti (id INTEGER NOT NULL, yil INTEGER NOT NULL, ozet INTEGER NOT NULL, PRIMARY KEY (id, yil))")
+
+
+def _indeks_durumu(conn, indeks, anahtar, varsayilan=None):
+    satir = conn.execute("SELECT deger FROM indeks_durumu WHERE indeks = ? AND anahtar = ?", (indeks, anahtar)).fetchone()
+    return satir[0] if satir else varsayilan
+
+
+def _indeks_durumu_yaz(conn, indeks, **degerler):
+    conn.executemany("INSERT OR REPLACE INTO indeks_durumu VALUES (?, ?, ?)", [(indeks, k, str(v)) for k, v in degerler.items()])
+
+
+def _degisen_satirlari_getir(conn, sorgu, anahtarlar):
+    """'_degisen' geçici tablosuna yazılan (id, yil) anahtarları için verilen sorguyu çalıştırır."""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS _degisen (id INTEGER, yil INTEGER)"); conn.execute("DELETE FROM _degisen")
+    conn.executemany("INSERT INTO _degisen VALUES (?, ?)", anahtarlar)
+    return conn.execute(sorgu).fetchall()
+
+
+class KiyiHatti:
+    """Sabit lejant noktalarından oluşan kıyı hattı; noktaları UTM 35N'de hatta vektörel olarak izdüşürür."""
+
+    PARCA_BOYUTU = 100_000
+
+    def __init__(self, sabit_lejantlar=None):
+        sabit_lejantlar = sabit_lejantlar if sabit_lejantlar is not None else load_config().get("sabit_lejantlar", {})
+        if len(sabit_lejantlar) < 2: raise ValueError("Kıyı hattı için en az iki sabit lejant noktası gerekir.")
+        self.isimler = list(sabit_lejantlar.keys()); self.imza = json.dumps(list(sabit_lejantlar.items()), ensure_ascii=False)
+        koordinatlar = np.array(list(sabit_lejantlar.values()), dtype=float)
+        self.noktalar = self._utm(koordinatlar[:, 0], koordinatlar[:, 1])
+        self.farklar = np.diff(self.noktalar, axis=0); self.uzunluklar = np.hypot(self.farklar[:, 0], self.farklar[:, 1])
+        self.kilometraj = np.concatenate([[0.0], np.cumsum(self.uzunluklar)])
+
+    @staticmethod
+    def _utm(lat, lon):
+        noktalar = gpd.GeoSeries(gpd.points_from_xy(lon, lat), crs="EPSG:4326").to_crs("EPSG:32635")
+        return np.column_stack([noktalar.x.to_numpy(), noktalar.y.to_numpy()])
+
+    def segment_adi(self, segment):
+        return f"{self.isimler[segment].title()} → {self.isimler[segment + 1].title()}"
+
+    def konum(self, deger):
+        """Lejant adını (arayüzdeki .title() hali dahil) veya metre değerini kilometraja çevirir."""
+        if not isinstance(deger, str): return float(deger)
+        for i, isim in enumerate(self.isimler):
+            if deger in (isim, isim.title()): return float(self.kilometraj[i])
+        raise ValueError(f"Bilinmeyen lejant: {deger}")
+
+    def izdusur(self, lat, lon):
+        """Her nokta için (kilometraj_m, segment, hatta_dik_uzaklik_m) dizilerini döner."""
+        lat = np.asarray(lat, dtype=float); lon = np.asarray(lon, dtype=float)
+        mesafe = np.empty(len(lat)); segment = np.empty(len(lat), dtype=np.int64); dik = np.empty(len(lat))
+        baslangiclar = self.noktalar[:-1]; uzunluk_kare = np.where(self.uzunluklar > 0, self.uzunluklar ** 2, 1.0)
+        for bas in range(0, len(lat), self.PARCA_BOYUTU):
+            son = bas + self.PARCA_BOYUTU; p = self._utm(lat[bas:son], lon[bas:son])
+            goreli = p[:, None, :] - baslangiclar[None, :, :]
+            t = np.clip((goreli * self.farklar[None, :, :]).sum(axis=2) / uzunluk_kare, 0.0, 1.0)
+            uzaklik_kare = ((goreli - t[:, :, None] * self.farklar[None, :, :]) ** 2).sum(axis=2)
+            en_yakin = uzaklik_kare.argmin(axis=1); satir = np.arange(len(p))
+            segment[bas:son] = en_yakin; dik[bas:son] = np.sqrt(uzaklik_kare[satir, en_yakin])
+            mesafe[bas:son] = self.kilometraj[en_yakin] + t[satir, en_yakin] * self.uzunluklar[en_yakin]
+        return mesafe, segment, dik
+
+
+@performans.olculen("kiyi.indeks_guncelle")
+def kiyi_indeksini_guncelle(conn=None, hat=None):
+    """
+    'kiyi_indeksi' tablosunu veri sürümüne getirir. Lejantlar değiştiyse ya da indeks hiç
+    kurulmadıysa tüm yuvalar izdüşürülür; aksi halde sadece değişiklik akışındaki yuvalar.
+    İzdüşürülen yuva sayısını döner.
+    """
+    kendi_baglantimiz = conn is None
+    if kendi_baglantimiz: conn = get_connection()
+    try:
+        hat = hat or KiyiHatti()
+        with conn:
+            _indeks_tablolarini_kur(conn)
+            islenen_seq = _indeks_durumu(conn, 'kiyi', 'islenen_seq'); surum = veri_surumu(conn)
+            if islenen_seq is None or _indeks_durumu(conn, 'kiyi', 'hat_imzasi') != hat.imza or surum < int(islenen_seq):
+                conn.execute("DELETE FROM kiyi_indeksi")
+                satirlar = conn.execute("SELECT id, yil, lat, lon FROM tum_yuvalar WHERE lat IS NOT NULL AND lon IS NOT NULL").fetchall()
+            elif surum > int(islenen_seq):
+                _, degisenler = degisiklikleri_getir(int(islenen_seq), conn)
+                conn.executemany("DELETE FROM kiyi_indeksi WHERE id = ? AND yil = ?", degisenler)
+                satirlar = _degisen_satirlari_getir(conn, "SELECT id, yil, lat, lon FROM tum_yuvalar WHERE (id, yil) IN (SELECT id, yil FROM _degisen) "
+                                                          "AND lat IS NOT NULL AND lon IS NOT NULL", degisenler)
+            else: return 0
+            if satirlar:
+                dizi = np.array([s[2:] for s in satirlar], dtype=float); mesafe, segment, dik = hat.izdusur(dizi[:, 0], dizi[:, 1])
+                conn.executemany("INSERT OR REPLACE INTO kiyi_indeksi VALUES (?, ?, ?, ?, ?)",
+                                 zip([s[0] for s in satirlar], [s[1] for s in satirlar], mesafe.round(2).tolist(), segment.tolist(), dik.round(2).tolist()))
+            _indeks_durumu_yaz(conn, 'kiyi', islenen_seq=surum, hat_imzasi=hat.imza)
+            performans.satir_say(len(satirlar)); logging.info(f"Kıyı indeksi güncellendi: {len(satirlar)} yuva izdüşürüldü.")
+            return len(satirlar)
+    finally:
+        if kendi_baglantimiz: conn.close()
+
+
+class KiyiIndeksi:
+    """
+    'kiyi_indeksi' tablosunun kilometraja göre sıralı bellek içi kopyası.
+    Veri sürümü değişmedikçe veritabanına tekrar gidilmez.
+    """
+
+    def __init__(self):
+        self.hat = None; self.surum = None; self.df = pd.DataFrame(); self.mesafe = np.empty(0)
+
+    def gecersiz_kil(self):
+        self.surum = None
+
+    @performans.olculen("kiyi.indeks_yukle")
+    def guncelle(self):
+        hat = KiyiHatti(); conn = get_connection()
+        try:
+            kiyi_indeksini_guncelle(conn, hat); surum = veri_surumu(conn)
+            if self.surum != surum or self.hat is None or self.hat.imza != hat.imza:
+                self.df = pd.read_sql_query(
+                    "SELECT k.id, k.yil, k.mesafe_m, k.segment, k.dik_uzaklik_m, y.predasyon_durumu, y.yuva_basarisi_yuzde "
+                    "FROM kiyi_indeksi k JOIN tum_yuvalar y ON y.id = k.id AND y.yil = k.yil ORDER BY k.mesafe_m", conn)
+                self.mesafe = self.df['mesafe_m'].to_numpy(); self.hat = hat; self.surum = surum
+                performans.satir_say(len(self.df))
+        finally:
+            conn.close()
+        return self
+
+    def aralik(self, baslangic, bitis, yil=None):
+        """İki lejant (veya metre değeri) arasındaki yuvaları kilometraj sırasıyla döner."""
+        a, b = sorted((self.hat.konum(baslangic), self.hat.konum(bitis)))
+        sonuc = self.df.iloc[np.searchsorted(self.mesafe, a, side='left'):np.searchsorted(self.mesafe, b, side='right')]
+        return sonuc if yil is None else sonuc[sonuc['yil'] == yil]
+
+    def segment_ozeti(self, yil=None):
+        """Her lejant arası segment için yoğunluk, predasyon ve başarı özetini döner."""
+        df = self.df if yil is None else self.df[self.df['yil'] == yil]
+        segment_sayisi = len(self.hat.uzunluklar); segment = df['segment'].to_numpy()
+        yuva_sayisi = np.bincount(segment, minlength=segment_sayisi)
+        predasyonlu = np.bincount(segment, weights=df['predasyon_durumu'].isin(['tam', 'yari', 'kismi']).to_numpy(dtype=float), minlength=segment_sayisi)
+        basari = pd.to_numeric(df['yuva_basarisi_yuzde'], errors='coerce').to_numpy(dtype=float); basari_var = ~np.isnan(basari)
+        basari_toplam = np.bincount(segment[basari_var], weights=basari[basari_var], minlength=segment_sayisi)
+        basari_sayisi = np.bincount(segment[basari_var], minlength=segment_sayisi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.DataFrame({
+                "Segment": [self.hat.segment_adi(i) for i in range(segment_sayisi)],
+                "Başlangıç (m)": self.hat.kilometraj[:-1].round(0), "Uzunluk (m)": self.hat.uzunluklar.round(0),
+                "Yuva Sayısı": yuva_sayisi, "Yoğunluk (yuva/100 m)": np.where(self.hat.uzunluklar > 0, yuva_sayisi * 100 / self.hat.uzunluklar, 0).round(2),
+                "Predasyonlu": predasyonlu.astype(int), "Predasyon Oranı (%)": np.where(yuva_sayisi > 0, predasyonlu * 100 / yuva_sayisi, 0).round(2),
+                "Ort. Başarı (%)": np.where(basari_sayisi > 0, basari_toplam / basari_sayisi, np.nan).round(2),
+            })
+
+
+# --- Sezon Fenolojisi (Yumurtlama ve Çıkış Eğrileri) ---
+# Her sezon için 1 Ocak'tan itibaren gün indeksli bir tamsayı dizisi tutulur. Satırları sırasıyla
+# günlük yumurtlama, ilk çıkış ve yavru çıkışı sayıları ile açık yuvaların beklenen çıkış penceresinin
+# fark dizisidir (kümülatif toplamı o gün penceresi açık yuva sayısını verir). Her yuvanın katkısı
+# küçük bir demette saklanır: değişiklik günlüğünden gelen her (id, yil) için eski katkı çıkarılıp
+# yenisi eklenir, yani güncelleme maliyeti sezon boyutuyla değil değişen yuva sayısıyla orantılıdır.
+# Açık yuvalar ayrıca pencerelerinin başladığı güne göre kovalara konur; "bu hafta çıkacaklar"
+# sorgusu yalnızca sorgu aralığına değebilecek birkaç kovayı okur.
+
+FENOLOJI_GUN_SAYISI = 400  # Geç yuvaların ertesi yıla taşan pencereleri için 365'in üzerinde pay bırakılır
+FENOLOJI_SERILERI = ("yumurtlama", "cikis", "yavru", "beklenen")
+FENOLOJI_KULUCKA_ARALIGI = (45, 65)  # gün; çıkış penceresi yuva tarihinden bu kadar sonrasıdır
+FENOLOJI_SUTUNLARI = ['id', 'yil', 'yuva_tarihi', 'ilk_yavru_cikis_tarihi', 'kulucka_suresi_gun', 'predasyon_durumu',
+                      'yavru_cikis_gun_1', 'yavru_cikis_gun_2', 'yavru_cikis_gun_3']
+
+
+def _fenoloji_katkilari(df, kulucka_araligi=FENOLOJI_KULUCKA_ARALIGI):
+    """
+    Yuvaların dizilere katkısını (id, yil, yumurtlama, cikis, yavru_1..3, pencere) tamsayı sütunları olarak döner.
+    Günler sezon yılının 1 Ocak'ına göre indekstir; olmayan ya da aralık dışı gün -1'dir. İlk çıkış tarihi yoksa
+    kuluçka süresinden hesaplanır; ikisi de yoksa ve yuva tam predasyona uğramadıysa yuva açıktır ve
+    'pencere' beklenen çıkış penceresinin ilk günüdür.
+    """
+    yil = df['yil'].to_numpy(dtype=np.int64); yil_basi = (yil - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+    yuva_tarihi = pd.to_datetime(df['yuva_tarihi'], errors='coerce')
+    cikis_tarihi = pd.to_datetime(df['ilk_yavru_cikis_tarihi'], errors='coerce').fillna(
+        yuva_tarihi + pd.to_timedelta(pd.to_numeric(df['kulucka_suresi_gun'], errors='coerce'), unit='D'))
+
+    def gun(tarihler):
+        g = (tarihler.to_numpy(dtype='datetime64[D]') - yil_basi) / np.timedelta64(1, 'D')
+        return np.where(np.isnan(g) | (g < 0) | (g >= FENOLOJI_GUN_SAYISI), -1, np.nan_to_num(g)).astype(np.int64)
+    yumurtlama = gun(yuva_tarihi); cikis = gun(cikis_tarihi)
+    acik = (cikis < 0) & cikis_tarihi.isna().to_numpy() & (yumurtlama >= 0) & (df['predasyon_durumu'].to_numpy(dtype=object) != 'tam')
+    pencere = np.where(acik & (yumurtlama + kulucka_araligi[0] < FENOLOJI_GUN_SAYISI), yumurtlama + kulucka_araligi[0], -1)
+    sonuc = pd.DataFrame({'id': df['id'].to_numpy(dtype=np.int64), 'yil': yil, 'yumurtlama': yumurtlama, 'cikis': cikis}, index=df.index)
+    for k in (1, 2, 3): sonuc[f'yavru_{k}'] = np.where(cikis >= 0, pd.to_numeric(df[f'yavru_cikis_gun_{k}'], errors='coerce').fillna(0).clip(lower=0), 0).astype(np.int64)
+    sonuc['pencere'] = pencere
+    return sonuc
+
+
+class FenolojiIndeksi:
+    """
+    Sezon başına gün indeksli yumurtlama/çıkış dizileri. İlk yüklemede tüm sezonlar vektörel olarak kurulur;
+    sonraki güncellemelerde yalnızca değişiklik günlüğündeki yuvaların katkıları değiştirilir.
+    """
+
+    def __init__(self, kulucka_araligi=FENOLOJI_KULUCKA_ARALIGI):
+        self.kulucka_araligi = kulucka_araligi; self.pencere_uzunlugu = kulucka_araligi[1] - kulucka_araligi[0] + 1
+        self.son_seq = None; self._diziler = {}; self._katkilar = {}; self._kovalar = {}
+
+    def gecersiz_kil(self):
+        self.son_seq = None
+
+    def _dizi(self, yil):
+        if yil not in self._diziler: self._diziler[yil] = np.zeros((len(FENOLOJI_SERILERI), FENOLOJI_GUN_SAYISI + 1), dtype=np.int64)
+        return self._diziler[yil]
+
+    def _uygula(self, anahtar, katki, isaret):
+        yil, yumurtlama, cikis, yavru_1, yavru_2, yavru_3, pencere = katki; dizi = self._dizi(yil)
+        if yumurtlama >= 0: dizi[0, yumurtlama] += isaret
+        if cikis >= 0:
+            dizi[1, cikis] += isaret
+            for k, adet in enumerate((yavru_1, yavru_2, yavru_3)):
+                if adet and cikis + k < FENOLOJI_GUN_SAYISI: dizi[2, cikis + k] += isaret * adet
+        if pencere >= 0:
+            dizi[3, pencere] += isaret; dizi[3, min(pencere + self.pencere_uzunlugu, FENOLOJI_GUN_SAYISI)] -= isaret
+            kova = self._kovalar.setdefault((yil, pencere), set())
+            if isaret > 0: kova.add(anahtar)
+            else: kova.discard(anahtar)
+
+    def _hepsini_kur(self, katkilar):
+        self._diziler = {}; self._kovalar = {}
+        for yil, grup in katkilar.groupby('yil'):
+            dizi = self._dizi(int(yil)); g = {s: grup[s].to_numpy() for s in grup.columns}
+            np.add.at(dizi[0], g['yumurtlama'][g['yumurtlama'] >= 0], 1); np.add.at(dizi[1], g['cikis'][g['cikis'] >= 0], 1)
+            for k in range(3):
+                gunler = g['cikis'] + k; secili = (g['cikis'] >= 0) & (g[f'yavru_{k + 1}'] > 0) & (gunler < FENOLOJI_GUN_SAYISI)
+                np.add.at(dizi[2], gunler[secili], g[f'yavru_{k + 1}'][secili])
+            pencere = g['pencere'][g['pencere'] >= 0]
+            np.add.at(dizi[3], pencere, 1); np.add.at(dizi[3], np.minimum(pencere + self.pencere_uzunlugu, FENOLOJI_GUN_SAYISI), -1)
+            for gun, idler in grup[grup['pencere'] >= 0].groupby('pencere')['id']: self._kovalar[(int(yil), int(gun))] = {(i, int(yil)) for i in idler.tolist()}
+        self._katkilar = dict(zip(zip(katkilar['id'].tolist(), katkilar['yil'].tolist()), katkilar.drop(columns='id').itertuples(index=False, name=None)))
+
+    @performans.olculen("fenoloji.guncelle")
+    def guncelle(self):
+        with contextlib.closing(get_connection()) as conn:
+            surum = veri_surumu(conn)
+            if self.son_seq is None or surum < self.son_seq:
+                df = pd.read_sql_query(f"SELECT {', '.join(FENOLOJI_SUTUNLARI)} FROM tum_yuvalar", conn)
+                self._hepsini_kur(_fenoloji_katkilari(df, self.kulucka_araligi)); performans.satir_say(len(df))
+            elif surum > self.son_seq:
+                _, degisenler = degisiklikleri_getir(self.son_seq, conn)
+                satirlar = _degisen_satirlari_getir(conn, f"SELECT {', '.join('y.' + s for s in FENOLOJI_SUTUNLARI)} FROM tum_yuvalar y "
+                                                          "JOIN _degisen d ON d.id = y.id AND d.yil = y.yil", list(degisenler))
+                for anahtar in degisenler:
+                    if (eski := self._katkilar.pop(anahtar, None)) is not None: self._uygula(anahtar, eski, -1)
+                yeni = _fenoloji_katkilari(pd.DataFrame(satirlar, columns=FENOLOJI_SUTUNLARI), self.kulucka_araligi)
+                for katki in yeni.itertuples(index=False, name=None):
+                    anahtar = katki[:2]; self._katkilar[anahtar] = katki[1:]; self._uygula(anahtar, katki[1:], +1)
+                performans.satir_say(len(degisenler))
+            self.son_seq = surum
+        return self
+
+    def yillar(self):
+        return sorted(yil for yil, dizi in self._diziler.items() if dizi.any())
+
+    def egriler(self, yil):
+        """Sezonun günlük ve kümülatif eğrilerini tarih indeksli DataFrame olarak döner (ilk ve son etkin gün arasında)."""
+        dizi = self._diziler.get(yil, np.zeros((len(FENOLOJI_SERILERI), FENOLOJI_GUN_SAYISI + 1), dtype=np.int64))[:, :FENOLOJI_GUN_SAYISI]
+        beklenen = np.cumsum(dizi[3])
+        df = pd.DataFrame({"yumurtlama": dizi[0], "kumulatif_yumurtlama": np.cumsum(dizi[0]), "cikis": dizi[1], "kumulatif_cikis": np.cumsum(dizi[1]),
+                           "yavru": dizi[2], "kumulatif_yavru": np.cumsum(dizi[2]), "beklenen_acik": beklenen},
+                          index=pd.date_range(f"{yil}-01-01", periods=FENOLOJI_GUN_SAYISI, freq="D", name="tarih"))
+        etkin = np.flatnonzero(dizi[:3].any(axis=0) | (beklenen > 0))
+        return df.iloc[etkin[0]:etkin[-1] + 1] if len(etkin) else df.iloc[0:0]
+
+    def cikmasi_beklenenler(self, baslangic=None, gun=7):
+        """
+        [baslangic, baslangic + gun) aralığına beklenen çıkış penceresi değen açık yuvaları, pencere başlangıcına
+        göre sıralı döner. Yalnızca ilgili kovalar okunur; sezon boyutundan bağımsızdır.
+        """
+        baslangic = np.datetime64(baslangic or datetime.now().date(), 'D'); yil = int(str(baslangic)[:4]); satirlar = []
+        for sezon in (yil, yil - 1):  # Önceki sezonun 365. günden sonraya taşan pencereleri
+            sezon_basi = np.datetime64(f"{sezon:04d}-01-01", 'D'); t = int((baslangic - sezon_basi).astype(int))
+            for pencere in range(max(0, t - self.pencere_uzunlugu + 1), min(t + gun, FENOLOJI_GUN_SAYISI)):
+                for yuva_id, yuva_yili in self._kovalar.get((sezon, pencere), ()):
+                    yumurtlama = pencere - self.kulucka_araligi[0]
+                    satirlar.append((yuva_id, yuva_yili, str(sezon_basi + yumurtlama), t - yumurtlama, str(sezon_basi + pencere),
+                                     str(sezon_basi + pencere + self.pencere_uzunlugu - 1)))
+        return pd.DataFrame(sorted(satirlar, key=lambda s: (s[4], s[1], s[0])),
+                            columns=["id", "yil", "yuva_tarihi", "yuva_yasi_gun", "pencere_baslangici", "pencere_bitisi"])
+
+
+# --- Sıcaklık Kaydedici Zaman Serisi Deposu ve Kuluçka Sıcaklık Motoru ---
+# Ölçümler veritabanının yanındaki '<db>_sicaklik' klasöründe iki sütunlu ham dosyada tutulur:
+# zaman (uint32, 2000-01-01'den itibaren dakika) ve sıcaklık (int16, santi-derece). Ölçüm başına
+# 6 bayt yer kaplar ve doğrudan np.memmap ile açılır. Dosyalar yalnızca sona ekleme ile büyür;
+# her (id, yil) serisinin konumu 'sicaklik_serileri' tablosundadır. CSV parçaları okundukça
+# diske yazılır, yuva başına birleştirilmiş seri sona eklenir. Hiçbir serinin göstermediği ölçümler
+# deponun yarısına ulaşınca depo sıkıştırılır; bu yüzden her yedek deponun kendi kopyasını alır.
+
+SICAKLIK_DEVRI = np.datetime64('2000-01-01T00:00', 'm')
+SICAKLIK_ZAMAN_SUTUNLARI = ['zaman', 'tarih_saat', 'tarih', 'timestamp', 'datetime', 'date_time', 'date']
+SICAKLIK_DEGER_SUTUNLARI = ['sicaklik', 'sicaklik_c', 'temperature', 'temp', 'deger']
+DERECE_GUN_ESIGI = 24.0          # °C, gelişim için alt eşik
+PIVOT_SICAKLIK = 29.0            # °C, Caretta caretta için %50 dişi üreten sıcaklık
+CINSIYET_GECIS_OLCEGI = 0.5      # °C, lojistik eğrinin ölçeği (%5-%95 geçiş aralığı ≈ 3 °C)
+VARSAYILAN_KULUCKA_GUN = 55
+AZAMI_ORNEK_ARALIGI_DK = 180     # Kaydedici boşluklarının derece-güne tek ölçümle sayılmaması için
+SICAKLIK_SIKISTIRMA_ORANI = 0.5  # Ölü ölçümlerin depoya oranı buna ulaşınca depo yeniden yazılır
+# Dosya adından yuva kimliği: '12.csv', '12_2024.csv', 'yuva-12 2024.csv' (ad bütünüyle bu biçimde olmalı)
+SICAKLIK_DOSYA_ADI_DESENI = re.compile(r"(?:yuva|nest)?[_\-\s]*(\d+)(?:[_\-\s]+((?:19|20)\d{2}))?", re.IGNORECASE)
+
+
+def _sicaklik_tablolarini_kur(conn):
+    _indeks_tablolarini_kur(conn)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS sicaklik_serileri (
+        id INTEGER NOT NULL, yil INTEGER NOT NULL, baslangic INTEGER NOT NULL, adet INTEGER NOT NULL,
+        ilk_zaman TEXT, son_zaman TEXT, PRIMARY KEY (id, yil)
+    )""")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS sicaklik_ozetleri (
+        id INTEGER NOT NULL, yil INTEGER NOT NULL, derece_gun REAL, ortalama_kulucka_sicakligi REAL,
+        orta_ucte_bir_sicaklik REAL, tahmini_disi_orani_yuzde REAL, sicaklik_ornek_sayisi INTEGER,
+        PRIMARY KEY (id, yil)
+    )""")
+
+
+class SicaklikDeposu:
+    """Sıcaklık ölçümlerinin sütunlu, sabit genişlikli ve yalnızca sona eklenen disk deposu."""
+
+    def __init__(self, db_yolu=None):
+        if db_yolu is None: db_yolu = _ANLIK_GORUNTULER[DB_PATH][0] if DB_PATH in _ANLIK_GORUNTULER else DB_PATH  # Yedek incelenirken yedeğin deposu
+        self.klasor = os.path.splitext(db_yolu)[0] + "_sicaklik"
+        self.zaman_yolu = os.path.join(self.klasor, "zaman.u32"); self.sicaklik_yolu = os.path.join(self.klasor, "sicaklik.i16")
+
+    def uzunluk(self):
+        if not os.path.exists(self.zaman_yolu): return 0
+        return min(os.path.getsize(self.zaman_yolu) // 4, os.path.getsize(self.sicaklik_yolu) // 2)
+
+    def oku(self):
+        """(zaman, sicaklik) dizilerini bellek eşlemeli olarak döner."""
+        uzunluk = self.uzunluk()
+        if uzunluk == 0: return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.int16)
+        return (np.memmap(self.zaman_yolu, dtype=np.uint32, mode='r', shape=(uzunluk,)),
+                np.memmap(self.sicaklik_yolu, dtype=np.int16, mode='r', shape=(uzunluk,)))
+
+    def ekle(self, seriler):
+        """[(zaman, sicaklik), ...] serilerini sona yazar ve her birinin başlangıç konumunu döner."""
+        os.makedirs(self.klasor, exist_ok=True); uzunluk = self.uzunluk()
+        for yol, boyut in ((self.zaman_yolu, 4), (self.sicaklik_yolu, 2)):
+            if os.path.exists(yol) and os.path.getsize(yol) != uzunluk * boyut:
+                with open(yol, 'r+b') as f: f.truncate(uzunluk * boyut)  # Yarım kalmış bir yazmanın artığı
+        baslangiclar = []
+        with open(self.zaman_yolu, 'ab') as fz, open(self.sicaklik_yolu, 'ab') as fs:
+            for zaman, sicaklik in seriler:
+                baslangiclar.append(uzunluk); uzunluk += len(zaman)
+                fz.write(np.ascontiguousarray(zaman, dtype=np.uint32).tobytes()); fs.write(np.ascontiguousarray(sicaklik, dtype=np.int16).tobytes())
+            fz.flush(); fs.flush(); os.fsync(fz.fileno()); os.fsync(fs.fileno())
+        return baslangiclar
+
+    def sikistir(self, conn):
+        """
+        Hiçbir serinin göstermediği ölçümleri atarak depoyu yeniden yazar ve konumları günceller;
+        atılan ölçüm sayısını döner. Çağıranın transaction'ı içinde çalıştırılmalıdır. Verisi
+        depoda olmayan bir seri varsa (depo klasörü eksik taşınmış olabilir) dokunulmaz.
+        """
+        seriler = conn.execute("SELECT id, yil, baslangic, adet FROM sicaklik_serileri ORDER BY baslangic").fetchall()
+        zaman, sicaklik = self.oku(); uzunluk = len(zaman)
+        if any(bas + adet > uzunluk for _, _, bas, adet in seriler):
+            logging.warning("Sıcaklık deposunda verisi olmayan seriler var; depo sıkıştırılmadı."); return 0
+        atilan = uzunluk - sum(adet for *_, adet in seriler)
+        if atilan == 0: return 0
+        gecici_yollar = [self.zaman_yolu + ".yeni", self.sicaklik_yolu + ".yeni"]; yeni_konumlar = []; konum = 0
+        with open(gecici_yollar[0], 'wb') as fz, open(gecici_yollar[1], 'wb') as fs:
+            for yuva_id, yil, bas, adet in seriler:
+                fz.write(np.ascontiguousarray(zaman[bas:bas + adet]).tobytes()); fs.write(np.ascontiguousarray(sicaklik[bas:bas + adet]).tobytes())
+                yeni_konumlar.append((konum, yuva_id, yil)); konum += adet
+            fz.flush(); fs.flush(); os.fsync(fz.fileno()); os.fsync(fs.fileno())
+        del zaman, sicaklik
+        conn.executemany("UPDATE sicaklik_serileri SET baslangic = ? WHERE id = ? AND yil = ?", yeni_konumlar)
+        os.replace(gecici_yollar[0], self.zaman_yolu); os.replace(gecici_yollar[1], self.sicaklik_yolu)
+        logging.info(f"Sıcaklık deposu sıkıştırıldı: {atilan} ölçüm atıldı, {konum} ölçüm kaldı.")
+        return atilan
+
+
+def _dakikaya_cevir(tarihler):
+    """Tarih dizisini SICAKLIK_DEVRI'nden itibaren dakikaya çevirir; geçersiz tarihler NaN olur."""
+    tarihler = pd.to_datetime(pd.Series(tarihler), errors='coerce')
+    dakika = (tarihler.to_numpy().astype('datetime64[m]') - SICAKLIK_DEVRI).astype(np.int64).astype(float)
+    dakika[tarihler.isna().to_numpy()] = np.nan
+    return dakika
+
+
+def _sicaklik_parcasini_coz(parca, dosya_adi):
+    """Bir CSV parçasını (id, yil, dakika, santi-derece) sütunlu bir DataFrame'e çevirir."""
+    parca.columns = sutun_adlarini_normallestir(parca.columns)
+    zaman_sutunu = next((s for s in SICAKLIK_ZAMAN_SUTUNLARI if s in parca.columns), None)
+    deger_sutunu = next((s for s in SICAKLIK_DEGER_SUTUNLARI if s in parca.columns), None)
+    if zaman_sutunu is None or deger_sutunu is None: raise ValueError(f"'{dosya_adi}' içinde zaman veya sıcaklık sütunu bulunamadı.")
+    zaman = pd.to_datetime(parca[zaman_sutunu], errors='coerce', dayfirst=True)
+    deger = parca[deger_sutunu]
+    if not pd.api.types.is_numeric_dtype(deger): deger = deger.astype(str).str.replace(',', '.', regex=False)
+    deger = pd.to_numeric(deger, errors='coerce')
+    if 'id' in parca.columns: yuva_id = pd.to_numeric(parca['id'], errors='coerce')
+    else:
+        eslesme = SICAKLIK_DOSYA_ADI_DESENI.fullmatch(os.path.splitext(dosya_adi)[0].strip())
+        if eslesme is None: raise ValueError(f"'{dosya_adi}' için yuva kimliği bulunamadı (dosyada 'id' sütunu ya da '12_2024.csv' gibi bir ad gerekir).")
+        yuva_id = pd.Series(int(eslesme.group(1)), index=parca.index)
+        if eslesme.group(2) and 'yil' not in parca.columns: parca['yil'] = int(eslesme.group(2))
+    yil = pd.to_numeric(parca['yil'], errors='coerce') if 'yil' in parca.columns else zaman.dt.year
+    sonuc = pd.DataFrame({'id': yuva_id, 'yil': yil, 'dakika': _dakikaya_cevir(zaman), 'santi': (deger * 100).round()})
+    return sonuc[sonuc.notna().all(axis=1) & deger.between(-10, 60)].astype({'id': np.int64, 'yil': np.int64, 'dakika': np.int64, 'santi': np.int64})
+
+
+@performans.olculen("sicaklik.ice_aktar")
+def sicaklik_csv_ice_aktar(dosya_yollari, parca_boyutu=500_000):
+    """
+    Sıcaklık kaydedici CSV'lerini parça parça okuyup depoya ekler ve özetleri günceller.
+    Dosyada 'id' sütunu yoksa yuva kimliği (ve yılı) dosya adından alınır (örn. 12_2024.csv);
+    yıl verilmemişse ölçüm zamanından türetilir. Yuvanın mevcut ölçümleriyle birleştirilir,
+    aynı dakikadaki tekrarlarda son okunan değer kalır. Her parça okunur okunmaz depoya yazılır;
+    birleştirme yuva yuva yapıldığından bellekte en fazla bir parça ve bir yuvanın serisi bulunur.
+    """
+    try:
+        depo = SicaklikDeposu(); parca_konumlari = collections.defaultdict(list); okunan = 0
+        for yol in dosya_yollari:
+            with open(yol, 'r', encoding='utf-8-sig', errors='replace') as f: ilk_satir = f.readline()
+            ayrac = ';' if ilk_satir.count(';') > ilk_satir.count(',') else ','
+            for parca in pd.read_csv(yol, sep=ayrac, chunksize=parca_boyutu, encoding='utf-8-sig'):
+                cozulmus = _sicaklik_parcasini_coz(parca, os.path.basename(yol)); okunan += len(parca)
+                gruplar = list(cozulmus.groupby(['id', 'yil'], sort=False))
+                baslangiclar = depo.ekle((grup['dakika'].to_numpy(), grup['santi'].to_numpy()) for _, grup in gruplar)
+                for (anahtar, grup), bas in zip(gruplar, baslangiclar): parca_konumlari[anahtar].append((bas, len(grup)))
+        if not parca_konumlari: return 0, "Dosyalarda geçerli sıcaklık ölçümü bulunamadı."
+
+        conn = get_connection()
+        try:
+            with conn:
+                _sicaklik_tablolarini_kur(conn)
+                mevcut = {(s[0], s[1]): s[2:] for s in conn.execute("SELECT id, yil, baslangic, adet FROM sicaklik_serileri")}
+                depo_zaman, depo_sicaklik = depo.oku(); anahtarlar = list(parca_konumlari); seriler = []
+
+                def birlestirilmis_seriler():
+                    for anahtar in anahtarlar:
+                        konumlar = parca_konumlari[anahtar]
+                        if anahtar in mevcut and sum(mevcut[anahtar]) <= len(depo_zaman): konumlar = [mevcut[anahtar]] + konumlar
+                        zaman = np.concatenate([depo_zaman[bas:bas + adet] for bas, adet in konumlar]).astype(np.int64)
+                        sicaklik = np.concatenate([depo_sicaklik[bas:bas + adet] for bas, adet in konumlar])
+                        sira = np.argsort(zaman, kind='stable'); zaman = zaman[sira]; sicaklik = sicaklik[sira]
+                        son_deger = np.r_[zaman[1:] != zaman[:-1], True]; zaman = zaman[son_deger]
+                        seriler.append((len(zaman), int(zaman[0]), int(zaman[-1])))
+                        yield zaman, sicaklik[son_deger]
+                baslangiclar = depo.ekle(birlestirilmis_seriler())
+                del depo_zaman, depo_sicaklik
+                zaman_metni = lambda dakika: str(SICAKLIK_DEVRI + np.timedelta64(dakika, 'm')).replace('T', ' ')
+                conn.executemany("INSERT OR REPLACE INTO sicaklik_serileri VALUES (?, ?, ?, ?, ?, ?)",
+                                 [(int(a[0]), int(a[1]), bas, adet, zaman_metni(ilk), zaman_metni(son)) for a, bas, (adet, ilk, son) in zip(anahtarlar, baslangiclar, seriler)])
+                canli = conn.execute("SELECT COALESCE(SUM(adet), 0) FROM sicaklik_serileri").fetchone()[0]
+                if depo.uzunluk() - canli >= SICAKLIK_SIKISTIRMA_ORANI * depo.uzunluk(): depo.sikistir(conn)
+                _sicaklik_ozetlerini_yaz(conn, depo, anahtarlar)
+        finally:
+            conn.close()
+        eklenen = sum(adet for adet, _, _ in seriler)
+        mesaj = f"{len(anahtarlar)} yuva için {okunan} satır okundu; depoda {eklenen} ölçüm güncel."
+        logging.info(f"Sıcaklık aktarımı: {mesaj}")
+        return len(anahtarlar), mesaj
+    except Exception as e:
+        logging.error(f"Sıcaklık aktarım hatası: {e}", exc_info=True)
+        return 0, f"Sıcaklık aktarım hatası: {e}"
+
+
+def sicaklik_ozetlerini_hesapla(zaman, sicaklik, seriler):
+    """
+    Ardışık serilerin tümü için kuluçka sıcaklık özetlerini tek geçişte vektörel hesaplar.
+    'seriler' DataFrame'i baslangic, adet, kulucka_bas ve kulucka_bit (dakika, NaN olabilir)
+    sütunlarını içerir. Kuluçka penceresi bilinmiyorsa serinin tamamı kullanılır.
+    """
+    adet = seriler['adet'].to_numpy(dtype=np.int64); ofsetler = np.concatenate([[0], np.cumsum(adet)[:-1]])
+    konum = np.arange(adet.sum()) + np.repeat(seriler['baslangic'].to_numpy(dtype=np.int64) - ofsetler, adet)
+    z = np.asarray(zaman[konum], dtype=np.int64); t = np.asarray(sicaklik[konum], dtype=float) / 100
+    seri_sonu = np.zeros(len(z), dtype=bool); seri_sonu[ofsetler + adet - 1] = True
+    aralik = np.minimum(np.diff(z, append=z[-1] if len(z) else 0), AZAMI_ORNEK_ARALIGI_DK); aralik[seri_sonu] = 0
+
+    ilk = z[ofsetler]; son = z[ofsetler + adet - 1]
+    bas = np.where(np.isnan(seriler['kulucka_bas'].to_numpy(dtype=float)), ilk, seriler['kulucka_bas'].to_numpy(dtype=float))
+    bit = np.where(np.isnan(seriler['kulucka_bit'].to_numpy(dtype=float)), np.where(np.isnan(seriler['kulucka_bas'].to_numpy(dtype=float)), son + 1, bas + VARSAYILAN_KULUCKA_GUN * 1440),
+                   seriler['kulucka_bit'].to_numpy(dtype=float))
+    uzunluk = bit - bas; bas_r = np.repeat(bas, adet); uzunluk_r = np.repeat(uzunluk, adet)
+    kulucka = (z >= bas_r) & (z < bas_r + uzunluk_r); orta = (z >= bas_r + uzunluk_r / 3) & (z < bas_r + 2 * uzunluk_r / 3)
+
+    toplam = lambda dizi: np.add.reduceat(dizi, ofsetler) if len(z) else np.zeros(len(adet))
+    kulucka_sayisi = toplam(kulucka.astype(float)); orta_sayisi = toplam(orta.astype(float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ortalama = np.where(kulucka_sayisi > 0, toplam(t * kulucka) / kulucka_sayisi, np.nan)
+        orta_ortalama = np.where(orta_sayisi > 0, toplam(t * orta) / orta_sayisi, np.nan)
+    return pd.DataFrame({
+        'id': seriler['id'].to_numpy(), 'yil': seriler['yil'].to_numpy(),
+        'derece_gun': (toplam(np.clip(t - DERECE_GUN_ESIGI, 0, None) * aralik * kulucka) / 1440).round(2),
+        'ortalama_kulucka_sicakligi': ortalama.round(2), 'orta_ucte_bir_sicaklik': orta_ortalama.round(2),
+        'tahmini_disi_orani_yuzde': (100 / (1 + np.exp(-(orta_ortalama - PIVOT_SICAKLIK) / CINSIYET_GECIS_OLCEGI))).round(1),
+        'sicaklik_ornek_sayisi': kulucka_sayisi.astype(int),
+    })
+
+
+def _sicaklik_ozetlerini_yaz(conn, depo, anahtarlar=None):
+    """Verilen (id, yil) anahtarlarının (None ise tüm serilerin) özetlerini hesaplayıp tabloya yazar."""
+    sorgu = ("SELECT s.id, s.yil, s.baslangic, s.adet, y.yuva_tarihi, y.ilk_yavru_cikis_tarihi, y.kulucka_suresi_gun "
+             "FROM sicaklik_serileri s LEFT JOIN tum_yuvalar y ON y.id = s.id AND y.yil = s.yil")
+    if anahtarlar is None: satirlar = conn.execute(sorgu).fetchall()
+    else: satirlar = _degisen_satirlari_getir(conn, sorgu + " JOIN _degisen d ON d.id = s.id AND d.yil = s.yil", anahtarlar)
+    if not satirlar: return 0
+    seriler = pd.DataFrame(satirlar, columns=['id', 'yil', 'baslangic', 'adet', 'yuva_tarihi', 'ilk_yavru_cikis_tarihi', 'kulucka_suresi_gun'])
+    zaman, sicaklik = depo.oku()
+    eksik = seriler['baslangic'] + seriler['adet'] > len(zaman)
+    if eksik.any(): logging.warning(f"Sıcaklık deposunda {int(eksik.sum())} serinin verisi yok (depo klasörü taşınmamış olabilir); atlandı.")
+    seriler = seriler[~eksik & (seriler['adet'] > 0)].sort_values('baslangic')
+    if seriler.empty: return 0
+    seriler['kulucka_bas'] = _dakikaya_cevir(seriler['yuva_tarihi'])
+    kulucka_gun = pd.to_numeric(seriler['kulucka_suresi_gun'], errors='coerce').to_numpy(dtype=float)
+    seriler['kulucka_bit'] = np.where(np.isnan(_dakikaya_cevir(seriler['ilk_yavru_cikis_tarihi'])), seriler['kulucka_bas'] + kulucka_gun * 1440,
+                                      _dakikaya_cevir(seriler['ilk_yavru_cikis_tarihi']))
+    ozet = sicaklik_ozetlerini_hesapla(zaman, sicaklik, seriler)
+    conn.executemany("INSERT OR REPLACE INTO sicaklik_ozetleri VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     ozet.astype(object).where(ozet.notna(), None).itertuples(index=False, name=None))
+    return len(ozet)
+
+
+@performans.olculen("sicaklik.ozet_guncelle")
+def sicaklik_ozetlerini_guncelle(conn=None):
+    """
+    Sıcaklık özet önbelleğini veri sürümüne getirir: ilk çağrıda tüm seriler, sonrasında sadece
+    değişiklik akışında tarihi/kuluçka süresi değişmiş olabilecek yuvalar yeniden hesaplanır.
+    """
+    kendi_baglantimiz = conn is None
+    if kendi_baglantimiz: conn = get_connection()
+    try:
+        with conn:
+            _sicaklik_tablolarini_kur(conn)
+            islenen_seq = _indeks_durumu(conn, 'sicaklik', 'islenen_seq'); surum = veri_surumu(conn)
+            if islenen_seq is not None and surum == int(islenen_seq): return 0
+            if islenen_seq is None or surum < int(islenen_seq): hesaplanan = _sicaklik_ozetlerini_yaz(conn, SicaklikDeposu())
+            else: hesaplanan = _sicaklik_ozetlerini_yaz(conn, SicaklikDeposu(), degisiklikleri_getir(int(islenen_seq), conn)[1])
+            _indeks_durumu_yaz(conn, 'sicaklik', islenen_seq=surum)
+            return hesaplanan
+    finally:
+        if kendi_baglantimiz: conn.close()
+
+
+# --- Predasyon Sıcak Noktaları ve Komşuluk Analizi ---
+# Yuvalar UTM 35N'e izdüşürülüp Shapely STRtree (R-ağacı) ile indekslenir; mesafe içindeki
+# komşu çiftleri ve en yakın komşular tek toplu sorguyla O(n log n) bulunur. DBSCAN bu
+# çiftlerin bağlı bileşenleri, Getis-Ord Gi* ise çiftler üzerinde bincount ile hesaplanır.
+# Sonuçlar (veritabanı, veri sürümü, parametreler) anahtarıyla bellekte tutulur.
+
+SICAK_NOKTA_YONTEMLERI = {"dbscan": "DBSCAN Kümeleme", "getis_ord": "Getis-Ord Gi*"}
+GI_Z_ESIGI = 1.96  # %95 güven düzeyi
+
+
+def _komsu_ciftleri(agac, noktalar, mesafe_m):
+    """Birbirine mesafe_m'den yakın tüm (i, j) çiftlerini (noktanın kendisi dahil) döner."""
+    return agac.query(noktalar, predicate='dwithin', distance=mesafe_m)
+
+
+def _bagli_bilesenler(n, i, j):
+    """Kenar listesinin bağlı bileşenlerini etiket yayılımı ve işaretçi atlamayla bulur."""
+    etiket = np.arange(n)
+    while True:
+        onceki = etiket.copy()
+        np.minimum.at(etiket, i, etiket[j]); np.minimum.at(etiket, j, etiket[i])
+        while not np.array_equal(etiket, etiket[etiket]): etiket = etiket[etiket]
+        if np.array_equal(etiket, onceki): return etiket
+
+
+def dbscan_kumele(xy, mesafe_m, min_yuva):
+    """Metrik koordinatlarda DBSCAN; her nokta için küme numarası (gürültü -1) döner."""
+    n = len(xy)
+    if n == 0: return np.empty(0, dtype=np.int64)
+    noktalar = shapely.points(xy); i, j = _komsu_ciftleri(STRtree(noktalar), noktalar, mesafe_m)
+    cekirdek = np.bincount(i, minlength=n) >= min_yuva
+    kenar = cekirdek[i] & cekirdek[j]
+    etiket = np.where(cekirdek, _bagli_bilesenler(n, i[kenar], j[kenar]), -1)
+    sinir = ~cekirdek[i] & cekirdek[j]; etiket[i[sinir]] = etiket[j[sinir]]
+    kumeler = np.unique(etiket[etiket >= 0])
+    return np.where(etiket >= 0, np.searchsorted(kumeler, etiket), -1)
+
+
+def getis_ord_gi(xy, deger, mesafe_m, ciftler=None):
+    """
+    İkili mesafe ağırlıklı Getis-Ord Gi* z-skorlarını döner (komşuluk noktanın kendisini içerir).
+    Aynı noktalar için birden çok değişken hesaplanacaksa komşu çiftleri 'ciftler' ile verilebilir.
+    """
+    n = len(xy); deger = np.asarray(deger, dtype=float)
+    if n < 2: return np.full(n, np.nan)
+    if ciftler is None: noktalar = shapely.points(xy); ciftler = _komsu_ciftleri(STRtree(noktalar), noktalar, mesafe_m)
+    i, j = ciftler
+    komsu_sayisi = np.bincount(i, minlength=n).astype(float); komsu_toplami = np.bincount(i, weights=deger[j], minlength=n)
+    ortalama = deger.mean(); standart_sapma = np.sqrt(max((deger ** 2).mean() - ortalama ** 2, 0.0))
+    payda = standart_sapma * np.sqrt((n * komsu_sayisi - komsu_sayisi ** 2) / (n - 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(payda > 0, (komsu_toplami - ortalama * komsu_sayisi) / payda, np.nan)
+
+
+def en_yakin_komsu_mesafeleri(xy):
+    """Her noktanın kendisi dışındaki en yakın noktaya metre cinsinden uzaklığını döner."""
+    sonuc = np.full(len(xy), np.nan)
+    if len(xy) < 2: return sonuc
+    noktalar = shapely.points(xy); indeksler, mesafeler = STRtree(noktalar).query_nearest(noktalar, return_distance=True, exclusive=True, all_matches=False)
+    sonuc[indeksler[0]] = mesafeler
+    return sonuc
+
+
+@functools.lru_cache(maxsize=8)
+def _sicak_nokta_hesapla(db_yolu, surum, yontem, mesafe_m, min_yuva):
+    with contextlib.closing(get_connection(db_yolu)) as conn:
+        df = pd.read_sql_query("SELECT id, yil, lat, lon, predasyon_durumu, predator_canli_listesi FROM tum_yuvalar "
+                               "WHERE lat IS NOT NULL AND lon IS NOT NULL ORDER BY yil, id", conn)
+    bos_yuvalar = pd.DataFrame(columns=['id', 'yil', 'lat', 'lon', 'x', 'y', 'predator', 'kume', 'gi_z', 'sicak_nokta', 'en_yakin_komsu_m'])
+    if df.empty: return bos_yuvalar, pd.DataFrame()
+    df['predatorler'] = df['predator_canli_listesi'].apply(lambda x: json.loads(x) if isinstance(x, str) and x.startswith('[') else [])
+    df['predasyonlu'] = df['predasyon_durumu'].isin(['tam', 'yari', 'kismi'])
+    utm = gpd.GeoSeries(gpd.points_from_xy(df['lon'], df['lat']), crs="EPSG:4326").to_crs("EPSG:32635"); df['x'] = utm.x.to_numpy(); df['y'] = utm.y.to_numpy()
+    yuva_parcalari = []; ozet = []
+    for yil, grup in df.groupby('yil'):
+        xy = grup[['x', 'y']].to_numpy(); komsu = en_yakin_komsu_mesafeleri(xy)
+        predatorler = sorted({p for liste in grup['predatorler'] for p in liste}); ciftler = None
+        if yontem == 'getis_ord': noktalar = shapely.points(xy); ciftler = _komsu_ciftleri(STRtree(noktalar), noktalar, mesafe_m)
+        for predator in ['tümü'] + predatorler:
+            hedef = grup['predasyonlu'].to_numpy() if predator == 'tümü' else grup['predatorler'].apply(lambda liste: predator in liste).to_numpy()
+            kume = np.full(len(grup), -1); gi_z = np.full(len(grup), np.nan)
+            if yontem == 'dbscan':
+                kume[hedef] = dbscan_kumele(xy[hedef], mesafe_m, min_yuva); sicak = kume >= 0
+                sicak_sayisi = int(kume.max() + 1) if hedef.any() else 0
+            else:
+                gi_z = getis_ord_gi(xy, hedef, mesafe_m, ciftler); sicak = gi_z > GI_Z_ESIGI; sicak_sayisi = int((sicak & hedef).sum())
+            yuva_parcalari.append(pd.DataFrame({'id': grup['id'].to_numpy(), 'yil': yil, 'lat': grup['lat'].to_numpy(), 'lon': grup['lon'].to_numpy(),
+                                                'x': xy[:, 0], 'y': xy[:, 1], 'predator': predator, 'kume': kume, 'gi_z': gi_z.round(3),
+                                                'sicak_nokta': sicak, 'en_yakin_komsu_m': komsu.round(1)}))
+            ozet.append({"Yıl": int(yil), "Predatör": predator.title(), "Yuva": len(grup), "Predasyonlu": int(hedef.sum()),
+                         "Küme Sayısı" if yontem == 'dbscan' else "Sıcak Noktadaki Predasyonlu": sicak_sayisi,
+                         "Sıcak Noktadaki Yuva": int(sicak.sum()), "Medyan Komşu Aralığı (m)": round(float(np.nanmedian(komsu)), 1) if len(grup) > 1 else None})
+    logging.info(f"Sıcak nokta analizi ({yontem}, {mesafe_m} m) {len(df)} yuva için hesaplandı.")
+    return pd.concat(yuva_parcalari, ignore_index=True), pd.DataFrame(ozet)
+
+
+@performans.olculen("analiz.sicak_nokta")
+def sicak_nokta_analizi(yontem="dbscan", mesafe_m=50, min_yuva=4):
+    """
+    Yıl ve predatör bazında predasyon sıcak noktalarını hesaplar.
+    (yuva bazlı sonuçlar, yıl/predatör özeti) DataFrame'lerini döner; sonuçlar önbellekten
+    gelebileceği için çağıran tarafından değiştirilmemelidir.
+    """
+    if yontem not in SICAK_NOKTA_YONTEMLERI: raise ValueError(f"Bilinmeyen yöntem: {yontem}")
+    return _sicak_nokta_hesapla(DB_PATH, veri_surumu(), yontem, float(mesafe_m), int(min_yuva))
+
+
+# --- Mekânsal Dışa Aktarım (GeoJSON / GeoPackage / FlatGeobuf) ---
+# Yuvalar tum_yuvalar'dan parça parça (imleçle) okunup her parça sürücüye eklenerek yazılır;
+# bellekte hiçbir zaman tüm sezon tutulmaz. GeoPackage tüm katmanları tek dosyada (R-ağacı
+# indeksiyle) tutar; GeoJSON ve FlatGeobuf tek katmanlı olduğundan ek katmanlar yanına
+# '<ad>_<katman>' dosyaları olarak yazılır. FlatGeobuf'un paketlenmiş Hilbert R-ağacı bir kez
+# kurulabildiği için parçalar önce geçici bir GeoPackage'a eklenir, ardından GDAL içinde Arrow
+# akışıyla tek geçişte FlatGeobuf'a kopyalanır.
+
+COGRAFI_BICIMLER = {".gpkg": "GPKG", ".geojson": "GeoJSON", ".fgb": "FlatGeobuf"}
+COGRAFI_KATMANLAR = ["yuvalar", "sabit_lejantlar", "cizim_alani", "tampon_bolge", "sicak_nokta_yuvalari", "sicak_nokta_kumeleri"]
+COGRAFI_PARCA_BOYUTU = 5000
+
+
+def _yuva_katmani_parcalari(conn, parca_boyutu):
+    """Koordinatlı yuvaları sütun türleri sabit GeoDataFrame parçaları olarak üretir (ilk parça katman şemasını belirler)."""
+    turler = {satir[1]: (satir[2] or "").upper() for satir in conn.execute("PRAGMA table_info(yuvalar)")}
+    sorgu = f"SELECT {', '.join(YUVA_SUTUNLARI)} FROM tum_yuvalar WHERE lat IS NOT NULL AND lon IS NOT NULL ORDER BY yil, id"
+    tanimlar = olcum_tanimlari()
+    for df in pd.read_sql_query(sorgu, conn, chunksize=parca_boyutu):
+        for sutun in YUVA_SUTUNLARI:
+            if turler.get(sutun) == "INTEGER": df[sutun] = pd.to_numeric(df[sutun], errors='coerce').astype('Int64')
+            elif turler.get(sutun) == "REAL": df[sutun] = pd.to_numeric(df[sutun], errors='coerce').astype(float)
+            else: df[sutun] = df[sutun].astype(object).where(df[sutun].notna(), None)
+        df['predator_canli_listesi'] = df['predator_canli_listesi'].map(lambda x: ', '.join(json.loads(x)) if isinstance(x, str) and x.startswith('[') else x)
+        df = pd.concat([df, olcumleri_hesapla(df, tanimlar=tanimlar).round(2)], axis=1)
+        yield gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df['lon'], df['lat']), crs="EPSG:4326")
+
+
+def analiz_katmanlari(cizim=None, tampon=None, sicak_nokta=None):
+    """
+    Yuvalar dışındaki katmanları {ad: GeoDataFrame} olarak kurar (hepsi EPSG:4326). cizim haritada çizilen [lat, lon]
+    köşeleri, tampon (referans_adi, [lat, lon], mesafe_m), sicak_nokta ise sicak_nokta_analizi() ayarlarıdır.
+    """
+    katmanlar = {}; sabit_lejantlar = load_config().get("sabit_lejantlar", {})
+    if sabit_lejantlar:
+        katmanlar["sabit_lejantlar"] = gpd.GeoDataFrame({'isim': list(sabit_lejantlar)}, geometry=[Point(lon, lat) for lat, lon in sabit_lejantlar.values()], crs="EPSG:4326")
+    if cizim and len(cizim) >= 2:
+        kapali = len(cizim) >= 3 and cizim[0] == cizim[-1]  # Çokgen köşeleri kapalı halka olarak gelir; açık liste çizgidir
+        geometri = Polygon([(lon, lat) for lat, lon in cizim]) if kapali else shapely.LineString([(lon, lat) for lat, lon in cizim])
+        katmanlar["cizim_alani"] = gpd.GeoDataFrame({'tur': ['alan' if kapali else 'cizgi']}, geometry=[geometri], crs="EPSG:4326")
+    if tampon:
+        referans_adi, referans_koordinat, mesafe_m = tampon
+        katmanlar["tampon_bolge"] = gpd.GeoDataFrame({'referans': [referans_adi], 'mesafe_m': [float(mesafe_m)]}, geometry=[_tampon_bolge_utm(referans_koordinat, float(mesafe_m))], crs="EPSG:32635").to_crs("EPSG:4326")
+    if sicak_nokta:
+        yuva_sonuclari, _ = sicak_nokta_analizi(**sicak_nokta)
+        sicak = yuva_sonuclari[yuva_sonuclari['sicak_nokta'].astype(bool)]
+        if not sicak.empty:
+            katmanlar["sicak_nokta_yuvalari"] = gpd.GeoDataFrame(sicak[['id', 'yil', 'predator', 'kume', 'gi_z', 'en_yakin_komsu_m']].reset_index(drop=True),
+                                                                 geometry=gpd.points_from_xy(sicak['lon'], sicak['lat']), crs="EPSG:4326")
+            if sicak_nokta.get("yontem", "dbscan") == "dbscan":
+                gdf = gpd.GeoDataFrame({'yil': sicak['yil'].to_numpy(), 'predator': sicak['predator'].to_numpy(), 'kume': sicak['kume'].to_numpy() + 1, 'yuva': 1},
+                                       geometry=gpd.points_from_xy(sicak['x'], sicak['y']), crs="EPSG:32635")
+                kumeler = gdf.dissolve(by=['yil', 'predator', 'kume'], aggfunc={'yuva': 'sum'}).reset_index()
+                kumeler['geometry'] = kumeler.geometry.convex_hull.buffer(10); katmanlar["sicak_nokta_kumeleri"] = kumeler.to_crs("EPSG:4326")
+    return katmanlar
+
+
+def _pyogrio_yukle():
+    """pyogrio yalnızca coğrafi dışa aktarımda gerektiği için ilk kullanımda yüklenir; kurulu değilse anlaşılır bir hata verir."""
+    try: import pyogrio
+    except ImportError: raise RuntimeError("Coğrafi dışa aktarım için 'pyogrio' paketi gerekli (pip install pyogrio).") from None
+    return pyogrio
+
+
+def _katmani_yaz(parcalar, yol, surucu, katman):
+    """GeoDataFrame parçalarını katmana ekleyerek yazar; FlatGeobuf geçici GeoPackage üzerinden tek geçişte indekslenir. Yazılan öğe sayısını döner."""
+    pyogrio = _pyogrio_yukle()
+    hedef = yol if surucu != "FlatGeobuf" else os.path.join(tempfile.mkdtemp(prefix="patara_fgb_"), "ara.gpkg")
+    hedef_surucu = surucu if surucu != "FlatGeobuf" else "GPKG"; adet = 0; geometri_turu = None
+    try:
+        for parca in parcalar:
+            if parca.empty: continue
+            pyogrio.write_dataframe(parca, hedef, layer=katman, driver=hedef_surucu, append=adet > 0, promote_to_multi=False)
+            adet += len(parca); geometri_turu = geometri_turu or parca.geom_type.iloc[0]
+        if surucu == "FlatGeobuf" and adet:
+            with pyogrio.raw.open_arrow(hedef, layer=katman, use_pyarrow=False) as (meta, akis):
+                pyogrio.write_arrow(akis, yol, layer=katman, driver="FlatGeobuf", geometry_name=meta['geometry_name'] or 'geom', geometry_type=geometri_turu,
+                                    crs=meta['crs'], layer_options={"SPATIAL_INDEX": "YES"})
+        return adet
+    finally:
+        if surucu == "FlatGeobuf": shutil.rmtree(os.path.dirname(hedef), ignore_errors=True)
+
+
+@performans.olculen("cografi_disa_aktar")
+def cografi_disa_aktar(yol, katmanlar=None, cizim=None, tampon=None, sicak_nokta=None, parca_boyutu=COGRAFI_PARCA_BOYUTU):
+    """
+    Yuvaları ve analiz katmanlarını dosya uzantısına göre GeoPackage, GeoJSON ya da FlatGeobuf olarak dışa aktarır.
+    katmanlar COGRAFI_KATMANLAR'dan bir seçimdir (varsayılan: verisi olanların hepsi). (başarılı, mesaj, yazılan_dosyalar) döner.
+    """
+    govde, uzanti = os.path.splitext(yol); surucu = COGRAFI_BICIMLER.get(uzanti.lower())
+    if surucu is None: return False, f"Desteklenmeyen biçim: '{uzanti}'. Kullanılabilir: {', '.join(COGRAFI_BICIMLER)}", []
+    istenen = [k for k in COGRAFI_KATMANLAR if katmanlar is None or k in katmanlar]
+    try: _pyogrio_yukle()
+    except RuntimeError as e: return False, str(e), []
+    try:
+        ekler = analiz_katmanlari(cizim if "cizim_alani" in istenen else None, tampon if "tampon_bolge" in istenen else None,
+                                  sicak_nokta if {"sicak_nokta_yuvalari", "sicak_nokta_kumeleri"} & set(istenen) else None)
+        istenen = [k for k in istenen if k == "yuvalar" or k in ekler]
+        if not istenen: return False, "Dışa aktarılacak katman bulunamadı.", []
+        hedefler = {k: yol if surucu == "GPKG" or i == 0 else f"{govde}_{k}{uzanti}" for i, k in enumerate(istenen)}
+        for dosya in set(hedefler.values()):
+            if os.path.exists(dosya): os.remove(dosya)
+        sayilar = {}
+        with contextlib.closing(get_connection()) as conn:
+            for katman in istenen:
+                parcalar = _yuva_katmani_parcalari(conn, parca_boyutu) if katman == "yuvalar" else [ekler[katman]]
+                sayilar[katman] = _katmani_yaz(parcalar, hedefler[katman], surucu, katman)
+                if katman == "yuvalar": performans.satir_say(sayilar[katman])
+        yazilanlar = [hedefler[k] for k in istenen if sayilar[k]]
+        mesaj = f"{surucu} dışa aktarımı: " + ", ".join(f"{k} ({sayilar[k]})" for k in istenen) + (f" → {len(set(yazilanlar))} dosya." if len(set(yazilanlar)) > 1 else f" → {os.path.basename(yol)}.")
+        logging.info(mesaj); return True, mesaj, sorted(set(yazilanlar), key=yazilanlar.index)
+    except Exception as e:
+        logging.error(f"Coğrafi dışa aktarım hatası: {e}", exc_info=True)
+        return False, f"Coğrafi dışa aktarım hatası: {e}", []
+
+
+# --- Başsız (Headless) Statik Harita Çizimi ---
+# Çizimin kendisi patara_isci modülündedir (Qt'siz, matplotlib Agg); burada altlık karolarının
+# indirilmesi ve çizim girdilerinin (yuvalar, sabit lejantlar) veritabanından ve ayardan toplanması
+# yapılır. Yıl başına haritalar gibi toplu işler, yalnızca o modülü yükleyen işçi süreçlerde çizilir.
+
+KARO_KLASORU = os.path.join(SCRIPT_DIR, "assets", "karolar")
+KARO_URL = "https://a.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png"  # Etkileşimli haritadaki "CartoDB positron" altlığı
+
+
+def harita_karolarini_indir(zoomlar=(13, 14, 15, 16), sinir_kutusu=PATARA_SINIR_KUTUSU, klasor=KARO_KLASORU, zaman_asimi=30):
+    """Statik haritaların çevrimdışı altlığı için çalışma alanını örten karoları bir kez indirir; (başarılı, mesaj) döner."""
+    (x0, x1), (y0, y1) = (web_merkator([sinir_kutusu[1], sinir_kutusu[3]], [sinir_kutusu[0], sinir_kutusu[2]]))
+    indirilen = mevcut = 0; hatalar = []
+    for zoom in zoomlar:
+        sx0, sx1, sy0, sy1 = karo_araligi(x0, x1, y0, y1, zoom)
+        for x in range(sx0, sx1 + 1):
+            for y in range(sy0, sy1 + 1):
+                hedef = os.path.join(klasor, str(zoom), str(x), f"{y}.png")
+                if os.path.isfile(hedef): mevcut += 1; continue
+                istek = urllib.request.Request(KARO_URL.format(z=zoom, x=x, y=y), headers={"User-Agent": "PataraVeriPlatformu/1.3"})
+                try:
+                    with urllib.request.urlopen(istek, timeout=zaman_asimi) as yanit: veri = yanit.read()
+                except (urllib.error.URLError, OSError) as e: hatalar.append(f"{zoom}/{x}/{y}: {e}"); continue
+                os.makedirs(os.path.dirname(hedef), exist_ok=True)
+                with open(hedef, "wb") as f: f.write(veri)
+                indirilen += 1
+    mesaj = f"{indirilen} altlık karosu indirildi, {mevcut} tanesi zaten önbellekteydi (zoom {', '.join(map(str, zoomlar))})."
+    if hatalar: mesaj += f" {len(hatalar)} karo indirilemedi (ilki: {hatalar[0]})."
+    logging.info(mesaj); return not hatalar, mesaj
+
+
+def karo_imzasi():
+    """Önbellekteki altlık karosu zoom düzeyleri; statik harita önbellek anahtarlarına girer."""
+    return sorted(os.listdir(KARO_KLASORU)) if os.path.isdir(KARO_KLASORU) else []
+
+
+def statik_harita_girdileri(is_tanimi):
+    """
+    statik_harita_ciz() argüman sözlüğünü işçiye gönderilebilir hale getirir: yuvalar verilmemişse veritabanından
+    (yillar ile süzülerek) okunur, sabit lejantlar ayardan ve karo klasörü eklenir.
+    """
+    is_tanimi = dict(is_tanimi); yillar = is_tanimi.pop("yillar", None)
+    if is_tanimi.get("yuvalar") is None:
+        with contextlib.closing(get_connection()) as conn:
+            kosul = f" AND yil IN ({', '.join('?' * len(yillar))})" if yillar else ""
+            is_tanimi["yuvalar"] = pd.read_sql_query(f"SELECT id, yil, lat, lon, predasyon_durumu FROM tum_yuvalar WHERE lat IS NOT NULL AND lon IS NOT NULL{kosul}", conn, params=list(yillar or []))
+    if is_tanimi.get("sabit_lejantlar") is None: is_tanimi["sabit_lejantlar"] = load_config().get("sabit_lejantlar", {})
+    is_tanimi.setdefault("karo_klasoru", KARO_KLASORU)
+    return is_tanimi
+
+
+@performans.olculen("statik_harita_ciz")
+def statik_harita_ciz(cikti_yolu, yuvalar=None, yillar=None, **secenekler):
+    """
+    Tek bir statik haritayı bu süreçte çizer (bkz. patara_isci.statik_harita_ciz; baslik, cizimler, yogunluk, karolar, dpi,
+    boyut, sabit_lejantlar). yuvalar verilmezse veritabanından, yillar ile süzülerek okunur. Çıktı yolunu döner.
+    """
+    girdiler = statik_harita_girdileri({"cikti_yolu": cikti_yolu, "yuvalar": yuvalar, "yillar": yillar, **secenekler})
+    performans.satir_say(len(girdiler["yuvalar"])); return patara_isci.statik_harita_ciz(**girdiler)
+
+
+def statik_harita_anahtari(is_tanimi):
+    """Veritabanından okunan (yuvalar verilmemiş) bir statik harita işinin çıktı önbelleği anahtarı; veri doğrudan verilmişse None."""
+    if is_tanimi.get("yuvalar") is not None: return None
+    girdiler = {k: v for k, v in is_tanimi.items() if k != "cikti_yolu"}
+    girdiler.setdefault("sabit_lejantlar", load_config().get("sabit_lejantlar", {}))
+    if girdiler.get("karolar", True): girdiler["karo_zoomlari"] = karo_imzasi()
+    return cikti_onbellegi.anahtar("statik_harita", veri=veri_parmak_izi(is_tanimi.get("yillar")), bicim=os.path.splitext(is_tanimi["cikti_yolu"])[1].lower(), **girdiler)
+
+
+def statik_haritalari_ciz(isler, isci_sayisi=None, onbellek=None):
+    """
+    statik_harita_ciz() argüman sözlüklerini (yıl başına harita gibi) işçi süreçlerde paralel çizer; [(yol, hata)] döner.
+    Yuvalar ana süreçte okunur; işçiler yalnızca Qt'siz patara_isci modülünü yükleyip Agg ile çizer.
+    onbellek (CiktiOnbellegi) verilirse girdileri ve ilgili yıllarının verisi değişmemiş haritalar önbellekten kopyalanır,
+    yalnızca kalanlar çizilir.
+    """
+    sonuclar = [None] * len(isler); anahtarlar = [None] * len(isler)
+    if onbellek is not None:
+        for i, is_tanimi in enumerate(isler):
+            anahtarlar[i] = statik_harita_anahtari(is_tanimi)
+            yol = onbellek.getir(anahtarlar[i], os.path.splitext(is_tanimi["cikti_yolu"])[1]) if anahtarlar[i] else None
+            if yol: shutil.copyfile(yol, is_tanimi["cikti_yolu"]); sonuclar[i] = (is_tanimi["cikti_yolu"], None)
+    bekleyen = [i for i, sonuc in enumerate(sonuclar) if sonuc is None]
+    if not bekleyen: return sonuclar
+    isci_sayisi = max(1, min(len(bekleyen), isci_sayisi or kullanilabilir_cpu_sayisi()))
+    with performans.olc("statik_haritalar", satir=len(bekleyen)):
+        cizilecek = [statik_harita_girdileri(isler[i]) for i in bekleyen]
+        if isci_sayisi == 1: cizilen = list(map(patara_isci.statik_harita_isi, cizilecek))
+        else: cizilen = patara_isci.paralel_esle(patara_isci.statik_harita_isi, cizilecek, isci_sayisi)
+    for i, (yol, hata) in zip(bekleyen, cizilen):
+        sonuclar[i] = (yol, hata)
+        if onbellek is not None and anahtarlar[i] and hata is None: onbellek.sakla(anahtarlar[i], os.path.splitext(yol)[1], yol)
+    return sonuclar
+
+
+# --- Predasyon Risk Modeli ---
+# Özellik matrisi veri sürümü başına bir kez kurulur: denize uzaklık sütunları, kıyı hattı
+# üzerindeki konum (segment), yılın günü ve aynı yıl içindeki komşu yuva yoğunluğu. L2
+# cezalı lojistik regresyon NumPy ile Newton (IRLS) adımlarıyla eğitilir ve tüm yuvalar tek
+# bir matris çarpımıyla puanlanır. Etiket: predasyon durumu 'tam'/'yari'/'kismi' ise 1, 'yok' ise 0.
+
+RISK_MESAFE_SUTUNLARI = ['kuru_kum_uzakligi', 'islak_kum_uzakligi', 'toplam_denize_uzaklik']
+RISK_KOMSULUK_MESAFESI_M = 50
+RISK_L2_CEZASI = 1.0
+RISK_EN_AZ_ORNEK = 10  # Her iki sınıfta da en az bu kadar etiketli yuva gerekir
+RISK_CV_KATLAMA = 5    # Eğitim dışı AUC için tabakalı çapraz doğrulama katlaması
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35, 35)))
+
+
+def lojistik_regresyon_egit(X, y, ceza=RISK_L2_CEZASI, azami_iterasyon=50):
+    """L2 cezalı lojistik regresyonu Newton-Raphson (IRLS) ile eğitir; [sabit, katsayılar...] döner."""
+    X1 = np.column_stack([np.ones(len(X)), X]); w = np.zeros(X1.shape[1])
+    R = np.eye(X1.shape[1]) * ceza; R[0, 0] = 0.0  # Sabit terim cezalandırılmaz
+    for _ in range(azami_iterasyon):
+        p = _sigmoid(X1 @ w)
+        gradyan = X1.T @ (p - y) + R @ w; hessian = (X1 * (p * (1 - p))[:, None]).T @ X1 + R
+        adim = np.linalg.solve(hessian, gradyan); w -= adim
+        if np.abs(adim).max() < 1e-8: break
+    return w
+
+
+def roc_auc(y, skor):
+    """Mann-Whitney sıra istatistiğiyle ROC eğrisi altındaki alanı hesaplar."""
+    y = np.asarray(y, dtype=bool); pozitif = y.sum(); negatif = len(y) - pozitif
+    if pozitif == 0 or negatif == 0: return float('nan')
+    siralar = pd.Series(skor).rank().to_numpy()
+    return float((siralar[y].sum() - pozitif * (pozitif + 1) / 2) / (pozitif * negatif))
+
+
+def capraz_dogrulama_auc(X, y, katlama=RISK_CV_KATLAMA, tohum=0):
+    """
+    Tabakalı k-katlı çapraz doğrulamayla eğitim dışı AUC hesaplar: her yuva, kendisinin
+    bulunmadığı katlarla eğitilmiş modelle puanlanır ve AUC bu puanların tamamı üzerinden alınır.
+    """
+    rng = np.random.default_rng(tohum); kat = np.empty(len(y), dtype=int)
+    for sinif in (0, 1):
+        indeksler = rng.permutation(np.flatnonzero(y == sinif)); kat[indeksler] = np.arange(len(indeksler)) % katlama
+    skor = np.empty(len(y))
+    for k in range(katlama):
+        test = kat == k; w = lojistik_regresyon_egit(X[~test], y[~test])
+        skor[test] = _sigmoid(w[0] + X[test] @ w[1:])
+    return roc_auc(y, skor)
+
+
+class PredasyonRiskModeli:
+    """Veri sürümü başına özellikleri kurup modeli eğiten ve tüm yuvaları puanlayan önbellekli model."""
 
-def get_connection():
-    """Veritabanı bağlantısı oluşturur."""
-    return sqlite3.connect(DB_PATH)
+    def __init__(self):
+        self.surum = None; self.db_yolu = None; self.riskler = {}; self.katsayilar = None
+        self.ozellik_adlari = []; self.egitim_ozeti = {}
 
+    def gecersiz_kil(self):
+        self.surum = None
 
-def setup_database():
-    """Veritabanını ve 'yuvalar' tablosunu Yıllık ID şemasıyla kurar."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS yuvalar (
-        id INTEGER NOT NULL, yil INTEGER NOT NULL, lat REAL, lon REAL, yuva_tarihi TEXT, 
-        ilk_yavru_cikis_tarihi TEXT, ikinci_predasyon_tarihi TEXT, kuru_kum_uzakligi REAL, 
-        yari_islak_kum_uzakligi REAL, islak_kum_uzakligi REAL, toplam_denize_uzaklik REAL, 
-        tasinma_durumu TEXT, sicaklik_aleti_var_mi TEXT, kulucka_suresi_gun INTEGER, 
-        yuva_basarisi_yuzde REAL, predasyon_durumu TEXT, predator_canli_listesi TEXT, marka TEXT, 
-        yuva_derinligi REAL, yuva_capi REAL, yuva_ici_canli_yavru INTEGER, yuva_ici_olu_yavru INTEGER, 
-        erken_donem_embriyo INTEGER, orta_donem_embriyo INTEGER, gec_donem_embriyo INTEGER, 
-        toplam_olu_embriyo INTEGER, bos_kabuk_sayisi INTEGER, predasyonlu_yumurta_sayisi INTEGER,
-        dollenmemis_yumurta_sayisi INTEGER, toplam_yumurta_sayisi INTEGER,
-        yavru_cikis_gun_1 INTEGER, yavru_cikis_gun_2 INTEGER, yavru_cikis_gun_3 INTEGER,
-        PRIMARY KEY (id, yil)
+    def risk(self, yuva_id, yil):
+        """Yuvanın tahmini predasyon olasılığını (0-1) döner; model yoksa None."""
+        return self.riskler.get((yuva_id, yil))
+
+    @performans.olculen("analiz.risk_modeli")
+    def guncelle(self):
+        conn = get_connection()
+        try:
+            surum = veri_surumu(conn)
+            if surum == self.surum and self.db_yolu == DB_PATH: return self
+            hat = KiyiHatti(); kiyi_indeksini_guncelle(conn, hat)
+            df = pd.read_sql_query(f"SELECT y.id, y.yil, y.lat, y.lon, y.yuva_tarihi, y.predasyon_durumu, {', '.join('y.' + s for s in RISK_MESAFE_SUTUNLARI)}, "
+                                   "k.mesafe_m FROM tum_yuvalar y LEFT JOIN kiyi_indeksi k ON k.id = y.id AND k.yil = y.yil", conn)
+        finally:
+            conn.close()
+        self.surum = surum; self.db_yolu = DB_PATH; self.riskler = {}; self.katsayilar = None; self.egitim_ozeti = {}
+        if df.empty: return self
+        X, self.ozellik_adlari = self._ozellik_matrisi(df, hat)
+        etiketli = df['predasyon_durumu'].isin(['tam', 'yari', 'kismi', 'yok']).to_numpy(); y = df['predasyon_durumu'].isin(['tam', 'yari', 'kismi']).to_numpy(dtype=float)
+        pozitif = int(y[etiketli].sum()); negatif = int(etiketli.sum()) - pozitif
+        if min(pozitif, negatif) < RISK_EN_AZ_ORNEK:
+            logging.info(f"Risk modeli eğitilmedi: yetersiz etiketli yuva ({pozitif} predasyonlu, {negatif} sağlam)."); return self
+        self.katsayilar = lojistik_regresyon_egit(X[etiketli], y[etiketli])
+        olasilik = _sigmoid(self.katsayilar[0] + X @ self.katsayilar[1:])
+        self.riskler = dict(zip(zip(df['id'].tolist(), df['yil'].tolist()), olasilik.round(4).tolist()))
+        self.egitim_ozeti = {"Etiketli Yuva": int(etiketli.sum()), "Predasyonlu": pozitif, "Sağlam": negatif,
+                             "Eğitim AUC": round(roc_auc(y[etiketli], olasilik[etiketli]), 3),
+                             f"{RISK_CV_KATLAMA}-Katlı Çapraz Doğrulama AUC": round(capraz_dogrulama_auc(X[etiketli], y[etiketli]), 3),
+                             "Veri Sürümü": surum}
+        logging.info(f"Risk modeli {len(df)} yuva için güncellendi: {self.egitim_ozeti}")
+        return self
+
+    @staticmethod
+    def _ozellik_matrisi(df, hat):
+        """Standartlaştırılmış özellik matrisini ve sütun adlarını döner; eksik değerler medyanla doldurulur."""
+        sutunlar = {}; mesafe_eksik = np.zeros(len(df), dtype=bool)
+        for sutun in RISK_MESAFE_SUTUNLARI:
+            deger = pd.to_numeric(df[sutun], errors='coerce'); mesafe_eksik |= deger.isna().to_numpy()
+            sutunlar[sutun] = deger.fillna(deger.median() if deger.notna().any() else 0).to_numpy(dtype=float)
+        sutunlar['mesafe_bilgisi_eksik'] = mesafe_eksik.astype(float)
+        gun = pd.to_datetime(df['yuva_tarihi'], errors='coerce').dt.dayofyear
+        gun = gun.fillna(gun.median() if gun.notna().any() else 180).to_numpy(dtype=float)
+        sutunlar['yilin_gunu'] = gun; sutunlar['yilin_gunu_kare'] = (gun - gun.mean()) ** 2
+
+        # Komşu yoğunluğu: aynı yıl içinde RISK_KOMSULUK_MESAFESI_M içindeki diğer yuvalar
+        yogunluk = np.zeros(len(df)); konumlu = df['lat'].notna() & df['lon'].notna()
+        if konumlu.any():
+            utm = gpd.GeoSeries(gpd.points_from_xy(df.loc[konumlu, 'lon'], df.loc[konumlu, 'lat']), crs="EPSG:4326").to_crs("EPSG:32635")
+            xy = np.column_stack([utm.x.to_numpy(), utm.y.to_numpy()]); konum_indeksi = np.flatnonzero(konumlu.to_numpy())
+            for yil in np.unique(df.loc[konumlu, 'yil']):
+                secili = (df.loc[konumlu, 'yil'] == yil).to_numpy(); noktalar = shapely.points(xy[secili])
+                i, _ = _komsu_ciftleri(STRtree(noktalar), noktalar, RISK_KOMSULUK_MESAFESI_M)
+                yogunluk[konum_indeksi[secili]] = np.bincount(i, minlength=secili.sum()) - 1
+        sutunlar['komsu_yogunlugu'] = yogunluk
+
+        # Kıyı konumu: lejantlar arası segmentin göstergesi (ilk segment referans alınır)
+        kilometraj = df['mesafe_m'].to_numpy(dtype=float); kilometraj = np.where(np.isnan(kilometraj), np.nanmedian(kilometraj) if (~np.isnan(kilometraj)).any() else 0, kilometraj)
+        segment = np.clip(np.searchsorted(hat.kilometraj, kilometraj, side='right') - 1, 0, len(hat.uzunluklar) - 1)
+        for i in range(1, len(hat.uzunluklar)): sutunlar[f"segment: {hat.segment_adi(i)}"] = (segment == i).astype(float)
+
+        X = np.column_stack(list(sutunlar.values())); standart_sapma = X.std(axis=0)
+        X = (X - X.mean(axis=0)) / np.where(standart_sapma > 0, standart_sapma, 1)
+        return X, list(sutunlar.keys())
+
+    def katsayi_tablosu(self):
+        """Standartlaştırılmış katsayıları mutlak etkiye göre sıralı bir DataFrame olarak döner."""
+        if self.katsayilar is None: return pd.DataFrame(columns=["Özellik", "Katsayı"])
+        tablo = pd.DataFrame({"Özellik": self.ozellik_adlari, "Katsayı": self.katsayilar[1:].round(3)})
+        return tablo.reindex(tablo["Katsayı"].abs().sort_values(ascending=False).index)
+
+
+# --- Yeniden Örnekleme ile Anlamlılık Testleri ---
+# Bootstrap güven aralıkları ve permütasyon testleri, yeniden örneklemeleri satır satır değil
+# parti matrisleri hâlinde üretir. Ölçümler (başarı yüzdesi, kuluçka günü, predasyon 0/1) az
+# sayıda farklı değer aldığından, değer sayısı küçükse örneklem doğrudan değer sayaçları üzerinden
+# çekilir: bootstrap için multinom, permütasyon için çok değişkenli hipergeometrik dağılım.
+# Bu, indekslerle yeniden örneklemeyle birebir aynı dağılımı verir; değer sayısı büyükse (ör. başarı
+# yüzdesi) indeks matrisleri kullanılır. Partiler bağımsız tohumlarla iş parçacıklarına dağıtılır.
+# Permütasyon testi sıralı durur: p değerinin Monte Carlo hatası anlamlılık kararını artık
+# değiştiremiyorsa kalan permütasyonlar çekilmez; yalnızca eşiğe yakın p değerleri sonuna kadar gider.
+
+YENIDEN_ORNEKLEME_SAYISI = 10000  # En fazla permütasyon sayısı
+BOOTSTRAP_SAYISI = 10000          # Yüzdelik güven aralığı için bootstrap örneklemi
+PERMUTASYON_PARTISI = 1000        # Sıralı durdurma kontrolleri arasındaki permütasyon sayısı
+ANLAMLILIK_DUZEYI = 0.05
+_PARTI_ELEMAN_SAYISI = 4_000_000  # Bir partide bellekte tutulacak en fazla örneklem elemanı
+
+ANLAMLILIK_OLCUTLERI = {  # Kayıt defterindeki ölçümlere ek olarak sınanır
+    "Ortalama Kuluçka Süresi (gün)": lambda df: pd.to_numeric(df['kulucka_suresi_gun'], errors='coerce').dropna().to_numpy(dtype=float),
+    "Predasyon Oranı (%)": lambda df: df['predasyon_durumu'].isin(['tam', 'yari', 'kismi']).to_numpy(dtype=float) * 100,
+}
+
+
+def _partiler_halinde(islev, tekrar, satir_uzunlugu, tohum):
+    """islev(rng, k) çağrılarını bellek sınırlı partilere bölüp iş parçacıklarında çalıştırır ve birleştirir."""
+    parti = max(1, _PARTI_ELEMAN_SAYISI // max(satir_uzunlugu, 1)); boyutlar = [min(parti, tekrar - i) for i in range(0, tekrar, parti)]
+    tohumlar = (tohum if isinstance(tohum, np.random.SeedSequence) else np.random.SeedSequence(tohum)).spawn(len(boyutlar))
+    if len(boyutlar) == 1: return islev(np.random.default_rng(tohumlar[0]), boyutlar[0])
+    with concurrent.futures.ThreadPoolExecutor(min(len(boyutlar), kullanilabilir_cpu_sayisi()), thread_name_prefix="yeniden-ornekleme") as yurutucu:
+        return np.concatenate(list(yurutucu.map(lambda k, s: islev(np.random.default_rng(s), k), boyutlar, tohumlar)))
+
+
+def bootstrap_ortalamalari(x, tekrar=YENIDEN_ORNEKLEME_SAYISI, tohum=None):
+    """x'in 'tekrar' adet bootstrap örnekleminin ortalamalarını döner."""
+    x = np.asarray(x, dtype=float); n = len(x); degerler, sayilar = np.unique(x, return_counts=True)
+    if len(degerler) * 25 <= n:
+        return _partiler_halinde(lambda rng, k: rng.multinomial(n, sayilar / n, size=k) @ degerler / n, tekrar, len(degerler), tohum)
+    return _partiler_halinde(lambda rng, k: x[rng.integers(0, n, (k, n))].mean(axis=1), tekrar, n, tohum)
+
+
+def permutasyon_toplamlari(birlesik, n1, tekrar=YENIDEN_ORNEKLEME_SAYISI, tohum=None):
+    """Birleşik örneklemden iadesiz çekilen n1 elemanlı rastgele alt kümelerin toplamlarını döner."""
+    birlesik = np.asarray(birlesik, dtype=float); degerler, sayilar = np.unique(birlesik, return_counts=True)
+    if len(degerler) * 14 <= len(birlesik):
+        return _partiler_halinde(lambda rng, k: rng.multivariate_hypergeometric(sayilar, n1, size=k, method='marginals') @ degerler, tekrar, len(degerler), tohum)
+
+    def parti(rng, k):
+        # Her satırda rastgele anahtarların en küçük n1 tanesi alt kümeyi belirler (tam karıştırmadan ucuzdur)
+        anahtarlar = rng.random((k, len(birlesik)), dtype=np.float32); esik = np.partition(anahtarlar, n1 - 1, axis=1)[:, n1 - 1:n1]
+        return (anahtarlar <= esik) @ birlesik
+    return _partiler_halinde(parti, tekrar, len(birlesik), tohum)
+
+
+@performans.olculen("analiz.anlamlilik_testi")
+def anlamlilik_testi(x1, x2, tekrar=YENIDEN_ORNEKLEME_SAYISI, guven=1 - ANLAMLILIK_DUZEYI, tohum=0, bootstrap_tekrar=BOOTSTRAP_SAYISI):
+    """
+    İki grubun ortalama farkı (x2 - x1) için yüzdelik bootstrap güven aralığı ve iki yönlü
+    permütasyon testi p değeri hesaplar. Permütasyonlar PERMUTASYON_PARTISI'lık adımlarla en
+    fazla 'tekrar' kadar çekilir; p değerinin 3 standart hatalık aralığı anlamlılık düzeyini
+    içermediğinde durulur. Gruplardan biri 2'den az gözlem içeriyorsa None döner.
+    """
+    x1 = np.asarray(x1, dtype=float); x2 = np.asarray(x2, dtype=float)
+    if len(x1) < 2 or len(x2) < 2: return None
+    tohumlar = np.random.SeedSequence(tohum).spawn(3); fark = x2.mean() - x1.mean(); alfa = 1 - guven
+    bootstrap_farklari = bootstrap_ortalamalari(x2, bootstrap_tekrar, tohumlar[1]) - bootstrap_ortalamalari(x1, bootstrap_tekrar, tohumlar[0])
+    alt, ust = np.quantile(bootstrap_farklari, [alfa / 2, 1 - alfa / 2])
+    birlesik = np.concatenate([x1, x2]); toplam = birlesik.sum(); n1 = len(x1); n2 = len(x2)
+    asan = yapilan = 0
+    for parti_tohumu in tohumlar[2].spawn(-(-tekrar // PERMUTASYON_PARTISI)):
+        k = min(PERMUTASYON_PARTISI, tekrar - yapilan)
+        toplam1 = permutasyon_toplamlari(birlesik, n1, k, parti_tohumu); permutasyon_farklari = (toplam - toplam1) / n2 - toplam1 / n1
+        asan += np.count_nonzero(np.abs(permutasyon_farklari) >= abs(fark) - 1e-9); yapilan += k
+        p = (1 + asan) / (yapilan + 1)
+        if abs(p - alfa) > 3 * np.sqrt(p * (1 - p) / yapilan): break
+    return {"n1": n1, "n2": n2, "ortalama1": float(x1.mean()), "ortalama2": float(x2.mean()), "fark": float(fark),
+            "alt": float(alt), "ust": float(ust), "p": float(p), "anlamli": bool(p < alfa), "permutasyon": yapilan}
+
+
+def gruplari_karsilastir(df1, df2, tekrar=YENIDEN_ORNEKLEME_SAYISI, tohum=0):
+    """Her türetilmiş ölçüm ve ANLAMLILIK_OLCUTLERI için iki grubu karşılaştırır; {ölçüm: sonuç veya None} döner."""
+    tanimlar = olcum_tanimlari(); olcumler1 = olcumleri_hesapla(df1, tanimlar=tanimlar); olcumler2 = olcumleri_hesapla(df2, tanimlar=tanimlar)
+    sonuclar = {f"Ortalama {tanimlar[ad]['etiket']}": anlamlilik_testi(olcumler1[ad].dropna(), olcumler2[ad].dropna(), tekrar, tohum=tohum) for ad in olcumler1.columns}
+    return sonuclar | {olcut: anlamlilik_testi(degerler(df1), degerler(df2), tekrar, tohum=tohum) for olcut, degerler in ANLAMLILIK_OLCUTLERI.items()}
+
+
+# --- Saha Kopyaları Arasında Çevrimdışı Senkronizasyon ---
+# Her veritabanı kopyası bir cihaz kimliğine sahiptir. Her (id, yil, sütun) için son
+# değişikliğin (zaman, cihaz) damgası 'alan_surumleri' tablosunda tutulur; damgalar
+# değişiklik günlüğünden artımlı olarak üretilir. Kopyalar birbirine sadece karşı tarafın
+# henüz görmediği alanları sıkıştırılmış paketlerle gönderir ve çakışmalar alan bazında
+# "son yazan kazanır" kuralıyla (eşitlikte cihaz kimliği) çözülür.
+
+SILINME_ALANI = '_silindi'
+SENKRON_ALANLARI = set(YUVA_SUTUNLARI[2:]) | {SILINME_ALANI}
+
+
+def _senkron_tablolarini_kur(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS senkron_ayarlari (anahtar TEXT PRIMARY KEY, deger TEXT)")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS alan_surumleri (
+        id INTEGER NOT NULL, yil INTEGER NOT NULL, sutun TEXT NOT NULL, zaman REAL NOT NULL,
+        cihaz TEXT NOT NULL, yerel_seq INTEGER NOT NULL, PRIMARY KEY (id, yil, sutun)
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_alan_surumleri_seq ON alan_surumleri (yerel_seq)")
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS senkron_esleri (
+        cihaz TEXT PRIMARY KEY, gonderilen_seq INTEGER NOT NULL DEFAULT -1,
+        alinan_seq INTEGER NOT NULL DEFAULT -1, son_senkron REAL
     )""")
-    conn.commit()
-    conn.close()
-    logging.info("Veritabanı şeması (yıl bilgisiyle) kuruldu/kontrol edildi.")
 
 
-def excelden_toplu_ekle(excel_dosya_yolu):
-    """Excel dosyasından toplu veri aktarımı yapar, Yıllık ID sistemini dikkate alır."""
-    try:
-        df = pd.read_excel(excel_dosya_yolu, engine='openpyxl')
-        df = df.where(pd.notna(df), None)
-        df.columns = [
-            str(col).strip().lower().replace(' ', '_').replace('ı', 'i').replace('ğ', 'g').replace('ü', 'u').replace(
-                'ş', 's').replace('ö', 'o').replace('ç', 'c').replace('(', '').replace(')', '').replace('.', '') for col
-            in df.columns]
+def _senkron_ayari(conn, anahtar, varsayilan=None):
+    satir = conn.execute("SELECT deger FROM senkron_ayarlari WHERE anahtar = ?", (anahtar,)).fetchone()
+    return satir[0] if satir else varsayilan
 
-        if 'yuva_tarihi' not in df.columns: return 0, "Excel'de 'yuva_tarihi' sütunu bulunamadı."
 
-        df['yuva_tarihi'] = pd.to_datetime(df['yuva_tarihi'], errors='coerce')
-        df.dropna(subset=['yuva_tarihi'], inplace=True)
-        df['yil'] = df['yuva_tarihi'].dt.year.astype(int)
+def cihaz_kimligi(conn):
+    """Bu veritabanı kopyasının kalıcı cihaz kimliğini döner, yoksa oluşturur."""
+    _senkron_tablolarini_kur(conn)
+    kimlik = _senkron_ayari(conn, 'cihaz_kimligi')
+    if kimlik is None:
+        kimlik = uuid.uuid4().hex[:12]
+        with conn: conn.execute("INSERT INTO senkron_ayarlari VALUES ('cihaz_kimligi', ?)", (kimlik,))
+    return kimlik
 
-        id_key = next((k for k in ['id', 'yuva_sira_no', 'yuva_no'] if k in df.columns), None)
-        if id_key is None: return 0, "Excel'de 'id' sütunu bulunamadı."
-        if id_key != 'id': df['id'] = df[id_key]
-        df.dropna(subset=['id'], inplace=True)
-        df['id'] = df['id'].astype(int)
 
-        conn = get_connection()
-        mevcut_df = pd.read_sql_query("SELECT id, yil FROM yuvalar", conn)
-        mevcut_kombinasyonlar = set(tuple(x) for x in mevcut_df.to_numpy())
+def cihaz_kimligini_yenile(conn):
+    """
+    Kopyalanarak çoğaltılmış bir veritabanına yeni bir cihaz kimliği verir. Bekleyen yerel
+    değişiklikler önce eski kimlikle damgalanır, ardından eski kimliğin damgaları yeni
+    kimliğe taşınır; böylece kopyada yapılmış düzenlemeler karşı tarafa gönderilebilir
+    (aynı kimlikli damgalar karşı cihaza hiç gönderilmez). Yeni kimliği döner.
+    """
+    eski = cihaz_kimligi(conn)
+    _alan_surumlerini_guncelle(conn)
+    yeni = uuid.uuid4().hex[:12]
+    with conn:
+        conn.execute("UPDATE alan_surumleri SET cihaz = ? WHERE cihaz = ?", (yeni, eski))
+        conn.execute("INSERT OR REPLACE INTO senkron_ayarlari VALUES ('cihaz_kimligi', ?)", (yeni,))
+    logging.info(f"Cihaz kimliği yenilendi: {eski} -> {yeni}")
+    return yeni
 
-        yeni_kayitlar = [row.to_dict() for index, row in df.iterrows() if
-                         (row['id'], row['yil']) not in mevcut_kombinasyonlar]
-        if not yeni_kayitlar:
-            conn.close()
-            return 0, "Excel'de yeni bir (ID, Yıl) kombinasyonu bulunamadı."
 
-        yeni_df = pd.DataFrame(yeni_kayitlar)
-        if 'yuva_ici_canli_yavru' in yeni_df.columns and 'toplam_yumurta_sayisi' in yeni_df.columns:
-            canli = pd.to_numeric(yeni_df['yuva_ici_canli_yavru'], errors='coerce').fillna(0)
-            toplam = pd.to_numeric(yeni_df['toplam_yumurta_sayisi'], errors='coerce').fillna(0)
-            yeni_df['yuva_basarisi_yuzde'] = np.divide(canli * 100, toplam, out=np.zeros_like(canli, dtype=float),
-                                                       where=toplam != 0).round(2)
+def _alan_surumlerini_guncelle(conn):
+    """
+    Değişiklik günlüğünde henüz işlenmemiş yerel değişiklikleri alan damgalarına çevirir.
+    Sadece son çağrıdan bu yana eklenen günlük satırları okunur; ilk çağrıda mevcut
+    tüm kayıtlar sıfır zaman damgasıyla bir kez kataloglanır.
+    """
+    cihaz = cihaz_kimligi(conn)
+    islenen_seq = _senkron_ayari(conn, 'islenen_seq')
+    with conn:
+        if islenen_seq is None:
+            damgalar = []
+            for satir in conn.execute(f"SELECT {_json_nesnesi('yuvalar')} FROM yuvalar"):
+                durum = json.loads(satir[0])
+                damgalar.extend((durum['id'], durum['yil'], s, 0.0, cihaz, 0) for s in [SILINME_ALANI] + YUVA_SUTUNLARI[2:]
+                                if s == SILINME_ALANI or durum.get(s) is not None)
+            conn.executemany("INSERT OR IGNORE INTO alan_surumleri VALUES (?, ?, ?, ?, ?, ?)", damgalar)
+            islenen_seq = 0
+        kayitlar = conn.execute(
+            "SELECT d.seq, d.tur, d.id, d.yil, d.eski, d.yeni, i.zaman, i.tur FROM degisiklik_gunlugu d "
+            "LEFT JOIN gunluk_islemleri i ON i.islem_no = d.islem_no WHERE d.seq > ? ORDER BY d.seq",
+            (int(islenen_seq),)).fetchall()
+        damgalar = []
+        for seq, tur, yuva_id, yil, eski, yeni, zaman, islem_turu in kayitlar:
+            if islem_turu in ('senkron', 'arsiv'): continue  # Senkronizasyonla gelenler ve sezon arşivleme taşımaları yayılmaz
+            eski = json.loads(eski) if eski else {}; yeni = json.loads(yeni) if yeni else {}
+            if tur == 'UPDATE': degisenler = [s for s in YUVA_SUTUNLARI[2:] if eski.get(s) != yeni.get(s)]
+            elif tur == 'INSERT': degisenler = [SILINME_ALANI] + [s for s in YUVA_SUTUNLARI[2:] if yeni.get(s) is not None]
+            else: degisenler = [SILINME_ALANI]
+            damgalar.extend((yuva_id, yil, s, zaman or time.time(), cihaz, seq) for s in degisenler)
+        conn.executemany("INSERT OR REPLACE INTO alan_surumleri VALUES (?, ?, ?, ?, ?, ?)", damgalar)
+        if kayitlar: islenen_seq = kayitlar[-1][0]
+        conn.execute("INSERT OR REPLACE INTO senkron_ayarlari VALUES ('islenen_seq', ?)", (str(islenen_seq),))
+
+
+def satir_ozetleri(conn):
+    """Her yuva satırının içerik özetini {(id, yil): sha1} olarak döner."""
+    return {(yuva_id, yil): hashlib.sha1(durum.encode('utf-8')).hexdigest() for yuva_id, yil, durum in
+            conn.execute(f"SELECT id, yil, {_json_nesnesi('yuvalar')} FROM yuvalar")}
+
+
+def degisiklik_paketi_olustur(conn, karsi_cihaz, karsi_ozetleri=None):
+    """
+    Karşı cihazın henüz görmediği alan değişikliklerini (id, yil) bazında toplayıp
+    zlib ile sıkıştırılmış bir JSON paketi olarak döner. 'karsi_ozetleri' verilirse
+    (iki kopyanın ilk senkronizasyonu) içeriği karşı taraftakiyle aynı olan satırlar ve
+    iki tarafta da bulunmayan silinmiş satırlar gönderilmez; ortak bir dosyadan türeyen
+    kopyalar yalnızca farklılaşan satırları taşır.
+    """
+    _alan_surumlerini_guncelle(conn)
+    gonderilen_seq = conn.execute("SELECT gonderilen_seq FROM senkron_esleri WHERE cihaz = ?", (karsi_cihaz,)).fetchone()
+    gonderilen_seq = gonderilen_seq[0] if gonderilen_seq else -1
+    son_seq = conn.execute("SELECT COALESCE(MAX(yerel_seq), ?) FROM alan_surumleri WHERE yerel_seq > ?",
+                           (gonderilen_seq, gonderilen_seq)).fetchone()[0]
+    degisiklikler = {}
+    for yuva_id, yil, sutun, zaman, cihaz in conn.execute(
+            "SELECT id, yil, sutun, zaman, cihaz FROM alan_surumleri WHERE yerel_seq > ? AND cihaz != ?",
+            (gonderilen_seq, karsi_cihaz)):
+        degisiklikler.setdefault((yuva_id, yil), {})[sutun] = (zaman, cihaz)
+    kayitlar = []
+    for (yuva_id, yil), alanlar in degisiklikler.items():
+        satir = conn.execute(f"SELECT {_json_nesnesi('yuvalar')} FROM yuvalar WHERE id = ? AND yil = ?", (yuva_id, yil)).fetchone()
+        ozet = hashlib.sha1(satir[0].encode('utf-8')).hexdigest() if satir else None
+        if karsi_ozetleri is not None and karsi_ozetleri.get((yuva_id, yil)) == ozet: continue  # Karşıda aynı satır var ya da satır iki tarafta da yok
+        durum = json.loads(satir[0]) if satir else None
+        kayitlar.append({"id": yuva_id, "yil": yil, "alanlar": {
+            s: [(0 if durum else 1) if s == SILINME_ALANI else (durum or {}).get(s), zaman, cihaz]
+            for s, (zaman, cihaz) in alanlar.items()}})
+    paket = {"kaynak": cihaz_kimligi(conn), "hedef": karsi_cihaz, "son_seq": son_seq, "kayitlar": kayitlar}
+    return zlib.compress(json.dumps(paket, default=str).encode('utf-8'))
+
+
+def degisiklik_paketi_uygula(conn, paket_verisi):
+    """
+    Bir değişiklik paketini tek transaction içinde uygular. Her alan için gelen damga
+    yereldekinden yeniyse gelen değer alınır. Uygulama özetini döner.
+    """
+    _alan_surumlerini_guncelle(conn)
+    paket = json.loads(zlib.decompress(paket_verisi))
+    ozet = {"kaynak": paket["kaynak"], "kayit": len(paket["kayitlar"]), "alinan_alan": 0, "reddedilen_alan": 0, "silinen": 0}
+    arsivli = arsivli_sezonlar(conn)
+    with conn, gunluk_islemi(conn, f"Senkronizasyon: {paket['kaynak']}", tur='senkron'):
+        yeni_damgalar = []
+        for kayit in paket["kayitlar"]:
+            anahtar = (kayit["id"], kayit["yil"])
+            if kayit["yil"] in arsivli: ozet["reddedilen_alan"] += len(kayit["alanlar"]); continue  # Arşivlenmiş sezonlar salt okunur
+            yerel = {s: (z, c) for s, z, c in conn.execute(
+                "SELECT sutun, zaman, cihaz FROM alan_surumleri WHERE id = ? AND yil = ?", anahtar)}
+            kazananlar = {s: v for s, v in kayit["alanlar"].items()
+                          if s in SENKRON_ALANLARI and (v[1], v[2]) > yerel.get(s, (-1.0, ""))}
+            silindi = kazananlar.get(SILINME_ALANI, [None])[0]
+            satir_var = conn.execute("SELECT 1 FROM yuvalar WHERE id = ? AND yil = ?", anahtar).fetchone()
+            if not satir_var and silindi is None and SILINME_ALANI in yerel: kazananlar = {}
+            ozet["alinan_alan"] += len(kazananlar); ozet["reddedilen_alan"] += len(kayit["alanlar"]) - len(kazananlar)
+            if not kazananlar: continue
+            yeni_damgalar.extend((*anahtar, s, v[1], v[2]) for s, v in kazananlar.items())
+            if silindi == 1:
+                conn.execute("DELETE FROM yuvalar WHERE id = ? AND yil = ?", anahtar); ozet["silinen"] += 1; continue
+            degerler = {s: v[0] for s, v in kazananlar.items() if s != SILINME_ALANI}
+            if satir_var and degerler:
+                conn.execute(f"UPDATE yuvalar SET {', '.join(f'{s} = ?' for s in degerler)} WHERE id = ? AND yil = ?",
+                             [*degerler.values(), *anahtar])
+            elif not satir_var:
+                sutunlar = ['id', 'yil', *degerler]
+                conn.execute(f"INSERT INTO yuvalar ({', '.join(sutunlar)}) VALUES ({', '.join(['?'] * len(sutunlar))})",
+                             [*anahtar, *degerler.values()])
+        yerel_seq = veri_surumu(conn)
+        conn.executemany("INSERT OR REPLACE INTO alan_surumleri VALUES (?, ?, ?, ?, ?, ?)",
+                         [(*d, yerel_seq) for d in yeni_damgalar])
+        conn.execute("INSERT INTO senkron_esleri (cihaz, alinan_seq, son_senkron) VALUES (?, ?, ?) "
+                     "ON CONFLICT(cihaz) DO UPDATE SET alinan_seq = excluded.alinan_seq, son_senkron = excluded.son_senkron",
+                     (paket["kaynak"], paket["son_seq"], time.time()))
+    return ozet
+
+
+def _gonderim_onayla(conn, karsi_cihaz, son_seq):
+    with conn:
+        conn.execute("INSERT INTO senkron_esleri (cihaz, gonderilen_seq, son_senkron) VALUES (?, ?, ?) "
+                     "ON CONFLICT(cihaz) DO UPDATE SET gonderilen_seq = excluded.gonderilen_seq, son_senkron = excluded.son_senkron",
+                     (karsi_cihaz, son_seq, time.time()))
+
+
+def veritabanlarini_senkronize_et(yol_a, yol_b):
+    """
+    İki veritabanı kopyasını çift yönlü senkronize eder. Her yönde sadece karşı tarafın
+    görmediği değişiklikler sıkıştırılmış paketle taşınır. (basarili, mesaj, ozet) döner.
+    """
+    try:
+        t0 = time.perf_counter()
+        setup_database(yol_a); setup_database(yol_b)
+        conn_a = get_connection(yol_a); conn_b = get_connection(yol_b)
+        try:
+            kimlik_a = cihaz_kimligi(conn_a); kimlik_b = cihaz_kimligi(conn_b)
+            ozet = {}
+            if kimlik_a == kimlik_b:
+                # Dosya kopyalanarak kurulmuş yeni bir saha kopyası; karşı dosyaya kendi kimliği verilir.
+                kimlik_b = cihaz_kimligini_yenile(conn_b); ozet["yeni_kimlik"] = kimlik_b
+            for kaynak, hedef, kaynak_kimlik, hedef_kimlik, yon in ((conn_a, conn_b, kimlik_a, kimlik_b, "a_to_b"), (conn_b, conn_a, kimlik_b, kimlik_a, "b_to_a")):
+                ilk_senkron = kaynak.execute("SELECT COALESCE(MAX(gonderilen_seq), -1) FROM senkron_esleri WHERE cihaz = ?", (hedef_kimlik,)).fetchone()[0] < 0
+                paket = degisiklik_paketi_olustur(kaynak, hedef_kimlik, satir_ozetleri(hedef) if ilk_senkron else None)
+                ozet[yon] = {"paket_bayt": len(paket), **degisiklik_paketi_uygula(hedef, paket)}
+                _gonderim_onayla(kaynak, hedef_kimlik, json.loads(zlib.decompress(paket))["son_seq"])
+            _alan_surumlerini_guncelle(conn_a); _alan_surumlerini_guncelle(conn_b)
+        finally:
+            conn_a.close(); conn_b.close()
+        ozet["sure_sn"] = round(time.perf_counter() - t0, 3)
+        mesaj = (f"Senkronizasyon tamamlandı: {ozet['a_to_b']['kayit']} kayıt gönderildi, {ozet['b_to_a']['kayit']} kayıt alındı "
+                 f"({ozet['a_to_b']['paket_bayt'] + ozet['b_to_a']['paket_bayt']} bayt, {ozet['sure_sn']} sn).")
+        if "yeni_kimlik" in ozet: mesaj += f" Diğer dosya bu veritabanının kopyasıydı; yeni cihaz kimliği atandı ({ozet['yeni_kimlik']})."
+        logging.info(mesaj)
+        return True, mesaj, ozet
+    except Exception as e:
+        logging.error(f"Senkronizasyon hatası: {e}", exc_info=True)
+        return False, f"Senkronizasyon hatası: {e}", {}
 
-        yeni_df['yuva_tarihi'] = yeni_df['yuva_tarihi'].dt.strftime('%Y-%m-%d')
 
-        cursor = conn.cursor()
-        cursor.execute("PRAGMA table_info(yuvalar)")
-        db_sutunlar = {row[1] for row in cursor.fetchall()}
+# --- Yerel Çok Kullanıcılı API Sunucusu ---
 
-        eklenecek_df = yeni_df[[col for col in yeni_df.columns if col in db_sutunlar]]
+_BAGLANTI_HAVUZLARI = weakref.WeakSet()  # Arşivden çıkarma sırasında arşivleri bırakması gereken açık havuzlar
 
-        eklenecek_df.to_sql('yuvalar', conn, if_exists='append', index=False)
-        conn.close()
-        return len(eklenecek_df), f"{len(eklenecek_df)} yeni kayıt başarıyla eklendi."
-    except Exception as e:
-        logging.error(f"Excel aktarım hatası: {e}", exc_info=True)
-        return 0, f"Excel aktarım hatası: {e}"
 
+class BaglantiHavuzu:
+    """
+    İş parçacıkları arasında paylaşılan sabit boyutlu SQLite bağlantı havuzu. Arşiv klasörü
+    değiştiyse (başka bir süreçte de olsa) bağlantının arşivleri verilmeden önce yeniden bağlanır.
+    """
+    _BAGLANMADI = object()
+
+    def __init__(self, db_yolu, boyut=4, satir_fabrikasi=sqlite3.Row):
+        self.db_yolu = db_yolu; self.boyut = boyut
+        self.arsiv_sahibi = _ANLIK_GORUNTULER[db_yolu][1] if db_yolu in _ANLIK_GORUNTULER else db_yolu
+        self._bos_baglantilar = queue.Queue(); self._arsiv_imzalari = {}
+        for _ in range(boyut):
+            imza = arsiv_imzasi(self.arsiv_sahibi)  # Bağlanmadan önce okunur; arada değişirse ilk kullanımda yakalanır
+            conn = get_connection(db_yolu, check_same_thread=False); conn.row_factory = satir_fabrikasi
+            self._arsiv_imzalari[conn] = imza; self._bos_baglantilar.put(conn)
+        _BAGLANTI_HAVUZLARI.add(self)
+
+    @contextlib.contextmanager
+    def baglanti(self):
+        conn = self._bos_baglantilar.get()
+        try:
+            imza = arsiv_imzasi(self.arsiv_sahibi)
+            if imza != self._arsiv_imzalari[conn]: arsivleri_yeniden_bagla(conn, self.db_yolu); self._arsiv_imzalari[conn] = imza
+            yield conn
+        finally: self._bos_baglantilar.put(conn)
+
+    @contextlib.contextmanager
+    def arsivleri_birak(self):
+        """Kullanımdakilerin dönmesini bekleyip tüm bağlantıları alır ve arşivlerini bırakır; blok boyunca havuz bekler."""
+        baglantilar = [self._bos_baglantilar.get() for _ in range(self.boyut)]
+        try:
+            for conn in baglantilar: arsivleri_yeniden_bagla(conn, self.db_yolu, arsivsiz=True); self._arsiv_imzalari[conn] = self._BAGLANMADI
+            yield
+        finally:
+            for conn in baglantilar: self._bos_baglantilar.put(conn)
 
-def yuva_var_mi(id, yil):
-    """Belirtilen ID ve YIL kombinasyonunun veritabanında olup olmadığını kontrol eder."""
-    conn = get_connection();
-    cursor = conn.cursor();
-    cursor.execute("SELECT 1 FROM yuvalar WHERE id = ? AND yil = ?", (id, yil));
-    result = cursor.fetchone();
-    conn.close();
-    return result is not None
+    def kapat(self):
+        _BAGLANTI_HAVUZLARI.discard(self)
+        for _ in range(self.boyut): self._bos_baglantilar.get().close()
 
 
-def yuva_ekle(yuva_verisi):
-    """Verilen yuva verisini, 'yil' sütununu otomatik ekleyerek kaydeder."""
-    conn = get_connection();
-    cursor = conn.cursor()
-    if 'yuva_tarihi' in yuva_verisi and yuva_verisi['yuva_tarihi']:
+class YerelApiSunucusu:
+    """
+    Veritabanı işlemlerini yerel ağda HTTP/JSON üzerinden sunan asyncio tabanlı sunucu.
+    Okumalar bağlantı havuzundan paralel yürütülür; tüm yazmalar tek bir yazıcı
+    kuyruğundan sırayla geçer. Liste ve istatistik yanıtları veri sürümüyle (ETag)
+    önbelleğe alınır, değişmeyen veri için 304 döner. Kimlik doğrulama yoktur;
+    yalnızca güvenilen bir makinede/ağda dinletilmelidir.
+    """
+    VARSAYILAN_SAYFA_BOYUTU = 500
+    EN_BUYUK_SAYFA_BOYUTU = 5000
+    EN_BUYUK_GOVDE_BAYT = 32 * 1024 * 1024
+
+    def __init__(self, db_yolu=None, havuz_boyutu=4, onbellek_boyutu=256):
+        self.db_yolu = db_yolu or DB_PATH
+        self.havuz_boyutu = havuz_boyutu
+        self.onbellek_boyutu = onbellek_boyutu
+        self._yanit_onbellegi = collections.OrderedDict(); self._onbellek_kilidi = threading.Lock()
+        self._rotalar = {
+            ("GET", "/api/surum"): self._surum,
+            ("GET", "/api/yuvalar"): self._yuvalari_listele,
+            ("GET", "/api/istatistik"): self._istatistik,
+            ("GET", "/api/degisiklikler"): self._degisiklikler,
+            ("POST", "/api/yuvalar"): self._yuva_ekle,
+            ("POST", "/api/predasyon"): self._predasyon_guncelle,
+            ("POST", "/api/ice-aktar"): self._ice_aktar,
+        }
+
+    # -- Yaşam döngüsü --
+    async def baslat(self, host="127.0.0.1", port=8765):
+        conn = sqlite3.connect(self.db_yolu); conn.execute("PRAGMA journal_mode=WAL"); conn.close()
+        self.havuz = BaglantiHavuzu(self.db_yolu, self.havuz_boyutu)
+        self.okuma_yurutucusu = concurrent.futures.ThreadPoolExecutor(self.havuz_boyutu, thread_name_prefix="api-okuma")
+        self.yazma_yurutucusu = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="api-yazma")
+        self.yazma_havuzu = BaglantiHavuzu(self.db_yolu, 1, satir_fabrikasi=None)
+        self.yazma_kuyrugu = asyncio.Queue()
+        self._yazici_gorevi = asyncio.create_task(self._yazici_dongusu())
+        self.sunucu = await asyncio.start_server(self._istemciyi_isle, host, port)
+        self.adres = self.sunucu.sockets[0].getsockname()[:2]
+        logging.info(f"Yerel API sunucusu başlatıldı: http://{self.adres[0]}:{self.adres[1]}")
+        if host not in ("127.0.0.1", "localhost", "::1"):
+            logging.warning(f"API sunucusu kimlik doğrulamasız olarak {host} adresinde dinliyor; ağdaki herkes veritabanına yazabilir.")
+        return self
+
+    async def durdur(self):
+        self.sunucu.close(); await self.sunucu.wait_closed()
+        self._yazici_gorevi.cancel()
+        self.okuma_yurutucusu.shutdown(); self.yazma_yurutucusu.shutdown()
+        self.havuz.kapat()
+        with self.yazma_havuzu.baglanti() as conn: conn.execute("PRAGMA wal_checkpoint(TRUNCATE)"); conn.execute("PRAGMA journal_mode=DELETE")
+        self.yazma_havuzu.kapat()
+        logging.info("Yerel API sunucusu durduruldu.")
+
+    # -- Okuma / yazma yürütme --
+    async def _oku(self, fonksiyon, *args):
+        def calistir():
+            with self.havuz.baglanti() as conn: return fonksiyon(conn, *args)
+        return await asyncio.get_running_loop().run_in_executor(self.okuma_yurutucusu, calistir)
+
+    async def _yaz(self, islem):
+        """Bir YuvaIslemBirimi'ni yazıcı kuyruğuna bırakır ve uygulanmasını bekler."""
+        future = asyncio.get_running_loop().create_future()
+        await self.yazma_kuyrugu.put((islem, future))
+        return await future
+
+    def _yazmayi_uygula(self, islem):
+        with self.yazma_havuzu.baglanti() as conn: return islem.uygula(conn)
+
+    async def _yazici_dongusu(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            islem, future = await self.yazma_kuyrugu.get()
+            try: sonuc = await loop.run_in_executor(self.yazma_yurutucusu, self._yazmayi_uygula, islem)
+            except Exception as e:
+                if not future.done(): future.set_exception(e)
+            else:
+                if not future.done(): future.set_result(sonuc)
+
+    # -- HTTP --
+    async def _istemciyi_isle(self, reader, writer):
         try:
-            yuva_verisi['yil'] = datetime.strptime(yuva_verisi['yuva_tarihi'], '%Y-%m-%d').year
-        except (ValueError, TypeError):
-            logging.error(f"Geçersiz tarih: {yuva_verisi['yuva_tarihi']}."); conn.close(); return
+            while True:
+                istek_satiri = await reader.readline()
+                if not istek_satiri: break
+                yontem, hedef, _ = istek_satiri.decode('latin-1').split(' ', 2)
+                basliklar = {}
+                while True:
+                    satir = await reader.readline()
+                    if satir in (b'\r\n', b'\n', b''): break
+                    anahtar, _, deger = satir.decode('latin-1').partition(':'); basliklar[anahtar.strip().lower()] = deger.strip()
+                govde_boyutu = int(basliklar.get('content-length', 0) or 0)
+                if not 0 <= govde_boyutu <= self.EN_BUYUK_GOVDE_BAYT:
+                    # Gövde okunmadan reddedilir; bağlantı kapatılır çünkü okunmayan gövde akışta kalır.
+                    durum, yanit_basliklari, yanit_govdesi = self._json_yanit(413, {"hata": f"İstek gövdesi en fazla {self.EN_BUYUK_GOVDE_BAYT} bayt olabilir."})
+                    kapat = True
+                else:
+                    govde = await reader.readexactly(govde_boyutu)
+                    durum, yanit_basliklari, yanit_govdesi = await self._istegi_yonlendir(yontem, hedef, basliklar, govde)
+                    kapat = basliklar.get('connection', '').lower() == 'close'
+                yanit_basliklari.update({"Content-Length": str(len(yanit_govdesi)), "Connection": "close" if kapat else "keep-alive"})
+                baslik_metni = "".join(f"{k}: {v}\r\n" for k, v in yanit_basliklari.items())
+                writer.write(f"HTTP/1.1 {durum} {HTTPStatus(durum).phrase}\r\n{baslik_metni}\r\n".encode('latin-1') + yanit_govdesi)
+                await writer.drain()
+                if kapat: break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _istegi_yonlendir(self, yontem, hedef, basliklar, govde):
+        url = urllib.parse.urlsplit(hedef); parametreler = dict(urllib.parse.parse_qsl(url.query))
+        isleyici = self._rotalar.get((yontem, url.path))
+        if isleyici is None: return self._json_yanit(404, {"hata": f"Bilinmeyen adres: {yontem} {url.path}"})
+        try:
+            if yontem == "GET":
+                surum, yanit_govdesi = await self._oku(self._okuma_yaniti, hedef, isleyici, parametreler, basliklar.get('if-none-match'))
+                etag = f'"{surum}"'
+                if yanit_govdesi is None: return 304, {"ETag": etag}, b""
+                return 200, {"Content-Type": "application/json; charset=utf-8", "ETag": etag, "Cache-Control": "no-cache"}, yanit_govdesi
+            return self._json_yanit(200, await isleyici(parametreler, json.loads(govde or b"null")))
+        except sqlite3.IntegrityError as e: return self._json_yanit(409, {"hata": str(e)})
+        except (ValueError, KeyError, TypeError) as e: return self._json_yanit(400, {"hata": str(e)})
+        except Exception as e:
+            logging.error(f"API isteği işlenirken hata: {yontem} {hedef}: {e}", exc_info=True)
+            return self._json_yanit(500, {"hata": str(e)})
 
-    sutunlar_list = [k for k, v in yuva_verisi.items() if v is not None]
-    degerler = [v for k, v in yuva_verisi.items() if v is not None]
-    if 'yil' not in sutunlar_list: logging.error("Yuva verisinde 'yil' bilgisi eksik."); conn.close(); return
+    def _okuma_yaniti(self, conn, hedef, isleyici, parametreler, istemci_etag):
+        """
+        Veri sürümünü ve yanıtı aynı okuma işleminde (tek anlık görüntü) üretir; böylece
+        ETag her zaman gövdedeki verinin sürümüdür. Veri değişmediyse gövde yerine None döner.
+        """
+        conn.execute("BEGIN")
+        try:
+            surum = veri_surumu(conn)
+            if istemci_etag == f'"{surum}"': return surum, None
+            onbellek_anahtari = (hedef, surum)
+            with self._onbellek_kilidi:
+                if onbellek_anahtari in self._yanit_onbellegi:
+                    self._yanit_onbellegi.move_to_end(onbellek_anahtari); return surum, self._yanit_onbellegi[onbellek_anahtari]
+            yanit_govdesi = json.dumps(isleyici(conn, parametreler, surum), ensure_ascii=False, default=str).encode('utf-8')
+        finally:
+            conn.rollback()
+        with self._onbellek_kilidi:
+            self._yanit_onbellegi[onbellek_anahtari] = yanit_govdesi
+            while len(self._yanit_onbellegi) > self.onbellek_boyutu: self._yanit_onbellegi.popitem(last=False)
+        return surum, yanit_govdesi
+
+    @staticmethod
+    def _json_yanit(durum, veri):
+        return durum, {"Content-Type": "application/json; charset=utf-8"}, json.dumps(veri, ensure_ascii=False, default=str).encode('utf-8')
+
+    # -- Uç noktalar (GET uç noktaları okuma işleminin bağlantısıyla çağrılır) --
+    def _surum(self, conn, parametreler, surum):
+        return {"veri_surumu": surum}
+
+    def _yuvalari_listele(self, conn, parametreler, surum):
+        """Sayfalı yuva listesi. 'sonra=YIL:ID' imleci ile anahtar sırasına göre sonraki sayfa alınır."""
+        limit = max(1, min(int(parametreler.get('limit', self.VARSAYILAN_SAYFA_BOYUTU)), self.EN_BUYUK_SAYFA_BOYUTU))
+        kosullar, degerler = [], []
+        if 'yil' in parametreler: kosullar.append("yil = ?"); degerler.append(int(parametreler['yil']))
+        if 'durum' in parametreler: kosullar.append("predasyon_durumu = ?"); degerler.append(parametreler['durum'])
+        if parametreler.get('sonra'):
+            imlec_yil, imlec_id = (int(p) for p in parametreler['sonra'].split(':'))
+            kosullar.append("(yil, id) > (?, ?)"); degerler.extend([imlec_yil, imlec_id])
+        sorgu = ("SELECT * FROM {kaynak}" + (" WHERE " + " AND ".join(kosullar) if kosullar else "") +
+                 " ORDER BY yil, id LIMIT ?")
+        kaynak = yuva_kaynagi(conn, parametreler.get('yil'))
+        yuvalar = [_yuva_satirini_coz(row) for row in conn.execute(sorgu.format(kaynak=kaynak), degerler + [limit + 1])]
+        sonraki = f"{yuvalar[limit - 1]['yil']}:{yuvalar[limit - 1]['id']}" if len(yuvalar) > limit else None
+        return {"veri_surumu": surum, "yuvalar": yuvalar[:limit], "sonraki": sonraki}
+
+    def _istatistik(self, conn, parametreler, surum):
+        kosul, degerler = ("WHERE yil = ?", [int(parametreler['yil'])]) if 'yil' in parametreler else ("", [])
+        toplam, basari, kulucka, predasyonlu = conn.execute(
+            "SELECT COUNT(*), AVG(yuva_basarisi_yuzde), AVG(kulucka_suresi_gun), "
+            f"SUM(predasyon_durumu IN ('tam', 'yari', 'kismi')) FROM {yuva_kaynagi(conn, parametreler.get('yil'))} {kosul}", degerler).fetchone()
+        return {"veri_surumu": surum, "toplam_yuva": toplam, "ortalama_basari_yuzde": basari, "ortalama_kulucka_gun": kulucka,
+                "predasyonlu_yuva": predasyonlu or 0,
+                "predasyon_orani_yuzde": (predasyonlu or 0) * 100 / toplam if toplam else 0}
+
+    def _degisiklikler(self, conn, parametreler, surum):
+        yeni_seq, degisenler = degisiklikleri_getir(int(parametreler.get('sonra', 0)), conn)
+        return {"veri_surumu": yeni_seq, "degisenler": sorted(degisenler)}
+
+    async def _yuva_ekle(self, parametreler, veri):
+        kayitlar = veri if isinstance(veri, list) else [veri]
+        islem = YuvaIslemBirimi(f"API: {len(kayitlar)} yuva yazıldı")
+        for kayit in kayitlar:
+            if parametreler.get('upsert') == '1': islem.upsert(kayit)
+            else: islem.ekle(kayit)
+        return await self._yaz(islem)
+
+    async def _predasyon_guncelle(self, parametreler, veri):
+        guncellemeler = veri if isinstance(veri, list) else [veri]
+        islem = YuvaIslemBirimi(f"API: {len(guncellemeler)} predasyon güncellemesi")
+        for g in guncellemeler: islem.predasyon_guncelle(g['id'], g['yil'], g['durum'], g.get('turler', []))
+        return await self._yaz(islem)
+
+    async def _ice_aktar(self, parametreler, veri):
+        islem = YuvaIslemBirimi(f"API: toplu içe aktarım ({len(veri['yuvalar'])} kayıt)")
+        for kayit in veri['yuvalar']: islem.upsert(kayit)
+        return await self._yaz(islem)
+
+
+def sunucuyu_calistir(host="127.0.0.1", port=8765, havuz_boyutu=4):
+    """Sunucuyu başlatır ve Ctrl+C ile durdurulana kadar çalıştırır."""
+    async def ana():
+        sunucu = await YerelApiSunucusu(havuz_boyutu=havuz_boyutu).baslat(host, port)
+        print(f"Patara API sunucusu dinleniyor: http://{sunucu.adres[0]}:{sunucu.adres[1]} (durdurmak için Ctrl+C)")
+        try: await asyncio.Event().wait()
+        finally: await sunucu.durdur()
+    try: asyncio.run(ana())
+    except KeyboardInterrupt: pass
+
+
+class SunucuIstemcisi:
+    """
+    Yerel API sunucusu için ince istemci. GET yanıtlarını ETag ile önbelleğe alır;
+    veri değişmediyse sunucu 304 döner ve önbellekteki yanıt kullanılır.
+    """
 
-    sutunlar = ', '.join(sutunlar_list);
-    yer_tutucular = ', '.join(['?'] * len(sutunlar_list))
-    try:
-        cursor.execute(f"INSERT INTO yuvalar ({sutunlar}) VALUES ({yer_tutucular})", degerler); conn.commit()
-    except sqlite3.IntegrityError:
-        logging.error(f"Bileşik anahtar hatası: ID {yuva_verisi.get('id')} YIL {yuva_verisi.get('yil')} zaten mevcut.")
-    finally:
-        conn.close()
+    def __init__(self, adres, zaman_asimi=30):
+        self.adres = adres.rstrip('/')
+        self.zaman_asimi = zaman_asimi
+        self._onbellek = {}
 
+    def _istek(self, yontem, yol, veri=None):
+        basliklar = {"Content-Type": "application/json"}
+        if yontem == "GET" and yol in self._onbellek: basliklar["If-None-Match"] = self._onbellek[yol][0]
+        govde = json.dumps(veri, default=str).encode('utf-8') if veri is not None else None
+        istek = urllib.request.Request(self.adres + yol, data=govde, headers=basliklar, method=yontem)
+        try:
+            with urllib.request.urlopen(istek, timeout=self.zaman_asimi) as yanit:
+                sonuc = json.loads(yanit.read())
+                if yontem == "GET" and yanit.headers.get("ETag"): self._onbellek[yol] = (yanit.headers["ETag"], sonuc)
+                return sonuc
+        except urllib.error.HTTPError as e:
+            if e.code == 304: return self._onbellek[yol][1]
+            raise
 
-def yuva_predasyon_guncelle(id, yil, durum, turler):
-    """Belirtilen ID ve YIL'a ait yuvanın predasyon durumunu günceller."""
-    conn = get_connection();
-    cursor = conn.cursor();
-    turler_json = json.dumps(turler)
-    cursor.execute("UPDATE yuvalar SET predasyon_durumu = ?, predator_canli_listesi = ? WHERE id = ? AND yil = ?",
-                   (durum, turler_json, id, yil));
-    conn.commit();
-    conn.close()
+    def veri_surumu(self):
+        return self._istek("GET", "/api/surum")["veri_surumu"]
 
+    def yuvalar(self, yil=None, sayfa_boyutu=YerelApiSunucusu.VARSAYILAN_SAYFA_BOYUTU):
+        """Tüm sayfaları dolaşarak yuva listesini döner."""
+        yuvalar, sonra = [], None
+        while True:
+            parametreler = {"limit": sayfa_boyutu, **({"yil": yil} if yil is not None else {}), **({"sonra": sonra} if sonra else {})}
+            sayfa = self._istek("GET", "/api/yuvalar?" + urllib.parse.urlencode(parametreler))
+            yuvalar.extend(sayfa["yuvalar"]); sonra = sayfa["sonraki"]
+            if not sonra: return yuvalar
 
-def toplu_yuva_sil(yuva_kombinasyonlari):
-    """Verilen (id, yil) listesindeki tüm yuvaları tek bir sorguyla siler."""
-    if not yuva_kombinasyonlari: return
-    conn = get_connection();
-    cursor = conn.cursor()
+    def istatistik(self, yil=None):
+        return self._istek("GET", "/api/istatistik" + (f"?yil={yil}" if yil is not None else ""))
+
+    def yuva_ekle(self, yuva_verisi, upsert=False):
+        return self._istek("POST", "/api/yuvalar" + ("?upsert=1" if upsert else ""), yuva_verisi)
+
+    def predasyon_guncelle(self, id, yil, durum, turler):
+        return self._istek("POST", "/api/predasyon", {"id": id, "yil": yil, "durum": durum, "turler": turler})
+
+    def ice_aktar(self, yuvalar):
+        return self._istek("POST", "/api/ice-aktar", {"yuvalar": yuvalar})
+
+
+def sunucu_yuk_testi(istemci_sayisi=8, istek_sayisi=200, yazma_orani=0.1, havuz_boyutu=4):
+    """
+    Sunucuyu veritabanının geçici bir kopyası üzerinde boş bir portta başlatıp eşzamanlı
+    istemcilerle yük altında ölçer; canlı veritabanına yazılmaz.
+    Saniyedeki istek sayısı ve gecikme yüzdeliklerini içeren bir sözlük döner.
+    """
+    sonuc_kutusu = {}; hazir = threading.Event()
+    gecici_klasor = tempfile.mkdtemp(prefix="patara_yuk_testi_"); db_kopyasi = os.path.join(gecici_klasor, "yuk_testi.db")
+    shutil.copy2(DB_PATH, db_kopyasi)
+
+    def sunucu_is_parcacigi():
+        async def ana():
+            sunucu = await YerelApiSunucusu(db_yolu=db_kopyasi, havuz_boyutu=havuz_boyutu).baslat("127.0.0.1", 0)
+            sonuc_kutusu['sunucu'] = sunucu; sonuc_kutusu['loop'] = asyncio.get_running_loop()
+            sonuc_kutusu['dur'] = asyncio.Event(); hazir.set()
+            await sonuc_kutusu['dur'].wait(); await sunucu.durdur()
+        asyncio.run(ana())
+    is_parcacigi = threading.Thread(target=sunucu_is_parcacigi, daemon=True); is_parcacigi.start(); hazir.wait()
+    host, port = sonuc_kutusu['sunucu'].adres; adres = f"http://{host}:{port}"
+    yil = datetime.now().year; baslangic_id = 10_000_000; yazma_adimi = round(1 / yazma_orani) if yazma_orani > 0 else 0
+
+    def istemci(istemci_no):
+        api = SunucuIstemcisi(adres); sureler = []
+        for i in range(istek_sayisi):
+            t0 = time.perf_counter()
+            if yazma_adimi and i % yazma_adimi == 0:
+                api.yuva_ekle({"id": baslangic_id + istemci_no * istek_sayisi + i, "yil": yil, "lat": 36.27, "lon": 29.29}, upsert=True)
+            elif i % 2: api.istatistik()
+            else: api._istek("GET", "/api/yuvalar?limit=100")
+            sureler.append(time.perf_counter() - t0)
+        return sureler
+    t0 = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(istemci_sayisi) as yurutucu:
+        sureler = [s for liste in yurutucu.map(istemci, range(istemci_sayisi)) for s in liste]
+    toplam_sure = time.perf_counter() - t0
+    sonuc_kutusu['loop'].call_soon_threadsafe(sonuc_kutusu['dur'].set); is_parcacigi.join()
+    shutil.rmtree(gecici_klasor, ignore_errors=True)
+    sureler_ms = np.array(sureler) * 1000
+    return {"istemci_sayisi": istemci_sayisi, "toplam_istek": len(sureler), "saniyede_istek": len(sureler) / toplam_sure,
+            "p50_ms": float(np.percentile(sureler_ms, 50)), "p95_ms": float(np.percentile(sureler_ms, 95))}
+
+
+# --- Kıyaslama (Benchmark) Paketi ---
+# Sentetik sezonlar sabit lejantların oluşturduğu kıyı hattı boyunca üretilir ve temel
+# işlemler arayüz açılmadan, geçici bir veritabanında ölçülür. Sonuçlar JSON olarak
+# saklanır; önceki bir çalıştırmayla karşılaştırılarak gerilemeler raporlanır.
+
+KIYASLAMA_ISLEMLERI = ["ice_aktar", "tam_okuma", "dataframe", "poligon_filtresi", "tampon_filtresi", "liste_doldurma",
+                       "arama", "istatistik", "simulasyon", "kiyi_indeksi", "kiyi_segment_ozeti",
+                       "sicak_nokta_dbscan", "sicak_nokta_getis_ord", "risk_modeli", "fenoloji_indeksi", "fenoloji_sorgusu", "anlamlilik_testi", "disa_aktar", "pdf_raporu", "yedekleme"]
+SENTETIK_PREDATORLER = ["domuz", "marti", "tilki", "yengec"]
+
+
+def sentetik_sezon_uret(yuva_sayisi, yil=2024, tohum=0, kiyi_hatti=None):
+    """
+    Patara kıyı hattı boyunca gerçekçi dağılımlarla sentetik bir yuvalama sezonu üretir.
+    Yuvalar hat boyunca birkaç yoğun kümeyle dağılır; yuvalama tarihi Haziran ortasında
+    tepe yapar, predasyon ve kuluçka başarısı saha verisine benzer oranlarla atanır.
+    Aynı tohum her zaman aynı DataFrame'i üretir.
+    """
+    rng = np.random.default_rng(tohum); n = int(yuva_sayisi)
+    kiyi_hatti = np.asarray(kiyi_hatti if kiyi_hatti is not None else list(load_config().get("sabit_lejantlar", {}).values()), dtype=float)
+    if len(kiyi_hatti) < 2: raise ValueError("Sentetik sezon için en az iki sabit lejant noktası gerekir.")
+
+    # Hat üzerindeki konum: %70 düzgün, %30 üç yoğun kümede (yerel metrik düzlemde).
+    enlem_m = 111_320.0; boylam_m = enlem_m * np.cos(np.radians(kiyi_hatti[:, 0].mean()))
+    xy = kiyi_hatti[:, [1, 0]] * [boylam_m, enlem_m]; farklar = np.diff(xy, axis=0)
+    uzunluklar = np.hypot(farklar[:, 0], farklar[:, 1]); kumulatif = np.concatenate([[0.0], np.cumsum(uzunluklar)])
+    kume_merkezleri = rng.uniform(0, kumulatif[-1], 3)
+    kumede = rng.random(n) < 0.3
+    mesafe = np.where(kumede, rng.choice(kume_merkezleri, n) + rng.normal(0, 250, n), rng.uniform(0, kumulatif[-1], n))
+    mesafe = np.clip(mesafe, 0, kumulatif[-1])
+    segment = np.clip(np.searchsorted(kumulatif, mesafe, side='right') - 1, 0, len(uzunluklar) - 1)
+    oran = (mesafe - kumulatif[segment]) / np.where(uzunluklar[segment] > 0, uzunluklar[segment], 1)
+    normal = np.column_stack([-farklar[segment, 1], farklar[segment, 0]]) / np.where(uzunluklar[segment] > 0, uzunluklar[segment], 1)[:, None]
+    nokta = xy[segment] + oran[:, None] * farklar[segment] + normal * rng.normal(0, 15, n)[:, None]
+
+    # Kumsal profili (metre).
+    islak = rng.gamma(2.0, 2.5, n).round(1); yari_islak = rng.gamma(2.0, 3.0, n).round(1); kuru = rng.gamma(3.0, 5.0, n).round(1)
+
+    # Tarihler: yuvalama Haziran ortası tepeli, kuluçka ~52 gün.
+    yuva_gunu = np.clip(rng.normal(0, 18, n), -45, 60).round().astype(int)
+    yuva_tarihi = pd.Timestamp(yil, 6, 15) + pd.to_timedelta(yuva_gunu, unit='D')
+    kulucka = np.clip(rng.normal(52, 4, n), 42, 65).round().astype(int)
+
+    # Predasyon ve yumurta akıbeti.
+    predasyon = rng.choice(np.array(["yok", "yari", "tam"]), n, p=[0.72, 0.18, 0.10])
+    toplam = np.clip(rng.normal(80, 18, n), 30, 140).round().astype(int)
+    dollenmemis = rng.binomial(toplam, 0.05); kalan = toplam - dollenmemis
+    predasyonlu = np.where(predasyon == "tam", kalan, np.where(predasyon == "yari", rng.binomial(kalan, 0.4), 0)); kalan = kalan - predasyonlu
+    olu_embriyo = rng.binomial(kalan, rng.beta(2, 12, n)); erken = rng.binomial(olu_embriyo, 0.5); orta = rng.binomial(olu_embriyo - erken, 0.5)
+    bos_kabuk = kalan - olu_embriyo; olu_yavru = rng.binomial(bos_kabuk, 0.03); canli = bos_kabuk - olu_yavru
+    gun_1 = rng.binomial(canli, 0.6); gun_2 = rng.binomial(canli - gun_1, 0.75)
+
+    predasyonlu_mu = predasyon != "yok"; ilk_predator = rng.choice(len(SENTETIK_PREDATORLER), n, p=[0.2, 0.15, 0.45, 0.2])
+    ikinci_predator = np.where(rng.random(n) < 0.25, (ilk_predator + rng.integers(1, len(SENTETIK_PREDATORLER), n)) % len(SENTETIK_PREDATORLER), -1)
+    predatorler = np.full(n, "[]", dtype=object)
+    predatorler[predasyonlu_mu] = [json.dumps([SENTETIK_PREDATORLER[a]] + ([SENTETIK_PREDATORLER[b]] if b >= 0 else []))
+                                   for a, b in zip(ilk_predator[predasyonlu_mu], ikinci_predator[predasyonlu_mu])]
+
+    ciktisi_var = predasyon != "tam"
+    df = pd.DataFrame({
+        'id': np.arange(1, n + 1), 'yil': yil,
+        'lat': (nokta[:, 1] / enlem_m).round(6), 'lon': (nokta[:, 0] / boylam_m).round(6),
+        'yuva_tarihi': yuva_tarihi.strftime("%Y-%m-%d"),
+        'ilk_yavru_cikis_tarihi': np.where(ciktisi_var, (yuva_tarihi + pd.to_timedelta(kulucka, unit='D')).strftime("%Y-%m-%d"), None),
+        'ikinci_predasyon_tarihi': None,
+        'kuru_kum_uzakligi': kuru, 'yari_islak_kum_uzakligi': yari_islak, 'islak_kum_uzakligi': islak,
+        'toplam_denize_uzaklik': (kuru + yari_islak + islak).round(1),
+        'tasinma_durumu': np.where(rng.random(n) < 0.08, "Evet", None), 'sicaklik_aleti_var_mi': np.where(rng.random(n) < 0.05, "Evet", None),
+        'kulucka_suresi_gun': np.where(ciktisi_var, kulucka, None), 'yuva_basarisi_yuzde': None,
+        'predasyon_durumu': predasyon, 'predator_canli_listesi': predatorler, 'marka': None,
+        'yuva_derinligi': np.clip(rng.normal(50, 6, n), 30, 75).round(1), 'yuva_capi': np.clip(rng.normal(22, 3, n), 12, 35).round(1),
+        'yuva_ici_canli_yavru': canli, 'yuva_ici_olu_yavru': olu_yavru,
+        'erken_donem_embriyo': erken, 'orta_donem_embriyo': orta, 'gec_donem_embriyo': olu_embriyo - erken - orta, 'toplam_olu_embriyo': olu_embriyo,
+        'bos_kabuk_sayisi': bos_kabuk, 'predasyonlu_yumurta_sayisi': predasyonlu, 'dollenmemis_yumurta_sayisi': dollenmemis,
+        'toplam_yumurta_sayisi': toplam, 'yavru_cikis_gun_1': gun_1, 'yavru_cikis_gun_2': gun_2, 'yavru_cikis_gun_3': canli - gun_1 - gun_2,
+    }, columns=YUVA_SUTUNLARI)
+    return basari_yuzdesini_hesapla(df)
+
+
+def _sentetik_veritabani_kur(db_yolu, df):
+    """Boş bir veritabanı oluşturup sentetik sezonu toplu olarak yazar."""
+    setup_database(db_yolu)
+    with contextlib.closing(get_connection(db_yolu)) as conn, conn, gunluk_islemi(conn, f"Sentetik sezon ({len(df)} yuva)"):
+        df.to_sql('yuvalar', conn, if_exists='append', index=False, chunksize=50_000)
+
+
+def _indeks_durumu_sifirla(db_yolu, indeks):
+    """Bir türetilmiş indeksin işlenme durumunu silerek sonraki güncellemede baştan kurulmasını sağlar."""
+    with contextlib.closing(get_connection(db_yolu)) as conn, conn:
+        _indeks_tablolarini_kur(conn); conn.execute("DELETE FROM indeks_durumu WHERE indeks = ?", (indeks,))
+
+
+def _sure_olc(islem, tekrar, hazirla=None):
+    """İşlemi 'tekrar' kez çalıştırıp en iyi ve medyan süreyi milisaniye olarak döner; hazırlık süreye katılmaz."""
+    sureler = []
+    for _ in range(tekrar):
+        girdi = hazirla() if hazirla else None
+        t0 = time.perf_counter(); islem(girdi); sureler.append((time.perf_counter() - t0) * 1000)
+    return {"en_iyi_ms": round(min(sureler), 3), "medyan_ms": round(float(np.median(sureler)), 3), "tekrar": tekrar}
+
+
+def _kiyaslama_boyutu_calistir(yuva_sayisi, tekrar, tohum, excel_siniri, klasor):
+    """Tek bir sezon boyutu için tüm işlemleri ölçer."""
+    df_sezon = sentetik_sezon_uret(yuva_sayisi, tohum=tohum)
+    db_yolu = os.path.join(klasor, f"sezon_{yuva_sayisi}.db"); _sentetik_veritabani_kur(db_yolu, df_sezon)
+    sabit_lejantlar = load_config().get("sabit_lejantlar", {}); referans_koordinat = list(sabit_lejantlar.values())[len(sabit_lejantlar) // 2]
+    lat_min, lat_max = df_sezon['lat'].quantile([0.3, 0.6]); lon_min, lon_max = df_sezon['lon'].min() - 0.01, df_sezon['lon'].max() + 0.01
+    poligon = [[lat_min, lon_min], [lat_min, lon_max], [lat_max, lon_max], [lat_max, lon_min]]
+    sonuclar = {}; excel_uygun = yuva_sayisi <= excel_siniri; atlama_notu = {"atlandi": f"Excel işlemleri {excel_siniri} yuvanın üzerinde ölçülmez."}
+
+    def olc(ad, islem, hazirla=None):
+        try: sonuclar[ad] = _sure_olc(islem, tekrar, hazirla)
+        except Exception as e: logging.error(f"Kıyaslama '{ad}' ({yuva_sayisi}) başarısız: {e}", exc_info=True); sonuclar[ad] = {"hata": str(e)}
+        logging.info(f"Kıyaslama {yuva_sayisi} / {ad}: {sonuclar[ad]}")
+
+    with veritabani_kullan(db_yolu):
+        if excel_uygun:
+            excel_yolu = os.path.join(klasor, f"sezon_{yuva_sayisi}.xlsx"); df_sezon.to_excel(excel_yolu, index=False, engine='openpyxl')
+            ice_aktarma_db = os.path.join(klasor, "ice_aktarma.db")
+
+            def ice_aktarma_hazirla():
+                if os.path.exists(ice_aktarma_db): os.remove(ice_aktarma_db)
+                setup_database(ice_aktarma_db); return ice_aktarma_db
+
+            def ice_aktar(hedef_db):
+                with veritabani_kullan(hedef_db): excelden_toplu_ekle(excel_yolu)
+            olc("ice_aktar", ice_aktar, ice_aktarma_hazirla)
+        else: sonuclar["ice_aktar"] = atlama_notu
+
+        olc("tam_okuma", lambda _: tum_yuvalari_getir())
+        olc("dataframe", lambda _: yuvalari_dataframe_yap())
+        yuvalar = tum_yuvalari_getir(); df = yuvalari_dataframe_yap()
+        olc("poligon_filtresi", lambda _: poligon_icindeki_yuvalar(yuvalar, poligon))
+        olc("tampon_filtresi", lambda _: referansa_yakin_yuvalar(yuvalar, referans_koordinat, 300))
+
+        def liste_doldur(_):
+            liste = QListWidget()
+            for yuva in sorted(yuvalar, key=lambda x: x.get('id', 0), reverse=True): liste.addItem(yuva_liste_ogesi_olustur(yuva))
+            liste.deleteLater()
+        olc("liste_doldurma", liste_doldur)
+
+        def ara(_):
+            for kriter, metin in (("ID", "12"), ("Durum", "yari"), ("Predatör", "tilki"), ("Tüm Bilgiler", "2024-06")):
+                sum(1 for yuva in yuvalar if yuva_aramaya_uyuyor_mu(yuva, metin, kriter))
+        olc("arama", ara)
+        olc("istatistik", lambda _: [grup_istatistigi_hesapla(df_grup) for _, df_grup in df.groupby(['yil', 'predasyon_durumu'])] + [grup_istatistigi_hesapla(df)])
+        olc("simulasyon", lambda _: konum_bazli_simulasyon(df, referans_koordinat, 300, "tam"))
+        kiyi_indeksi = KiyiIndeksi()
+        olc("kiyi_indeksi", lambda _: kiyi_indeksi.gecersiz_kil() or kiyi_indeksi.guncelle(), lambda: _indeks_durumu_sifirla(db_yolu, 'kiyi'))
+        olc("kiyi_segment_ozeti", lambda _: (kiyi_indeksi.segment_ozeti(), kiyi_indeksi.aralik("fener", "kum tepesi")))
+        olc("sicak_nokta_dbscan", lambda _: _sicak_nokta_hesapla.cache_clear() or sicak_nokta_analizi("dbscan", 30, 5))
+        olc("sicak_nokta_getis_ord", lambda _: _sicak_nokta_hesapla.cache_clear() or sicak_nokta_analizi("getis_ord", 30))
+        risk_modeli = PredasyonRiskModeli(); olc("risk_modeli", lambda _: risk_modeli.gecersiz_kil() or risk_modeli.guncelle())
+        fenoloji_indeksi = FenolojiIndeksi(); olc("fenoloji_indeksi", lambda _: fenoloji_indeksi.gecersiz_kil() or fenoloji_indeksi.guncelle())
+        devriye_gunu = pd.to_datetime(df['yuva_tarihi'], errors='coerce').max().date(); olc("fenoloji_sorgusu", lambda _: fenoloji_indeksi.cikmasi_beklenenler(devriye_gunu, 7))
+        df_tasinmis = df[df['tasinma_durumu'] == "Evet"]; df_yerinde = df[df['tasinma_durumu'] != "Evet"]
+        olc("anlamlilik_testi", lambda _: gruplari_karsilastir(df_tasinmis, df_yerinde))
+        if excel_uygun: olc("disa_aktar", lambda _: df.to_excel(os.path.join(klasor, "disa_aktarim.xlsx"), index=False, engine='openpyxl'))
+        else: sonuclar["disa_aktar"] = atlama_notu
+
+        def pdf_olustur(_):
+            fig = Figure(figsize=(6, 4)); ax = fig.add_subplot()
+            pd.to_numeric(df['yuva_basarisi_yuzde'], errors='coerce').dropna().plot.hist(ax=ax, bins=15, color='salmon')
+            grafik_yolu = os.path.join(klasor, "kiyaslama_grafik.png"); fig.savefig(grafik_yolu, dpi=150, bbox_inches='tight')
+            icerik = [(kriter, deger, "navy") for kriter, deger in grup_istatistigi_hesapla(df).items()]
+            basarili, mesaj = create_pdf_report(os.path.join(klasor, "kiyaslama_raporu.pdf"), "Kıyaslama Raporu", icerik, grafik_yolu=grafik_yolu)
+            if not basarili: raise RuntimeError(mesaj)
+        olc("pdf_raporu", pdf_olustur)
+        olc("yedekleme", lambda _: veritabanini_yedekle(os.path.join(klasor, "yedekler")))
+    return sonuclar
+
+
+def kiyaslama_calistir(boyutlar=(1_000, 10_000, 100_000), tekrar=3, tohum=42, excel_siniri=100_000):
+    """
+    Verilen sezon boyutları için kıyaslama paketini çalıştırır ve JSON'a yazılabilir bir sözlük döner.
+    Liste doldurma ölçümü için ekransız (offscreen) bir QApplication gerekir; yoksa oluşturulur.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    uygulama = QApplication.instance() or QApplication([sys.argv[0]])
+    sonuc = {"meta": {"tarih": datetime.now().isoformat(timespec='seconds'), "python": sys.version.split()[0], "platform": sys.platform,
+                      "numpy": np.__version__, "pandas": pd.__version__, "tekrar": tekrar, "tohum": tohum},
+             "sonuclar": {}}
+    gecici_klasor = tempfile.mkdtemp(prefix="patara_kiyaslama_")
     try:
-        cursor.execute("CREATE TEMP TABLE silinecek_yuvalar (id INTEGER, yil INTEGER)")
-        cursor.executemany("INSERT INTO silinecek_yuvalar (id, yil) VALUES (?, ?)", yuva_kombinasyonlari)
-        cursor.execute("DELETE FROM yuvalar WHERE (id, yil) IN (SELECT id, yil FROM silinecek_yuvalar)")
-        cursor.execute("DROP TABLE silinecek_yuvalar")
-        conn.commit()
-    except Exception as e:
-        conn.rollback(); logging.error(f"Toplu silme hatası: {e}", exc_info=True)
-    finally:
-        conn.close()
+        for yuva_sayisi in boyutlar:
+            t0 = time.perf_counter(); sonuc["sonuclar"][str(yuva_sayisi)] = _kiyaslama_boyutu_calistir(yuva_sayisi, tekrar, tohum, excel_siniri, gecici_klasor)
+            logging.info(f"Kıyaslama {yuva_sayisi} yuva için {time.perf_counter() - t0:.1f} sn'de tamamlandı.")
+    finally: shutil.rmtree(gecici_klasor, ignore_errors=True)
+    uygulama.processEvents()
+    return sonuc
 
 
-def tum_yuvalari_getir():
-    """Tüm yuva kayıtlarını veritabanından çeker."""
-    conn = get_connection();
-    conn.row_factory = sqlite3.Row;
-    cursor = conn.cursor();
-    cursor.execute("SELECT * FROM yuvalar");
-    yuvalar = [dict(row) for row in cursor.fetchall()]
-    for yuva in yuvalar:
-        if 'predator_canli_listesi' in yuva and yuva['predator_canli_listesi']:
-            try:
-                yuva['predator_canli_listesi'] = json.loads(yuva['predator_canli_listesi'])
-            except (json.JSONDecodeError, TypeError):
-                yuva['predator_canli_listesi'] = []
-        else:
-            yuva['predator_canli_listesi'] = []
-    conn.close();
-    return yuvalar
+def kiyaslama_karsilastir(onceki, simdiki, esik=1.2):
+    """
+    İki kıyaslama sonucunu medyan sürelere göre karşılaştırır.
+    (boyut, işlem, önceki_ms, şimdiki_ms, oran, gerileme_mi) satırlarından oluşan bir liste döner.
+    """
+    satirlar = []
+    for boyut, islemler in simdiki.get("sonuclar", {}).items():
+        for islem, olcum in islemler.items():
+            onceki_olcum = onceki.get("sonuclar", {}).get(boyut, {}).get(islem, {})
+            if "medyan_ms" not in olcum or "medyan_ms" not in onceki_olcum: continue
+            oran = olcum["medyan_ms"] / onceki_olcum["medyan_ms"] if onceki_olcum["medyan_ms"] > 0 else float('inf')
+            satirlar.append((boyut, islem, onceki_olcum["medyan_ms"], olcum["medyan_ms"], oran, oran > esik))
+    return satirlar
 
 
-def yuvalari_dataframe_yap():
-    """Tüm yuva kayıtlarını bir Pandas DataFrame'ine dönüştürür."""
-    conn = get_connection();
-    df = pd.read_sql_query("SELECT * FROM yuvalar", conn);
-    conn.close()
-    if not df.empty and 'predator_canli_listesi' in df.columns:
-        df['predator_canli_listesi'] = df['predator_canli_listesi'].apply(
-            lambda x: json.loads(x) if isinstance(x, str) and x.startswith('[') else [])
-    return df
 # ------------------------------------------------------------------------------
 # 3. BÖLÜM: ARAYÜZ SINIFLARI (TÜM DIALOG PENCERELERİ)
 # ------------------------------------------------------------------------------
 
+def yuva_liste_ogesi_olustur(yuva, risk=None):
+    """Yuva listesindeki tek bir satırı, predasyon ve başarıya göre renklendirilmiş olarak oluşturur."""
+    yuva_id = yuva.get('id', 'N/A')
+    durum = str(yuva.get('predasyon_durumu', '')).lower()
+    basari = yuva.get('yuva_basarisi_yuzde')
+
+    durum_str = durum.capitalize() if durum else 'Belirsiz'
+    item_text = f"ID: {yuva_id} - Durum: {durum_str}"
+    if risk is not None: item_text += f" - Risk: %{risk * 100:.0f}"
+
+    list_item = QListWidgetItem(item_text)
+    list_item.setData(Qt.ItemDataRole.UserRole, yuva)
+    if risk is not None: list_item.setToolTip(f"Tahmini predasyon riski: %{risk * 100:.1f}")
+
+    # --- RENKLENDİRME MANTIĞI BURADA BAŞLIYOR ---
+
+
+    if durum == "tam":
+        list_item.setForeground(QColor('white'))
+        list_item.setBackground(QColor('#DC3545'))  # Canlı Kırmızı
+
+
+    elif durum in ["yari", "kismi"]:
+        list_item.setForeground(QColor('white'))
+        list_item.setBackground(QColor('#007BFF'))  # Canlı Mavi
+
+
+    elif basari is not None:
+        if basari >= 75:
+            # Yüksek başarılı yuvalar
+            list_item.setBackground(QColor('#D4EDDA'))  # Açık Yeşil
+            list_item.setForeground(QColor('#155724'))  # Koyu Yeşil Metin
+        elif basari <= 25:
+            # Düşük başarılı yuvalar
+            list_item.setBackground(QColor('#FFF3CD'))  # Açık Sarı
+            list_item.setForeground(QColor('#856404'))  # Koyu Sarı/Kahve Metin
+
+    return list_item
+
+
 class YuvaEkleDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -437,19 +3938,20 @@ class YuvaEkleDialog(QDialog):
 class GelismisGrafikDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent); self.setWindowTitle("Gelişmiş Grafik Aracı"); self.resize(850, 700)
-        self.df = None; self.fig = None; self.canvas = None; self.readable_columns = {}; self.setup_ui(); self.load_data()
+        self.df = None; self.fig = None; self.canvas = None; self.readable_columns = {}; self.veri_kimligi = None; self.grafik_anahtari = None; self.setup_ui(); self.load_data()
     def setup_ui(self):
         layout = QVBoxLayout(self); filter_group = QGroupBox("Veri Filtrele (İsteğe Bağlı)"); filter_layout = QFormLayout(filter_group); self.baslangic_id_input = QLineEdit(); self.baslangic_id_input.setPlaceholderText("Örn: 10"); self.bitis_id_input = QLineEdit(); self.bitis_id_input.setPlaceholderText("Örn: 50"); self.belirli_idler_input = QLineEdit(); self.belirli_idler_input.setPlaceholderText("Örn: 1, 3, 5 (virgülle ayırın)"); filter_layout.addRow("ID Aralığı (Başlangıç):", self.baslangic_id_input); filter_layout.addRow("ID Aralığı (Bitiş):", self.bitis_id_input); filter_layout.addRow(QLabel("<b>--- VEYA ---</b>")); filter_layout.addRow("Belirli Yuva ID'leri:", self.belirli_idler_input); layout.addWidget(filter_group); form_layout = QFormLayout(); self.x_ekseni_combo = QComboBox(); self.y_ekseni_combo = QComboBox(); self.grafik_turu_combo = QComboBox(); form_layout.addRow("X Ekseni:", self.x_ekseni_combo); form_layout.addRow("Y Ekseni:", self.y_ekseni_combo); form_layout.addRow("Grafik Türü:", self.grafik_turu_combo); layout.addLayout(form_layout); self.plot_container = QWidget(); self.plot_layout = QVBoxLayout(self.plot_container); layout.addWidget(self.plot_container); button_layout = QHBoxLayout(); self.btn_ciz = QPushButton("Grafiği Çiz"); self.btn_kaydet = QPushButton("Grafiği PNG Olarak Kaydet"); self.btn_pdf_kaydet_grafik = QPushButton("Grafiği PDF Olarak Kaydet"); self.btn_kaydet.setEnabled(False); self.btn_pdf_kaydet_grafik.setEnabled(False); button_layout.addWidget(self.btn_ciz); button_layout.addWidget(self.btn_kaydet); button_layout.addWidget(self.btn_pdf_kaydet_grafik); layout.addLayout(button_layout); self.btn_ciz.clicked.connect(self.grafik_ciz_ve_goster); self.btn_kaydet.clicked.connect(self.grafik_kaydet); self.btn_pdf_kaydet_grafik.clicked.connect(self.grafik_pdf_kaydet); self.x_ekseni_combo.currentIndexChanged.connect(self.update_grafik_turu_options); self.y_ekseni_combo.currentIndexChanged.connect(self.update_grafik_turu_options)
     def clear_canvas(self):
         if self.canvas: self.plot_layout.removeWidget(self.canvas); self.canvas.deleteLater(); self.canvas = None
         if self.fig: plt.close(self.fig); self.fig = None
-        self.btn_kaydet.setEnabled(False); self.btn_pdf_kaydet_grafik.setEnabled(False)
+        self.grafik_anahtari = None; self.btn_kaydet.setEnabled(False); self.btn_pdf_kaydet_grafik.setEnabled(False)
     def load_data(self):
-        self.df = yuvalari_dataframe_yap(); self.btn_ciz.setEnabled(not self.df.empty)
+        self.veri_kimligi = [*veri_parmak_izi(), SicaklikDeposu().uzunluk(), olcum_imzasi()]
+        self.df = olcumleri_ekle(yuvalari_dataframe_yap(sicaklik_ozetleriyle=True)); self.btn_ciz.setEnabled(not self.df.empty)
         if self.df.empty: return
         for col in ['yuva_tarihi', 'ilk_yavru_cikis_tarihi', 'ikinci_predasyon_tarihi']:
             if col in self.df.columns: self.df[col] = pd.to_datetime(self.df[col], errors='coerce')
-        self.readable_columns = {col: col.replace('_', ' ').title() for col in self.df.columns}
+        self.readable_columns = {col: col.replace('_', ' ').title() for col in self.df.columns} | olcum_etiketleri()
         self.x_ekseni_combo.clear(); self.y_ekseni_combo.clear(); self.y_ekseni_combo.addItem("Yok (Tek Sütun Analizi)", None)
         all_columns = [col for col in self.df.columns if col not in ['lat', 'lon']]
         for col in all_columns: self.x_ekseni_combo.addItem(self.readable_columns[col], col); self.y_ekseni_combo.addItem(self.readable_columns[col], col)
@@ -504,24 +4006,27 @@ class GelismisGrafikDialog(QDialog):
                 ax.set_title(f"'{x_label}' ve '{y_label}' İlişkisi", fontsize=14); ax.set_ylabel(y_label, fontsize=10)
             ax.set_xlabel(x_label, fontsize=10); ax.grid(True, linestyle='--', alpha=0.6); self.fig.tight_layout()
             self.canvas = FigureCanvas(self.fig); self.plot_layout.addWidget(self.canvas); self.btn_kaydet.setEnabled(True); self.btn_pdf_kaydet_grafik.setEnabled(True)
+            self.grafik_anahtari = cikti_onbellegi.anahtar("grafik", veri=self.veri_kimligi, x=x_sutun, y=y_sutun, tur=grafik_turu, idler=self.belirli_idler_input.text().strip(),
+                                                           baslangic=self.baslangic_id_input.text().strip(), bitis=self.bitis_id_input.text().strip(), dpi=300)
         except Exception as e: QMessageBox.critical(self, "Grafik Hatası", f"Grafik çizilirken hata: {e}"); self.clear_canvas()
+    def grafik_png_yolu(self):
+        """Grafiğin 300 dpi PNG'sini çıktı önbelleğinden (aynı veri ve ayarlarla daha önce kaydedildiyse) ya da yeniden çizerek döner."""
+        return cikti_onbellegi.uret(self.grafik_anahtari, ".png", lambda hedef: self.fig.savefig(hedef, dpi=300, bbox_inches='tight'))
     def grafik_kaydet(self):
         if not self.fig: QMessageBox.warning(self, "Hata", "Kaydedilecek grafik yok."); return
         file_path, _ = QFileDialog.getSaveFileName(self, "Grafiği Kaydet", "grafik.png", "PNG Dosyaları (*.png)");
         if file_path:
-            try: self.fig.savefig(file_path, dpi=300, bbox_inches='tight'); QMessageBox.information(self, "Başarılı", f"Grafik kaydedildi: {file_path}")
+            try: shutil.copyfile(self.grafik_png_yolu(), file_path); QMessageBox.information(self, "Başarılı", f"Grafik kaydedildi: {file_path}")
             except Exception as e: QMessageBox.critical(self, "Hata", f"Grafik kaydedilemedi: {e}")
     def grafik_pdf_kaydet(self):
         if not self.fig: QMessageBox.warning(self, "Hata", "Kaydedilecek grafik yok."); return
         dosya_yolu, _ = QFileDialog.getSaveFileName(self, "Grafik Raporunu Kaydet", "grafik_raporu.pdf", "PDF Dosyaları (*.pdf)")
         if not dosya_yolu: return
-        gecici_grafik_yolu = os.path.join(SCRIPT_DIR, "temp_grafik.png")
-        try: self.fig.savefig(gecici_grafik_yolu, dpi=300, bbox_inches='tight')
-        except Exception as e: QMessageBox.critical(self, "Hata", f"Grafik geçici olarak kaydedilemedi: {e}"); return
+        try: grafik_yolu = self.grafik_png_yolu()
+        except Exception as e: QMessageBox.critical(self, "Hata", f"Grafik kaydedilemedi: {e}"); return
         baslik = "Patara Yuva Verileri Grafik Raporu"; x_ekseni = self.x_ekseni_combo.currentText(); y_ekseni = self.y_ekseni_combo.currentText(); grafik_turu = self.grafik_turu_combo.currentText()
         icerik = [("Analiz Edilen X Ekseni:", x_ekseni, "navy"), ("Analiz Edilen Y Ekseni:", y_ekseni, "navy"), ("Kullanılan Grafik Türü:", grafik_turu, "navy")]
-        basarili, mesaj = create_pdf_report(dosya_yolu, baslik, icerik, grafik_yolu=gecici_grafik_yolu)
-        if os.path.exists(gecici_grafik_yolu): os.remove(gecici_grafik_yolu)
+        basarili, mesaj = create_pdf_report(dosya_yolu, baslik, icerik, grafik_yolu=grafik_yolu)
         if basarili: QMessageBox.information(self, "Başarılı", mesaj)
         else: QMessageBox.critical(self, "Hata", mesaj)
     def closeEvent(self, event): self.clear_canvas(); super().closeEvent(event)
@@ -566,10 +4071,10 @@ class IstatistikDialog(QDialog):
 
 
     def hesapla_ve_goster(self):
-        """Butona basıldığında veriyi yükler, hesaplar ve gösterir."""
+        """Butona basıldığında istatistikleri (veri değişmediyse çıktı önbelleğinden) alır ve gösterir."""
         try:
-            df = yuvalari_dataframe_yap()
-            if df.empty:
+            satirlar = ozet_istatistiklerini_getir()
+            if not satirlar:
                 QMessageBox.warning(self, "Veri Yok", "Rapor oluşturulacak veri bulunamadı.")
                 return
 
@@ -581,32 +4086,9 @@ class IstatistikDialog(QDialog):
             self.form_layout = QFormLayout(self.sonuc_container)
             self.layout().addWidget(self.sonuc_container)
 
-            # İstatistikleri hesapla
-            self.hesaplanan_istatistikler = []
-
-            toplam_yuva = len(df)
-            self.form_layout.addRow("Toplam Kayıtlı Yuva Sayısı:", QLabel(f"<b>{toplam_yuva}</b>"))
-            self.hesaplanan_istatistikler.append(("Toplam Kayıtlı Yuva Sayısı:", f"{toplam_yuva}", "navy"))
-
-            ortalama_basari = pd.to_numeric(df['yuva_basarisi_yuzde'], errors='coerce').dropna().mean()
-            basari_str = f"<b>% {ortalama_basari:.2f}</b>" if pd.notna(ortalama_basari) else "N/A"
-            self.form_layout.addRow("Ortalama Yuva Başarısı:", QLabel(basari_str))
-            self.hesaplanan_istatistikler.append(
-                ("Ortalama Yuva Başarısı:", basari_str.replace("<b>", "").replace("</b>", ""), "green"))
-
-            ortalama_kulucka = pd.to_numeric(df['kulucka_suresi_gun'], errors='coerce').dropna().mean()
-            kulucka_str = f"<b>{ortalama_kulucka:.1f}</b>" if pd.notna(ortalama_kulucka) else "N/A"
-            self.form_layout.addRow("Ortalama Kuluçka Süresi (Gün):", QLabel(kulucka_str))
-            self.hesaplanan_istatistikler.append(
-                ("Ortalama Kuluçka Süresi (Gün):", kulucka_str.replace("<b>", "").replace("</b>", ""), "navy"))
-
-            predasyonlu_sayisi = len(df[df['predasyon_durumu'].isin(['tam', 'yari', 'kismi'])])
-            predasyon_orani = (predasyonlu_sayisi / toplam_yuva) * 100 if toplam_yuva > 0 else 0
-            pred_str = f"<b>{predasyonlu_sayisi} yuva (% {predasyon_orani:.2f})</b>"
-            self.form_layout.addRow("Predasyona Uğrayan Yuva Sayısı/Oranı:", QLabel(pred_str))
-            self.hesaplanan_istatistikler.append(
-                ("Predasyona Uğrayan Yuva Sayısı/Oranı:", pred_str.replace("<b>", "").replace("</b>", ""), "red"))
-
+            for etiket, deger, _ in satirlar:
+                self.form_layout.addRow(etiket, QLabel(deger if deger == "N/A" else f"<b>{deger}</b>"))
+            self.hesaplanan_istatistikler = satirlar
 
             self.btn_pdf_kaydet.setEnabled(True)
 
@@ -673,9 +4155,10 @@ class PredasyonDialog(QDialog):
 
 
 class KarsilastirmaDialog(QDialog):
+    GRUPLAMALAR = {"Yıl": "yil", "Kıyı Segmenti": "kiyi_segmenti", "Taşınma Durumu": "tasinma"}
     def __init__(self, parent=None):
-        super().__init__(parent); self.setWindowTitle("Yıllık Veri Karşılaştırma Aracı"); self.setMinimumSize(700, 500)
-        self.df = None; layout = QVBoxLayout(self)
+        super().__init__(parent); self.setWindowTitle("Yıllık Veri Karşılaştırma Aracı"); self.setMinimumSize(850, 500)
+        self.df = None; self.test_isi = None; self.bekleyen_karsilastirma = False; layout = QVBoxLayout(self)
         try:
             df_orjinal = yuvalari_dataframe_yap()
             if df_orjinal.empty or 'yuva_tarihi' not in df_orjinal.columns: layout.addWidget(QLabel("Karşılaştırma yapılacak yeterli veri bulunamadı.")); return
@@ -683,48 +4166,68 @@ class KarsilastirmaDialog(QDialog):
             self.df['yuva_tarihi_dt'] = pd.to_datetime(self.df['yuva_tarihi'], errors='coerce')
             self.df.dropna(subset=['yuva_tarihi_dt'], inplace=True)
             self.df['yil'] = self.df['yuva_tarihi_dt'].dt.year.astype(int)
-            self.setup_ui(layout); self.karsilastirmayi_yap()
+            self.df['tasinma'] = np.where(self.df['tasinma_durumu'].astype(str).str.lower() == 'evet', "Taşınmış", "Yerinde")
+            self.df['kiyi_segmenti'] = self.kiyi_segmentleri()
+            self.setup_ui(layout); self.gruplamayi_degistir()
         except Exception as e: layout.addWidget(QLabel(f"Veri hazırlanırken hata: {e}"))
+    def kiyi_segmentleri(self):
+        try:
+            kiyi = KiyiIndeksi().guncelle(); segmentler = {(i, y): kiyi.hat.segment_adi(s) for i, y, s in zip(kiyi.df['id'], kiyi.df['yil'], kiyi.df['segment'])}
+            return [segmentler.get((i, y), "Konumsuz") for i, y in zip(self.df['id'], self.df['yil'])]
+        except Exception as e: logging.warning(f"Karşılaştırma için kıyı segmentleri alınamadı: {e}"); return "Konumsuz"
     def setup_ui(self, layout):
-        secim_grup = QGroupBox("Karşılaştırılacak Yılları Seçin"); secim_layout = QHBoxLayout(secim_grup)
-        mevcut_yillar = sorted(self.df['yil'].unique(), reverse=True); yillar_str = [str(yil) for yil in mevcut_yillar]
-        self.combo_grup1 = QComboBox(); self.combo_grup1.addItems(yillar_str)
-        self.combo_grup2 = QComboBox(); self.combo_grup2.addItems(yillar_str)
-        if len(yillar_str) > 1: self.combo_grup2.setCurrentIndex(1)
+        secim_grup = QGroupBox("Karşılaştırılacak Grupları Seçin"); secim_layout = QHBoxLayout(secim_grup)
+        self.combo_gruplama = QComboBox(); self.combo_gruplama.addItems(list(self.GRUPLAMALAR.keys()))
+        self.combo_grup1 = QComboBox(); self.combo_grup2 = QComboBox()
         self.btn_karsilastir = QPushButton("Karşılaştır")
-        secim_layout.addWidget(QLabel("Grup 1:")); secim_layout.addWidget(self.combo_grup1); secim_layout.addWidget(QLabel("Grup 2:")); secim_layout.addWidget(self.combo_grup2)
+        secim_layout.addWidget(QLabel("Gruplama:")); secim_layout.addWidget(self.combo_gruplama); secim_layout.addWidget(QLabel("Grup 1:")); secim_layout.addWidget(self.combo_grup1); secim_layout.addWidget(QLabel("Grup 2:")); secim_layout.addWidget(self.combo_grup2)
         secim_layout.addStretch(); secim_layout.addWidget(self.btn_karsilastir); layout.addWidget(secim_grup)
-        self.sonuc_tablosu = QTableWidget(); self.sonuc_tablosu.setColumnCount(3); self.sonuc_tablosu.setHorizontalHeaderLabels(["Ölçüm Kriteri", "Grup 1", "Grup 2"])
+        self.sonuc_tablosu = QTableWidget(); self.sonuc_tablosu.setColumnCount(5); self.sonuc_tablosu.setHorizontalHeaderLabels(["Ölçüm Kriteri", "Grup 1", "Grup 2", "Fark [%95 GA]", "p (permütasyon)"])
         self.sonuc_tablosu.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.sonuc_tablosu.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers); layout.addWidget(self.sonuc_tablosu)
-        self.btn_karsilastir.clicked.connect(self.karsilastirmayi_yap)
+        layout.addWidget(QLabel(f"Renkli hücreler, en fazla {YENIDEN_ORNEKLEME_SAYISI} yeniden örneklemeli permütasyon testinde p < {ANLAMLILIK_DUZEYI} olan farkları gösterir."))
+        self.combo_gruplama.currentIndexChanged.connect(self.gruplamayi_degistir); self.btn_karsilastir.clicked.connect(self.karsilastirmayi_yap)
+    def gruplamayi_degistir(self):
+        sutun = self.GRUPLAMALAR[self.combo_gruplama.currentText()]; degerler = [str(d) for d in sorted(self.df[sutun].unique(), reverse=(sutun == 'yil'))]
+        for combo in (self.combo_grup1, self.combo_grup2): combo.blockSignals(True); combo.clear(); combo.addItems(degerler); combo.blockSignals(False)
+        if len(degerler) > 1: self.combo_grup2.setCurrentIndex(1)
+        self.karsilastirmayi_yap()
     def karsilastirmayi_yap(self):
-        yil1_str = self.combo_grup1.currentText(); yil2_str = self.combo_grup2.currentText()
-        if not yil1_str or not yil2_str: return
-        yil1 = int(yil1_str); yil2 = int(yil2_str)
-        self.sonuc_tablosu.setHorizontalHeaderItem(1, QTableWidgetItem(f"Grup 1 ({yil1})")); self.sonuc_tablosu.setHorizontalHeaderItem(2, QTableWidgetItem(f"Grup 2 ({yil2})"))
-        df1 = self.df[self.df['yil'] == yil1]; df2 = self.df[self.df['yil'] == yil2]
-        stats1 = self.hesapla_istatistik(df1); stats2 = self.hesapla_istatistik(df2); self.tabloyu_doldur(stats1, stats2)
+        grup1 = self.combo_grup1.currentText(); grup2 = self.combo_grup2.currentText()
+        if not grup1 or not grup2: return
+        if self.test_isi is not None: self.bekleyen_karsilastirma = True; return  # Süren test bitince güncel seçim yeniden hesaplanır
+        sutun = self.GRUPLAMALAR[self.combo_gruplama.currentText()]; etiketler = self.df[sutun].astype(str)
+        self.sonuc_tablosu.setHorizontalHeaderItem(1, QTableWidgetItem(f"Grup 1 ({grup1})")); self.sonuc_tablosu.setHorizontalHeaderItem(2, QTableWidgetItem(f"Grup 2 ({grup2})"))
+        df1 = self.df[etiketler == grup1]; df2 = self.df[etiketler == grup2]
+        stats1 = self.hesapla_istatistik(df1); stats2 = self.hesapla_istatistik(df2)
+        self.tabloyu_doldur(stats1, stats2); self.btn_karsilastir.setEnabled(False); self.btn_karsilastir.setText("Test ediliyor...")
+        # Yeniden örnekleme testleri saniyeler sürebilir; diyalog donmasın diye arka planda çalışır
+        self.test_isi = ArkaPlanIsi(gruplari_karsilastir, df1, df2, parent=self); self.test_isi.istatistikler = (stats1, stats2)
+        self.test_isi.bitti.connect(self.karsilastirma_bitti); self.test_isi.start()
+    def karsilastirma_bitti(self, testler, hata):
+        stats1, stats2 = self.test_isi.istatistikler
+        self.test_isi.wait(); self.test_isi.deleteLater(); self.test_isi = None
+        self.btn_karsilastir.setEnabled(True); self.btn_karsilastir.setText("Karşılaştır")
+        if hata is None:
+            for olcut, sonuc in testler.items():
+                if olcut not in stats1: stats1[olcut] = f"{sonuc['ortalama1']:.2f}" if sonuc else "N/A"; stats2[olcut] = f"{sonuc['ortalama2']:.2f}" if sonuc else "N/A"
+            self.tabloyu_doldur(stats1, stats2, testler)
+        if self.bekleyen_karsilastirma: self.bekleyen_karsilastirma = False; self.karsilastirmayi_yap()
+    def done(self, sonuc):
+        if self.test_isi is not None: self.test_isi.wait()  # Çalışan iş parçacığı diyalogla birlikte yok edilmemeli
+        super().done(sonuc)
     def hesapla_istatistik(self, df_grup):
-        if df_grup.empty: return {k: "N/A" for k in ["Toplam Yuva Sayısı", "Ortalama Yuva Başarısı (%)", "Predasyonlu Yuva Sayısı", "Predasyon Oranı (%)"]}
-        stats = {}; toplam_yuva = len(df_grup); stats["Toplam Yuva Sayısı"] = str(toplam_yuva)
-        basari = pd.to_numeric(df_grup['yuva_basarisi_yuzde'], errors='coerce').dropna().mean()
-        stats["Ortalama Yuva Başarısı (%)"] = f"{basari:.2f}" if pd.notna(basari) else "N/A"
-        predasyonlu_sayisi = len(df_grup[df_grup['predasyon_durumu'].isin(['tam', 'yari', 'kismi'])]); stats["Predasyonlu Yuva Sayısı"] = str(predasyonlu_sayisi)
-        predasyon_orani = (predasyonlu_sayisi / toplam_yuva) * 100 if toplam_yuva > 0 else 0; stats["Predasyon Oranı (%)"] = f"{predasyon_orani:.2f}"
-        return stats
-    def tabloyu_doldur(self, stats1, stats2):
-        kriterler = list(stats1.keys()); self.sonuc_tablosu.setRowCount(len(kriterler))
+        return grup_istatistigi_hesapla(df_grup)
+    def tabloyu_doldur(self, stats1, stats2, testler=None):
+        testler = testler or {}; kriterler = list(stats1.keys()); self.sonuc_tablosu.setRowCount(len(kriterler))
         for satir, kriter in enumerate(kriterler):
-            deger_orjinal_str = stats1.get(kriter, "N/A"); deger_simule_str = stats2.get(kriter, "N/A")
+            deger_orjinal_str = stats1.get(kriter, "N/A"); deger_simule_str = stats2.get(kriter, "N/A"); test = testler.get(kriter)
             self.sonuc_tablosu.setItem(satir, 0, QTableWidgetItem(kriter)); self.sonuc_tablosu.setItem(satir, 1, QTableWidgetItem(deger_orjinal_str))
             item_simule = QTableWidgetItem(deger_simule_str)
-            try:
-                val_orj = float(str(deger_orjinal_str).replace('%','').strip()); val_sim = float(str(deger_simule_str).replace('%','').strip())
-                if val_sim > val_orj: item_simule.setForeground(QColor('#28A745'))
-                elif val_sim < val_orj: item_simule.setForeground(QColor('#DC3545'))
-            except (ValueError, TypeError): pass
+            if test and test['anlamli']: item_simule.setForeground(QColor('#28A745') if test['fark'] > 0 else QColor('#DC3545'))
             self.sonuc_tablosu.setItem(satir, 2, item_simule)
+            self.sonuc_tablosu.setItem(satir, 3, QTableWidgetItem(f"{test['fark']:+.2f} [{test['alt']:+.2f}, {test['ust']:+.2f}]" if test else "-"))
+            self.sonuc_tablosu.setItem(satir, 4, QTableWidgetItem(f"{test['p']:.4f}" if test else "-"))
 
 class SimulasyonDialog(QDialog):
     def __init__(self, parent=None):
@@ -766,28 +4269,17 @@ class SimulasyonDialog(QDialog):
             if "Konum Bazlı" in secilen_senaryo:
                 referans_adi = self.konum_referans_combo.currentText().lower(); mesafe_metre = int(self.konum_mesafe_input.text()); yeni_durum = self.konum_yeni_durum_combo.currentText()
                 config = load_config(); sabit_lejantlar = config.get("sabit_lejantlar", {}); referans_koordinat = sabit_lejantlar[referans_adi]
-                df_geo = df_simule[df_simule['lat'].notna() & df_simule['lon'].notna()].copy()
-                if not df_geo.empty:
-                    gdf = gpd.GeoDataFrame(df_geo, geometry=gpd.points_from_xy(df_geo.lon, df_geo.lat), crs="EPSG:4326"); gdf_utm = gdf.to_crs("EPSG:32635")
-                    referans_noktasi_utm = gpd.GeoSeries([Point(referans_koordinat[1], referans_koordinat[0])], crs="EPSG:4326").to_crs("EPSG:32635")[0]
-                    tampon_bolge = referans_noktasi_utm.buffer(mesafe_metre); etkilenen_indexler = gdf_utm[gdf_utm.within(tampon_bolge)].index; etkilenen_yuva_sayisi = len(etkilenen_indexler)
-                    df_simule.loc[etkilenen_indexler, 'predasyon_durumu'] = yeni_durum
+                df_simule, etkilenen_yuva_sayisi = konum_bazli_simulasyon(df_simule, referans_koordinat, mesafe_metre, yeni_durum)
             elif "Durum Değişikliği" in secilen_senaryo:
                 eski_durum = self.durum_eski_combo.currentText(); yeni_durum = self.durum_yeni_combo.currentText()
                 etkilenen_indexler = df_simule[df_simule['predasyon_durumu'] == eski_durum].index; etkilenen_yuva_sayisi = len(etkilenen_indexler)
                 df_simule.loc[etkilenen_indexler, 'predasyon_durumu'] = yeni_durum
         except Exception as e: QMessageBox.critical(self, "Simülasyon Hatası", f"Senaryo uygulanırken bir hata oluştu:\n{e}"); logging.error(f"Simülasyon hatası: {e}", exc_info=True); return
-        canli = pd.to_numeric(df_simule['yuva_ici_canli_yavru'], errors='coerce').fillna(0); toplam = pd.to_numeric(df_simule['toplam_yumurta_sayisi'], errors='coerce').fillna(0)
-        df_simule['yuva_basarisi_yuzde'] = np.divide(canli * 100, toplam, out=np.zeros_like(canli, dtype=float), where=toplam!=0).round(2)
+        df_simule = basari_yuzdesini_hesapla(df_simule)
         stats_orjinal = self.hesapla_istatistik(self.df_orjinal); stats_simule = self.hesapla_istatistik(df_simule); self.tabloyu_doldur(stats_orjinal, stats_simule)
         QMessageBox.information(self, "Simülasyon Tamamlandı", f"Simülasyon başarıyla çalıştırıldı.\nToplam {etkilenen_yuva_sayisi} yuva bu senaryodan etkilendi.")
     def hesapla_istatistik(self, df_grup):
-        if df_grup.empty: return {k: "N/A" for k in ["Toplam Yuva Sayısı", "Ortalama Yuva Başarısı (%)", "Predasyonlu Yuva Sayısı", "Predasyon Oranı (%)"]}
-        stats = {}; toplam_yuva = len(df_grup); stats["Toplam Yuva Sayısı"] = str(toplam_yuva)
-        basari = pd.to_numeric(df_grup['yuva_basarisi_yuzde'], errors='coerce').dropna().mean(); stats["Ortalama Yuva Başarısı (%)"] = f"{basari:.2f}" if pd.notna(basari) else "N/A"
-        predasyonlu_sayisi = len(df_grup[df_grup['predasyon_durumu'].isin(['tam', 'yari', 'kismi'])]); stats["Predasyonlu Yuva Sayısı"] = str(predasyonlu_sayisi)
-        predasyon_orani = (predasyonlu_sayisi / toplam_yuva) * 100 if toplam_yuva > 0 else 0; stats["Predasyon Oranı (%)"] = f"{predasyon_orani:.2f}"
-        return stats
+        return grup_istatistigi_hesapla(df_grup)
     def tabloyu_doldur(self, stats_orjinal, stats_simule):
         kriterler = list(stats_orjinal.keys()); self.sonuc_tablosu.setRowCount(len(kriterler))
         for satir, kriter in enumerate(kriterler):
@@ -801,6 +4293,215 @@ class SimulasyonDialog(QDialog):
             except (ValueError, TypeError): pass
             self.sonuc_tablosu.setItem(satir, 2, item_simule)
 
+class KiyiSegmentDialog(QDialog):
+    """Lejantlar arası kıyı segmentlerinin yoğunluk/predasyon özeti ve iki lejant arası bölge sorgusu."""
+    def __init__(self, parent=None, kiyi_indeksi=None):
+        super().__init__(parent); self.setWindowTitle("Kıyı Segment Özeti"); self.setMinimumSize(850, 550)
+        layout = QVBoxLayout(self)
+        try: self.kiyi_indeksi = (kiyi_indeksi or KiyiIndeksi()).guncelle()
+        except Exception as e: logging.error(f"Kıyı indeksi yüklenemedi: {e}", exc_info=True); layout.addWidget(QLabel(f"Kıyı indeksi yüklenemedi:\n{e}")); return
+        ust_layout = QHBoxLayout(); self.yil_combo = QComboBox(); self.yil_combo.addItem("Tüm Yıllar")
+        self.yil_combo.addItems([str(yil) for yil in sorted(self.kiyi_indeksi.df['yil'].unique(), reverse=True)])
+        ust_layout.addWidget(QLabel("Yıl:")); ust_layout.addWidget(self.yil_combo); ust_layout.addStretch(); layout.addLayout(ust_layout)
+        self.tablo = QTableWidget(); self.tablo.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.tablo.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents); layout.addWidget(self.tablo)
+        aralik_grup = QGroupBox("Bölge Sorgusu"); aralik_layout = QHBoxLayout(aralik_grup); lejantlar = [isim.title() for isim in self.kiyi_indeksi.hat.isimler]
+        self.baslangic_combo = QComboBox(); self.baslangic_combo.addItems(lejantlar); self.bitis_combo = QComboBox(); self.bitis_combo.addItems(lejantlar); self.bitis_combo.setCurrentIndex(len(lejantlar) - 1)
+        self.btn_sorgula = QPushButton("Sorgula"); self.aralik_sonuc_label = QLabel("-")
+        aralik_layout.addWidget(QLabel("Başlangıç:")); aralik_layout.addWidget(self.baslangic_combo); aralik_layout.addWidget(QLabel("Bitiş:")); aralik_layout.addWidget(self.bitis_combo)
+        aralik_layout.addWidget(self.btn_sorgula); aralik_layout.addWidget(self.aralik_sonuc_label, 1); layout.addWidget(aralik_grup)
+        self.yil_combo.currentIndexChanged.connect(self.tabloyu_doldur); self.yil_combo.currentIndexChanged.connect(self.araligi_sorgula); self.btn_sorgula.clicked.connect(self.araligi_sorgula)
+        self.tabloyu_doldur(); self.araligi_sorgula()
+    def secili_yil(self):
+        metin = self.yil_combo.currentText(); return int(metin) if metin.isdigit() else None
+    def tabloyu_doldur(self):
+        ozet = self.kiyi_indeksi.segment_ozeti(self.secili_yil()); self.tablo.setRowCount(len(ozet)); self.tablo.setColumnCount(len(ozet.columns)); self.tablo.setHorizontalHeaderLabels(list(ozet.columns))
+        for satir, kayit in enumerate(ozet.itertuples(index=False)):
+            for sutun, deger in enumerate(kayit): self.tablo.setItem(satir, sutun, QTableWidgetItem("N/A" if pd.isna(deger) else str(deger)))
+    def araligi_sorgula(self):
+        bolge = self.kiyi_indeksi.aralik(self.baslangic_combo.currentText(), self.bitis_combo.currentText(), self.secili_yil())
+        if bolge.empty: self.aralik_sonuc_label.setText("Bu aralıkta yuva yok."); return
+        predasyon_orani = bolge['predasyon_durumu'].isin(['tam', 'yari', 'kismi']).mean() * 100; basari = pd.to_numeric(bolge['yuva_basarisi_yuzde'], errors='coerce').mean()
+        self.aralik_sonuc_label.setText(f"{len(bolge)} yuva | Predasyon: %{predasyon_orani:.1f} | Ort. başarı: " + (f"%{basari:.1f}" if pd.notna(basari) else "N/A"))
+
+class RiskModeliDialog(QDialog):
+    """Risk modelinin eğitim özeti, katsayıları ve son sezonun devriye öncelik listesi."""
+    def __init__(self, parent=None, risk_modeli=None):
+        super().__init__(parent); self.setWindowTitle("Predasyon Risk Modeli"); self.setMinimumSize(800, 600)
+        layout = QVBoxLayout(self); self.risk_modeli = risk_modeli or PredasyonRiskModeli().guncelle()
+        if self.risk_modeli.katsayilar is None: layout.addWidget(QLabel(f"Model eğitilemedi: her iki sınıfta da en az {RISK_EN_AZ_ORNEK} etiketli yuva (predasyonlu ve sağlam) gereklidir.")); return
+        ozet_grup = QGroupBox("Eğitim Özeti"); ozet_form = QFormLayout(ozet_grup)
+        for etiket, deger in self.risk_modeli.egitim_ozeti.items(): ozet_form.addRow(f"{etiket}:", QLabel(str(deger)))
+        layout.addWidget(ozet_grup)
+        katsayilar = self.risk_modeli.katsayi_tablosu(); katsayi_grup = QGroupBox("Standartlaştırılmış Katsayılar (pozitif = riski artırır)"); katsayi_layout = QVBoxLayout(katsayi_grup)
+        katsayi_layout.addWidget(self.tablo_olustur(katsayilar)); layout.addWidget(katsayi_grup)
+        df = yuvalari_dataframe_yap(); son_yil = df['yil'].max() if not df.empty else None
+        aday = df[(df['yil'] == son_yil) & ~df['predasyon_durumu'].isin(['tam', 'yari', 'kismi'])].copy()
+        aday['Risk (%)'] = [round(self.risk_modeli.risk(i, y) * 100, 1) if self.risk_modeli.risk(i, y) is not None else None for i, y in zip(aday['id'], aday['yil'])]
+        aday = aday.sort_values('Risk (%)', ascending=False).head(25)[['id', 'yuva_tarihi', 'Risk (%)']].rename(columns={'id': 'Yuva ID', 'yuva_tarihi': 'Yuva Tarihi'})
+        devriye_grup = QGroupBox(f"Devriye Önceliği: {son_yil} Sezonunun En Riskli Sağlam Yuvaları"); devriye_layout = QVBoxLayout(devriye_grup)
+        devriye_layout.addWidget(self.tablo_olustur(aday)); layout.addWidget(devriye_grup)
+    @staticmethod
+    def tablo_olustur(df):
+        tablo = QTableWidget(len(df), len(df.columns)); tablo.setHorizontalHeaderLabels([str(c) for c in df.columns]); tablo.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        tablo.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        for satir, kayit in enumerate(df.itertuples(index=False)):
+            for sutun, deger in enumerate(kayit): tablo.setItem(satir, sutun, QTableWidgetItem("N/A" if pd.isna(deger) else str(deger)))
+        return tablo
+
+class SicakNoktaDialog(QDialog):
+    """Yıl ve predatör bazında predasyon sıcak noktası ve komşu aralığı tablosu."""
+    def __init__(self, parent=None, ayarlar=None):
+        super().__init__(parent); self.setWindowTitle("Predasyon Sıcak Noktaları"); self.setMinimumSize(800, 550)
+        ayarlar = ayarlar or {"yontem": "dbscan", "mesafe_m": 50, "min_yuva": 4}; layout = QVBoxLayout(self)
+        parametre_grup = QGroupBox("Analiz Parametreleri"); form = QFormLayout(parametre_grup)
+        self.yontem_combo = QComboBox()
+        for anahtar, ad in SICAK_NOKTA_YONTEMLERI.items(): self.yontem_combo.addItem(ad, anahtar)
+        self.yontem_combo.setCurrentIndex(list(SICAK_NOKTA_YONTEMLERI).index(ayarlar["yontem"]))
+        self.mesafe_input = QLineEdit(str(int(ayarlar["mesafe_m"]))); self.min_yuva_input = QLineEdit(str(ayarlar["min_yuva"]))
+        form.addRow("Yöntem:", self.yontem_combo); form.addRow("Komşuluk Mesafesi (m):", self.mesafe_input); form.addRow("Küme İçin En Az Yuva (DBSCAN):", self.min_yuva_input)
+        self.btn_hesapla = QPushButton("Hesapla"); form.addRow(self.btn_hesapla); layout.addWidget(parametre_grup)
+        self.tablo = QTableWidget(); self.tablo.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers); self.tablo.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents); layout.addWidget(self.tablo)
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close); self.btn_haritada_goster = self.button_box.addButton("Haritada Göster", QDialogButtonBox.ButtonRole.AcceptRole)
+        self.button_box.accepted.connect(self.accept); self.button_box.rejected.connect(self.reject); layout.addWidget(self.button_box)
+        self.btn_hesapla.clicked.connect(self.hesapla); self.yontem_combo.currentIndexChanged.connect(lambda _: self.min_yuva_input.setEnabled(self.yontem_combo.currentData() == "dbscan"))
+        self.min_yuva_input.setEnabled(ayarlar["yontem"] == "dbscan"); self.hesapla()
+    def ayarlar(self):
+        try: return {"yontem": self.yontem_combo.currentData(), "mesafe_m": float(self.mesafe_input.text().replace(',', '.')), "min_yuva": int(self.min_yuva_input.text())}
+        except ValueError: raise ValueError("Mesafe ve en az yuva sayısı sayı olmalıdır.")
+    def hesapla(self):
+        try: _, ozet = sicak_nokta_analizi(**self.ayarlar())
+        except Exception as e: logging.error(f"Sıcak nokta analizi hatası: {e}", exc_info=True); QMessageBox.critical(self, "Analiz Hatası", f"Sıcak noktalar hesaplanamadı:\n{e}"); return
+        self.tablo.setRowCount(len(ozet)); self.tablo.setColumnCount(len(ozet.columns)); self.tablo.setHorizontalHeaderLabels([str(c) for c in ozet.columns])
+        for satir, kayit in enumerate(ozet.itertuples(index=False)):
+            for sutun, deger in enumerate(kayit): self.tablo.setItem(satir, sutun, QTableWidgetItem("N/A" if pd.isna(deger) else str(deger)))
+
+class KarantinaDialog(QDialog):
+    """İçe aktarmada doğrulamadan geçemeyen satırları nedenleriyle listeler; CSV'ye aktarılabilir ya da temizlenebilir."""
+    def __init__(self, parent=None):
+        super().__init__(parent); self.setWindowTitle("İçe Aktarma Karantinası"); self.setMinimumSize(1000, 600)
+        layout = QVBoxLayout(self); self.df = karantina_kayitlari()
+        layout.addWidget(QLabel(f"Karantinada {len(self.df)} satır var. Satırları kaynak dosyada düzeltip yeniden içe aktarabilirsiniz."))
+        layout.addWidget(RiskModeliDialog.tablo_olustur(self.df.drop(columns=['veri'])))
+        buton_layout = QHBoxLayout(); btn_csv = QPushButton("CSV'ye Aktar..."); btn_temizle = QPushButton("Karantinayı Temizle")
+        btn_csv.setEnabled(not self.df.empty); btn_temizle.setEnabled(not self.df.empty)
+        buton_layout.addWidget(btn_csv); buton_layout.addWidget(btn_temizle); buton_layout.addStretch(1); layout.addLayout(buton_layout)
+        btn_csv.clicked.connect(self.csv_aktar); btn_temizle.clicked.connect(self.temizle)
+    def csv_aktar(self):
+        dosya_yolu, _ = QFileDialog.getSaveFileName(self, "Karantinayı Kaydet", "karantina.csv", "CSV Dosyaları (*.csv)")
+        if dosya_yolu: self.df.to_csv(dosya_yolu, index=False, encoding='utf-8-sig'); QMessageBox.information(self, "Başarılı", f"{len(self.df)} satır kaydedildi.")
+    def temizle(self):
+        if QMessageBox.question(self, "Karantinayı Temizle", f"{len(self.df)} karantina satırı silinsin mi?") == QMessageBox.StandardButton.Yes:
+            silinen = karantinayi_temizle(); logging.info(f"KULLANICI EYLEMİ: Karantina temizlendi ({silinen} satır).", extra={"eylem": "karantina_temizle", "satir": silinen}); self.accept()
+
+class YedekFarkiDialog(QDialog):
+    """Bir yedeği canlı veriyle ya da başka bir yedekle satır satır karşılaştırır; canlı dosyaya dokunmaz."""
+    GOSTERILECEK_EN_FAZLA_SATIR = 5000
+    def __init__(self, parent=None):
+        super().__init__(parent); self.setWindowTitle("Yedekle Karşılaştır"); self.setMinimumSize(900, 600)
+        layout = QVBoxLayout(self); self.yedekler = yedekleri_listele()
+        if not self.yedekler: layout.addWidget(QLabel("Hiç yedek dosyası bulunamadı.")); return
+        secim_grup = QGroupBox("Karşılaştırılacak Görüntüler"); secim_layout = QHBoxLayout(secim_grup)
+        self.eski_combo = QComboBox(); self.yeni_combo = QComboBox(); self.yeni_combo.addItem("Canlı Veritabanı", None)
+        for zaman, yol in self.yedekler: self.eski_combo.addItem(f"{zaman:%d.%m.%Y %H:%M} — {os.path.basename(yol)}", yol); self.yeni_combo.addItem(f"{zaman:%d.%m.%Y %H:%M} — {os.path.basename(yol)}", yol)
+        self.btn_karsilastir = QPushButton("Karşılaştır")
+        secim_layout.addWidget(QLabel("Eski:")); secim_layout.addWidget(self.eski_combo, 1); secim_layout.addWidget(QLabel("Yeni:")); secim_layout.addWidget(self.yeni_combo, 1); secim_layout.addWidget(self.btn_karsilastir)
+        layout.addWidget(secim_grup); self.ozet_label = QLabel("-"); layout.addWidget(self.ozet_label)
+        self.tablo = QTableWidget(); self.tablo.setColumnCount(6); self.tablo.setHorizontalHeaderLabels(["ID", "Yıl", "Değişiklik", "Sütun", "Eski Değer", "Yeni Değer"])
+        self.tablo.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers); self.tablo.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch); layout.addWidget(self.tablo)
+        self.btn_karsilastir.clicked.connect(self.karsilastir)
+    def karsilastir(self):
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try: ozet, fark_df = anlik_goruntu_farki(self.eski_combo.currentData(), self.yeni_combo.currentData())
+        except Exception as e: logging.error(f"Yedek karşılaştırma hatası: {e}", exc_info=True); QMessageBox.critical(self, "Hata", f"Karşılaştırma yapılamadı:\n{e}"); return
+        finally: QApplication.restoreOverrideCursor()
+        self.ozet_label.setText(f"{ozet['eklenen']} yuva eklendi, {ozet['silinen']} yuva silindi, {ozet['degisen']} yuvada {ozet['degisen_alan']} alan değişti ({ozet['sure_sn']} sn)."
+                                + (f" İlk {self.GOSTERILECEK_EN_FAZLA_SATIR} satır gösteriliyor." if len(fark_df) > self.GOSTERILECEK_EN_FAZLA_SATIR else ""))
+        gosterilen = fark_df.head(self.GOSTERILECEK_EN_FAZLA_SATIR); self.tablo.setRowCount(len(gosterilen))
+        renkler = {'eklendi': QColor('#D4EDDA'), 'silindi': QColor('#F8D7DA')}
+        for satir, kayit in enumerate(gosterilen.itertuples(index=False)):
+            for sutun, deger in enumerate(kayit):
+                item = QTableWidgetItem("" if deger is None or (isinstance(deger, float) and pd.isna(deger)) else str(deger))
+                if kayit.degisiklik in renkler: item.setBackground(renkler[kayit.degisiklik])
+                self.tablo.setItem(satir, sutun, item)
+
+class OlcumDialog(QDialog):
+    """Türetilmiş ölçümlerin listesi, ortalamaları ve kullanıcı ölçümü ekleme/silme."""
+    def __init__(self, parent=None):
+        super().__init__(parent); self.setWindowTitle("Türetilmiş Ölçümler"); self.setMinimumSize(900, 550); layout = QVBoxLayout(self)
+        self.tablo = QTableWidget(); self.tablo.setColumnCount(5); self.tablo.setHorizontalHeaderLabels(["Ad", "Etiket", "İfade", "Tür", "Ortalama (yuva)"])
+        self.tablo.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers); self.tablo.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.tablo.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents); self.tablo.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch); layout.addWidget(self.tablo)
+        form_grup = QGroupBox("Kullanıcı Ölçümü Ekle / Güncelle"); form = QFormLayout(form_grup)
+        self.ad_input = QLineEdit(); self.ad_input.setPlaceholderText("örn. kirik_yumurta_orani"); self.etiket_input = QLineEdit(); self.etiket_input.setPlaceholderText("örn. Kırık Yumurta Oranı (%)")
+        self.ifade_input = QLineEdit(); self.ifade_input.setPlaceholderText("örn. oran(predasyonlu_yumurta_sayisi, toplam_yumurta_sayisi) * 100")
+        form.addRow("Ad:", self.ad_input); form.addRow("Etiket:", self.etiket_input); form.addRow("İfade:", self.ifade_input)
+        form.addRow(QLabel(f"Fonksiyonlar: {', '.join(OLCUM_ISLEVLERI)}. Karşılaştırma, and/or/not ve sabit listesiyle 'in' kullanılabilir."))
+        buton_layout = QHBoxLayout(); btn_kaydet = QPushButton("Kaydet"); self.btn_sil = QPushButton("Seçili Ölçümü Sil")
+        buton_layout.addWidget(btn_kaydet); buton_layout.addWidget(self.btn_sil); buton_layout.addStretch(1); form.addRow(buton_layout); layout.addWidget(form_grup)
+        btn_kaydet.clicked.connect(self.kaydet); self.btn_sil.clicked.connect(self.sil); self.tablo.itemSelectionChanged.connect(self.secimi_forma_yaz); self.tabloyu_doldur()
+    def tabloyu_doldur(self):
+        tanimlar = olcum_tanimlari()
+        try: ortalamalar = olcum_tablosu().drop(columns=['id', 'yil']).agg(['mean', 'count'])
+        except Exception as e: logging.error(f"Ölçüm tablosu hesaplanamadı: {e}", exc_info=True); ortalamalar = pd.DataFrame()
+        self.tablo.setRowCount(len(tanimlar))
+        for satir, (ad, tanim) in enumerate(tanimlar.items()):
+            ortalama = f"{ortalamalar.at['mean', ad]:.2f} ({int(ortalamalar.at['count', ad])})" if ad in ortalamalar.columns and ortalamalar.at['count', ad] else "N/A"
+            for sutun, deger in enumerate([ad, tanim["etiket"], tanim["ifade"], "Yerleşik" if tanim["yerlesik"] else "Kullanıcı", ortalama]): self.tablo.setItem(satir, sutun, QTableWidgetItem(deger))
+    def secimi_forma_yaz(self):
+        satir = self.tablo.currentRow()
+        if satir < 0: return
+        yerlesik = self.tablo.item(satir, 3).text() == "Yerleşik"; self.btn_sil.setEnabled(not yerlesik)
+        if not yerlesik: self.ad_input.setText(self.tablo.item(satir, 0).text()); self.etiket_input.setText(self.tablo.item(satir, 1).text()); self.ifade_input.setText(self.tablo.item(satir, 2).text())
+    def kaydet(self):
+        basarili, mesaj = olcum_tanimini_kaydet(self.ad_input.text(), self.ifade_input.text(), self.etiket_input.text().strip() or None)
+        if basarili: self.tabloyu_doldur(); QMessageBox.information(self, "Ölçüm", mesaj)
+        else: QMessageBox.warning(self, "Ölçüm", mesaj)
+    def sil(self):
+        satir = self.tablo.currentRow()
+        if satir < 0: return
+        basarili, mesaj = olcum_tanimini_sil(self.tablo.item(satir, 0).text())
+        if basarili: self.tabloyu_doldur()
+        else: QMessageBox.warning(self, "Ölçüm", mesaj)
+
+class FenolojiDialog(QDialog):
+    """Sezonun yumurtlama/çıkış eğrileri ve gece devriyesi için beklenen çıkış penceresindeki açık yuvalar."""
+    def __init__(self, parent=None, fenoloji_indeksi=None):
+        super().__init__(parent); self.setWindowTitle("Sezon Fenolojisi"); self.setMinimumSize(950, 700); layout = QVBoxLayout(self)
+        self.fenoloji_indeksi = (fenoloji_indeksi or FenolojiIndeksi()).guncelle(); yillar = self.fenoloji_indeksi.yillar()
+        ust_layout = QHBoxLayout(); self.yil_combo = QComboBox(); self.yil_combo.addItems([str(y) for y in reversed(yillar)])
+        self.tarih_edit = QDateEdit(QDate.currentDate()); self.tarih_edit.setCalendarPopup(True); self.tarih_edit.setDisplayFormat("dd.MM.yyyy")
+        self.gun_spin = QSpinBox(); self.gun_spin.setRange(1, 60); self.gun_spin.setValue(7)
+        for etiket, widget in (("Sezon:", self.yil_combo), ("Devriye başlangıcı:", self.tarih_edit), ("Gün:", self.gun_spin)): ust_layout.addWidget(QLabel(etiket)); ust_layout.addWidget(widget)
+        ust_layout.addStretch(1); layout.addLayout(ust_layout)
+        self.fig = Figure(figsize=(9, 3.5)); self.canvas = FigureCanvas(self.fig); layout.addWidget(self.canvas, 3)
+        self.liste_grup = QGroupBox(); liste_layout = QVBoxLayout(self.liste_grup); self.tablo_yeri = QVBoxLayout(); liste_layout.addLayout(self.tablo_yeri)
+        btn_csv = QPushButton("CSV'ye Aktar"); btn_csv.clicked.connect(self.csv_kaydet); liste_layout.addWidget(btn_csv, 0, Qt.AlignmentFlag.AlignRight); layout.addWidget(self.liste_grup, 2)
+        self.yil_combo.currentTextChanged.connect(self.egrileri_ciz); self.tarih_edit.dateChanged.connect(self.listeyi_doldur); self.gun_spin.valueChanged.connect(self.listeyi_doldur)
+        self.liste = pd.DataFrame(); self.egrileri_ciz(); self.listeyi_doldur()
+    def egrileri_ciz(self):
+        self.fig.clear(); ax = self.fig.add_subplot()
+        if not self.yil_combo.currentText(): ax.text(0.5, 0.5, "Kayıtlı yuva yok.", ha='center', va='center'); self.canvas.draw(); return
+        egriler = self.fenoloji_indeksi.egriler(int(self.yil_combo.currentText()))
+        ax.bar(egriler.index, egriler['yumurtlama'], color='sandybrown', label='Günlük yumurtlama'); ax.bar(egriler.index, egriler['cikis'], color='seagreen', alpha=0.7, label='Günlük ilk çıkış')
+        ax2 = ax.twinx(); ax2.plot(egriler.index, egriler['kumulatif_yumurtlama'], color='saddlebrown', label='Kümülatif yumurtlama')
+        ax2.plot(egriler.index, egriler['kumulatif_cikis'], color='darkgreen', label='Kümülatif çıkış'); ax2.plot(egriler.index, egriler['beklenen_acik'], color='royalblue', linestyle='--', label='Penceresi açık yuva')
+        ax.set_ylabel("Günlük yuva"); ax2.set_ylabel("Kümülatif / açık yuva"); ax.set_title(f"{self.yil_combo.currentText()} Sezonu Yumurtlama ve Çıkış Eğrileri")
+        satirlar, etiketler = ax.get_legend_handles_labels(); satirlar2, etiketler2 = ax2.get_legend_handles_labels(); ax.legend(satirlar + satirlar2, etiketler + etiketler2, loc='upper left', fontsize=8)
+        self.fig.autofmt_xdate(); self.fig.tight_layout(); self.canvas.draw()
+    def listeyi_doldur(self):
+        baslangic = self.tarih_edit.date().toPyDate(); gun = self.gun_spin.value()
+        self.liste = self.fenoloji_indeksi.cikmasi_beklenenler(baslangic, gun)
+        self.liste_grup.setTitle(f"{baslangic:%d.%m.%Y} itibarıyla {gun} gün içinde çıkış penceresindeki açık yuvalar ({len(self.liste)})")
+        while self.tablo_yeri.count(): self.tablo_yeri.takeAt(0).widget().deleteLater()
+        self.tablo_yeri.addWidget(RiskModeliDialog.tablo_olustur(self.liste.rename(columns={'id': 'Yuva ID', 'yil': 'Yıl', 'yuva_tarihi': 'Yuva Tarihi', 'yuva_yasi_gun': 'Yuva Yaşı (gün)',
+                                                                                            'pencere_baslangici': 'Pencere Başlangıcı', 'pencere_bitisi': 'Pencere Bitişi'})))
+    def csv_kaydet(self):
+        dosya_yolu, _ = QFileDialog.getSaveFileName(self, "Devriye Listesini Kaydet", f"cikis_bekleyenler_{self.tarih_edit.date().toPyDate():%Y-%m-%d}.csv", "CSV Dosyaları (*.csv)")
+        if dosya_yolu:
+            try: self.liste.to_csv(dosya_yolu, index=False, encoding='utf-8-sig'); QMessageBox.information(self, "Başarılı", f"Liste kaydedildi: {dosya_yolu}")
+            except Exception as e: QMessageBox.critical(self, "Hata", f"Liste kaydedilemedi: {e}")
+
 class HakkindaDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent); self.setWindowTitle("Hakkında"); self.setFixedSize(450, 320)
@@ -818,8 +4519,229 @@ class HakkindaDialog(QDialog):
         info_label = QLabel(info_text); info_label.setOpenExternalLinks(True); info_label.setWordWrap(True); layout.addWidget(info_label)
         layout.addStretch(); kapat_button = QPushButton("Kapat"); kapat_button.clicked.connect(self.accept); layout.addWidget(kapat_button, 0, Qt.AlignmentFlag.AlignCenter)
 
+class PerformansDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent); self.setWindowTitle("Performans Paneli"); self.setMinimumSize(760, 480)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Bu oturumda ölçülen işlemler (süreler milisaniye cinsinden):"))
+        self.tablo = QTableWidget(); self.tablo.setColumnCount(6); self.tablo.setHorizontalHeaderLabels(["Ölçüm", "Çağrı", "p50", "p95", "En Uzun", "Ort. Satır"])
+        self.tablo.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch); self.tablo.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers); layout.addWidget(self.tablo)
+        button_layout = QHBoxLayout()
+        self.btn_yenile = QPushButton("Yenile"); self.btn_json = QPushButton("JSON Olarak Dışa Aktar"); self.btn_temizle = QPushButton("Ölçümleri Temizle"); self.btn_profil = QPushButton()
+        for buton in (self.btn_yenile, self.btn_json, self.btn_temizle, self.btn_profil): button_layout.addWidget(buton)
+        layout.addLayout(button_layout)
+        self.btn_yenile.clicked.connect(self.tabloyu_doldur); self.btn_json.clicked.connect(self.json_kaydet); self.btn_temizle.clicked.connect(self.olcumleri_temizle); self.btn_profil.clicked.connect(self.profil_degistir)
+        self.tabloyu_doldur()
+    def tabloyu_doldur(self):
+        ozet = performans.ozet(); self.tablo.setRowCount(len(ozet))
+        for satir, o in enumerate(ozet):
+            degerler = [o["ad"], str(o["cagri"]), f"{o['p50_ms']:.1f}", f"{o['p95_ms']:.1f}", f"{o['en_uzun_ms']:.1f}", f"{o['ortalama_satir']:.0f}" if o["ortalama_satir"] is not None else "-"]
+            for sutun, deger in enumerate(degerler): self.tablo.setItem(satir, sutun, QTableWidgetItem(deger))
+        self.btn_profil.setText("Profil Kaydını Durdur ve Kaydet" if performans.profil_aktif else "Profil Kaydını Başlat (cProfile)")
+    def json_kaydet(self):
+        dosya_yolu, _ = QFileDialog.getSaveFileName(self, "Performans Ölçümlerini Kaydet", "performans_olcumleri.json", "JSON Dosyaları (*.json)")
+        if dosya_yolu:
+            try: performans.json_aktar(dosya_yolu); QMessageBox.information(self, "Başarılı", f"Ölçümler kaydedildi: {dosya_yolu}")
+            except Exception as e: QMessageBox.critical(self, "Hata", f"Ölçümler kaydedilemedi: {e}")
+    def olcumleri_temizle(self): performans.temizle(); self.tabloyu_doldur()
+    def profil_degistir(self):
+        if not performans.profil_aktif:
+            performans.profil_baslat(); logging.info("cProfile kaydı başlatıldı."); self.tabloyu_doldur(); return
+        dosya_yolu, _ = QFileDialog.getSaveFileName(self, "Profil Kaydını Kaydet", "patara_profil.prof", "Profil Dosyaları (*.prof)")
+        if dosya_yolu:
+            performans.profil_durdur(dosya_yolu); logging.info(f"cProfile kaydı kaydedildi: {dosya_yolu}")
+            QMessageBox.information(self, "Başarılı", f"Profil kaydedildi: {dosya_yolu}\nÖzet: {os.path.splitext(dosya_yolu)[0]}.txt")
+        self.tabloyu_doldur()
+
+
+# --- Yerel Harita Varlıkları ---
+VARLIK_SEMASI = "patara"
+VARLIK_KOKU = f"{VARLIK_SEMASI}://varlik/"
+VARLIK_KLASORU = os.path.join(SCRIPT_DIR, "assets", "harita")
+QWEBCHANNEL_KAYNAGI = ":/qtwebchannel/qwebchannel.js"  # Qt içinde gömülü; ağ gerektirmez
+_HARICI_VARLIK_DESENI = re.compile(r'<script src="(https?://[^"]+)"></script>|<link rel="stylesheet" href="(https?://[^"]+)"/?>')
+_CSS_URL_DESENI = re.compile(r'url\(\s*[\'"]?([^\'")]+?)[\'"]?\s*\)')
+_CSS_YORUM_DESENI = re.compile(r'/\*.*?\*/', re.S)
+
+
+def _varlik_yolu(url):
+    """CDN adresini yerel klasördeki göreli yola çevirir: https://alan/yol/dosya.js -> alan/yol/dosya.js"""
+    parca = urllib.parse.urlsplit(url)
+    return posixpath.normpath(f"{parca.netloc}{parca.path}").lstrip("/")
+
+
+class HaritaVarliklari:
+    """
+    Folium'un CDN'den yüklediği JS/CSS dosyalarını yerel klasörden sunar. Tüm varlıklar yereldeyse sayfadaki
+    etiketler sıralı tek bir JS ve tek bir CSS paketiyle değiştirilir. JS dosyaları (CDN'deki küçültülmüş
+    sürümler) olduğu gibi birleştirilir; CSS'ten yorumlar ve boşluklar atılır. Paket adı birleştirilmiş
+    içeriğin özetidir; değişmeyeceği için şema yanıtında süresiz önbelleklenebilir olarak işaretlenir.
+    Harita sayfası da aynı şemadan sunulur.
+    """
+
+    def __init__(self, klasor=VARLIK_KLASORU):
+        self.klasor = klasor; self._bellek = {}; self._sayfalar = collections.OrderedDict(); self._sayfa_sayaci = 0; self._eksik_uyarildi = False
+        self._paket_yollari = {}  # (uzantı, [(url, boyut, değişiklik zamanı), ...]) -> paket yolu
+
+    def yerel_mi(self, url):
+        return os.path.isfile(os.path.join(self.klasor, _varlik_yolu(url)))
+
+    def oku(self, yol):
+        """Şema isteğini (mime, bayt) olarak karşılar; bulunamazsa None. Okunan dosyalar bellekte tutulur."""
+        yol = posixpath.normpath(urllib.parse.unquote(yol)).lstrip("/")
+        if yol in self._sayfalar: return "text/html", self._sayfalar[yol]
+        if yol in self._bellek: return self._bellek[yol]
+        if yol == "qwebchannel.js":
+            kaynak = QFile(QWEBCHANNEL_KAYNAGI)
+            if not kaynak.open(QIODevice.OpenModeFlag.ReadOnly): return None
+            veri = bytes(kaynak.readAll()); kaynak.close()
+        else:
+            tam_yol = os.path.realpath(os.path.join(self.klasor, yol))
+            if not tam_yol.startswith(os.path.realpath(self.klasor) + os.sep) or not os.path.isfile(tam_yol): return None
+            with open(tam_yol, "rb") as f: veri = f.read()
+        self._bellek[yol] = (mimetypes.guess_type(yol)[0] or "application/octet-stream", veri)
+        return self._bellek[yol]
+
+    def _css_adreslerini_cevir(self, css, yol):
+        """Paketlenen CSS içindeki göreli url() başvurularını yerel şema adreslerine çevirir (fontlar, görseller)."""
+        def cevir(eslesme):
+            adres = eslesme.group(1)
+            if adres.startswith(("data:", "http:", "https:", "#", "/")): return eslesme.group(0)
+            return f'url("/{posixpath.normpath(posixpath.join(posixpath.dirname(yol), adres))}")'
+        return _CSS_URL_DESENI.sub(cevir, css)
+
+    @performans.olculen("harita.varlik_paketi")
+    def paket(self, urller, uzanti):
+        """
+        Verilen sıralı varlıkları tek dosyada birleştirir ve içeriğin özetiyle adlandırır; paketin şema içindeki
+        yolunu döner. Kaynak dosyalar (boyut, değişiklik zamanı) değişmedikçe paket yeniden derlenmez.
+        """
+        anahtar = (uzanti, tuple((url, (bilgi := os.stat(os.path.join(self.klasor, _varlik_yolu(url)))).st_size, bilgi.st_mtime_ns) for url in urller))
+        if anahtar in self._paket_yollari: return self._paket_yollari[anahtar]
+        parcalar = []
+        for url in urller:
+            with open(os.path.join(self.klasor, _varlik_yolu(url)), encoding="utf-8", errors="replace") as f: metin = f.read()
+            metin = re.sub(r'^\s*//[#@] sourceMappingURL=.*$|/\*[#@] sourceMappingURL=.*?\*/', "", metin, flags=re.M)
+            if uzanti == "css": metin = re.sub(r'\s+', " ", _CSS_YORUM_DESENI.sub("", self._css_adreslerini_cevir(metin, _varlik_yolu(url))))
+            parcalar.append(f"/* {url} */\n{metin.strip()}")
+        icerik = (";\n" if uzanti == "js" else "\n").join(parcalar).encode("utf-8")
+        ozet = hashlib.sha1(icerik).hexdigest()[:16]; yol = f"paket/{ozet}.{uzanti}"
+        paket_dosyasi = os.path.join(self.klasor, "paket", f"{ozet}.{uzanti}")
+        if not os.path.isfile(paket_dosyasi):
+            os.makedirs(os.path.dirname(paket_dosyasi), exist_ok=True)
+            with open(paket_dosyasi + ".tmp", "wb") as f: f.write(icerik)
+            os.replace(paket_dosyasi + ".tmp", paket_dosyasi); logging.info(f"Harita varlık paketi derlendi: {yol} ({len(urller)} dosya)")
+        self._bellek[yol] = (mimetypes.guess_type(yol)[0] or "application/octet-stream", icerik)
+        self._paket_yollari[anahtar] = yol
+        return yol
+
+    def onbellek_basligi(self, yol):
+        """Şema yanıtı için Cache-Control değeri: içerik özetli paketler süresiz, sayfalar hiç, diğer varlıklar bir gün."""
+        yol = posixpath.normpath(urllib.parse.unquote(yol)).lstrip("/")
+        if yol.startswith("paket/"): return "public, max-age=31536000, immutable"
+        if yol.startswith("harita/"): return "no-store"
+        return "public, max-age=86400"
+
+    def yerellestir(self, html):
+        """
+        Sayfadaki CDN etiketlerini yerel şemaya yönlendirir ve qwebchannel.js'i ekler. Eksik varlık varsa
+        sıralama bozulmasın diye paketleme yapılmaz; yereldekiler tek tek, kalanlar CDN'den yüklenir.
+        """
+        etiketler = list(_HARICI_VARLIK_DESENI.finditer(html))
+        eksik = [e.group(1) or e.group(2) for e in etiketler if not self.yerel_mi(e.group(1) or e.group(2))]
+        kanal = f'<script src="{VARLIK_KOKU}qwebchannel.js"></script>'
+        if etiketler and not eksik:
+            js = self.paket([e.group(1) for e in etiketler if e.group(1)], "js"); css = self.paket([e.group(2) for e in etiketler if e.group(2)], "css")
+            html = _HARICI_VARLIK_DESENI.sub("", html)
+            return html.replace("<head>", f'<head>\n    <link rel="stylesheet" href="{VARLIK_KOKU}{css}"/>\n    <script src="{VARLIK_KOKU}{js}"></script>\n    {kanal}', 1)
+        if eksik and not self._eksik_uyarildi: self._eksik_uyarildi = True; logging.warning(f"{len(eksik)} harita varlığı yerelde yok, CDN'den yüklenecek ('python patara.py varlik-indir' ile indirilebilir).")
+        def cevir(eslesme):
+            url = eslesme.group(1) or eslesme.group(2)
+            return eslesme.group(0).replace(url, VARLIK_KOKU + _varlik_yolu(url)) if self.yerel_mi(url) else eslesme.group(0)
+        return _HARICI_VARLIK_DESENI.sub(cevir, html).replace("<head>", f"<head>\n    {kanal}", 1)
+
+    def sayfa_yayinla(self, html):
+        """Haritayı setHtml'in 2 MB sınırına takılmadan şemadan sunar; son birkaç sayfa bellekte tutulur."""
+        self._sayfa_sayaci += 1; yol = f"harita/{self._sayfa_sayaci}.html"
+        self._sayfalar[yol] = self.yerellestir(html).encode("utf-8")
+        while len(self._sayfalar) > 3: self._sayfalar.popitem(last=False)
+        return QUrl(VARLIK_KOKU + yol)
+
+
+def harita_varliklarini_indir(klasor=VARLIK_KLASORU, zaman_asimi=30):
+    """
+    Uygulamanın kullandığı tüm Folium/eklenti varlıklarını ve CSS'lerin başvurduğu font/görselleri indirir.
+    Bir kez (ağ varken) çalıştırılması yeterlidir; sonrasında harita tamamen çevrimdışı açılır.
+    """
+    ornek = folium.Map(location=[36.27, 29.29]); kume = plugins.MarkerCluster().add_to(ornek)
+    folium.CircleMarker([36.27, 29.29], radius=5).add_to(kume); plugins.HeatMap([[36.27, 29.29]]).add_to(ornek)
+    plugins.Draw().add_to(ornek); folium.Marker([36.27, 29.29], icon=folium.Icon(icon='info-sign')).add_to(ornek); folium.LayerControl().add_to(ornek)
+    kuyruk = [e.group(1) or e.group(2) for e in _HARICI_VARLIK_DESENI.finditer(ornek.get_root().render())]; gorulen = set(); indirilen = 0; hatalar = []
+    kok = os.path.realpath(klasor) + os.sep; atlanan = set()
+    while kuyruk:
+        url = urllib.parse.urldefrag(kuyruk.pop(0))[0].split("?")[0]
+        if url in gorulen or url in atlanan: continue
+        hedef = os.path.realpath(os.path.join(klasor, _varlik_yolu(url)))
+        if not hedef.startswith(kok):  # CSS'teki url(//../..) gibi adresler varlık klasörünün dışına yazamaz
+            atlanan.add(url); logging.warning(f"Varlık klasörünün dışını gösteren adres atlandı: {url}"); continue
+        gorulen.add(url)
+        if not os.path.isfile(hedef):
+            try:
+                with urllib.request.urlopen(url, timeout=zaman_asimi) as yanit: veri = yanit.read()
+            except (urllib.error.URLError, OSError) as e: hatalar.append(f"{url}: {e}"); continue
+            os.makedirs(os.path.dirname(hedef), exist_ok=True)
+            with open(hedef, "wb") as f: f.write(veri)
+            indirilen += 1
+        if url.endswith(".css"):
+            with open(hedef, encoding="utf-8", errors="replace") as f: css = f.read()
+            kuyruk.extend(urllib.parse.urljoin(url, adres) for adres in _CSS_URL_DESENI.findall(css) if not adres.startswith(("data:", "#")))
+    mesaj = f"{len(gorulen)} harita varlığından {indirilen} tanesi indirildi, {len(gorulen) - indirilen - len(hatalar)} tanesi zaten yereldeydi."
+    if hatalar: mesaj += f" {len(hatalar)} varlık indirilemedi:\n" + "\n".join(hatalar)
+    logging.info(mesaj); return not hatalar, mesaj
+
+
+class VarlikSemaIsleyici(QWebEngineUrlSchemeHandler):
+    """patara://varlik/... isteklerini HaritaVarliklari üzerinden bellekten/diskten karşılar."""
+
+    def __init__(self, varliklar, parent=None):
+        super().__init__(parent); self.varliklar = varliklar
+
+    def requestStarted(self, job):
+        icerik = self.varliklar.oku(job.requestUrl().path())
+        if icerik is None: job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound); return
+        mime, veri = icerik; tampon = QBuffer(parent=job); tampon.setData(veri); tampon.open(QIODevice.OpenModeFlag.ReadOnly)
+        if hasattr(job, "setAdditionalResponseHeaders"):  # Qt 6.6+
+            job.setAdditionalResponseHeaders({b"Cache-Control": [self.varliklar.onbellek_basligi(job.requestUrl().path()).encode()]})
+        job.reply(mime.encode(), tampon)
+
+
+def varlik_semasini_kaydet():
+    """Şema, QApplication oluşturulmadan önce kaydedilmelidir."""
+    sema = QWebEngineUrlScheme(VARLIK_SEMASI.encode()); sema.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    sema.setFlags(QWebEngineUrlScheme.Flag.SecureScheme | QWebEngineUrlScheme.Flag.LocalAccessAllowed | QWebEngineUrlScheme.Flag.CorsEnabled)
+    QWebEngineUrlScheme.registerScheme(sema)
+
+
+harita_varliklari = HaritaVarliklari()
+
+
+class ArkaPlanIsi(QThread):
+    """Uzun bir işlemi GUI iş parçacığı dışında çalıştırır; sonucu ya da hatayı 'bitti' sinyaliyle GUI'ye döner."""
+    bitti = pyqtSignal(object, object)  # (sonuç, hata)
+
+    def __init__(self, islev, *args, parent=None, **kwargs):
+        super().__init__(parent); self.islev, self.args, self.kwargs = islev, args, kwargs
+
+    def run(self):
+        try: sonuc = self.islev(*self.args, **self.kwargs)
+        except Exception as e:
+            logging.error(f"Arka plan işlemi hatası ({getattr(self.islev, '__name__', self.islev)}): {e}", exc_info=True); self.bitti.emit(None, e); return
+        self.bitti.emit(sonuc, None)
+
+
 class MapCommunicator(QObject):
     drawing_finished_signal = pyqtSignal(list)
+    yuva_secildi_signal = pyqtSignal(str, bool)
     def __init__(self, parent=None):
         super().__init__(parent); self.drawn_polygon_coords = None; logging.info("MapCommunicator başlatıldı.")
     @pyqtSlot(str)
@@ -831,6 +4753,10 @@ class MapCommunicator(QObject):
                 self.drawn_polygon_coords = coords; logging.info(f"Haritadan {data['geometry']['type']} verisi alındı."); self.drawing_finished_signal.emit(coords)
             else: logging.warning(f"Desteklenmeyen çizim tipi: {data['geometry']['type']}")
         except Exception as e: logging.error(f"GeoJSON verisi işlenirken hata: {e}", exc_info=True)
+    @pyqtSlot(str, bool)
+    def yuva_secildi(self, anahtar, ekle):
+        """Haritada bir yuvaya tıklandığında çağrılır; anahtar 'id_yil', ekle Ctrl/Shift ile çoklu seçimdir."""
+        self.yuva_secildi_signal.emit(anahtar, ekle)
 
 
 
@@ -847,12 +4773,21 @@ class MainWindow(QMainWindow):
         self.sabit_lejantlar = self.config.get("sabit_lejantlar", {})
         self.renkler = ["red", "blue", "green", "purple", "orange", "darkred", "lightred", "beige", "darkblue", "darkgreen", "cadetblue", "pink"]
         self.map_object = None
+        self.liste_indeksi = {}
         self.map_communicator = MapCommunicator(self)
+        self.yuva_onbellegi = YuvaOnbellegi()
+        self.kiyi_indeksi = KiyiIndeksi()
+        self.risk_modeli = PredasyonRiskModeli()
+        self.fenoloji_indeksi = FenolojiIndeksi()
+        self.anlik_goruntu_yolu = None
+        self.sicak_nokta_ayarlari = {"yontem": "dbscan", "mesafe_m": 50, "min_yuva": 4}
         self.gelismis_grafik_penceresi = None
+        self.excel_aktarim_isi = None
         self.setWindowTitle("Patara Bilimsel Veri Platformu")
         self.setWindowIcon(QIcon('icon.ico'))
         self.resize(1600, 900)
         self.setup_ui()
+        self.yenileme_hattini_kur()
         self.setup_connections()
         self.setAcceptDrops(True)
         logging.info("Ana pencere __init__ süreci tamamlandı.")
@@ -882,8 +4817,10 @@ class MainWindow(QMainWindow):
         detay_layout.addRow("Yuva ID (Yıl):", self.detay_id); detay_layout.addRow("Yuva Tarihi:", self.detay_tarih); detay_layout.addRow("Toplam Yumurta:", self.detay_yumurta_sayisi); detay_layout.addRow("Canlı Yavru:", self.detay_canli_yavru); detay_layout.addRow("Yuva Başarısı:", self.detay_basari); detay_layout.addRow("Predasyon Durumu:", self.detay_predasyon)
         left_layout.addWidget(self.detay_paneli); main_layout.addWidget(left_panel)
         right_panel = QWidget(); right_layout = QVBoxLayout(right_panel); self.web_view = QWebEngineView(); right_layout.addWidget(self.web_view)
+        self.varlik_isleyici = VarlikSemaIsleyici(harita_varliklari, self); self.web_view.page().profile().installUrlSchemeHandler(VARLIK_SEMASI.encode(), self.varlik_isleyici)
         kontrol_paneli_grup = QGroupBox("Harita Analiz Araçları"); kontrol_paneli = QHBoxLayout(kontrol_paneli_grup)
-        self.heatmap_check = QCheckBox("Isı Haritasını Göster"); kontrol_paneli.addWidget(self.heatmap_check); kontrol_paneli.addWidget(QLabel(" | "))
+        self.heatmap_check = QCheckBox("Isı Haritasını Göster"); kontrol_paneli.addWidget(self.heatmap_check)
+        self.sicak_nokta_check = QCheckBox("Sıcak Noktalar"); kontrol_paneli.addWidget(self.sicak_nokta_check); kontrol_paneli.addWidget(QLabel(" | "))
         kontrol_paneli.addWidget(QLabel("Referans Noktası:")); self.combo_referans = QComboBox(); sabit_lejantlar_isimleri = [isim.title() for isim in self.sabit_lejantlar.keys()]; self.combo_referans.addItems(["Yok"] + sabit_lejantlar_isimleri)
         kontrol_paneli.addWidget(self.combo_referans); kontrol_paneli.addWidget(QLabel("Mesafe (m):")); self.mesafe_input = QLineEdit("500"); self.mesafe_input.setFixedWidth(50); kontrol_paneli.addWidget(self.mesafe_input)
         self.btn_filtrele = QPushButton(" Filtrele"); self.btn_filtrele.setIcon(_create_icon_safely('filter.png', QStyle.StandardPixmap.SP_DialogApplyButton)); kontrol_paneli.addWidget(self.btn_filtrele); kontrol_paneli.addWidget(QLabel(" | "))
@@ -907,23 +4844,46 @@ class MainWindow(QMainWindow):
 
     def setup_menu_bar(self):
         menu_bar = self.menuBar(); dosya_menu = menu_bar.addMenu("&Dosya"); geri_yukle_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_DialogResetButton), "Yedekten Geri Yükle...", self); geri_yukle_action.triggered.connect(self.yedekten_geri_yukle); dosya_menu.addAction(geri_yukle_action)
+        yedek_incele_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_FileDialogInfoView), "Yedeği Salt Okunur İncele...", self); yedek_incele_action.triggered.connect(self.yedegi_incele); dosya_menu.addAction(yedek_incele_action)
+        self.canli_veri_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_BrowserReload), "Canlı Veriye Dön", self); self.canli_veri_action.setEnabled(False); self.canli_veri_action.triggered.connect(self.canli_veriye_don); dosya_menu.addAction(self.canli_veri_action)
+        excel_klasoru_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_DirOpenIcon), "Klasörden Toplu Excel Aktar...", self); excel_klasoru_action.triggered.connect(self.excel_klasoru_dialog_ac); dosya_menu.addAction(excel_klasoru_action)
+        self.excel_guncelle_action = QAction("Aktarımda Değişen Kayıtları Güncelle", self); self.excel_guncelle_action.setCheckable(True); self.excel_guncelle_action.setToolTip("Zaten kayıtlı (ID, Yıl) satırlarından içeriği değişenler güncellenir, değişmeyenlere dokunulmaz."); dosya_menu.addAction(self.excel_guncelle_action)
+        cografi_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_DriveNetIcon), "Coğrafi Formatta Dışa Aktar (GPKG/GeoJSON/FGB)...", self); cografi_action.triggered.connect(self.cografi_disa_aktar_dialog_ac); dosya_menu.addAction(cografi_action)
+        statik_harita_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_FileDialogContentsView), "Haritayı Rapor Olarak Kaydet (PDF/PNG)...", self); statik_harita_action.triggered.connect(self.statik_harita_kaydet); dosya_menu.addAction(statik_harita_action)
+        karantina_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_MessageBoxWarning), "İçe Aktarma Karantinası...", self); karantina_action.triggered.connect(self.karantina_penceresi_ac); dosya_menu.addAction(karantina_action)
+        saha_formu_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_FileDialogContentsView), "Saha Formunu Uygula...", self); saha_formu_action.triggered.connect(self.saha_formu_dialog_ac); dosya_menu.addAction(saha_formu_action)
+        senkron_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_BrowserReload), "Başka Bir Kopya ile Senkronize Et...", self); senkron_action.triggered.connect(self.senkronizasyon_dialog_ac); dosya_menu.addAction(senkron_action)
+        sicaklik_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_DriveHDIcon), "Sıcaklık Kaydedici Verisi Yükle...", self); sicaklik_action.triggered.connect(self.sicaklik_verisi_dialog_ac); dosya_menu.addAction(sicaklik_action)
+        arsiv_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_DirClosedIcon), "Geçmiş Sezonları Arşivle...", self); arsiv_action.triggered.connect(self.sezonlari_arsivle_dialog_ac); dosya_menu.addAction(arsiv_action)
         dosya_menu.addSeparator(); cikis_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_DialogCloseButton), "Çıkış", self); cikis_action.triggered.connect(self.close); dosya_menu.addAction(cikis_action)
+        duzen_menu = menu_bar.addMenu("&Düzen")
+        self.geri_al_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_ArrowBack), "Geri Al", self); self.geri_al_action.setShortcut("Ctrl+Z"); self.geri_al_action.triggered.connect(self.islemi_geri_al); duzen_menu.addAction(self.geri_al_action)
+        self.yinele_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_ArrowForward), "Yinele", self); self.yinele_action.setShortcut("Ctrl+Y"); self.yinele_action.triggered.connect(self.islemi_yinele); duzen_menu.addAction(self.yinele_action)
+        analiz_menu = menu_bar.addMenu("&Analiz")
+        kiyi_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_FileDialogListView), "Kıyı Segment Özeti...", self); kiyi_action.triggered.connect(self.kiyi_segment_penceresi_ac); analiz_menu.addAction(kiyi_action)
+        sicak_nokta_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_MessageBoxWarning), "Predasyon Sıcak Noktaları...", self); sicak_nokta_action.triggered.connect(self.sicak_nokta_penceresi_ac); analiz_menu.addAction(sicak_nokta_action)
+        risk_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_MessageBoxInformation), "Predasyon Risk Modeli...", self); risk_action.triggered.connect(self.risk_modeli_penceresi_ac); analiz_menu.addAction(risk_action)
+        fark_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_FileDialogDetailedView), "Yedekle Karşılaştır (Ne Değişti?)...", self); fark_action.triggered.connect(self.yedek_farki_penceresi_ac); analiz_menu.addAction(fark_action)
+        olcum_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_FileDialogListView), "Türetilmiş Ölçümler...", self); olcum_action.triggered.connect(self.olcum_penceresi_ac); analiz_menu.addAction(olcum_action)
+        fenoloji_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_FileDialogInfoView), "Fenoloji ve Bu Hafta Çıkacak Yuvalar...", self); fenoloji_action.triggered.connect(self.fenoloji_penceresi_ac); analiz_menu.addAction(fenoloji_action)
         gorunum_menu = menu_bar.addMenu("&Görünüm"); tema_menu = gorunum_menu.addMenu("Tema Seç")
         acik_tema_action = QAction("Açık Tema", self, checkable=True); koyu_tema_action = QAction("Koyu Tema", self, checkable=True)
         self.tema_aksiyon_grubu = QActionGroup(self); self.tema_aksiyon_grubu.addAction(acik_tema_action); self.tema_aksiyon_grubu.addAction(koyu_tema_action); acik_tema_action.setChecked(True)
         tema_menu.addAction(acik_tema_action); tema_menu.addAction(koyu_tema_action)
+        performans_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_FileDialogInfoView), "Performans Paneli", self); performans_action.triggered.connect(self.performans_penceresi_ac); gorunum_menu.addAction(performans_action)
         yardim_menu = menu_bar.addMenu("&Yardım"); hakkinda_action = QAction(self.get_icon(QStyle.StandardPixmap.SP_DialogHelpButton), "Hakkında", self); hakkinda_action.triggered.connect(self.hakkinda_penceresi_ac); yardim_menu.addAction(hakkinda_action)
         self.tema_aksiyon_grubu.triggered.connect(self.tema_degistir)
 
     def setup_connections(self):
-        self.arama_kutusu.textChanged.connect(self.akilli_filtrele); self.arama_kriteri_combo.currentIndexChanged.connect(self.akilli_filtrele)
+        self.arama_kutusu.textChanged.connect(self.harita_ve_liste_yenile); self.arama_kriteri_combo.currentIndexChanged.connect(self.harita_ve_liste_yenile)
         self.yuva_list_widget.currentItemChanged.connect(self.yuva_secildiginde_odaklan)
-        self.btn_yenile.clicked.connect(self.harita_ve_liste_yenile); self.btn_yuva_ekle.clicked.connect(self.yuva_ekle_dialog_ac)
+        self.btn_yenile.clicked.connect(lambda: self.harita_ve_liste_yenile(zorla=True)); self.btn_yuva_ekle.clicked.connect(self.yuva_ekle_dialog_ac)
         self.btn_predasyon.clicked.connect(self.predasyon_dialog_ac); self.btn_sil.clicked.connect(self.yuva_sil_dialog_ac)
         self.btn_gelismis_grafik.clicked.connect(self.gelismis_grafik_penceresi_ac); self.btn_excel_import.clicked.connect(self.excel_import_dialog_ac); self.btn_excel_export.clicked.connect(self.excel_export_dialog_ac)
         self.btn_istatistik.clicked.connect(self.istatistik_penceresi_ac); self.btn_karsilastir.clicked.connect(self.karsilastirma_penceresi_ac); self.btn_simulasyon.clicked.connect(self.simulasyon_penceresi_ac)
-        self.heatmap_check.stateChanged.connect(self.harita_ve_liste_yenile); self.btn_filtrele.clicked.connect(self.harita_ve_liste_yenile); self.combo_referans.currentIndexChanged.connect(self.harita_ve_liste_yenile)
+        self.heatmap_check.stateChanged.connect(self.harita_ve_liste_yenile); self.sicak_nokta_check.stateChanged.connect(self.harita_ve_liste_yenile); self.btn_filtrele.clicked.connect(self.harita_ve_liste_yenile); self.combo_referans.currentIndexChanged.connect(self.harita_ve_liste_yenile)
         self.btn_cizim_modu.clicked.connect(self.cizim_modu_toggle); self.btn_cizim_temizle.clicked.connect(self.cizim_temizle); self.map_communicator.drawing_finished_signal.connect(self.cizim_sonucunu_islem)
+        self.map_communicator.yuva_secildi_signal.connect(self.haritadan_yuva_secildi); self.yuva_list_widget.itemSelectionChanged.connect(self.haritada_secimi_goster)
         self.web_view.page().loadFinished.connect(self.on_web_page_load_finished)
 
     def tema_degistir(self, action):
@@ -937,6 +4897,18 @@ class MainWindow(QMainWindow):
             else: app.setStyleSheet(""); logging.warning(f"Tema dosyası bulunamadı: {tema_adi}")
         except Exception as e: app.setStyleSheet(""); logging.error(f"Tema dosyası yüklenemedi: {e}", exc_info=True)
 
+    def islemi_geri_al(self):
+        basarili, mesaj = son_islemi_geri_al()
+        if basarili: self.harita_ve_liste_yenile()
+        else: QMessageBox.warning(self, "Geri Al", mesaj)
+        self.statusBar().showMessage(mesaj, 4000)
+
+    def islemi_yinele(self):
+        basarili, mesaj = son_islemi_yinele()
+        if basarili: self.harita_ve_liste_yenile()
+        else: QMessageBox.warning(self, "Yinele", mesaj)
+        self.statusBar().showMessage(mesaj, 4000)
+
     def cizim_modu_toggle(self):
         if self.web_view.page().url().isEmpty(): QMessageBox.warning(self, "Hata", "Harita yüklenmeden çizim modu aktifleştirilemez."); return
         js_enable = self.btn_cizim_modu.text() == " Çizim Modu"
@@ -952,6 +4924,7 @@ class MainWindow(QMainWindow):
     @pyqtSlot(list)
     def cizim_sonucunu_islem(self, coords):
         self.map_communicator.drawn_polygon_coords = coords; self.statusBar().showMessage("Alan çizildi. Veriler filtreleniyor...", 3000); self.harita_ve_liste_yenile(); self.btn_cizim_temizle.setEnabled(True)
+        self.yuva_list_widget.selectAll(); self.statusBar().showMessage(f"Çizilen alandaki {len(self.yuva_list_widget.selectedItems())} yuva seçildi.", 4000)
 
     @pyqtSlot(bool)
     def on_web_page_load_finished(self, ok):
@@ -959,54 +4932,80 @@ class MainWindow(QMainWindow):
             logging.info("QWebEngineView sayfası yüklendi. WebChannel kuruluyor.")
             channel = QWebChannel(self.web_view.page()); self.web_view.page().setWebChannel(channel); channel.registerObject("MapCommunicator", self.map_communicator)
             js_setup_script = """if (typeof window.setupWebChannelAndDrawPlugin === 'function') { window.setupWebChannelAndDrawPlugin(); } else { console.error("JS tarafında fonksiyon bulunamadı."); }"""; self.web_view.page().runJavaScript(js_setup_script)
+            self.haritada_secimi_goster(odakla=len(self.yuva_list_widget.selectedItems()) > 1)  # Yeniden kurulan sayfada seçimi geri uygula
         else: logging.error("QWebEngineView sayfası yüklenirken hata."); QMessageBox.critical(self, "Harita Yükleme Hatası", "Harita görüntülenemedi.")
 
     def get_icon(self, pixmap_enum):
         return self.style().standardIcon(pixmap_enum)
 
-    def get_filtrelenmis_yuvalar(self):
-        if self.map_communicator.drawn_polygon_coords:
+    @performans.olculen("get_filtrelenmis_yuvalar")
+    def get_filtrelenmis_yuvalar(self, yuvalar, cizim=None, referans="yok", mesafe=""):
+        if cizim:
             try:
-                drawn_polygon = Polygon(self.map_communicator.drawn_polygon_coords); yuvalar = tum_yuvalari_getir()
-                if not yuvalar: return []
-                gecerli_yuvalar = [y for y in yuvalar if y.get('lat') is not None and y.get('lon') is not None]
-                if not gecerli_yuvalar: return []
-                gdf_yuvalar = gpd.GeoDataFrame(gecerli_yuvalar, geometry=gpd.points_from_xy([y['lon'] for y in gecerli_yuvalar], [y['lat'] for y in gecerli_yuvalar]), crs="EPSG:4326")
-                gdf_polygon = gpd.GeoSeries([drawn_polygon], crs="EPSG:4326")
-                filtered_gdf = gdf_yuvalar[gdf_yuvalar.within(gdf_polygon.iloc[0])]
-                filtrelenmis_idler = set(filtered_gdf['id']); sonuc = [yuva for yuva in gecerli_yuvalar if yuva['id'] in filtrelenmis_idler]
-                logging.info(f"Çizilen alanda {len(sonuc)} yuva bulundu."); return sonuc
-            except Exception as e: logging.error(f"Çizim filtresi hatası: {e}", exc_info=True); QMessageBox.critical(self, "Çizim Filtresi Hatası", f"Filtreleme yapılamadı:\n{e}"); self.map_communicator.drawn_polygon_coords = None; return tum_yuvalari_getir()
-        referans_adi = self.combo_referans.currentText().lower(); mesafe_str = self.mesafe_input.text()
-        if referans_adi == "yok" or not mesafe_str.isdigit(): return tum_yuvalari_getir()
+                sonuc = poligon_icindeki_yuvalar(yuvalar, cizim)
+                logging.info(f"Çizilen alanda {len(sonuc)} yuva bulundu.", extra={"eylem": "cizim_filtresi", "satir": len(sonuc)}); return sonuc
+            except Exception as e: logging.error(f"Çizim filtresi hatası: {e}", exc_info=True); QMessageBox.critical(self, "Çizim Filtresi Hatası", f"Filtreleme yapılamadı:\n{e}"); self.map_communicator.drawn_polygon_coords = None; return yuvalar
+        if referans == "yok" or not mesafe.isdigit(): return yuvalar
         try:
-            mesafe_metre = int(mesafe_str); yuvalar = tum_yuvalari_getir()
-            if not yuvalar: return []
-            gecerli_yuvalar = [y for y in yuvalar if y.get('lat') is not None and y.get('lon') is not None]
-            if not gecerli_yuvalar: return []
-            gdf_yuvalar = gpd.GeoDataFrame(gecerli_yuvalar, geometry=gpd.points_from_xy([y['lon'] for y in gecerli_yuvalar], [y['lat'] for y in gecerli_yuvalar]), crs="EPSG:4326")
-            gdf_yuvalar_utm = gdf_yuvalar.to_crs("EPSG:32635")
-            referans_koordinat = self.sabit_lejantlar[referans_adi]; referans_noktasi_utm = gpd.GeoSeries([Point(referans_koordinat[1], referans_koordinat[0])], crs="EPSG:4326").to_crs("EPSG:32635")[0]
-            tampon_bolge = referans_noktasi_utm.buffer(mesafe_metre); icindeki_yuvalar_mask = gdf_yuvalar_utm.within(tampon_bolge)
-            filtrelenmis_gdf = gdf_yuvalar_utm[icindeki_yuvalar_mask]; filtrelenmis_idler = set(filtrelenmis_gdf['id'])
-            sonuc = [yuva for yuva in gecerli_yuvalar if yuva['id'] in filtrelenmis_idler]
-            logging.info(f"'{referans_adi.title()}' noktasına {mesafe_metre}m mesafe içinde {len(sonuc)} yuva bulundu."); return sonuc
-        except Exception as e: logging.error(f"Coğrafi analiz hatası: {e}", exc_info=True); QMessageBox.critical(self, "Coğrafi Analiz Hatası", f"Analiz hatası: {e}"); return tum_yuvalari_getir()
+            mesafe_metre = int(mesafe)
+            sonuc = referansa_yakin_yuvalar(yuvalar, self.sabit_lejantlar[referans], mesafe_metre)
+            logging.info(f"'{referans.title()}' noktasına {mesafe_metre}m mesafe içinde {len(sonuc)} yuva bulundu.", extra={"eylem": "mesafe_filtresi", "satir": len(sonuc)}); return sonuc
+        except Exception as e: logging.error(f"Coğrafi analiz hatası: {e}", exc_info=True); QMessageBox.critical(self, "Coğrafi Analiz Hatası", f"Analiz hatası: {e}"); return yuvalar
 
+    def yenileme_hattini_kur(self):
+        """
+        Yenilemeyi aşamalara böler: yükleme → risk / alan filtresi → harita → katman görünürlüğü, ve
+        alan filtresi → liste → arama / detaylar. Bir kontrol değiştiğinde yalnızca ona bağlı aşamalar yeniden çalışır;
+        örn. ısı haritası kutusu haritayı yeniden kurmaz, arama kutusu listeyi yeniden doldurmaz.
+        """
+        hat = self.yenileme_hatti = YenilemeHatti()
+        hat.asama("yuvalar", lambda nesil: self.yuva_onbellegi.yuvalar(), kontroller={"nesil": lambda: self.yuva_onbellegi.guncelle().nesil})
+        hat.asama("riskler", lambda yuvalar: self.guncel_risk_modeli().riskler, girdiler=("yuvalar",))
+        hat.asama("alan_filtresi", self.get_filtrelenmis_yuvalar, girdiler=("yuvalar",),
+                  kontroller={"cizim": lambda: self.map_communicator.drawn_polygon_coords, "referans": lambda: self.combo_referans.currentText().lower(), "mesafe": self.mesafe_input.text})
+        hat.asama("harita", self.harita_yukle, girdiler=("alan_filtresi", "riskler"),
+                  kontroller={"sicak_nokta": self.sicak_nokta_check.isChecked, "sicak_nokta_ayarlari": lambda: dict(self.sicak_nokta_ayarlari)})
+        hat.asama("katman_gorunurlugu", self.heatmap_gorunurlugu_uygula, girdiler=("harita",), kontroller={"heatmap": self.heatmap_check.isChecked})
+        hat.asama("liste", self.populate_yuva_listesi, girdiler=("alan_filtresi", "riskler"))
+        hat.asama("arama", self.akilli_filtrele, girdiler=("liste",), kontroller={"metin": lambda: self.arama_kutusu.text().lower().strip(), "kriter": self.arama_kriteri_combo.currentText})
+        hat.asama("detaylar", self.detay_panelini_guncelle, girdiler=("liste",), kontroller={"secim": self.secili_yuva_anahtari})
+
+    @performans.olculen("harita_ve_liste_yenile")
     def harita_ve_liste_yenile(self, *args, **kwargs):
         if kwargs.get('clear_drawn_filter', False): self.map_communicator.drawn_polygon_coords = None; self.btn_cizim_temizle.setEnabled(False)
-        filtrelenmis_yuvalar = self.get_filtrelenmis_yuvalar(); self.map_object = self.harita_olustur(yuva_verisi=filtrelenmis_yuvalar)
-        data = io.BytesIO(); self.map_object.save(data, close_file=False); self.web_view.setHtml(data.getvalue().decode())
-        self.populate_yuva_listesi(yuva_verisi=filtrelenmis_yuvalar); self.statusBar().showMessage("Harita ve yuva listesi başarıyla yenilendi.", 4000)
+        if kwargs.get('zorla', False): self.yenileme_hatti.gecersiz_kil()
+        hesaplanan = self.yenileme_hatti.calistir()
+        if "harita" in hesaplanan or "liste" in hesaplanan: self.statusBar().showMessage("Harita ve yuva listesi başarıyla yenilendi.", 4000)
 
+    def harita_yukle(self, yuva_verisi, riskler, sicak_nokta=False, sicak_nokta_ayarlari=None):
+        self.map_object = self.harita_olustur(yuva_verisi=yuva_verisi, riskler=riskler)
+        performans.satir_say(len(yuva_verisi))
+        with performans.olc("harita_html_yukle"):
+            data = io.BytesIO(); self.map_object.save(data, close_file=False); self.web_view.setUrl(harita_varliklari.sayfa_yayinla(data.getvalue().decode()))
+        return self.map_object
 
+    def heatmap_gorunurlugu_uygula(self, harita, heatmap):
+        """Isı haritası katmanını haritayı yeniden kurmadan, yüklü sayfada JS ile açar/kapatır."""
+        if heatmap != self.heatmap_gorunur:
+            self.web_view.page().runJavaScript(f"(function(m, k) {{ if ({str(heatmap).lower()}) m.addLayer(k); else m.removeLayer(k); }})({harita.get_name()}, {self.heatmap_katmani});")
+            self.heatmap_gorunur = heatmap
+        return heatmap
 
-    def harita_olustur(self, yuva_verisi=None):
+    def guncel_risk_modeli(self):
+        """Risk modelini veri sürümüne göre günceller; hata olursa harita ve liste risksiz çizilir."""
+        try: return self.risk_modeli.guncelle()
+        except Exception as e: logging.error(f"Risk modeli güncellenemedi: {e}", exc_info=True); self.risk_modeli.riskler = {}; return self.risk_modeli
+
+
+
+    @performans.olculen("harita_olustur")
+    def harita_olustur(self, yuva_verisi=None, riskler=None):
         """
         Verilen yuva verisine göre, kümelenmiş ve katmanlı bir Folium haritası oluşturur.
         Isı haritası seçeneğini de bir katman olarak ekler.
         """
-        yuva_noktalari = yuva_verisi if yuva_verisi is not None else tum_yuvalari_getir()
+        yuva_noktalari = yuva_verisi if yuva_verisi is not None else self.yuva_onbellegi.yuvalar()
+        performans.satir_say(len(yuva_noktalari))
         start_location = [36.27, 29.29]  # Varsayılan başlangıç konumu
 
         if yuva_noktalari:
@@ -1046,8 +5045,10 @@ class MainWindow(QMainWindow):
         cluster_tam = plugins.MarkerCluster().add_to(grup_tam)
 
         # Isı haritası için ayrı bir katman, başlangıçta gizli
-        grup_heatmap = folium.FeatureGroup(name="Yoğunluk Haritası (Heatmap)", show=False).add_to(harita)
+        self.heatmap_gorunur = self.heatmap_check.isChecked()
+        grup_heatmap = folium.FeatureGroup(name="Yoğunluk Haritası (Heatmap)", show=self.heatmap_gorunur).add_to(harita); self.heatmap_katmani = grup_heatmap.get_name()
         koordinatlar_heatmap = []
+        if riskler is None: riskler = self.guncel_risk_modeli().riskler
 
         # 2. Yuvaları tek tek işle ve doğru gruba/kümelere ekle
         for yuva in yuva_noktalari:
@@ -1063,6 +5064,9 @@ class MainWindow(QMainWindow):
                 predatorler = yuva.get("predator_canli_listesi", [])
                 if predatorler:
                     popup_text += f"<br>Predatörler: {', '.join(p.title() for p in predatorler)}"
+                risk = riskler.get((yuva.get('id'), yuva.get('yil')))
+                if risk is not None:
+                    popup_text += f"<br>Predasyon Riski: %{risk * 100:.0f}"
 
                 marker = folium.CircleMarker(
                     location=[lat, lon],
@@ -1072,6 +5076,7 @@ class MainWindow(QMainWindow):
                     fill=True,
                     fill_opacity=0.8
                 )
+                marker.options['yuvaAnahtari'] = yuva_anahtari(yuva)
 
                 # Duruma göre doğru kümeye ekle ve rengini ayarla
                 if durum == "tam":
@@ -1087,6 +5092,7 @@ class MainWindow(QMainWindow):
         # 3. Isı haritası katmanını doldur (eğer veri varsa)
         if koordinatlar_heatmap:
             plugins.HeatMap(koordinatlar_heatmap, radius=15).add_to(grup_heatmap)
+        if self.sicak_nokta_check.isChecked(): self.sicak_nokta_katmani_ekle(harita, yuva_noktalari)
 
         # 4. Çizim eklentisini ekle
         self.draw_control = plugins.Draw(
@@ -1120,79 +5126,121 @@ class MainWindow(QMainWindow):
         """
         harita.get_root().script.add_child(folium.Element(script))
 
+        # Anahtarlı işaretçi kaydı: (id, yil) -> katman. Kayıt ilk kullanımda bir kez kurulur; seçim ve odaklama
+        # her tıklamada tüm katmanları dolaşmak yerine doğrudan anahtarla yapılır.
+        secim_script = """
+            window.yuvaKayitlari = null; window.seciliYuvalar = [];
+            window.yuvaKayitlariniKur = function() {
+                if (window.yuvaKayitlari) { return window.yuvaKayitlari; }
+                var kayit = {};
+                [__KUMELER__].forEach(function(kume) {
+                    kume.eachLayer(function(katman) {
+                        var anahtar = katman.options.yuvaAnahtari; if (!anahtar) { return; }
+                        kayit[anahtar] = {katman: katman, kume: kume, stil: {color: katman.options.color, weight: katman.options.weight}};
+                        katman.on('click', function(e) {
+                            var ekle = !!(e.originalEvent && (e.originalEvent.ctrlKey || e.originalEvent.metaKey || e.originalEvent.shiftKey));
+                            if (window.MapCommunicator) { window.MapCommunicator.yuva_secildi(anahtar, ekle); }
+                        });
+                    });
+                });
+                window.yuvaKayitlari = kayit; return kayit;
+            };
+            window.yuvalariSec = function(anahtarlar, odakla) {
+                var kayit = window.yuvaKayitlariniKur();
+                window.seciliYuvalar.forEach(function(a) { if (kayit[a]) { kayit[a].katman.setStyle(kayit[a].stil); } });
+                window.seciliYuvalar = anahtarlar.filter(function(a) { return kayit[a]; });
+                window.seciliYuvalar.forEach(function(a) { kayit[a].katman.setStyle({color: '#FFD700', weight: 4}); });
+                if (!odakla || !window.seciliYuvalar.length) { return; }
+                if (window.seciliYuvalar.length === 1) {
+                    var k = kayit[window.seciliYuvalar[0]]; k.kume.zoomToShowLayer(k.katman, function() { k.katman.openPopup(); });
+                } else {
+                    __HARITA__.fitBounds(L.latLngBounds(window.seciliYuvalar.map(function(a) { return kayit[a].katman.getLatLng(); })), {maxZoom: 18, padding: [30, 30]});
+                }
+            };
+            setTimeout(window.yuvaKayitlariniKur, 0);
+        """.replace("__KUMELER__", ", ".join(k.get_name() for k in (cluster_saglam, cluster_yari, cluster_tam))).replace("__HARITA__", harita.get_name())
+        harita.get_root().script.add_child(folium.Element(secim_script))
+
         #tüm katmanları yönetecek olan kontrol paneli
         folium.LayerControl(collapsed=False).add_to(harita)
 
         return harita
 
-    def populate_yuva_listesi(self, yuva_verisi=None):
+    def sicak_nokta_katmani_ekle(self, harita, yuva_noktalari):
+        """Seçili yöntemle bulunan (tüm predatörler için) sıcak noktaları haritaya ayrı bir katman olarak ekler."""
+        grup = folium.FeatureGroup(name="Predasyon Sıcak Noktaları", show=True).add_to(harita)
+        try: yuva_sonuclari, _ = sicak_nokta_analizi(**self.sicak_nokta_ayarlari)
+        except Exception as e: logging.error(f"Sıcak nokta katmanı oluşturulamadı: {e}", exc_info=True); return
+        gosterilen = {(y.get('id'), y.get('yil')) for y in yuva_noktalari}
+        sicak = yuva_sonuclari[(yuva_sonuclari['predator'] == 'tümü') & yuva_sonuclari['sicak_nokta']]
+        sicak = sicak[[anahtar in gosterilen for anahtar in zip(sicak['id'], sicak['yil'])]]
+        if sicak.empty: return
+        if self.sicak_nokta_ayarlari["yontem"] == "dbscan":
+            gdf = gpd.GeoDataFrame({'yil': sicak['yil'].to_numpy(), 'kume': sicak['kume'].to_numpy() + 1, 'yuva': 1}, geometry=gpd.points_from_xy(sicak['x'], sicak['y']), crs="EPSG:32635")
+            kumeler = gdf.dissolve(by=['yil', 'kume'], aggfunc={'yuva': 'sum'}).reset_index()
+            kumeler['geometry'] = kumeler.geometry.convex_hull.buffer(10); kumeler = kumeler.to_crs("EPSG:4326")
+            folium.GeoJson(kumeler, style_function=lambda _: {'color': '#B22222', 'weight': 2, 'fillColor': '#DC3545', 'fillOpacity': 0.25},
+                           tooltip=folium.GeoJsonTooltip(fields=['yil', 'kume', 'yuva'], aliases=['Yıl', 'Küme', 'Yuva Sayısı'])).add_to(grup)
+        else:
+            for kayit in sicak.itertuples(index=False):
+                folium.CircleMarker(location=[kayit.lat, kayit.lon], radius=9, color='#FF8C00', weight=2, fill=False, tooltip=f"ID: {kayit.id} ({kayit.yil}) - Gi* z = {kayit.gi_z:.2f}").add_to(grup)
+
+    @performans.olculen("populate_yuva_listesi")
+    def populate_yuva_listesi(self, yuva_verisi=None, riskler=None):
         self.yuva_list_widget.blockSignals(True)
-        self.yuva_list_widget.clear()
+        secili_anahtar = self.secili_yuva_anahtari()
+        self.yuva_list_widget.clear(); self.liste_indeksi = {}
 
-        yuvalar_ham = yuva_verisi if yuva_verisi is not None else tum_yuvalari_getir()
+        yuvalar_ham = yuva_verisi if yuva_verisi is not None else self.yuva_onbellegi.yuvalar()
 
         # Listeyi ID'ye göre tersten sırala (en yeni en üstte)
         yuvalar = sorted(yuvalar_ham, key=lambda x: x.get('id', 0), reverse=True)
+        performans.satir_say(len(yuvalar))
 
+        if riskler is None: riskler = self.guncel_risk_modeli().riskler
         for yuva in yuvalar:
-            yuva_id = yuva.get('id', 'N/A')
-            durum = str(yuva.get('predasyon_durumu', '')).lower()
-            basari = yuva.get('yuva_basarisi_yuzde')
-
-            durum_str = durum.capitalize() if durum else 'Belirsiz'
-            item_text = f"ID: {yuva_id} - Durum: {durum_str}"
-
-            list_item = QListWidgetItem(item_text)
-            list_item.setData(Qt.ItemDataRole.UserRole, yuva)
-
-            # --- RENKLENDİRME MANTIĞI BURADA BAŞLIYOR ---
-
-
-            if durum == "tam":
-                list_item.setForeground(QColor('white'))
-                list_item.setBackground(QColor('#DC3545'))  # Canlı Kırmızı
-
-
-            elif durum in ["yari", "kismi"]:
-                list_item.setForeground(QColor('white'))
-                list_item.setBackground(QColor('#007BFF'))  # Canlı Mavi
-
-
-            elif basari is not None:
-                if basari >= 75:
-                    # Yüksek başarılı yuvalar
-                    list_item.setBackground(QColor('#D4EDDA'))  # Açık Yeşil
-                    list_item.setForeground(QColor('#155724'))  # Koyu Yeşil Metin
-                elif basari <= 25:
-                    # Düşük başarılı yuvalar
-                    list_item.setBackground(QColor('#FFF3CD'))  # Açık Sarı
-                    list_item.setForeground(QColor('#856404'))  # Koyu Sarı/Kahve Metin
-
+            anahtar = (yuva.get('id'), yuva.get('yil')); list_item = yuva_liste_ogesi_olustur(yuva, riskler.get(anahtar))
+            self.yuva_list_widget.addItem(list_item); self.liste_indeksi[yuva_anahtari(yuva)] = list_item
+            if anahtar == secili_anahtar: self.yuva_list_widget.setCurrentItem(list_item)  # Yenilemeden sonra seçim korunur
 
+        self.yuva_list_widget.blockSignals(False)
+        return yuvalar
 
-            self.yuva_list_widget.addItem(list_item)
+    def secili_yuva_anahtari(self):
+        item = self.yuva_list_widget.currentItem(); yuva_data = item.data(Qt.ItemDataRole.UserRole) if item else None
+        return (yuva_data.get('id'), yuva_data.get('yil')) if yuva_data else None
 
-        self.yuva_list_widget.blockSignals(False)
-    def akilli_filtrele(self):
-        arama_metni = self.arama_kutusu.text().lower().strip(); kriter = self.arama_kriteri_combo.currentText()
+    def akilli_filtrele(self, yuvalar=None, metin="", kriter="Tüm Bilgiler"):
         for i in range(self.yuva_list_widget.count()):
-            item = self.yuva_list_widget.item(i); yuva_data = item.data(Qt.ItemDataRole.UserRole); gorunur_yap = False
-            if not arama_metni: gorunur_yap = True
-            else:
-                if kriter == "ID": hedef_metin = str(yuva_data.get('id', '')); gorunur_yap = arama_metni in hedef_metin
-                elif kriter == "Yıl": hedef_metin = str(yuva_data.get('yil', '')); gorunur_yap = arama_metni in hedef_metin
-                elif kriter == "Durum": hedef_metin = str(yuva_data.get('predasyon_durumu', '')).lower(); gorunur_yap = arama_metni in hedef_metin
-                elif kriter == "Predatör": hedef_metin = ', '.join(yuva_data.get('predator_canli_listesi', [])).lower(); gorunur_yap = arama_metni in hedef_metin
-                else: tum_bilgiler = ' '.join(str(v) for v in yuva_data.values()).lower(); gorunur_yap = arama_metni in tum_bilgiler
-            item.setHidden(not gorunur_yap)
+            item = self.yuva_list_widget.item(i); yuva_data = item.data(Qt.ItemDataRole.UserRole)
+            item.setHidden(not yuva_aramaya_uyuyor_mu(yuva_data, metin, kriter))
+        return metin, kriter
 
     def yuva_secildiginde_odaklan(self, current_item, previous_item):
-        if not current_item: self.detay_id.setText("-"); self.detay_tarih.setText("-"); self.detay_yumurta_sayisi.setText("-"); self.detay_canli_yavru.setText("-"); self.detay_basari.setText("-"); self.detay_predasyon.setText("-"); self.statusBar().showMessage("Seçim kaldırıldı.", 3000); return
-        try:
-            yuva_data = current_item.data(Qt.ItemDataRole.UserRole); yuva_id = yuva_data.get('id'); yil = yuva_data.get('yil'); lat = yuva_data.get('lat'); lon = yuva_data.get('lon')
+        if not current_item: self.statusBar().showMessage("Seçim kaldırıldı.", 3000)
+        else:
+            yuva_data = current_item.data(Qt.ItemDataRole.UserRole); yuva_id = yuva_data.get('id'); yil = yuva_data.get('yil')
             self.statusBar().showMessage(f"[{yil}] ID: {yuva_id} olan yuva seçildi.", 3000)
-            if self.map_object and lat is not None and lon is not None:
-                js_script = f"var map = {self.map_object.get_name()}; map.setView([{lat}, {lon}], 18); setTimeout(function() {{ var targetLatLng = L.latLng({lat}, {lon}); var closestLayer = null; var minDistance = Infinity; map.eachLayer(function(layer) {{ if (layer instanceof L.Marker || layer instanceof L.CircleMarker) {{ var distance = targetLatLng.distanceTo(layer.getLatLng()); if (distance < minDistance) {{ minDistance = distance; closestLayer = layer; }} }} }}); if (closestLayer && minDistance < 1) {{ closestLayer.openPopup(); }} }}, 200);"; self.web_view.page().runJavaScript(js_script)
+        self.yenileme_hatti.calistir("detaylar")
+
+    def haritada_secimi_goster(self, odakla=True):
+        """Listede seçili yuvaları haritada anahtarla vurgular; tek yuvada kümeyi açıp ona yakınlaşır, çoklu seçimde hepsini sığdırır."""
+        if not self.map_object: return
+        anahtarlar = [yuva_anahtari(item.data(Qt.ItemDataRole.UserRole)) for item in self.yuva_list_widget.selectedItems()]
+        self.web_view.page().runJavaScript(f"if (window.yuvalariSec) {{ window.yuvalariSec({json.dumps(anahtarlar)}, {str(bool(odakla)).lower()}); }}")
+
+    def haritadan_yuva_secildi(self, anahtar, ekle):
+        item = self.liste_indeksi.get(anahtar)
+        if item is None: return
+        if ekle: item.setSelected(not item.isSelected())
+        else: self.yuva_list_widget.setCurrentItem(item)
+        self.yuva_list_widget.scrollToItem(item)
+
+    def detay_panelini_guncelle(self, yuvalar=None, secim=None):
+        current_item = self.yuva_list_widget.currentItem()
+        if secim is None or not current_item: self.detay_id.setText("-"); self.detay_tarih.setText("-"); self.detay_yumurta_sayisi.setText("-"); self.detay_canli_yavru.setText("-"); self.detay_basari.setText("-"); self.detay_predasyon.setText("-"); return secim
+        try:
+            yuva_data = current_item.data(Qt.ItemDataRole.UserRole); yil = yuva_data.get('yil')
             self.detay_id.setText(f"{yuva_data.get('id', 'N/A')} ({yil})"); self.detay_tarih.setText(str(yuva_data.get('yuva_tarihi', 'N/A'))); self.detay_yumurta_sayisi.setText(str(yuva_data.get('toplam_yumurta_sayisi', 'N/A'))); self.detay_canli_yavru.setText(str(yuva_data.get('yuva_ici_canli_yavru', 'N/A')))
             basari_yuzde = yuva_data.get('yuva_basarisi_yuzde'); self.detay_basari.setText(f"{basari_yuzde}%" if basari_yuzde is not None else "N/A")
             predasyon_degeri = yuva_data.get('predasyon_durumu'); predasyon_str = str(predasyon_degeri).title() if predasyon_degeri else "Belirsiz"
@@ -1204,7 +5252,9 @@ class MainWindow(QMainWindow):
     def guvenli_dialog_ac(self, dialog_sinifi, *args, **kwargs):
         self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05)
         dialog = None; result = QDialog.DialogCode.Rejected
-        try: dialog = dialog_sinifi(parent=self, *args, **kwargs); result = dialog.exec()
+        try:
+            with performans.olc(f"dialog_yukle.{dialog_sinifi.__name__}"): dialog = dialog_sinifi(parent=self, *args, **kwargs)
+            result = dialog.exec()
         finally: self.web_view.show(); QApplication.processEvents()
         return dialog, result
 
@@ -1216,7 +5266,8 @@ class MainWindow(QMainWindow):
                 try:
                     tarih_str = yeni_veri.get('yuva_tarihi'); yil = datetime.strptime(tarih_str, '%Y-%m-%d').year; yuva_id = yeni_veri.get('id')
                     if yuva_var_mi(yuva_id, yil): QMessageBox.critical(self, "Hata", f"{yil} yılı için ID: {yuva_id} zaten kullanılıyor!"); return
-                    yuva_ekle(yeni_veri); self.harita_ve_liste_yenile(); QMessageBox.information(self, "Başarılı", f"ID: {yuva_id} ({yil}) eklendi!"); logging.info(f"ID {yuva_id} ({yil}) eklendi."); self.statusBar().showMessage(f"ID: {yuva_id} ({yil}) eklendi!", 4000)
+                    yuva_ekle(yeni_veri); self.harita_ve_liste_yenile(); risk = self.guncel_risk_modeli().risk(yuva_id, yil)
+                    QMessageBox.information(self, "Başarılı", f"ID: {yuva_id} ({yil}) eklendi!" + (f"\nTahmini predasyon riski: %{risk * 100:.0f}" if risk is not None else "")); logging.info(f"KULLANICI EYLEMİ: ID {yuva_id} ({yil}) eklendi.", extra={"eylem": "yuva_ekle", "idler": [yuva_id], "yil": yil, "satir": 1}); self.statusBar().showMessage(f"ID: {yuva_id} ({yil}) eklendi!", 4000)
                 except (ValueError, TypeError) as e: QMessageBox.critical(self, "Veri Hatası", f"Geçersiz veri: {e}"); return
 
     def predasyon_dialog_ac(self):
@@ -1227,7 +5278,7 @@ class MainWindow(QMainWindow):
             veri = dialog.get_data()
             if not veri: QMessageBox.warning(self, "Hata", "Lütfen geçerli bir Yuva ID ve Yıl girin."); return
             if not yuva_var_mi(veri['id'], veri['yil']): QMessageBox.warning(self, "Hata", f"{veri['yil']} yılı için {veri['id']} ID'li bir yuva bulunamadı."); return
-            yuva_predasyon_guncelle(veri['id'], veri['yil'], veri['durum'], veri['turler']); self.harita_ve_liste_yenile(); QMessageBox.information(self, "Başarılı", f"[{veri['yil']}] ID: {veri['id']} durumu güncellendi."); logging.info(f"KULLANICI EYLEMİ: [{veri['yil']}] ID: {veri['id']} durumu güncellendi."); self.statusBar().showMessage(f"[{veri['yil']}] ID: {veri['id']} durumu güncellendi!", 4000)
+            yuva_predasyon_guncelle(veri['id'], veri['yil'], veri['durum'], veri['turler']); self.harita_ve_liste_yenile(); QMessageBox.information(self, "Başarılı", f"[{veri['yil']}] ID: {veri['id']} durumu güncellendi."); logging.info(f"KULLANICI EYLEMİ: [{veri['yil']}] ID: {veri['id']} durumu güncellendi.", extra={"eylem": "predasyon_guncelle", "idler": [veri['id']], "yil": veri['yil'], "satir": 1}); self.statusBar().showMessage(f"[{veri['yil']}] ID: {veri['id']} durumu güncellendi!", 4000)
 
     def yuva_sil_dialog_ac(self):
         secili_itemler = self.yuva_list_widget.selectedItems()
@@ -1249,7 +5300,7 @@ class MainWindow(QMainWindow):
 
         cevap = QMessageBox.question(self, 'Onay',
                                      f"Seçili {len(silinecek_yuvalar)} adet yuvayı ve tüm verilerini silmek istediğinizden emin misiniz?\n"
-                                     "Bu işlem geri alınamaz!",
+                                     "Bu işlem Düzen > Geri Al ile geri alınabilir.",
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                      QMessageBox.StandardButton.No)
 
@@ -1259,7 +5310,8 @@ class MainWindow(QMainWindow):
 
             self.harita_ve_liste_yenile()
             QMessageBox.information(self, "Başarılı", f"{len(silinecek_yuvalar)} adet yuva başarıyla silindi.")
-            logging.warning(f"KULLANICI EYLEMİ: {len(silinecek_yuvalar)} adet yuva toplu olarak silindi.")
+            logging.warning(f"KULLANICI EYLEMİ: {len(silinecek_yuvalar)} adet yuva toplu olarak silindi.",
+                            extra={"eylem": "toplu_sil", "idler": [f"{yil}/{yuva_id}" for yuva_id, yil in silinecek_yuvalar], "satir": len(silinecek_yuvalar)})
             self.statusBar().showMessage(f"{len(silinecek_yuvalar)} adet yuva silindi!", 4000)
 
     def gelismis_grafik_penceresi_ac(self):
@@ -1271,20 +5323,102 @@ class MainWindow(QMainWindow):
         dialog, result = self.guvenli_dialog_ac(IstatistikDialog)
         self.statusBar().showMessage("İstatistik raporu penceresi kapatıldı.", 3000)
     def karsilastirma_penceresi_ac(self): dialog, result = self.guvenli_dialog_ac(KarsilastirmaDialog); self.statusBar().showMessage("Veri karşılaştırma aracı görüntülendi.", 3000)
+    def performans_penceresi_ac(self): dialog, result = self.guvenli_dialog_ac(PerformansDialog)
+    def sicak_nokta_penceresi_ac(self):
+        dialog, result = self.guvenli_dialog_ac(SicakNoktaDialog, ayarlar=self.sicak_nokta_ayarlari)
+        if result != QDialog.DialogCode.Accepted: return
+        try: self.sicak_nokta_ayarlari = dialog.ayarlar()
+        except ValueError as e: QMessageBox.warning(self, "Geçersiz Parametre", str(e)); return
+        if self.sicak_nokta_check.isChecked(): self.harita_ve_liste_yenile()
+        else: self.sicak_nokta_check.setChecked(True)
+    def karantina_penceresi_ac(self): self.guvenli_dialog_ac(KarantinaDialog)
+    def yedek_farki_penceresi_ac(self): dialog, result = self.guvenli_dialog_ac(YedekFarkiDialog); self.statusBar().showMessage("Yedek karşılaştırması görüntülendi.", 3000)
+    def olcum_penceresi_ac(self): dialog, result = self.guvenli_dialog_ac(OlcumDialog); self.statusBar().showMessage("Türetilmiş ölçümler görüntülendi.", 3000)
+    def fenoloji_penceresi_ac(self): dialog, result = self.guvenli_dialog_ac(FenolojiDialog, fenoloji_indeksi=self.fenoloji_indeksi); self.statusBar().showMessage("Sezon fenolojisi görüntülendi.", 3000)
+    def risk_modeli_penceresi_ac(self): dialog, result = self.guvenli_dialog_ac(RiskModeliDialog, risk_modeli=self.guncel_risk_modeli()); self.statusBar().showMessage("Predasyon risk modeli görüntülendi.", 3000)
+    def kiyi_segment_penceresi_ac(self): dialog, result = self.guvenli_dialog_ac(KiyiSegmentDialog, kiyi_indeksi=self.kiyi_indeksi); self.statusBar().showMessage("Kıyı segment özeti görüntülendi.", 3000)
     def hakkinda_penceresi_ac(self): dialog, result = self.guvenli_dialog_ac(HakkindaDialog); self.statusBar().showMessage("Hakkında penceresi görüntülendi.", 3000)
     def simulasyon_penceresi_ac(self): dialog, result = self.guvenli_dialog_ac(SimulasyonDialog); self.statusBar().showMessage("Simülasyon aracı görüntülendi.", 3000)
 
     def excel_import_dialog_ac(self):
         self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
-        try: dosya_yolu, _ = QFileDialog.getOpenFileName(self, "Excel'den Veri Al", "", "Excel Dosyaları (*.xlsx *.xls)")
+        try: dosya_yollari, _ = QFileDialog.getOpenFileNames(self, "Excel'den Veri Al", "", "Excel Dosyaları (*.xlsx *.xls)")
+        finally: self.web_view.show(); QApplication.processEvents()
+        if dosya_yollari: self.excel_dosyalarini_aktar(dosya_yollari)
+
+    def excel_klasoru_dialog_ac(self):
+        self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
+        try: klasor = QFileDialog.getExistingDirectory(self, "Excel Dosyalarının Bulunduğu Klasörü Seçin")
+        finally: self.web_view.show(); QApplication.processEvents()
+        if klasor: self.excel_dosyalarini_aktar([klasor])
+
+    def excel_dosyalarini_aktar(self, yollar):
+        """Aktarımı bir ArkaPlanIsi'nde başlatır; pencere bu sırada yanıt vermeye devam eder, sonuç excel_aktarimi_bitti'ye gelir."""
+        if self.excel_aktarim_isi is not None: QMessageBox.information(self, "Excel Aktarımı", "Önceki Excel aktarımı henüz bitmedi."); return
+        self.excel_aktarim_isi = ArkaPlanIsi(excelleri_toplu_ekle, yollar, guncelle=self.excel_guncelle_action.isChecked(), parent=self)
+        self.excel_aktarim_isi.bitti.connect(self.excel_aktarimi_bitti)
+        QApplication.setOverrideCursor(Qt.CursorShape.BusyCursor); self.statusBar().showMessage("Excel dosyaları aktarılıyor...")
+        self.excel_aktarim_isi.start()
+
+    def excel_aktarimi_bitti(self, sonuc, hata):
+        QApplication.restoreOverrideCursor(); self.excel_aktarim_isi.wait(); self.excel_aktarim_isi.deleteLater(); self.excel_aktarim_isi = None
+        if hata is not None: QMessageBox.critical(self, "Hata", f"Excel aktarımı başarısız: {hata}"); self.statusBar().showMessage("Excel aktarımı başarısız.", 5000); return
+        eklenen_sayisi, mesaj, ozetler = sonuc
+        logging.info(f"KULLANICI EYLEMİ: Excel aktarım: {mesaj}", extra={"eylem": "excel_aktar", "satir": eklenen_sayisi})
+        kutu = QMessageBox(QMessageBox.Icon.Information, "İşlem Tamamlandı", mesaj, parent=self)
+        if len(ozetler) > 1: kutu.setDetailedText(excel_aktarim_ozeti_metni(ozetler))
+        kutu.exec()
+        if eklenen_sayisi > 0: self.harita_ve_liste_yenile()
+        self.statusBar().showMessage(mesaj.split("\n")[0], 5000)
+
+    def saha_formu_dialog_ac(self):
+        self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
+        try: dosya_yolu, _ = QFileDialog.getOpenFileName(self, "Saha Formunu Uygula", "", "Saha Formları (*.xlsx *.xls *.csv)")
         finally: self.web_view.show(); QApplication.processEvents()
         if dosya_yolu:
-            eklenen_sayisi, mesaj = excelden_toplu_ekle(dosya_yolu); QMessageBox.information(self, "İşlem Tamamlandı", mesaj); logging.info(f"Excel aktarım: {mesaj}")
-            if eklenen_sayisi > 0: self.harita_ve_liste_yenile()
+            yazilan_sayisi, mesaj = saha_formu_uygula(dosya_yolu); QMessageBox.information(self, "İşlem Tamamlandı", mesaj); logging.info(f"KULLANICI EYLEMİ: {mesaj}", extra={"eylem": "saha_formu", "satir": yazilan_sayisi})
+            if yazilan_sayisi > 0: self.harita_ve_liste_yenile()
             self.statusBar().showMessage(mesaj, 5000)
 
+    def sezonlari_arsivle_dialog_ac(self):
+        with contextlib.closing(get_connection()) as conn: yillar = [yil for (yil,) in conn.execute("SELECT DISTINCT yil FROM main.yuvalar ORDER BY yil")]
+        if len(yillar) < 2: QMessageBox.information(self, "Sezon Arşivi", "Arşivlenecek geçmiş sezon yok (ana dosyada sadece güncel sezon var)."); return
+        cevap = QMessageBox.question(self, 'Onay', f"{', '.join(map(str, yillar[:-1]))} sezonları salt okunur yıllık arşiv dosyalarına taşınacak.\n"
+                                     "Arşivlenen sezonlarda düzenleme yapılamaz ve bu sezonlardaki eski işlemler geri alınamaz. Devam edilsin mi?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+        if cevap != QMessageBox.StandardButton.Yes: return
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try: basarili, mesaj = sezonlari_arsivle()
+        finally: QApplication.restoreOverrideCursor()
+        if basarili: QMessageBox.information(self, "Sezon Arşivi", mesaj); self.harita_ve_liste_yenile()
+        else: QMessageBox.warning(self, "Sezon Arşivi", mesaj)
+        logging.info(f"KULLANICI EYLEMİ: {mesaj}", extra={"eylem": "sezon_arsivle"}); self.statusBar().showMessage(mesaj, 5000)
+
+    def sicaklik_verisi_dialog_ac(self):
+        self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
+        try: dosya_yollari, _ = QFileDialog.getOpenFileNames(self, "Sıcaklık Kaydedici Dosyalarını Seçin", "", "CSV Dosyaları (*.csv *.txt)")
+        finally: self.web_view.show(); QApplication.processEvents()
+        if dosya_yollari:
+            self.statusBar().showMessage("Sıcaklık verisi yükleniyor...")
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try: yuva_sayisi, mesaj = sicaklik_csv_ice_aktar(dosya_yollari)
+            finally: QApplication.restoreOverrideCursor()
+            QMessageBox.information(self, "İşlem Tamamlandı", mesaj); logging.info(f"KULLANICI EYLEMİ: {mesaj}", extra={"eylem": "sicaklik_yukle", "satir": yuva_sayisi}); self.statusBar().showMessage(mesaj, 5000)
+
+    def senkronizasyon_dialog_ac(self):
+        self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
+        try: dosya_yolu, _ = QFileDialog.getOpenFileName(self, "Senkronize Edilecek Veritabanı Kopyasını Seçin", "", "Veritabanı Dosyaları (*.db)")
+        finally: self.web_view.show(); QApplication.processEvents()
+        if not dosya_yolu: return
+        if os.path.abspath(dosya_yolu) == os.path.abspath(DB_PATH): QMessageBox.warning(self, "Hata", "Veritabanı kendisiyle senkronize edilemez."); return
+        basarili, mesaj, _ = veritabanlarini_senkronize_et(DB_PATH, dosya_yolu)
+        if basarili: QMessageBox.information(self, "Senkronizasyon", mesaj); self.harita_ve_liste_yenile()
+        else: QMessageBox.critical(self, "Senkronizasyon Hatası", mesaj)
+        self.statusBar().showMessage(mesaj, 5000)
+
     def excel_export_dialog_ac(self):
         df = yuvalari_dataframe_yap()
+        if not df.empty: df = olcumleri_ekle(df).round({ad: 2 for ad in olcum_tanimlari()})
         if df.empty: QMessageBox.warning(self, "Veri Yok", "Dışa aktarılacak veri bulunamadı."); return
         self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
         try: dosya_yolu, _ = QFileDialog.getSaveFileName(self, "Verileri Excel'e Aktar", "patara_yuva_verileri.xlsx", "Excel Dosyaları (*.xlsx)")
@@ -1293,11 +5427,73 @@ class MainWindow(QMainWindow):
             try:
                 if 'predator_canli_listesi' in df.columns: df['predator_canli_listesi'] = df['predator_canli_listesi'].apply(lambda d: ', '.join(d) if isinstance(d, list) else d)
                 yeni_sutun_isimleri = {sutun: sutun.replace('_', ' ').title() for sutun in df.columns}; df.rename(columns=yeni_sutun_isimleri, inplace=True)
-                df.to_excel(dosya_yolu, index=False, engine='openpyxl'); QMessageBox.information(self, "Başarılı", f"Veriler '{dosya_yolu}' dosyasına kaydedildi."); logging.info(f"Veriler Excel'e aktarıldı: {dosya_yolu}")
+                df.to_excel(dosya_yolu, index=False, engine='openpyxl'); QMessageBox.information(self, "Başarılı", f"Veriler '{dosya_yolu}' dosyasına kaydedildi."); logging.info(f"KULLANICI EYLEMİ: Veriler Excel'e aktarıldı: {dosya_yolu}", extra={"eylem": "excel_disa_aktar", "satir": len(df)})
                 self.statusBar().showMessage(f"Veriler Excel'e aktarıldı: {os.path.basename(dosya_yolu)}", 5000)
             except Exception as e: QMessageBox.critical(self, "Hata", f"Dosya kaydedilemedi: {e}"); logging.error(f"Excel'e aktarma hatası: {e}", exc_info=True)
 
+    def cografi_disa_aktar_dialog_ac(self):
+        self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
+        try: dosya_yolu, _ = QFileDialog.getSaveFileName(self, "Coğrafi Formatta Dışa Aktar", "patara_yuvalar.gpkg", "GeoPackage (*.gpkg);;GeoJSON (*.geojson);;FlatGeobuf (*.fgb)")
+        finally: self.web_view.show(); QApplication.processEvents()
+        if not dosya_yolu: return
+        tampon = None; referans = self.combo_referans.currentText().lower()
+        if referans != "yok" and referans in self.sabit_lejantlar:
+            try: tampon = (referans, self.sabit_lejantlar[referans], float(self.mesafe_input.text()))
+            except ValueError: pass
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try: basarili, mesaj, dosyalar = cografi_disa_aktar(dosya_yolu, cizim=self.map_communicator.drawn_polygon_coords, tampon=tampon, sicak_nokta=self.sicak_nokta_ayarlari)
+        finally: QApplication.restoreOverrideCursor()
+        if not basarili: QMessageBox.critical(self, "Hata", mesaj); return
+        kutu = QMessageBox(QMessageBox.Icon.Information, "Başarılı", mesaj, parent=self)
+        if len(dosyalar) > 1: kutu.setDetailedText("\n".join(dosyalar))
+        kutu.exec(); self.statusBar().showMessage(mesaj, 5000)
+
+    def statik_harita_kaydet(self):
+        self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
+        try: dosya_yolu, _ = QFileDialog.getSaveFileName(self, "Haritayı Kaydet", "patara_harita.pdf", "PDF Raporu (*.pdf);;PNG Görüntüsü (*.png)")
+        finally: self.web_view.show(); QApplication.processEvents()
+        if not dosya_yolu: return
+        yuvalar = self.yenileme_hatti.sonuc("alan_filtresi"); yuvalar = yuvalar if yuvalar is not None else self.yuva_onbellegi.yuvalar()
+        cizim = self.map_communicator.drawn_polygon_coords; pdf_mi = dosya_yolu.lower().endswith(".pdf"); yogunluk = self.heatmap_check.isChecked()
+        # Liste, veri ile çizim/referans filtresinden türediği için anahtar bunlardan kurulur
+        anahtar = cikti_onbellegi.anahtar("statik_harita_gorunum", veri=veri_parmak_izi(), cizim=cizim, referans=self.combo_referans.currentText().lower(), mesafe=self.mesafe_input.text(),
+                                          yuva=len(yuvalar), yogunluk=yogunluk, sabit_lejantlar=self.sabit_lejantlar, karo_zoomlari=karo_imzasi())
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            harita_yolu = cikti_onbellegi.uret(anahtar, ".png", lambda hedef: statik_harita_ciz(hedef, yuvalar, baslik=f"Patara Yuvaları ({len(yuvalar)} yuva)", cizimler=[cizim] if cizim else (), yogunluk=yogunluk))
+            if pdf_mi:
+                icerik = [(f"{kriter}:", deger, "navy") for kriter, deger in grup_istatistigi_hesapla(pd.DataFrame(yuvalar)).items()]
+                basarili, mesaj = create_pdf_report(dosya_yolu, "Patara Yuva Haritası Raporu", icerik, harita_yollari=[harita_yolu])
+            else: shutil.copyfile(harita_yolu, dosya_yolu); basarili, mesaj = True, f"Harita kaydedildi: {dosya_yolu}"
+        except Exception as e: basarili, mesaj = False, f"Harita çizilemedi: {e}"; logging.error(mesaj, exc_info=True)
+        finally: QApplication.restoreOverrideCursor()
+        if basarili: QMessageBox.information(self, "Başarılı", mesaj); logging.info(f"Statik harita kaydedildi: {dosya_yolu}"); self.statusBar().showMessage(f"Harita kaydedildi: {os.path.basename(dosya_yolu)}", 5000)
+        else: QMessageBox.critical(self, "Hata", mesaj)
+
+    def yedegi_incele(self):
+        self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
+        try: dosya_yolu, _ = QFileDialog.getOpenFileName(self, "İncelenecek Yedeği Seçin", os.path.join(SCRIPT_DIR, "backups"), "Veritabanı Yedekleri (*.db)")
+        finally: self.web_view.show(); QApplication.processEvents()
+        if not dosya_yolu: return
+        try: self.anlik_goruntuyu_degistir(anlik_goruntu_ac(dosya_yolu))
+        except Exception as e: QMessageBox.critical(self, "Hata", f"Yedek açılamadı: {e}"); logging.error(f"Yedek açma hatası: {e}", exc_info=True); return
+        self.statusBar().showMessage(f"Yedek salt okunur inceleniyor: {os.path.basename(dosya_yolu)}. Canlı veri değiştirilmez.", 6000)
+
+    def canli_veriye_don(self):
+        if self.anlik_goruntu_yolu: self.anlik_goruntuyu_degistir(None); self.statusBar().showMessage("Canlı veriye dönüldü.", 4000)
+
+    def anlik_goruntuyu_degistir(self, calisma_yolu):
+        """Tüm okumaları bir yedek görüntüsüne (calisma_yolu) ya da None ise canlı veritabanına yönlendirir."""
+        global DB_PATH
+        canli_yol = canli_veritabani_yolu(); onceki = self.anlik_goruntu_yolu
+        DB_PATH = calisma_yolu or canli_yol; self.anlik_goruntu_yolu = calisma_yolu
+        if onceki: anlik_goruntu_kapat(onceki)
+        self.yuva_onbellegi.gecersiz_kil(); self.kiyi_indeksi.gecersiz_kil(); self.risk_modeli.gecersiz_kil(); self.fenoloji_indeksi.gecersiz_kil(); self.canli_veri_action.setEnabled(bool(calisma_yolu))
+        self.setWindowTitle("Patara Bilimsel Veri Platformu" + (f" — Yedek (salt okunur): {os.path.basename(_ANLIK_GORUNTULER[calisma_yolu][0])}" if calisma_yolu else ""))
+        self.harita_ve_liste_yenile()
+
     def yedekten_geri_yukle(self):
+        self.canli_veriye_don()
         yedekler_klasoru = os.path.join(SCRIPT_DIR, "backups")
         if not os.path.exists(yedekler_klasoru): QMessageBox.warning(self, "Yedek Bulunamadı", "Hiç yedek dosyası bulunamadı."); return
         self.web_view.hide(); QApplication.processEvents(); time.sleep(0.05);
@@ -1307,15 +5503,11 @@ class MainWindow(QMainWindow):
             cevap = QMessageBox.question(self, 'Onay', "Mevcut veritabanı seçilen yedek ile değiştirilecek.\nBu işlem geri alınamaz. Emin misiniz?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
             if cevap == QMessageBox.StandardButton.Yes:
                 try:
-                    shutil.copy2(dosya_yolu, DB_PATH); QMessageBox.information(self, "Başarılı", "Veritabanı geri yüklendi."); logging.warning(f"Veritabanı '{os.path.basename(dosya_yolu)}' yedeğinden geri yüklendi."); self.harita_ve_liste_yenile(); self.statusBar().showMessage("Veritabanı yedekten geri yüklendi.", 4000)
+                    shutil.copy2(dosya_yolu, DB_PATH); setup_database(); self.yuva_onbellegi.gecersiz_kil(); self.kiyi_indeksi.gecersiz_kil(); self.risk_modeli.gecersiz_kil(); self.fenoloji_indeksi.gecersiz_kil(); QMessageBox.information(self, "Başarılı", "Veritabanı geri yüklendi."); logging.warning(f"Veritabanı '{os.path.basename(dosya_yolu)}' yedeğinden geri yüklendi."); self.harita_ve_liste_yenile(); self.statusBar().showMessage("Veritabanı yedekten geri yüklendi.", 4000)
                 except Exception as e: QMessageBox.critical(self, "Hata", f"Geri yükleme hatası: {e}"); logging.error(f"Yedekten geri yükleme hatası: {e}", exc_info=True)
 
     def otomatik_yedekle(self):
-        try:
-            yedekler_klasoru = os.path.join(SCRIPT_DIR, "backups");
-            if not os.path.exists(yedekler_klasoru): os.makedirs(yedekler_klasoru)
-            tarih_damgasi = datetime.now().strftime("%Y-%m-%d_%H-%M-%S"); yedek_dosya_yolu = os.path.join(yedekler_klasoru, f"caretta_final_{tarih_damgasi}.db")
-            if os.path.exists(DB_PATH): shutil.copy2(DB_PATH, yedek_dosya_yolu); logging.info(f"Veritabanı yedeklendi: {yedek_dosya_yolu}")
+        try: veritabanini_yedekle()
         except Exception as e: logging.error(f"Yedekleme hatası: {e}", exc_info=True)
 
     def dragEnterEvent(self, event):
@@ -1323,22 +5515,22 @@ class MainWindow(QMainWindow):
         else: super().dragEnterEvent(event)
 
     def dropEvent(self, event):
-        urls = event.mimeData().urls()
-        if urls:
-            dosya_yolu = urls[0].toLocalFile()
-            if dosya_yolu.lower().endswith(('.xlsx', '.xls')):
-                logging.info(f"Kullanıcı Excel dosyası sürükledi: {dosya_yolu}")
-                cevap = QMessageBox.question(self, 'Excel Dosyası Algılandı', f"'{os.path.basename(dosya_yolu)}' dosyasını aktarmak istiyor musunuz?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
-                if cevap == QMessageBox.StandardButton.Yes:
-                    eklenen_sayisi, mesaj = excelden_toplu_ekle(dosya_yolu)
-                    logging.info(f"Excel aktarım sonucu: {mesaj}"); QMessageBox.information(self, "İşlem Tamamlandı", mesaj)
-                    if eklenen_sayisi > 0: self.harita_ve_liste_yenile()
-                    self.statusBar().showMessage(mesaj, 5000)
-            else: QMessageBox.warning(self, "Geçersiz Dosya Türü", "Lütfen sadece Excel (.xlsx, .xls) dosyası sürükleyin.")
+        yollar = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if yollar:
+            dosyalar = excel_dosyalarini_bul(yollar)
+            if dosyalar:
+                logging.info(f"Kullanıcı {len(dosyalar)} Excel dosyası sürükledi: {yollar}")
+                soru = f"'{os.path.basename(dosyalar[0])}' dosyasını aktarmak istiyor musunuz?" if len(dosyalar) == 1 else f"{len(dosyalar)} Excel dosyasını aktarmak istiyor musunuz?"
+                cevap = QMessageBox.question(self, 'Excel Dosyası Algılandı', soru, QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+                if cevap == QMessageBox.StandardButton.Yes: self.excel_dosyalarini_aktar(dosyalar)
+            else: QMessageBox.warning(self, "Geçersiz Dosya Türü", "Lütfen Excel (.xlsx, .xls) dosyaları ya da bunları içeren bir klasör sürükleyin.")
         super().dropEvent(event)
 
     def closeEvent(self, event):
-        logging.info("Uygulama kapatılıyor..."); self.otomatik_yedekle()
+        logging.info("Uygulama kapatılıyor...")
+        if self.excel_aktarim_isi is not None: self.excel_aktarim_isi.wait()  # Yarım kalan aktarım yedekten önce bitmeli
+        self.otomatik_yedekle()
+        if self.anlik_goruntu_yolu: anlik_goruntu_kapat(self.anlik_goruntu_yolu)
         if hasattr(self, 'gelismis_grafik_penceresi') and self.gelismis_grafik_penceresi: self.gelismis_grafik_penceresi.close()
         super().closeEvent(event)
 
@@ -1347,11 +5539,220 @@ class MainWindow(QMainWindow):
 # BÖLÜM 5: UYGULAMAYI BAŞLATMA
 # ==============================================================================
 
+def komut_satiri_ayristirici():
+    """Arayüz açılmadan çalıştırılabilen komut satırı işlemlerini tanımlar."""
+    parser = argparse.ArgumentParser(prog="patara.py", description="Patara Bilimsel Veri Platformu komut satırı araçları")
+    parser.add_argument("--veritabani", help="Kullanılacak veritabanı dosyası (varsayılan: caretta_final.db)")
+    alt_komutlar = parser.add_subparsers(dest="komut", required=True)
+    saha_formu = alt_komutlar.add_parser("saha-formu", help="Bir günlük saha formunu tek işlemde veritabanına uygular.")
+    saha_formu.add_argument("dosya", help="Excel (.xlsx) veya CSV saha formu")
+    senkron = alt_komutlar.add_parser("senkronize", help="Başka bir saha kopyasıyla değişiklikleri çift yönlü birleştirir.")
+    senkron.add_argument("diger_veritabani", help="Senkronize edilecek diğer .db dosyası")
+    sunucu = alt_komutlar.add_parser("serve", help="Veritabanını yerel ağda HTTP/JSON API olarak sunar.")
+    sunucu.add_argument("--host", default="127.0.0.1"); sunucu.add_argument("--port", type=int, default=8765)
+    sunucu.add_argument("--havuz", type=int, default=4, help="Okuma bağlantı havuzu boyutu")
+    yuk_testi = alt_komutlar.add_parser("serve-bench", help="API sunucusunu yerelde eşzamanlı istemcilerle ölçer.")
+    yuk_testi.add_argument("--istemci", type=int, default=8); yuk_testi.add_argument("--istek", type=int, default=200)
+    yuk_testi.add_argument("--yazma-orani", type=float, default=0.1); yuk_testi.add_argument("--havuz", type=int, default=4)
+    sicaklik = alt_komutlar.add_parser("sicaklik-yukle", help="Sıcaklık kaydedici CSV'lerini zaman serisi deposuna ekler.")
+    sicaklik.add_argument("dosyalar", nargs="+", help="CSV dosyaları ('id' sütunlu ya da 12_2024.csv gibi adlandırılmış)")
+    arsiv = alt_komutlar.add_parser("sezon-arsivle", help="Geçmiş sezonları salt okunur yıllık arşiv dosyalarına taşır.")
+    arsiv.add_argument("yillar", type=int, nargs="*", help="Arşivlenecek yıllar (varsayılan: en son sezon dışındakiler)")
+    arsiv.add_argument("--cikar", action="store_true", help="Verilen yılları arşivden çıkarıp ana dosyaya geri alır")
+    excel = alt_komutlar.add_parser("excel-aktar", help="Excel dosyalarını ya da klasörleri paralel okuyup tek işlemde aktarır.")
+    excel.add_argument("yollar", nargs="+", help="Excel dosyaları ve/veya klasörler"); excel.add_argument("--isci", type=int, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    excel.add_argument("--guncelle", action="store_true", help="Zaten kayıtlı satırlardan içeriği değişenleri günceller (değişmeyenlere dokunmaz)")
+    karantina = alt_komutlar.add_parser("karantina", help="İçe aktarmada doğrulamadan geçemeyen satırları listeler.")
+    karantina.add_argument("--cikti", help="Karantinanın yazılacağı CSV dosyası"); karantina.add_argument("--temizle", action="store_true", help="Listeledikten sonra karantinayı boşaltır")
+    olcum = alt_komutlar.add_parser("olcum", help="Türetilmiş ölçümleri listeler, ekler, siler ya da yuva başına tablo olarak yazar.")
+    olcum.add_argument("islem", choices=["listele", "ekle", "sil", "tablo"]); olcum.add_argument("ad", nargs="?", help="Ölçüm adı (ekle/sil)")
+    olcum.add_argument("ifade", nargs="?", help="Ölçüm ifadesi (ekle), örn. \"oran(bos_kabuk_sayisi, toplam_yumurta_sayisi) * 100\"")
+    olcum.add_argument("--etiket", help="Okunur ad (ekle)"); olcum.add_argument("--cikti", help="Tablonun yazılacağı CSV dosyası (tablo)")
+    fenoloji = alt_komutlar.add_parser("fenoloji", help="Beklenen çıkış penceresindeki açık yuvaları (gece devriyesi listesi) ve sezon eğrilerini yazar.")
+    fenoloji.add_argument("--tarih", help="Devriye başlangıç günü (YYYY-AA-GG, varsayılan: bugün)"); fenoloji.add_argument("--gun", type=int, default=7, help="Kaç günlük aralık")
+    fenoloji.add_argument("--cikti", help="Yuva listesinin yazılacağı CSV dosyası"); fenoloji.add_argument("--yil", type=int, help="Eğrisi yazılacak sezon (varsayılan: son sezon)")
+    fenoloji.add_argument("--egri", help="Günlük ve kümülatif yumurtlama/çıkış eğrilerinin yazılacağı CSV dosyası")
+    gunluk = alt_komutlar.add_parser("gunluk", help="Yapısal etkinlik günlüğünü özetler (kullanıcı eylemleri, yavaş işlemler, hatalar).")
+    gunluk.add_argument("ozet", choices=["eylemler", "yavas", "hatalar"]); gunluk.add_argument("--baslangic", help="Bu tarihten (YYYY-AA-GG) itibaren")
+    gunluk.add_argument("--bitis", help="Bu tarihe (YYYY-AA-GG) kadar"); gunluk.add_argument("--esik", type=float, default=YAVAS_ISLEM_ESIGI_MS, help="Yavaş sayılacak süre (ms)")
+    gunluk.add_argument("--eskisiz", action="store_true", help="Eski activity_log.txt metin günlüğünü okuma"); gunluk.add_argument("--cikti", help="Özetin yazılacağı CSV dosyası")
+    onbellek = alt_komutlar.add_parser("onbellek", help="Rapor/grafik çıktı önbelleğinin boyutunu gösterir.")
+    onbellek.add_argument("--temizle", action="store_true", help="Önbellekteki tüm çıktıları siler")
+    cografi = alt_komutlar.add_parser("cografi-aktar", help="Yuvaları ve analiz katmanlarını GeoPackage, GeoJSON ya da FlatGeobuf olarak dışa aktarır.")
+    cografi.add_argument("cikti", help="Çıktı dosyası (.gpkg, .geojson ya da .fgb; biçim uzantıdan seçilir)")
+    cografi.add_argument("--katmanlar", nargs="+", choices=[k for k in COGRAFI_KATMANLAR if k != "cizim_alani"], help="Yazılacak katmanlar (varsayılan: hepsi)")
+    cografi.add_argument("--referans", help="Tampon bölge için sabit lejant adı"); cografi.add_argument("--mesafe", type=float, default=300, help="Tampon yarıçapı (m)")
+    cografi.add_argument("--sicak-nokta-yontemi", choices=list(SICAK_NOKTA_YONTEMLERI), default="dbscan"); cografi.add_argument("--parca", type=int, default=COGRAFI_PARCA_BOYUTU, help="Parça başına yuva sayısı")
+    varlik = alt_komutlar.add_parser("varlik-indir", help="Harita JS/CSS varlıklarını bir kez indirip yerelden (çevrimdışı) sunulmak üzere saklar.")
+    varlik.add_argument("--karolar", nargs="*", type=int, metavar="ZOOM", help="Statik haritalar için altlık karolarını da indir (varsayılan zoom: 13-16)")
+    statik = alt_komutlar.add_parser("harita-ciz", help="Haritayı arayüz olmadan PNG/PDF olarak çizer; .pdf çıktısı özet tablolu rapordur.")
+    statik.add_argument("cikti", help="Çıktı dosyası (.png, .svg ya da .pdf)"); statik.add_argument("--yillar", type=int, nargs="+", help="Yalnızca bu yılların yuvaları")
+    statik.add_argument("--yil-basina", action="store_true", help="Her yıl için ayrı harita (paralel işçi süreçlerde) çizer")
+    statik.add_argument("--yogunluk", action="store_true", help="Yoğunluk (ısı) ızgarasını ekler"); statik.add_argument("--karosuz", action="store_true", help="Önbellekteki altlık karolarını kullanma")
+    statik.add_argument("--dpi", type=int, default=300); statik.add_argument("--isci", type=int, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    statik.add_argument("--onbelleksiz", action="store_true", help="Çıktı önbelleğini kullanmadan tüm haritaları yeniden çiz")
+    fark = alt_komutlar.add_parser("fark", help="Bir yedeği canlı veriyle ya da başka bir yedekle satır satır karşılaştırır.")
+    fark.add_argument("eski", nargs="?", help="Eski görüntü (.db yedeği)")
+    fark.add_argument("--tarih", help="Eski görüntü olarak bu tarihte (YYYY-AA-GG) ya da öncesinde alınmış en son yedeği kullan")
+    fark.add_argument("--yeni", help="Yeni görüntü (varsayılan: canlı veritabanı)"); fark.add_argument("--cikti", help="Farkların yazılacağı CSV dosyası")
+    kiyaslama = alt_komutlar.add_parser("benchmark", help="Sentetik sezonlarla temel işlemleri ölçer ve sonuçları JSON olarak kaydeder.")
+    kiyaslama.add_argument("--boyutlar", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Ölçülecek sezon büyüklükleri (yuva sayısı)")
+    kiyaslama.add_argument("--tekrar", type=int, default=3); kiyaslama.add_argument("--tohum", type=int, default=42)
+    kiyaslama.add_argument("--excel-siniri", type=int, default=100_000, help="Bu boyutun üzerinde Excel içe/dışa aktarma ölçülmez")
+    kiyaslama.add_argument("--cikti", help="Sonuç JSON dosyası (varsayılan: benchmarks/kiyaslama_<tarih>.json)")
+    kiyaslama.add_argument("--karsilastir", help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    kiyaslama.add_argument("--esik", type=float, default=1.2, help="Gerileme sayılacak süre oranı")
+    return parser
+
+
+def komut_satiri_calistir(argv):
+    """Komut satırı işlemini çalıştırır ve çıkış kodunu döner."""
+    global DB_PATH
+    args = komut_satiri_ayristirici().parse_args(argv)
+    if args.veritabani: DB_PATH = os.path.abspath(args.veritabani)
+    setup_database()
+    if args.komut == "saha-formu":
+        yazilan_sayisi, mesaj = saha_formu_uygula(args.dosya)
+        print(mesaj)
+        return 0 if yazilan_sayisi > 0 else 1
+    if args.komut == "senkronize":
+        basarili, mesaj, _ = veritabanlarini_senkronize_et(DB_PATH, args.diger_veritabani)
+        print(mesaj)
+        return 0 if basarili else 1
+    if args.komut == "serve":
+        sunucuyu_calistir(args.host, args.port, args.havuz)
+        return 0
+    if args.komut == "serve-bench":
+        print(json.dumps(sunucu_yuk_testi(args.istemci, args.istek, args.yazma_orani, args.havuz), indent=2))
+        return 0
+    if args.komut == "sicaklik-yukle":
+        yuva_sayisi, mesaj = sicaklik_csv_ice_aktar(args.dosyalar)
+        print(mesaj)
+        return 0 if yuva_sayisi > 0 else 1
+    if args.komut == "sezon-arsivle":
+        if args.cikar:
+            if not args.yillar: print("Arşivden çıkarılacak yılları belirtin."); return 1
+            sonuclar = [sezonu_arsivden_cikar(yil) for yil in args.yillar]
+            for _, mesaj in sonuclar: print(mesaj)
+            return 0 if all(basarili for basarili, _ in sonuclar) else 1
+        basarili, mesaj = sezonlari_arsivle(args.yillar or None)
+        print(mesaj)
+        return 0 if basarili else 1
+    if args.komut == "excel-aktar":
+        eklenen, mesaj, ozetler = excelleri_toplu_ekle(args.yollar, args.isci, args.guncelle)
+        print(mesaj)
+        if len(ozetler) > 1: print(excel_aktarim_ozeti_metni(ozetler))
+        return 0 if eklenen or not any(o['hata'] for o in ozetler) else 1
+    if args.komut == "karantina":
+        df = karantina_kayitlari()
+        if args.cikti: df.to_csv(args.cikti, index=False, encoding='utf-8-sig'); print(f"{len(df)} karantina satırı kaydedildi: {args.cikti}")
+        else: print(df.drop(columns=['veri']).to_string(index=False) if not df.empty else "Karantina boş.")
+        if args.temizle: print(f"{karantinayi_temizle()} satır karantinadan silindi.")
+        return 0
+    if args.komut == "harita-ciz":
+        df = yuvalari_dataframe_yap()
+        if args.yillar: df = df[df['yil'].isin(args.yillar)]
+        yillar = sorted(df['yil'].unique().tolist()) if args.yil_basina else [None]
+        govde, uzanti = os.path.splitext(args.cikti); pdf_mi = uzanti.lower() == ".pdf"; gecici = tempfile.mkdtemp(prefix="patara_harita_") if pdf_mi else None
+        try:
+            isler = [{"cikti_yolu": os.path.join(gecici, f"harita_{yil or 'tum'}.png") if pdf_mi else (f"{govde}_{yil}{uzanti}" if yil else args.cikti),
+                      "yillar": [yil] if yil else args.yillar, "baslik": f"Patara {yil} Sezonu" if yil else "Patara Yuvaları", "yogunluk": args.yogunluk,
+                      "karolar": not args.karosuz, "dpi": args.dpi} for yil in yillar]
+            sonuclar = statik_haritalari_ciz(isler, args.isci, onbellek=None if args.onbelleksiz else cikti_onbellegi); hatalar = [f"{yol}: {hata}" for yol, hata in sonuclar if hata]
+            if hatalar: print("\n".join(hatalar)); return 1
+            if pdf_mi:
+                icerik = [(f"{kriter}:", deger, "navy") for kriter, deger in grup_istatistigi_hesapla(df).items()]
+                basarili, mesaj = create_pdf_report(args.cikti, "Patara Yuva Haritası Raporu", icerik, harita_yollari=[yol for yol, _ in sonuclar])
+                print(mesaj); return 0 if basarili else 1
+            print("\n".join(yol for yol, _ in sonuclar)); return 0
+        finally:
+            if gecici: shutil.rmtree(gecici, ignore_errors=True)
+    if args.komut == "olcum":
+        if args.islem in ("ekle", "sil") and not args.ad or args.islem == "ekle" and not args.ifade: print("Ölçüm adı (ve ekle için ifade) gerekli."); return 1
+        if args.islem == "ekle": basarili, mesaj = olcum_tanimini_kaydet(args.ad, args.ifade, args.etiket); print(mesaj); return 0 if basarili else 1
+        if args.islem == "sil": basarili, mesaj = olcum_tanimini_sil(args.ad); print(mesaj); return 0 if basarili else 1
+        tablo = olcum_tablosu()
+        if args.islem == "tablo":
+            if args.cikti: tablo.round(2).to_csv(args.cikti, index=False, encoding='utf-8-sig'); print(f"{len(tablo)} yuva için ölçümler yazıldı: {args.cikti}")
+            else: print(tablo.round(2).to_string(index=False))
+            return 0
+        for ad, tanim in olcum_tanimlari().items():
+            ortalama = f"ort. {tablo[ad].mean():8.2f} ({tablo[ad].count()} yuva)" if ad in tablo.columns else "hesaplanamadı"
+            print(f"{ad:<22} {'yerleşik ' if tanim['yerlesik'] else 'kullanıcı'} {ortalama}  {tanim['ifade']}")
+        return 0
+    if args.komut == "fenoloji":
+        try: baslangic = datetime.strptime(args.tarih, "%Y-%m-%d").date() if args.tarih else None
+        except ValueError: print(f"Geçersiz tarih: {args.tarih} (YYYY-AA-GG bekleniyor)"); return 1
+        indeks = FenolojiIndeksi().guncelle(); liste = indeks.cikmasi_beklenenler(baslangic, args.gun)
+        if args.egri:
+            yil = args.yil or (indeks.yillar() or [None])[-1]
+            if yil is None: print("Kayıtlı yuva yok."); return 1
+            indeks.egriler(yil).to_csv(args.egri, encoding='utf-8-sig'); print(f"{yil} sezonu eğrileri yazıldı: {args.egri}")
+        if args.cikti: liste.to_csv(args.cikti, index=False, encoding='utf-8-sig')
+        print(liste.to_string(index=False) if not liste.empty else "Bu aralıkta çıkış penceresinde açık yuva yok."); return 0
+    if args.komut == "gunluk":
+        ozet = gunluk_ozeti(args.ozet, gunluk_tablosu(baslangic=args.baslangic, bitis=args.bitis, eski=not args.eskisiz), args.esik)
+        if args.cikti: ozet.to_csv(args.cikti, index=False, encoding='utf-8-sig')
+        print(ozet.to_string(index=False) if not ozet.empty else "Eşleşen günlük kaydı yok."); return 0
+    if args.komut == "onbellek":
+        if args.temizle: print(f"{cikti_onbellegi.temizle()} çıktı önbellekten silindi.")
+        ozet = cikti_onbellegi.ozet(); print(f"{ozet['klasor']}: {ozet['dosya']} çıktı, {ozet['bayt'] / 1e6:.1f} / {ozet['azami_bayt'] / 1e6:.0f} MB")
+        return 0
+    if args.komut == "cografi-aktar":
+        sabit_lejantlar = load_config().get("sabit_lejantlar", {})
+        if args.referans and args.referans.lower() not in sabit_lejantlar: print(f"Bilinmeyen referans: {args.referans}. Seçenekler: {', '.join(sabit_lejantlar)}"); return 1
+        tampon = (args.referans.lower(), sabit_lejantlar[args.referans.lower()], args.mesafe) if args.referans else None
+        basarili, mesaj, dosyalar = cografi_disa_aktar(args.cikti, args.katmanlar, tampon=tampon, parca_boyutu=args.parca,
+                                                       sicak_nokta={"yontem": args.sicak_nokta_yontemi, "mesafe_m": 50, "min_yuva": 4})
+        print(mesaj)
+        if len(dosyalar) > 1: print("\n".join(dosyalar))
+        return 0 if basarili else 1
+    if args.komut == "varlik-indir":
+        basarili, mesaj = harita_varliklarini_indir()
+        print(mesaj)
+        if args.karolar is not None:
+            karo_basarili, karo_mesaji = harita_karolarini_indir(tuple(args.karolar) or (13, 14, 15, 16))
+            print(karo_mesaji); basarili = basarili and karo_basarili
+        return 0 if basarili else 1
+    if args.komut == "fark":
+        eski_yol = args.eski or (tarihten_onceki_yedek(datetime.strptime(args.tarih, "%Y-%m-%d").replace(hour=23, minute=59, second=59)) if args.tarih else None)
+        if not eski_yol: print("Karşılaştırılacak yedek bulunamadı (eski dosyayı ya da --tarih verin)."); return 1
+        ozet, fark_df = anlik_goruntu_farki(eski_yol, args.yeni)
+        print(f"{ozet['eski']} -> {ozet['yeni']}: {ozet['eklenen']} eklenen, {ozet['silinen']} silinen, {ozet['degisen']} değişen yuva "
+              f"({ozet['degisen_alan']} alan), {ozet['sure_sn']} sn")
+        if args.cikti: fark_df.to_csv(args.cikti, index=False); print(f"Farklar kaydedildi: {args.cikti}")
+        else: print(fark_df.head(50).to_string(index=False))
+        return 0
+    if args.komut == "benchmark":
+        sonuc = kiyaslama_calistir(args.boyutlar, args.tekrar, args.tohum, args.excel_siniri)
+        cikti_yolu = args.cikti or os.path.join(SCRIPT_DIR, "benchmarks", f"kiyaslama_{datetime.now():%Y-%m-%d_%H-%M-%S}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(cikti_yolu)), exist_ok=True)
+        with open(cikti_yolu, 'w', encoding='utf-8') as f: json.dump(sonuc, f, indent=2, ensure_ascii=False)
+        for boyut, islemler in sonuc["sonuclar"].items():
+            for islem, olcum in islemler.items():
+                deger = f"{olcum['medyan_ms']:>12.1f} ms" if "medyan_ms" in olcum else olcum.get("atlandi") or f"HATA: {olcum.get('hata')}"
+                print(f"{boyut:>9} {islem:<22} {deger}")
+        print(f"Sonuçlar kaydedildi: {cikti_yolu}")
+        if not args.karsilastir: return 0
+        with open(args.karsilastir, 'r', encoding='utf-8') as f: onceki = json.load(f)
+        gerilemeler = [satir for satir in kiyaslama_karsilastir(onceki, sonuc, args.esik) if satir[5]]
+        for boyut, islem, onceki_ms, simdiki_ms, oran, _ in gerilemeler:
+            print(f"GERİLEME {boyut:>9} {islem:<22} {onceki_ms:.1f} ms -> {simdiki_ms:.1f} ms (x{oran:.2f})")
+        if not gerilemeler: print(f"Önceki sonuca göre gerileme yok (eşik x{args.esik}).")
+        return 1 if gerilemeler else 0
+    return 1
+
+
+KOMUT_SATIRI_KOMUTLARI = {"saha-formu", "senkronize", "serve", "serve-bench", "benchmark", "sicaklik-yukle", "sezon-arsivle", "fark", "varlik-indir", "excel-aktar", "karantina", "cografi-aktar", "harita-ciz", "onbellek", "gunluk", "olcum", "fenoloji"}
+
 if __name__ == "__main__":
     # 1. Gerekli Kurulumlar
     setup_logging()
+    if len(sys.argv) > 1 and (sys.argv[1] in KOMUT_SATIRI_KOMUTLARI or sys.argv[1].startswith("--veritabani")):
+        sys.exit(komut_satiri_calistir(sys.argv[1:]))
     os.environ['QTWEBENGINE_DISABLE_SANDBOX'] = "1"
     QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseSoftwareOpenGL)
+    varlik_semasini_kaydet()
 
     # 2. Uygulama Nesnesi
     app = QApplication(sys.argv)
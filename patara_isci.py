@@ -0,0 +1,308 @@
+# ==============================================================================
+#               PATARA BİLİMSEL VERİ PLATFORMU - İŞÇİ SÜREÇ YARDIMCILARI
+# ==============================================================================
+# Açıklama: Ağır işleri (toplu çizim, toplu okuma) spawn ile açılan işçi
+# süreçlere dağıtan havuz yardımcısı ile işçilerde çalışan Excel okuma/
+# doğrulama ve başsız statik harita çizimi. Bu modül Qt içe aktarmaz; işçi
+# süreçler yalnızca bu modülü ve bilimsel kütüphaneleri yükler, matplotlib
+# yalnızca Agg tuvaline çizer.
+# ==============================================================================
+
+import concurrent.futures
+import contextlib
+import json
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import sys
+import threading
+import numpy as np
+import pandas as pd
+import matplotlib.image
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+# --- İşçi Süreç Havuzu ---
+# İşçiler 'spawn' ile açılır (fork, Qt ve iş parçacıklı ana süreçte güvenli değildir ve Windows'ta
+# yoktur). Spawn edilen süreç ana betiği yeniden içe aktarır; süreçler açılırken __main__ bu modül
+# olarak gösterilir ki işçiler GUI modülünü (Qt, QtWebEngine) yüklemesin. Ana sürecin günlük düzeni de
+# devralınmaz; başlatıcı kök kaydediciyi bir çoklu süreç kuyruğuna bağlar, ana süreçteki dinleyici de
+# kayıtları oradaki düzene (dosya, konsol) verir.
+_ANA_MODUL_KILIDI = threading.Lock()
+
+
+class _KayitAktarici(logging.Handler):
+    """İşçilerden gelen kaydı ana süreçte aynı adlı kaydediciye verir."""
+
+    def emit(self, record):
+        logging.getLogger(record.name).handle(record)
+
+
+def _isci_gunlugunu_kur(kuyruk, seviye):
+    """İşçi süreç başlatıcısı: kök kaydedicinin tek işleyicisi ana sürece giden kuyruktur."""
+    kok = logging.getLogger()
+    for isleyici in list(kok.handlers): kok.removeHandler(isleyici)
+    kok.setLevel(seviye); kok.addHandler(logging.handlers.QueueHandler(kuyruk))
+
+
+def kullanilabilir_cpu_sayisi():
+    """Bu sürecin çalışabileceği işlemci sayısı (Linux'ta benzeşim maskesine, taskset/konteyner sınırlarına göre)."""
+    return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+
+@contextlib.contextmanager
+def _hafif_ana_modul():
+    """Blok süresince spawn edilen süreçler ana betik yerine bu modülü __mp_main__ olarak çalıştırır."""
+    with _ANA_MODUL_KILIDI:
+        ana = sys.modules['__main__']; eski = getattr(ana, '__spec__', None); ana.__spec__ = __spec__
+        try: yield
+        finally: ana.__spec__ = eski
+
+
+def paralel_esle(islev, ogeler, isci_sayisi):
+    """
+    islev'i ogeler üzerinde isci_sayisi spawn işçi süreçte çalıştırır; sonuçları öğe sırasıyla liste olarak döner.
+    islev Qt içe aktarmayan bir modülde tanımlı olmalıdır (işçi onu içe aktarır). İşçilerdeki günlük kayıtları
+    havuz açık kaldığı sürece ana sürecin günlüğüne aktarılır.
+    """
+    baglam = multiprocessing.get_context("spawn"); kuyruk = baglam.Queue()
+    dinleyici = logging.handlers.QueueListener(kuyruk, _KayitAktarici()); dinleyici.start()
+    try:
+        with concurrent.futures.ProcessPoolExecutor(isci_sayisi, mp_context=baglam, initializer=_isci_gunlugunu_kur,
+                                                    initargs=(kuyruk, logging.getLogger().getEffectiveLevel())) as yurutucu:
+            with _hafif_ana_modul(): gelecekler = [yurutucu.submit(islev, oge) for oge in ogeler]  # Süreçler gönderim sırasında açılır
+            return [gelecek.result() for gelecek in gelecekler]
+    finally:
+        dinleyici.stop(); kuyruk.close()
+
+
+# --- Excel Okuma ve Doğrulama ---
+# Çalışma kitapları işçi süreçlerde okunup sütun bazında doğrulanır; veritabanına ve ayarlara
+# dokunulmaz. Bilinmeyen sütunların ayrılması ve türetilmiş sütunlar ana süreçte yapılır.
+
+PATARA_SINIR_KUTUSU = (36.20, 29.22, 36.33, 29.36)  # (en güney, en batı, en kuzey, en doğu) enlem/boylam
+
+
+def sutun_adlarini_normallestir(sutunlar):
+    """Excel başlıklarını veritabanı sütun adlarına (küçük harf, Türkçe karaktersiz, alt çizgili) çevirir."""
+    return [
+        str(col).strip().lower().replace(' ', '_').replace('ı', 'i').replace('ğ', 'g').replace('ü', 'u').replace(
+            'ş', 's').replace('ö', 'o').replace('ç', 'c').replace('(', '').replace(')', '').replace('.', '') for col
+        in sutunlar]
+
+
+TARIH_SUTUNLARI = ['yuva_tarihi', 'ilk_yavru_cikis_tarihi', 'ikinci_predasyon_tarihi']
+SAYIM_SUTUNLARI = ['yuva_ici_canli_yavru', 'yuva_ici_olu_yavru', 'erken_donem_embriyo', 'orta_donem_embriyo', 'gec_donem_embriyo',
+                   'toplam_olu_embriyo', 'bos_kabuk_sayisi', 'predasyonlu_yumurta_sayisi', 'dollenmemis_yumurta_sayisi',
+                   'toplam_yumurta_sayisi', 'yavru_cikis_gun_1', 'yavru_cikis_gun_2', 'yavru_cikis_gun_3']
+SAYISAL_ARALIKLAR = {  # sütun: (en az, en çok); None sınırsız
+    'kuru_kum_uzakligi': (0, None), 'yari_islak_kum_uzakligi': (0, None), 'islak_kum_uzakligi': (0, None),
+    'toplam_denize_uzaklik': (0, None), 'yuva_derinligi': (0, None), 'yuva_capi': (0, None),
+    'kulucka_suresi_gun': (20, 120), 'yuva_basarisi_yuzde': (0, 100), **{s: (0, None) for s in SAYIM_SUTUNLARI}}
+
+
+def _bos_mu(seri):
+    """Boş hücre maskesi: NaN/None ya da yalnızca boşluktan oluşan metin."""
+    bos = seri.isna()
+    return bos | seri.map(lambda deger: isinstance(deger, str) and not deger.strip()).astype(bool) if seri.dtype == object else bos
+
+
+def yuva_verisini_dogrula(df, sinir_kutusu=PATARA_SINIR_KUTUSU):
+    """
+    Normalleştirilmiş sütun adlı ham tabloyu sütun bazında, vektörel maskelerle doğrular: tür, aralık (konum Patara
+    sınır kutusunda, sayımlar ≥ 0), yumurta sayımlarının tutarlılığı ve tarih sırası. (temiz_df, karantina_df) döner;
+    karantina_df satır numarası (RangeIndex ile okunmuş Excel'deki satır), id, yil, nedenler ve ham veriyi (JSON) taşır. Temiz satırlar
+    veritabanı türlerine çevrilmiş olarak döner.
+    """
+    n = len(df); nedenler = np.full(n, "", dtype=object)
+    def isaretle(maske, neden):
+        maske = np.asarray(maske, dtype=bool)
+        if maske.any(): nedenler[maske] = nedenler[maske] + (neden + "; ")
+    temiz = pd.DataFrame(index=df.index)
+
+    kimlik = pd.to_numeric(df['id'], errors='coerce') if 'id' in df.columns else pd.Series(np.nan, index=df.index)
+    isaretle(kimlik.isna() | (kimlik % 1 != 0) | (kimlik < 0), "id boş ya da negatif olmayan tam sayı değil")
+    for sutun in TARIH_SUTUNLARI:
+        if sutun not in df.columns: continue
+        bos = _bos_mu(df[sutun]); temiz[sutun] = pd.to_datetime(df[sutun].where(~bos), errors='coerce', format='mixed')
+        isaretle(~bos & temiz[sutun].isna(), f"{sutun} geçersiz tarih")
+    isaretle(temiz['yuva_tarihi'].isna() & _bos_mu(df['yuva_tarihi']), "yuva_tarihi boş")
+    for sutun in ('ilk_yavru_cikis_tarihi', 'ikinci_predasyon_tarihi'):
+        if sutun in temiz.columns: isaretle(temiz[sutun] < temiz['yuva_tarihi'], f"{sutun} yuva_tarihi'nden önce")
+
+    sayilar = {}
+    for sutun in ['lat', 'lon', *SAYISAL_ARALIKLAR]:
+        if sutun not in df.columns: continue
+        bos = _bos_mu(df[sutun]); deger = pd.to_numeric(df[sutun].where(~bos), errors='coerce'); sayilar[sutun] = deger
+        isaretle(~bos & deger.isna(), f"{sutun} sayısal değil")
+        en_az, en_cok = SAYISAL_ARALIKLAR.get(sutun, (None, None))
+        if en_az is not None: isaretle(deger < en_az, f"{sutun} < {en_az}")
+        if en_cok is not None: isaretle(deger > en_cok, f"{sutun} > {en_cok}")
+        if sutun in SAYIM_SUTUNLARI: isaretle(deger % 1 > 0, f"{sutun} tam sayı değil")
+    if 'lat' in sayilar or 'lon' in sayilar:
+        enlem = sayilar.get('lat', pd.Series(np.nan, index=df.index)); boylam = sayilar.get('lon', pd.Series(np.nan, index=df.index))
+        isaretle(enlem.isna() != boylam.isna(), "lat/lon yalnızca biri dolu")
+        guney, bati, kuzey, dogu = sinir_kutusu
+        isaretle(enlem.notna() & boylam.notna() & ~(enlem.between(guney, kuzey) & boylam.between(bati, dogu)), "konum Patara sınır kutusu dışında")
+
+    def toplam(sutunlar):
+        mevcut = [sayilar[s] for s in sutunlar if s in sayilar]
+        return pd.concat(mevcut, axis=1).sum(axis=1, min_count=1) if mevcut else pd.Series(np.nan, index=df.index)
+    embriyo = toplam(['erken_donem_embriyo', 'orta_donem_embriyo', 'gec_donem_embriyo'])
+    if 'toplam_olu_embriyo' in sayilar: isaretle(embriyo > sayilar['toplam_olu_embriyo'], "evre embriyoları toplam_olu_embriyo'dan fazla")
+    if 'toplam_yumurta_sayisi' in sayilar:
+        yumurta = sayilar['toplam_yumurta_sayisi']
+        bilesenler = toplam(['bos_kabuk_sayisi', 'toplam_olu_embriyo', 'predasyonlu_yumurta_sayisi', 'dollenmemis_yumurta_sayisi'])
+        isaretle(bilesenler > yumurta, "kabuk + embriyo + predasyonlu + döllenmemiş toplam yumurtadan fazla")
+        isaretle(toplam(['yuva_ici_canli_yavru', 'yuva_ici_olu_yavru']) > yumurta, "yuva içi yavrular toplam yumurtadan fazla")
+        isaretle(toplam(['yavru_cikis_gun_1', 'yavru_cikis_gun_2', 'yavru_cikis_gun_3']) > yumurta, "günlük yavru çıkışları toplam yumurtadan fazla")
+
+    hatali = nedenler != ""
+    yil = temiz['yuva_tarihi'].dt.year
+    ham = df.loc[hatali].astype(object).where(df.loc[hatali].notna(), None)
+    karantina_df = pd.DataFrame({'satir': df.index[hatali] + 2, 'id': kimlik[hatali].where(kimlik[hatali] % 1 == 0).astype('Int64'),
+                                 'yil': yil[hatali].astype('Int64'), 'nedenler': [m.rstrip("; ") for m in nedenler[hatali]],
+                                 'veri': [json.dumps(kayit, ensure_ascii=False, default=str) for kayit in ham.to_dict('records')]})
+
+    temiz_df = df.loc[~hatali].copy()
+    temiz_df['id'] = kimlik[~hatali].astype(int); temiz_df['yil'] = yil[~hatali].astype(int)
+    for sutun in temiz.columns: temiz_df[sutun] = temiz.loc[~hatali, sutun].dt.strftime('%Y-%m-%d')
+    for sutun, deger in sayilar.items(): temiz_df[sutun] = deger[~hatali].round().astype('Int64') if sutun in SAYIM_SUTUNLARI or sutun == 'kulucka_suresi_gun' else deger[~hatali]
+    temiz_df = temiz_df.astype(object).where(temiz_df.notna(), None)
+    return temiz_df.reset_index(drop=True), karantina_df
+
+
+def excel_calismasini_oku(excel_dosya_yolu):
+    """
+    İşçi süreç girişi: tek bir çalışma kitabını okuyup doğrular ve veritabanı biçimine normalleştirir;
+    (yol, temiz_df, karantina_df, sutunlar, hata) döner, sutunlar dosyanın normalleştirilmiş başlıklarıdır. Dosya
+    düzeyinde bir hata (okunamama, zorunlu sütun eksikliği) varsa tablolar None'dır; satır hataları yalnızca o satırları ayırır.
+    """
+    try:
+        df = pd.read_excel(excel_dosya_yolu, engine='openpyxl', dtype=object)
+        df.columns = sutun_adlarini_normallestir(df.columns)
+
+        if 'yuva_tarihi' not in df.columns: return excel_dosya_yolu, None, None, [], "'yuva_tarihi' sütunu bulunamadı."
+        id_key = next((k for k in ['id', 'yuva_sira_no', 'yuva_no'] if k in df.columns), None)
+        if id_key is None: return excel_dosya_yolu, None, None, [], "'id' sütunu bulunamadı."
+        if id_key != 'id': df['id'] = df[id_key]
+        sutunlar = list(df.columns)
+
+        df, karantina_df = yuva_verisini_dogrula(df.dropna(how='all'))
+        if 'predator_canli_listesi' in df.columns:  # Dışa aktarılan "a, b" metni, saklanan JSON listesine geri çevrilir
+            df['predator_canli_listesi'] = df['predator_canli_listesi'].map(
+                lambda d: d if d is None or (isinstance(d, str) and d.startswith('[')) or pd.isna(d) else json.dumps([p.strip().lower() for p in str(d).split(',') if p.strip()]))
+        return excel_dosya_yolu, df, karantina_df, sutunlar, None
+    except Exception as e:
+        return excel_dosya_yolu, None, None, [], str(e)
+
+
+# --- Başsız (Headless) Statik Harita Çizimi ---
+# Rapor ve toplu çıktılar için harita, QtWebEngine olmadan doğrudan matplotlib Agg tuvaline
+# çizilir: yuvalar Web Mercator'a (EPSG:3857) NumPy ile izdüşürülür, böylece önbellekteki
+# çevrimdışı altlık karoları ({z}/{x}/{y}.png) tek bir mozaik olarak birebir hizalanır.
+# Çizim veritabanına ve ayar dosyasına dokunmaz; yuvaları ve lejantları çağıran verir.
+
+KARO_BOYUTU = 256
+MERKATOR_YARI_CEVRE = 20037508.342789244
+PREDASYON_RENKLERI = {"tam": ("darkred", "red", "Tam Predasyon"), "yari": ("darkblue", "blue", "Yarı Predasyon"), "saglam": ("darkgreen", "green", "Sağlam")}
+
+
+def web_merkator(lon, lat):
+    """Boylam/enlem dizilerini EPSG:3857 metre koordinatlarına çevirir."""
+    lon = np.asarray(lon, dtype=float); lat = np.clip(np.asarray(lat, dtype=float), -85.0511, 85.0511)
+    return lon * MERKATOR_YARI_CEVRE / 180.0, np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * MERKATOR_YARI_CEVRE / np.pi
+
+
+def karo_araligi(x0, x1, y0, y1, zoom):
+    """Merkatör kapsamını örten karo sütun/satır aralığını döner."""
+    n = 2 ** zoom; karo_m = 2 * MERKATOR_YARI_CEVRE / n
+    return (int((x0 + MERKATOR_YARI_CEVRE) // karo_m), int((x1 + MERKATOR_YARI_CEVRE) // karo_m),
+            int((MERKATOR_YARI_CEVRE - y1) // karo_m), int((MERKATOR_YARI_CEVRE - y0) // karo_m))
+
+
+def karo_mozaigi(x0, x1, y0, y1, genislik_px, klasor):
+    """Kapsam için önbellekteki en uygun zoom düzeyinden tek bir RGBA mozaik ve kapsamını döner; karo yoksa None."""
+    if not klasor or not os.path.isdir(klasor): return None
+    zoomlar = sorted(int(z) for z in os.listdir(klasor) if z.isdigit())
+    if not zoomlar: return None
+    ideal = np.log2(genislik_px * 2 * MERKATOR_YARI_CEVRE / (KARO_BOYUTU * max(x1 - x0, 1.0)))
+    zoom = max([z for z in zoomlar if z <= ideal + 0.5] or zoomlar[:1])
+    sx0, sx1, sy0, sy1 = karo_araligi(x0, x1, y0, y1, zoom)
+    if (sx1 - sx0 + 1) * (sy1 - sy0 + 1) > 400: return None
+    mozaik = np.zeros(((sy1 - sy0 + 1) * KARO_BOYUTU, (sx1 - sx0 + 1) * KARO_BOYUTU, 4), dtype=np.float32); bulunan = 0
+    for x in range(sx0, sx1 + 1):
+        for y in range(sy0, sy1 + 1):
+            yol = os.path.join(klasor, str(zoom), str(x), f"{y}.png")
+            if not os.path.isfile(yol): continue
+            karo = matplotlib.image.imread(yol)
+            if karo.ndim == 2: karo = np.dstack([karo] * 3)
+            if karo.shape[2] == 3: karo = np.dstack([karo, np.ones(karo.shape[:2], dtype=karo.dtype)])
+            mozaik[(y - sy0) * KARO_BOYUTU:(y - sy0 + 1) * KARO_BOYUTU, (x - sx0) * KARO_BOYUTU:(x - sx0 + 1) * KARO_BOYUTU] = karo[:KARO_BOYUTU, :KARO_BOYUTU]; bulunan += 1
+    if not bulunan: return None
+    karo_m = 2 * MERKATOR_YARI_CEVRE / 2 ** zoom
+    return mozaik, (sx0 * karo_m - MERKATOR_YARI_CEVRE, (sx1 + 1) * karo_m - MERKATOR_YARI_CEVRE, MERKATOR_YARI_CEVRE - (sy1 + 1) * karo_m, MERKATOR_YARI_CEVRE - sy0 * karo_m)
+
+
+def yogunluk_izgarasi(x, y, kapsam, hucre_m=20.0, yumusatma_m=40.0):
+    """Noktalardan Gauss çekirdeğiyle yumuşatılmış yoğunluk ızgarası (satır 0 = güney) üretir; ısı haritasının statik karşılığıdır."""
+    x0, x1, y0, y1 = kapsam
+    izgara, _, _ = np.histogram2d(y, x, bins=(max(int((y1 - y0) / hucre_m), 1), max(int((x1 - x0) / hucre_m), 1)), range=[[y0, y1], [x0, x1]])
+    sigma = yumusatma_m / hucre_m; eksen = np.arange(-int(3 * sigma), int(3 * sigma) + 1); cekirdek = np.exp(-0.5 * (eksen / sigma) ** 2); cekirdek /= cekirdek.sum()
+    izgara = np.apply_along_axis(np.convolve, 0, izgara, cekirdek, mode='same')
+    return np.apply_along_axis(np.convolve, 1, izgara, cekirdek, mode='same')
+
+
+def statik_harita_ciz(cikti_yolu, yuvalar, baslik=None, cizimler=(), yogunluk=False, karolar=True, dpi=300, boyut=(8, 10), sabit_lejantlar=None, karo_klasoru=None):
+    """
+    Yuvaları predasyon durumuna göre renklendirilmiş, kıyı çizgisi, sabit lejantlar, (isteğe bağlı) yoğunluk ızgarası,
+    çizilmiş alanlar ve karo_klasoru'ndaki altlık karolarıyla birlikte PNG/PDF olarak çizer. yuvalar DataFrame ya da yuva
+    sözlükleri listesidir; sabit_lejantlar {isim: [lat, lon]}, cizimler [lat, lon] köşe listeleridir. Çıktı yolunu döner.
+    """
+    df = pd.DataFrame(yuvalar) if not isinstance(yuvalar, pd.DataFrame) else yuvalar
+    if df.empty: df = pd.DataFrame(columns=['lat', 'lon', 'predasyon_durumu'])
+    df = df.dropna(subset=['lat', 'lon']); sabit_lejantlar = sabit_lejantlar or {}
+    x, y = web_merkator(df['lon'], df['lat'])
+    lejant_x, lejant_y = web_merkator([k[1] for k in sabit_lejantlar.values()], [k[0] for k in sabit_lejantlar.values()])
+    cizim_xy = [web_merkator([k[1] for k in c], [k[0] for k in c]) for c in cizimler if c]
+
+    tum_x = np.concatenate([x, lejant_x, *[c[0] for c in cizim_xy]]); tum_y = np.concatenate([y, lejant_y, *[c[1] for c in cizim_xy]])
+    if not len(tum_x): tum_x, tum_y = web_merkator([PATARA_SINIR_KUTUSU[1], PATARA_SINIR_KUTUSU[3]], [PATARA_SINIR_KUTUSU[0], PATARA_SINIR_KUTUSU[2]])
+    # Kapsam, şekil en-boy oranına genişletilir ki eşit ölçekli eksen boş şerit bırakmasın
+    orta_x, orta_y = (tum_x.min() + tum_x.max()) / 2, (tum_y.min() + tum_y.max()) / 2
+    yari_g = max(np.ptp(tum_x) * 0.55, 150.0); yari_y = max(np.ptp(tum_y) * 0.55, 150.0); oran = boyut[1] / boyut[0]
+    if yari_y / yari_g < oran: yari_y = yari_g * oran
+    else: yari_g = yari_y / oran
+    kapsam = (orta_x - yari_g, orta_x + yari_g, orta_y - yari_y, orta_y + yari_y)
+
+    fig = Figure(figsize=boyut, dpi=dpi); FigureCanvasAgg(fig); ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(kapsam[0], kapsam[1]); ax.set_ylim(kapsam[2], kapsam[3]); ax.set_aspect('equal'); ax.set_axis_off()
+    mozaik = karo_mozaigi(*kapsam, boyut[0] * dpi, karo_klasoru) if karolar else None
+    if mozaik is not None: ax.imshow(mozaik[0], extent=mozaik[1], zorder=0, interpolation='bilinear')
+    else: ax.set_facecolor('#f2efe9'); ax.set_axis_on(); ax.set_xticks([]); ax.set_yticks([])
+    if yogunluk and len(x):
+        izgara = yogunluk_izgarasi(x, y, kapsam)
+        ax.imshow(np.ma.masked_less(izgara, izgara.max() * 0.05), extent=kapsam, origin='lower', cmap='YlOrRd', alpha=0.6, zorder=1, interpolation='bilinear')
+    if len(lejant_x) > 1: ax.plot(lejant_x, lejant_y, color='gray', linewidth=1.2, linestyle=(0, (5, 5)), alpha=0.8, zorder=2)
+    for cx, cy in cizim_xy:
+        ax.fill(cx, cy, facecolor='#3388ff', alpha=0.15, zorder=2); ax.plot(cx, cy, color='#3388ff', linewidth=1.5, zorder=2)
+    durum = df['predasyon_durumu'].astype(str).str.lower().to_numpy() if 'predasyon_durumu' in df.columns else np.full(len(df), "")
+    siniflar = {"saglam": ~np.isin(durum, ["tam", "yari", "kismi"]), "yari": np.isin(durum, ["yari", "kismi"]), "tam": durum == "tam"}
+    for sinif in ("saglam", "yari", "tam"):
+        kenar, dolgu, etiket = PREDASYON_RENKLERI[sinif]; secili = siniflar[sinif]
+        ax.scatter(x[secili], y[secili], s=10, c=dolgu, edgecolors=kenar, linewidths=0.4, alpha=0.8, zorder=3, rasterized=True, label=f"{etiket} ({int(secili.sum())})")
+    ax.scatter(lejant_x, lejant_y, s=28, marker='^', c='black', zorder=4)
+    for isim, lx, ly in zip(sabit_lejantlar, lejant_x, lejant_y):
+        ax.annotate(isim.title(), (lx, ly), xytext=(4, 4), textcoords='offset points', fontsize=6, zorder=5, bbox={"boxstyle": "round,pad=0.15", "fc": "white", "ec": "none", "alpha": 0.7})
+    ax.legend(loc='lower left', fontsize=7, framealpha=0.85)
+    if baslik: ax.set_title(baslik, fontsize=11, y=0.97, bbox={"fc": "white", "ec": "none", "alpha": 0.8})
+    if mozaik is not None: ax.text(0.995, 0.003, "© OpenStreetMap katkıcıları © CARTO", transform=ax.transAxes, ha='right', va='bottom', fontsize=5, color='#555555', zorder=5)
+    fig.savefig(cikti_yolu, dpi=dpi); return cikti_yolu
+
+
+def statik_harita_isi(is_tanimi):
+    """İşçi süreç girişi: statik_harita_ciz() argüman sözlüğünden bir harita çizer; (çıktı yolu, hata) döner."""
+    try: return statik_harita_ciz(**is_tanimi), None
+    except Exception as e: return is_tanimi.get("cikti_yolu"), str(e)
@@ -0,0 +1,84 @@
+import os
+import shutil
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWebEngineWidgets")
+import patara
+
+
+def _yuvalari_ekle(db_yolu, adet):
+    conn = patara.get_connection(db_yolu)
+    with conn, patara.gunluk_islemi(conn, "test: yuva ekle"):
+        conn.executemany("INSERT INTO yuvalar (id, yil, lat, lon, predasyon_durumu) VALUES (?, 2024, ?, ?, 'yok')",
+                         [(i, 36.26 + i * 1e-4, 29.31 + i * 1e-4) for i in range(1, adet + 1)])
+    conn.close()
+
+
+def _predasyonu_guncelle(db_yolu, yuva_id, durum):
+    conn = patara.get_connection(db_yolu)
+    with conn, patara.gunluk_islemi(conn, "test: predasyon"):
+        conn.execute("UPDATE yuvalar SET predasyon_durumu = ? WHERE id = ? AND yil = 2024", (durum, yuva_id))
+    conn.close()
+
+
+def _predasyonlar(db_yolu):
+    conn = patara.get_connection(db_yolu)
+    try: return dict(conn.execute("SELECT id, predasyon_durumu FROM yuvalar ORDER BY id").fetchall())
+    finally: conn.close()
+
+
+@pytest.fixture
+def kopyalar(tmp_path):
+    """Ortak bir dosyadan kopyalanmış iki saha veritabanı."""
+    a, b = os.path.join(tmp_path, "a.db"), os.path.join(tmp_path, "b.db")
+    patara.setup_database(a)
+    _yuvalari_ekle(a, 100)
+    shutil.copy(a, b)
+    return a, b
+
+
+def test_ortak_atadan_gelen_ayni_satirlar_gonderilmez(kopyalar):
+    a, b = kopyalar
+    basarili, _, ozet = patara.veritabanlarini_senkronize_et(a, b)
+    assert basarili
+    assert ozet["a_to_b"]["kayit"] == 0 and ozet["b_to_a"]["kayit"] == 0
+
+
+def test_ortak_atada_silinen_satirlar_gonderilmez(tmp_path):
+    a, b = os.path.join(tmp_path, "a.db"), os.path.join(tmp_path, "b.db")
+    patara.setup_database(a)
+    _yuvalari_ekle(a, 20)
+    conn = patara.get_connection(a)
+    with conn, patara.gunluk_islemi(conn, "test: yuva sil"):
+        conn.execute("DELETE FROM yuvalar WHERE id <= 5")
+    conn.close()
+    shutil.copy(a, b)
+    basarili, _, ozet = patara.veritabanlarini_senkronize_et(a, b)
+    assert basarili
+    assert ozet["a_to_b"]["kayit"] == 0 and ozet["b_to_a"]["kayit"] == 0
+    assert _predasyonlar(a) == _predasyonlar(b) and len(_predasyonlar(a)) == 15
+
+
+def test_cift_yonlu_degisiklikler_tasinir(kopyalar):
+    a, b = kopyalar
+    _predasyonu_guncelle(a, 1, "tam")
+    _predasyonu_guncelle(b, 2, "kismi")
+    basarili, _, ozet = patara.veritabanlarini_senkronize_et(a, b)
+    assert basarili
+    assert ozet["a_to_b"]["kayit"] + ozet["b_to_a"]["kayit"] <= 4
+    assert _predasyonlar(a) == _predasyonlar(b)
+    assert _predasyonlar(a)[1] == "tam" and _predasyonlar(a)[2] == "kismi"
+
+    # Sonraki turda taşınacak bir şey kalmaz.
+    _, _, ozet = patara.veritabanlarini_senkronize_et(a, b)
+    assert ozet["a_to_b"]["kayit"] == 0 and ozet["b_to_a"]["kayit"] == 0
+
+
+def test_ayni_alanda_son_yazan_kazanir(kopyalar):
+    a, b = kopyalar
+    patara.veritabanlarini_senkronize_et(a, b)
+    _predasyonu_guncelle(a, 5, "yari")
+    _predasyonu_guncelle(b, 5, "tam")
+    patara.veritabanlarini_senkronize_et(a, b)
+    assert _predasyonlar(a)[5] == _predasyonlar(b)[5] == "tam"